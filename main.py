@@ -1,4 +1,3 @@
-import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
@@ -12,20 +11,32 @@ from util.config import APP_NAME, SECRET_KEY, HOST, PORT, RELOAD, VERSION
 # Logger
 from util.logger_config import logger
 
+# Banco de dados
+from util.db_util import fechar_pool
+from util.db_async import executor_banco
+from util.chat_manager import chat_manager
+
+# Rate limiting (varredura do estado dos limiters)
+from util.rate_limiter import varredor_rate_limit
+
 # Exception Handlers
 from util.exception_handlers import (
     http_exception_handler,
     validation_exception_handler,
     generic_exception_handler,
     form_validation_exception_handler,
+    banco_sobrecarregado_exception_handler,
 )
-from util.exceptions import FormValidationError
+from util.exceptions import FormValidationError, BancoSobrecarregadoError
+
+# Migrações do esquema do banco
+from util.migracoes import aplicar_migracoes
 
-# Repositórios
-from repo import usuario_repo, configuracao_repo, tarefa_repo, chamado_repo, chamado_interacao_repo, indices_repo
-from repo import chat_sala_repo, chat_participante_repo, chat_mensagem_repo, categoria_repo
-from repo import especie_repo, raca_repo, abrigo_repo, adotante_repo, animal_repo, endereco_repo
-from repo import solicitacao_repo, adocao_repo, visita_repo
+# Cópia das configurações do .env para o banco
+from util.migrar_config import migrar_configs_para_banco
+
+# Cache de configurações (pré-carregado após as migrações)
+from util.config_cache import config, verificador_configuracoes
 
 # Rotas
 from routes.auth_routes import router as auth_router
@@ -44,6 +55,9 @@ from routes.examples_routes import router as examples_router
 # Seeds
 from util.seed_data import inicializar_dados
 
+# Templates
+from util.template_util import TEMPLATES_PRECOMPILAR, precompilar_templates
+
 # Criar aplicação FastAPI
 app = FastAPI(title=APP_NAME, version=VERSION)
 
@@ -59,6 +73,7 @@ logger.info("CSRF Protection habilitado")
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)  # type: ignore[arg-type]
 app.add_exception_handler(RequestValidationError, validation_exception_handler)  # type: ignore[arg-type]
 app.add_exception_handler(FormValidationError, form_validation_exception_handler)  # type: ignore[arg-type]
+app.add_exception_handler(BancoSobrecarregadoError, banco_sobrecarregado_exception_handler)  # type: ignore[arg-type]
 app.add_exception_handler(Exception, generic_exception_handler)
 logger.info("Exception handlers registrados")
 
@@ -68,73 +83,22 @@ if static_path.exists():
     app.mount("/static", StaticFiles(directory="static"), name="static")
     logger.info("Arquivos estáticos montados em /static")
 
-# Criar tabelas do banco de dados
-logger.info("Criando tabelas do banco de dados...")
+# Criar/atualizar o esquema do banco de dados (apenas migrações pendentes)
 try:
-    usuario_repo.criar_tabela()
-    logger.info("Tabela 'usuario' criada/verificada")
-
-    configuracao_repo.criar_tabela()
-    logger.info("Tabela 'configuracao' criada/verificada")
-
-    tarefa_repo.criar_tabela()
-    logger.info("Tabela 'tarefa' criada/verificada")
-
-    chamado_repo.criar_tabela()
-    logger.info("Tabela 'chamado' criada/verificada")
-
-    chamado_interacao_repo.criar_tabela()
-    logger.info("Tabela 'chamado_interacao' criada/verificada")
-
-    chat_sala_repo.criar_tabela()
-    logger.info("Tabela 'chat_sala' criada/verificada")
-
-    chat_participante_repo.criar_tabela()
-    logger.info("Tabela 'chat_participante' criada/verificada")
-
-    chat_mensagem_repo.criar_tabela()
-    logger.info("Tabela 'chat_mensagem' criada/verificada")
-
-    categoria_repo.criar_tabela()
-    logger.info("Tabela 'categoria' criada/verificada")
-
-    # Tabelas específicas do PetLar
-    especie_repo.criar_tabela()
-    logger.info("Tabela 'especie' criada/verificada")
-
-    raca_repo.criar_tabela()
-    logger.info("Tabela 'raca' criada/verificada")
-
-    abrigo_repo.criar_tabela()
-    logger.info("Tabela 'abrigo' criada/verificada")
-
-    adotante_repo.criar_tabela()
-    logger.info("Tabela 'adotante' criada/verificada")
-
-    endereco_repo.criar_tabela()
-    logger.info("Tabela 'endereco' criada/verificada")
-
-    animal_repo.criar_tabela()
-    logger.info("Tabela 'animal' criada/verificada")
-
-    solicitacao_repo.criar_tabela()
-    logger.info("Tabela 'solicitacao' criada/verificada")
-
-    adocao_repo.criar_tabela()
-    logger.info("Tabela 'adocao' criada/verificada")
-
-    visita_repo.criar_tabela()
-    logger.info("Tabela 'visita' criada/verificada")
-
-
-    # Criar índices para otimização de performance
-    indices_repo.criar_indices()
-
+    aplicar_migracoes()
 except Exception as e:
-    logger.error(f"Erro ao criar tabelas: {e}")
+    logger.error(f"Erro ao aplicar migrações do banco de dados: {e}")
     raise
 
+# Migrar configurações do .env para o banco de dados (apenas chaves ausentes,
+# assim chaves novas chegam a bancos já migrados)
+try:
+    migrar_configs_para_banco()
+except Exception as e:
+    logger.error(f"Erro ao migrar configurações para banco: {e}", exc_info=True)
 
+# Carregar as configurações do banco com uma única consulta
+config.precarregar()
 
 # Inicializar dados seed
 try:
@@ -142,12 +106,12 @@ try:
 except Exception as e:
     logger.error(f"Erro ao inicializar dados seed: {e}", exc_info=True)
 
-# Migrar configurações do .env para o banco de dados
-try:
-    from util.migrar_config import migrar_configs_para_banco
-    migrar_configs_para_banco()
-except Exception as e:
-    logger.error(f"Erro ao migrar configurações para banco: {e}", exc_info=True)
+# Compilar os templates antes da primeira requisição (opcional)
+if TEMPLATES_PRECOMPILAR:
+    try:
+        logger.info(f"Templates pré-compilados: {precompilar_templates()}")
+    except Exception as e:
+        logger.error(f"Erro ao pré-compilar templates: {e}", exc_info=True)
 
 # Incluir routers
 # IMPORTANTE: public_router deve ser incluído por último para que a rota "/" funcione corretamente
@@ -189,12 +153,32 @@ logger.info("Router público incluído")
 app.include_router(examples_router, tags=["Exemplos"])
 logger.info("Router de exemplos incluído")
 
+@app.on_event("startup")
+async def iniciar_tarefas_periodicas():
+    """Inicia a varredura dos rate limiters e a verificação das configurações"""
+    varredor_rate_limit.iniciar()
+    verificador_configuracoes.iniciar()
+
+
+@app.on_event("shutdown")
+async def fechar_conexoes_banco():
+    """Encerra o broadcast do chat, o executor assíncrono e o pool ao encerrar a aplicação"""
+    await varredor_rate_limit.encerrar()
+    await verificador_configuracoes.encerrar()
+    await chat_manager.encerrar()
+    executor_banco.encerrar()
+    fechar_pool()
+    logger.info("Pool de conexões do banco de dados encerrado")
+
+
 @app.get("/health")
 async def health_check():
     """Endpoint de health check"""
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    import uvicorn
+
     logger.info("=" * 60)
     logger.info(f"Iniciando {APP_NAME} v{VERSION}")
     logger.info("=" * 60)
@@ -0,0 +1,52 @@
+"""
+Models para os resultados da busca textual (FTS5).
+"""
+from dataclasses import dataclass, field
+from typing import Any, List
+
+
+@dataclass
+class ResultadoBusca:
+    """
+    Um item encontrado pela busca textual.
+
+    Attributes:
+        item: Registro encontrado (dicionário ou model, conforme o repositório)
+        trecho: Trecho do texto indexado com os termos encontrados delimitados
+            por MARCADOR_INICIO/MARCADOR_FIM (ver util.busca_fts.trecho_para_html)
+        relevancia: Pontuação bm25 (quanto menor, mais relevante)
+    """
+    item: Any
+    trecho: str = ""
+    relevancia: float = 0.0
+
+
+@dataclass
+class PaginaBusca:
+    """
+    Uma página de resultados da busca textual.
+
+    Attributes:
+        termo: Texto buscado
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade máxima de itens por página
+        total: Total de itens encontrados em todas as páginas
+        resultados: Itens da página, do mais relevante para o menos relevante
+    """
+    termo: str
+    pagina: int
+    por_pagina: int
+    total: int = 0
+    resultados: List[ResultadoBusca] = field(default_factory=list)
+
+    @property
+    def total_paginas(self) -> int:
+        return (self.total + self.por_pagina - 1) // self.por_pagina
+
+    @property
+    def tem_anterior(self) -> bool:
+        return self.pagina > 1
+
+    @property
+    def tem_proxima(self) -> bool:
+        return self.pagina < self.total_paginas
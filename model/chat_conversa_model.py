@@ -0,0 +1,36 @@
+"""
+Model para representar o resumo de uma conversa na lista de conversas do chat.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class ChatConversa:
+    """
+    Representa uma conversa do ponto de vista de um usuário.
+
+    Agrega a sala, o outro participante, a última mensagem e o número de
+    mensagens não lidas, conforme retornado por uma única consulta.
+
+    Attributes:
+        sala_id: ID da sala de chat
+        ultima_atividade: Timestamp da última atividade da sala
+        outro_usuario_id: ID do outro participante
+        outro_usuario_nome: Nome do outro participante
+        outro_usuario_email: E-mail do outro participante
+        nao_lidas: Número de mensagens não lidas pelo usuário
+        ultima_mensagem: Conteúdo da última mensagem (None se não houver)
+        ultima_mensagem_data_envio: Timestamp da última mensagem
+        ultima_mensagem_usuario_id: ID do autor da última mensagem
+    """
+    sala_id: str
+    ultima_atividade: datetime
+    outro_usuario_id: int
+    outro_usuario_nome: str
+    outro_usuario_email: str
+    nao_lidas: int = 0
+    ultima_mensagem: Optional[str] = None
+    ultima_mensagem_data_envio: Optional[datetime] = None
+    ultima_mensagem_usuario_id: Optional[int] = None
@@ -0,0 +1,23 @@
+"""
+Model para representar um evento do log de broadcast do chat.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class ChatEvento:
+    """
+    Evento SSE destinado a um usuário, publicado no log compartilhado.
+
+    Attributes:
+        id: ID sequencial do evento (cursor de leitura dos workers)
+        usuario_id: ID do usuário destinatário
+        dados: Conteúdo do evento (dicionário enviado via SSE)
+        criado_em: Timestamp de publicação
+    """
+    id: int
+    usuario_id: int
+    dados: dict
+    criado_em: Optional[datetime] = None
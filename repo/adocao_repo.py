@@ -4,6 +4,14 @@ from typing import List, Optional
 from datetime import datetime
 from model.adocao_model import Adocao
 from sql.adocao_sql import *
+from model.busca_model import PaginaBusca
+from util.busca_fts import (
+    BUSCA_POR_PAGINA,
+    criar_indice_fts,
+    executar_busca_paginada,
+    montar_consulta_fts,
+    reconstruir_indice_fts,
+)
 from util.db_util import get_connection
 
 
@@ -34,10 +42,11 @@ def _row_to_adocao(row) -> Adocao:
 
 
 def criar_tabela() -> bool:
-    """Cria a tabela adocao se não existir."""
+    """Cria a tabela adocao e o índice de busca textual se não existirem."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        criar_indice_fts(cursor, "adocao_fts", CRIAR_TABELA_FTS, TRIGGERS_FTS, POPULAR_FTS)
         return True
 
 
@@ -104,18 +113,57 @@ def contar() -> int:
         return cursor.fetchone()[0]
 
 
-def buscar_por_termo(termo: str) -> List[dict]:
+def buscar_por_termo(termo: str, limite: int = 50) -> List[dict]:
     """
-    Busca adoções por termo (nome do animal, adotante ou observações).
+    Busca adoções por termo (nome do animal, nome do adotante ou observações).
+
+    Usa o índice FTS5: cada palavra é buscada por prefixo, sem diferenciar
+    maiúsculas nem acentos, e os resultados vêm ordenados por relevância.
 
     Args:
         termo: Termo de busca
+        limite: Número máximo de resultados
 
     Returns:
-        Lista de dicionários com dados das adoções que correspondem ao termo
+        Lista de dicionários com dados das adoções que correspondem ao termo (mais relevantes primeiro)
     """
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return []
+
     with get_connection() as conn:
         cursor = conn.cursor()
-        termo_like = f"%{termo}%"
-        cursor.execute(BUSCAR_POR_TERMO, (termo_like, termo_like, termo_like))
+        cursor.execute(BUSCAR_POR_TERMO, (consulta, limite, 0))
         return [dict(row) for row in cursor.fetchall()]
+
+
+def buscar_paginado(termo: str, pagina: int = 1, por_pagina: int = BUSCA_POR_PAGINA) -> PaginaBusca:
+    """
+    Busca adoções por termo com paginação, ranking e trechos destacados.
+
+    Args:
+        termo: Termo de busca
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade de itens por página
+
+    Returns:
+        PaginaBusca com dicionários com dados das adoções como itens
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        return executar_busca_paginada(
+            cursor, BUSCAR_POR_TERMO, CONTAR_POR_TERMO, termo, pagina, por_pagina, dict
+        )
+
+
+def reconstruir_indice_busca() -> int:
+    """
+    Reconstrói o índice de busca textual a partir da tabela adocao.
+
+    Returns:
+        Número de registros indexados
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA_FTS)
+        return reconstruir_indice_fts(cursor, "adocao_fts", [LIMPAR_FTS, POPULAR_FTS])
@@ -3,6 +3,14 @@
 from typing import List, Optional
 from model.adotante_model import Adotante
 from sql.adotante_sql import *
+from model.busca_model import PaginaBusca
+from util.busca_fts import (
+    BUSCA_POR_PAGINA,
+    criar_indice_fts,
+    executar_busca_paginada,
+    montar_consulta_fts,
+    reconstruir_indice_fts,
+)
 from util.db_util import get_connection
 
 
@@ -19,10 +27,11 @@ def _row_to_adotante(row) -> Adotante:
 
 
 def criar_tabela() -> bool:
-    """Cria a tabela adotante se não existir."""
+    """Cria a tabela adotante e o índice de busca textual se não existirem."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        criar_indice_fts(cursor, "adotante_fts", CRIAR_TABELA_FTS, TRIGGERS_FTS, POPULAR_FTS)
         return True
 
 
@@ -127,18 +136,57 @@ def contar() -> int:
         return cursor.fetchone()[0]
 
 
-def buscar_por_termo(termo: str) -> List[Adotante]:
+def buscar_por_termo(termo: str, limite: int = 50) -> List[Adotante]:
     """
-    Busca adotantes por termo (estado de saúde).
+    Busca adotantes por termo (nome ou e-mail do usuário, ou estado de saúde).
+
+    Usa o índice FTS5: cada palavra é buscada por prefixo, sem diferenciar
+    maiúsculas nem acentos, e os resultados vêm ordenados por relevância.
+
+    Args:
+        termo: Termo de busca
+        limite: Número máximo de resultados
+
+    Returns:
+        Lista de objetos Adotante que correspondem ao termo (mais relevantes primeiro)
+    """
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return []
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(BUSCAR_POR_TERMO, (consulta, limite, 0))
+        return [_row_to_adotante(row) for row in cursor.fetchall()]
+
+
+def buscar_paginado(termo: str, pagina: int = 1, por_pagina: int = BUSCA_POR_PAGINA) -> PaginaBusca:
+    """
+    Busca adotantes por termo com paginação, ranking e trechos destacados.
 
     Args:
         termo: Termo de busca
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade de itens por página
+
+    Returns:
+        PaginaBusca com objetos Adotante como itens
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        return executar_busca_paginada(
+            cursor, BUSCAR_POR_TERMO, CONTAR_POR_TERMO, termo, pagina, por_pagina, _row_to_adotante
+        )
+
+
+def reconstruir_indice_busca() -> int:
+    """
+    Reconstrói o índice de busca textual a partir da tabela adotante.
 
     Returns:
-        Lista de objetos Adotante que correspondem ao termo
+        Número de registros indexados
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        termo_like = f"%{termo}%"
-        cursor.execute(BUSCAR_POR_TERMO, (termo_like,))
-        return [_row_to_adotante(row) for row in cursor.fetchall()]
\ No newline at end of file
+        cursor.execute(CRIAR_TABELA_FTS)
+        return reconstruir_indice_fts(cursor, "adotante_fts", [LIMPAR_FTS, POPULAR_FTS])
@@ -6,6 +6,14 @@ from model.raca_model import Raca
 from model.especie_model import Especie
 from model.abrigo_model import Abrigo
 from sql.animal_sql import *
+from model.busca_model import PaginaBusca
+from util.busca_fts import (
+    BUSCA_POR_PAGINA,
+    criar_indice_fts,
+    executar_busca_paginada,
+    montar_consulta_fts,
+    reconstruir_indice_fts,
+)
 from util.db_util import get_connection
 
 
@@ -46,10 +54,17 @@ def _row_to_animal(row) -> Animal:
 
 
 def criar_tabela() -> bool:
-    """Cria a tabela animal se não existir."""
+    """
+    Cria a tabela animal e o índice de busca textual se não existirem.
+
+    Deve ser chamada depois de criar raca, especie e abrigo, pois os triggers
+    do índice também observam essas tabelas. Em bancos criados antes do
+    índice, ele é populado a partir dos animais existentes.
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        criar_indice_fts(cursor, "animal_fts", CRIAR_TABELA_FTS, TRIGGERS_FTS, POPULAR_FTS)
         return True
 
 
@@ -195,18 +210,57 @@ def contar() -> int:
         return cursor.fetchone()[0]
 
 
-def buscar_por_termo(termo: str) -> List[Animal]:
+def buscar_por_termo(termo: str, limite: int = 50) -> List[Animal]:
     """
-    Busca animais por termo (nome do animal, raça, espécie ou abrigo).
+    Busca animais por termo (nome do animal, raça, espécie, abrigo ou observações).
+
+    Usa o índice FTS5: cada palavra é buscada por prefixo, sem diferenciar
+    maiúsculas nem acentos, e os resultados vêm ordenados por relevância.
 
     Args:
         termo: Termo de busca
+        limite: Número máximo de resultados
+
+    Returns:
+        Lista de objetos Animal que correspondem ao termo (mais relevantes primeiro)
+    """
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return []
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(BUSCAR_POR_TERMO, (consulta, limite, 0))
+        return [_row_to_animal(row) for row in cursor.fetchall()]
+
+
+def buscar_paginado(termo: str, pagina: int = 1, por_pagina: int = BUSCA_POR_PAGINA) -> PaginaBusca:
+    """
+    Busca animais por termo com paginação, ranking e trechos destacados.
+
+    Args:
+        termo: Termo de busca
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade de itens por página
+
+    Returns:
+        PaginaBusca com objetos Animal como itens
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        return executar_busca_paginada(
+            cursor, BUSCAR_POR_TERMO, CONTAR_POR_TERMO, termo, pagina, por_pagina, _row_to_animal
+        )
+
+
+def reconstruir_indice_busca() -> int:
+    """
+    Reconstrói o índice de busca textual a partir da tabela animal.
 
     Returns:
-        Lista de objetos Animal que correspondem ao termo
+        Número de animais indexados
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        termo_like = f"%{termo}%"
-        cursor.execute(BUSCAR_POR_TERMO, (termo_like, termo_like, termo_like, termo_like))
-        return [_row_to_animal(row) for row in cursor.fetchall()]
\ No newline at end of file
+        cursor.execute(CRIAR_TABELA_FTS)
+        return reconstruir_indice_fts(cursor, "animal_fts", [LIMPAR_FTS, POPULAR_FTS])
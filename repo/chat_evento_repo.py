@@ -0,0 +1,105 @@
+"""
+Repositório para operações com a tabela chat_evento.
+"""
+import json
+from datetime import datetime
+from typing import List
+from sqlite3 import Row
+
+from model.chat_evento_model import ChatEvento
+from sql.chat_evento_sql import (
+    CRIAR_TABELA,
+    INSERIR,
+    LISTAR_POSTERIORES,
+    OBTER_ULTIMO_ID,
+    EXCLUIR_ANTERIORES
+)
+from util.db_util import get_connection
+from util.datetime_util import agora
+
+
+def _row_to_evento(row: Row) -> ChatEvento:
+    """Converte uma row do banco em objeto ChatEvento."""
+    return ChatEvento(
+        id=row["id"],
+        usuario_id=row["usuario_id"],
+        dados=json.loads(row["dados"]),
+        criado_em=row["criado_em"]
+    )
+
+
+def criar_tabela():
+    """Cria a tabela chat_evento se não existir."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA)
+
+
+def inserir(usuario_ids: List[int], dados: dict) -> int:
+    """
+    Publica um evento para cada usuário destinatário.
+
+    Args:
+        usuario_ids: IDs dos usuários destinatários
+        dados: Conteúdo do evento (serializado como JSON)
+
+    Returns:
+        ID do último evento inserido (0 se não houver destinatários)
+    """
+    conteudo = json.dumps(dados)
+    criado_em = agora()
+
+    # execute por linha: após executemany, lastrowid é None
+    ultimo_id = 0
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        for usuario_id in usuario_ids:
+            cursor.execute(INSERIR, (usuario_id, conteudo, criado_em))
+            ultimo_id = cursor.lastrowid
+    return ultimo_id
+
+
+def listar_posteriores(ultimo_id: int, limite: int = 500) -> List[ChatEvento]:
+    """
+    Lista eventos publicados após um cursor.
+
+    Args:
+        ultimo_id: ID do último evento já processado
+        limite: Número máximo de eventos a retornar
+
+    Returns:
+        Lista de ChatEvento em ordem de publicação
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(LISTAR_POSTERIORES, (ultimo_id, limite))
+        return [_row_to_evento(row) for row in cursor.fetchall()]
+
+
+def obter_ultimo_id() -> int:
+    """
+    Retorna o ID do evento mais recente (0 se o log estiver vazio).
+
+    Returns:
+        ID do último evento
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ULTIMO_ID)
+        return cursor.fetchone()["ultimo_id"]
+
+
+def excluir_anteriores(limite: datetime) -> int:
+    """
+    Remove eventos publicados antes de um instante.
+
+    Args:
+        limite: Eventos com criado_em anterior a este instante são removidos
+
+    Returns:
+        Número de eventos removidos
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_ANTERIORES, (limite,))
+        return cursor.rowcount
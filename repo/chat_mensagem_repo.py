@@ -9,12 +9,23 @@ from sql.chat_mensagem_sql import (
     CRIAR_TABELA,
     INSERIR,
     OBTER_POR_ID,
-    LISTAR_POR_SALA,
+    OBTER_DADOS_CONTADOR,
+    CRIAR_INDICE_SALA_ID,
+    LISTAR_RECENTES_POR_SALA,
+    LISTAR_ANTERIORES_POR_SALA,
+    LISTAR_POSTERIORES_POR_SALA,
+    LISTAR_POR_USUARIO_APOS_ID,
+    OBTER_ULTIMO_ID,
     CONTAR_POR_SALA,
     MARCAR_COMO_LIDAS,
     OBTER_ULTIMA_MENSAGEM_SALA,
     EXCLUIR
 )
+from sql.chat_participante_sql import (
+    INCREMENTAR_NAO_LIDAS,
+    DECREMENTAR_NAO_LIDAS,
+    ZERAR_NAO_LIDAS
+)
 from util.db_util import get_connection
 from util.datetime_util import agora
 
@@ -41,16 +52,19 @@ def _row_to_mensagem(row: Row) -> ChatMensagem:
 
 
 def criar_tabela():
-    """Cria a tabela chat_mensagem se não existir."""
+    """Cria a tabela chat_mensagem e o índice de paginação se não existirem."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        cursor.execute(CRIAR_INDICE_SALA_ID)
 
 
 def inserir(sala_id: str, usuario_id: int, mensagem: str) -> ChatMensagem:
     """
     Insere uma nova mensagem em uma sala.
 
+    Na mesma transação, incrementa o contador de não lidas dos demais participantes.
+
     Args:
         sala_id: ID da sala
         usuario_id: ID do usuário que enviou
@@ -65,6 +79,7 @@ def inserir(sala_id: str, usuario_id: int, mensagem: str) -> ChatMensagem:
         cursor = conn.cursor()
         cursor.execute(INSERIR, (sala_id, usuario_id, mensagem, data_envio, None))
         mensagem_id = cursor.lastrowid
+        cursor.execute(INCREMENTAR_NAO_LIDAS, (sala_id, usuario_id))
 
     return ChatMensagem(
         id=mensagem_id,
@@ -96,24 +111,82 @@ def obter_por_id(mensagem_id: int) -> Optional[ChatMensagem]:
         return None
 
 
-def listar_por_sala(sala_id: str, limit: int = 50, offset: int = 0) -> List[ChatMensagem]:
+def listar_por_sala(
+    sala_id: str,
+    limit: int = 50,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None
+) -> List[ChatMensagem]:
     """
-    Lista mensagens de uma sala com paginação.
+    Lista mensagens de uma sala com paginação por cursor (keyset).
+
+    Sem cursor, retorna as `limit` mensagens mais recentes. Com before_id,
+    retorna as `limit` mensagens imediatamente anteriores ao cursor (para
+    carregar o histórico); com after_id, as `limit` imediatamente posteriores
+    (para buscar mensagens novas).
 
     Args:
         sala_id: ID da sala
         limit: Número máximo de mensagens a retornar
-        offset: Número de mensagens a pular (para paginação)
+        before_id: Retornar apenas mensagens com ID menor que este
+        after_id: Retornar apenas mensagens com ID maior que este
 
     Returns:
         Lista de objetos ChatMensagem (ordenadas por ID crescente - mais antigas primeiro)
+
+    Raises:
+        ValueError: Se before_id e after_id forem informados juntos
     """
+    if before_id is not None and after_id is not None:
+        raise ValueError("Informe apenas um cursor: before_id ou after_id")
+
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(LISTAR_POR_SALA, (sala_id, limit, offset))
+        if after_id is not None:
+            cursor.execute(LISTAR_POSTERIORES_POR_SALA, (sala_id, after_id, limit))
+            return [_row_to_mensagem(row) for row in cursor.fetchall()]
+
+        if before_id is not None:
+            cursor.execute(LISTAR_ANTERIORES_POR_SALA, (sala_id, before_id, limit))
+        else:
+            cursor.execute(LISTAR_RECENTES_POR_SALA, (sala_id, limit))
         rows = cursor.fetchall()
 
-        return [_row_to_mensagem(row) for row in rows]
+        # A consulta percorre o índice do mais recente para o mais antigo
+        return [_row_to_mensagem(row) for row in reversed(rows)]
+
+
+def listar_por_usuario_apos(usuario_id: int, after_id: int, limit: int = 100) -> List[ChatMensagem]:
+    """
+    Lista mensagens de todas as salas do usuário com ID maior que um cursor.
+
+    Usado para reenviar mensagens perdidas quando o stream SSE reconecta.
+
+    Args:
+        usuario_id: ID do usuário participante
+        after_id: Retornar apenas mensagens com ID maior que este
+        limit: Número máximo de mensagens a retornar
+
+    Returns:
+        Lista de objetos ChatMensagem (ordenadas por ID crescente)
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(LISTAR_POR_USUARIO_APOS_ID, (usuario_id, after_id, limit))
+        return [_row_to_mensagem(row) for row in cursor.fetchall()]
+
+
+def obter_ultimo_id() -> int:
+    """
+    Retorna o maior ID de mensagem existente (0 se não houver mensagens).
+
+    Returns:
+        ID da mensagem mais recente
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ULTIMO_ID)
+        return cursor.fetchone()["ultimo_id"]
 
 
 def contar_por_sala(sala_id: str) -> int:
@@ -138,6 +211,8 @@ def marcar_como_lidas(sala_id: str, usuario_id: int) -> bool:
     """
     Marca como lidas todas as mensagens não lidas de outros usuários em uma sala.
 
+    Também zera o contador de não lidas do usuário na sala.
+
     Args:
         sala_id: ID da sala
         usuario_id: ID do usuário que está marcando como lidas
@@ -148,7 +223,9 @@ def marcar_como_lidas(sala_id: str, usuario_id: int) -> bool:
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(MARCAR_COMO_LIDAS, (agora(), sala_id, usuario_id))
-        return cursor.rowcount >= 0  # Retorna True mesmo se nenhuma mensagem foi marcada
+        marcadas = cursor.rowcount
+        cursor.execute(ZERAR_NAO_LIDAS, (sala_id, usuario_id))
+        return marcadas >= 0  # Retorna True mesmo se nenhuma mensagem foi marcada
 
 
 def obter_ultima_mensagem_sala(sala_id: str) -> Optional[ChatMensagem]:
@@ -175,6 +252,8 @@ def excluir(mensagem_id: int) -> bool:
     """
     Exclui uma mensagem.
 
+    Decrementa o contador de não lidas dos participantes que ainda não a tinham lido.
+
     Args:
         mensagem_id: ID da mensagem
 
@@ -183,5 +262,13 @@ def excluir(mensagem_id: int) -> bool:
     """
     with get_connection() as conn:
         cursor = conn.cursor()
+        cursor.execute(OBTER_DADOS_CONTADOR, (mensagem_id,))
+        row = cursor.fetchone()
+        if not row:
+            return False
+
         cursor.execute(EXCLUIR, (mensagem_id,))
-        return cursor.rowcount > 0
+        if cursor.rowcount == 0:
+            return False
+        cursor.execute(DECREMENTAR_NAO_LIDAS, (row["sala_id"], row["usuario_id"], row["data_envio"]))
+        return True
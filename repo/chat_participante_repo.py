@@ -7,12 +7,15 @@ from sqlite3 import Row
 from model.chat_participante_model import ChatParticipante
 from sql.chat_participante_sql import (
     CRIAR_TABELA,
+    ADICIONAR_COLUNA_NAO_LIDAS,
     INSERIR,
     OBTER_POR_SALA_E_USUARIO,
     LISTAR_POR_SALA,
     LISTAR_POR_USUARIO,
     ATUALIZAR_ULTIMA_LEITURA,
-    CONTAR_MENSAGENS_NAO_LIDAS,
+    OBTER_NAO_LIDAS,
+    OBTER_TOTAL_NAO_LIDAS,
+    RECALCULAR_NAO_LIDAS,
     EXCLUIR
 )
 from util.db_util import get_connection
@@ -26,19 +29,34 @@ def _row_to_participante(row: Row) -> ChatParticipante:
     if "ultima_leitura" in row.keys():
         ultima_leitura = row["ultima_leitura"]
 
+    nao_lidas = 0
+    if "nao_lidas" in row.keys():
+        nao_lidas = row["nao_lidas"]
+
     return ChatParticipante(
         sala_id=row["sala_id"],
         usuario_id=row["usuario_id"],
-        ultima_leitura=ultima_leitura
+        ultima_leitura=ultima_leitura,
+        nao_lidas=nao_lidas
     )
 
 
 def criar_tabela():
-    """Cria a tabela chat_participante se não existir."""
+    """
+    Cria a tabela chat_participante se não existir.
+
+    Em bancos criados antes do contador materializado, adiciona a coluna
+    nao_lidas e calcula seus valores a partir das mensagens existentes.
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
 
+        colunas = [row["name"] for row in cursor.execute("PRAGMA table_info(chat_participante)")]
+        if "nao_lidas" not in colunas:
+            cursor.execute(ADICIONAR_COLUNA_NAO_LIDAS)
+            cursor.execute(RECALCULAR_NAO_LIDAS)
+
 
 def adicionar_participante(sala_id: str, usuario_id: int) -> ChatParticipante:
     """
@@ -121,7 +139,7 @@ def listar_por_usuario(usuario_id: int) -> List[ChatParticipante]:
 
 def atualizar_ultima_leitura(sala_id: str, usuario_id: int) -> bool:
     """
-    Atualiza o timestamp de última leitura do participante.
+    Atualiza o timestamp de última leitura do participante e zera seu contador de não lidas.
 
     Args:
         sala_id: ID da sala
@@ -138,7 +156,10 @@ def atualizar_ultima_leitura(sala_id: str, usuario_id: int) -> bool:
 
 def contar_mensagens_nao_lidas(sala_id: str, usuario_id: int) -> int:
     """
-    Conta quantas mensagens não lidas existem para um usuário em uma sala.
+    Retorna quantas mensagens não lidas existem para um usuário em uma sala.
+
+    Lê o contador materializado em chat_participante (O(1)), mantido por
+    chat_mensagem_repo.inserir/excluir/marcar_como_lidas e atualizar_ultima_leitura.
 
     Args:
         sala_id: ID da sala
@@ -149,13 +170,46 @@ def contar_mensagens_nao_lidas(sala_id: str, usuario_id: int) -> int:
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        # Passar usuario_id 3 vezes: para sala_id, usuario_id != ?, e duas vezes na subquery
-        cursor.execute(CONTAR_MENSAGENS_NAO_LIDAS, (sala_id, usuario_id, usuario_id, usuario_id))
+        cursor.execute(OBTER_NAO_LIDAS, (sala_id, usuario_id))
+        row = cursor.fetchone()
+
+        return row["nao_lidas"] if row else 0
+
+
+def contar_total_nao_lidas(usuario_id: int) -> int:
+    """
+    Retorna o total de mensagens não lidas de um usuário em todas as salas.
+
+    Args:
+        usuario_id: ID do usuário
+
+    Returns:
+        Soma dos contadores de não lidas do usuário
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_TOTAL_NAO_LIDAS, (usuario_id,))
         row = cursor.fetchone()
 
         return row["total"] if row else 0
 
 
+def recalcular_nao_lidas() -> int:
+    """
+    Reconstrói os contadores de não lidas a partir da tabela chat_mensagem.
+
+    Comando de reparo de consistência: corrige apenas os contadores que
+    divergem da contagem real.
+
+    Returns:
+        Número de participantes cujo contador foi corrigido
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(RECALCULAR_NAO_LIDAS)
+        return cursor.rowcount
+
+
 def excluir(sala_id: str, usuario_id: int) -> bool:
     """
     Remove um participante de uma sala.
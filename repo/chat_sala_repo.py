@@ -1,15 +1,17 @@
 """
 Repositório para operações com a tabela chat_sala.
 """
-from typing import Optional
+from typing import Optional, List
 from sqlite3 import Row
 
 from model.chat_sala_model import ChatSala
+from model.chat_conversa_model import ChatConversa
 from sql.chat_sala_sql import (
     CRIAR_TABELA,
     INSERIR,
     OBTER_POR_ID,
     ATUALIZAR_ULTIMA_ATIVIDADE,
+    LISTAR_CONVERSAS_POR_USUARIO,
     EXCLUIR
 )
 from util.db_util import get_connection
@@ -34,6 +36,21 @@ def _row_to_sala(row: Row) -> ChatSala:
     )
 
 
+def _row_to_conversa(row: Row) -> ChatConversa:
+    """Converte uma row da consulta de conversas em objeto ChatConversa."""
+    return ChatConversa(
+        sala_id=row["sala_id"],
+        ultima_atividade=row["ultima_atividade"],
+        outro_usuario_id=row["outro_usuario_id"],
+        outro_usuario_nome=row["outro_usuario_nome"],
+        outro_usuario_email=row["outro_usuario_email"],
+        nao_lidas=row["nao_lidas"],
+        ultima_mensagem=row["ultima_mensagem"],
+        ultima_mensagem_data_envio=row["ultima_mensagem_data_envio"],
+        ultima_mensagem_usuario_id=row["ultima_mensagem_usuario_id"]
+    )
+
+
 def criar_tabela():
     """Cria a tabela chat_sala se não existir."""
     with get_connection() as conn:
@@ -133,6 +150,30 @@ def atualizar_ultima_atividade(sala_id: str) -> bool:
         return cursor.rowcount > 0
 
 
+def listar_conversas_por_usuario(usuario_id: int, limit: int = 12, offset: int = 0) -> List[ChatConversa]:
+    """
+    Lista as conversas de um usuário em uma única consulta.
+
+    Cada conversa traz o outro participante, a última mensagem e o número
+    de mensagens não lidas. A ordenação (última atividade mais recente
+    primeiro) e a paginação são feitas no banco.
+
+    Args:
+        usuario_id: ID do usuário
+        limit: Número máximo de conversas a retornar
+        offset: Número de conversas a pular (para paginação)
+
+    Returns:
+        Lista de objetos ChatConversa
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(LISTAR_CONVERSAS_POR_USUARIO, (usuario_id, limit, offset))
+        rows = cursor.fetchall()
+
+        return [_row_to_conversa(row) for row in rows]
+
+
 def excluir(sala_id: str) -> bool:
     """
     Exclui uma sala (cascade deleta participantes e mensagens).
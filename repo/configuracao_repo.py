@@ -1,4 +1,5 @@
 from typing import List, Optional
+import json
 import sqlite3
 from model.configuracao_model import Configuracao
 from sql.configuracao_sql import *
@@ -59,10 +60,41 @@ def obter_por_chave(chave: str) -> Optional[Configuracao]:
             return _row_to_configuracao(row)
         return None
 
+def _incrementar_versao(cursor) -> None:
+    """Incrementa a versão das configurações na transação da alteração."""
+    cursor.execute(INCREMENTAR_VERSAO, (CHAVE_VERSAO,))
+
+
+def _chave_reservada(chave: str) -> bool:
+    """Indica (e registra no log) tentativa de alterar a linha de versão."""
+    if chave == CHAVE_VERSAO:
+        logger.warning(f"Configuração '{chave}' é reservada e não pode ser alterada")
+        return True
+    return False
+
+
+def obter_versao() -> int:
+    """
+    Obtém a versão atual das configurações.
+
+    A versão muda a cada alteração feita por este repositório; processos que
+    mantêm as configurações em cache comparam a versão para saber se precisam
+    recarregá-las.
+
+    Returns:
+        Versão atual (0 se nenhuma alteração foi registrada)
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_VERSAO, (CHAVE_VERSAO,))
+        row = cursor.fetchone()
+        return row["versao"] if row else 0
+
+
 def obter_todos() -> list[Configuracao]:
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(OBTER_TODOS)
+        cursor.execute(OBTER_TODOS, (CHAVE_VERSAO,))
         rows = cursor.fetchall()
         return [_row_to_configuracao(row) for row in rows]
 
@@ -113,7 +145,7 @@ def obter_por_categoria() -> dict[str, list[Configuracao]]:
 
 def obter_multiplas(chaves: list[str]) -> dict[str, Optional[Configuracao]]:
     """
-    Obtém múltiplas configurações de uma vez.
+    Obtém múltiplas configurações com uma única consulta.
 
     Args:
         chaves: Lista de chaves a buscar
@@ -125,9 +157,14 @@ def obter_multiplas(chaves: list[str]) -> dict[str, Optional[Configuracao]]:
         >>> obter_multiplas(["app_name", "theme", "inexistente"])
         {"app_name": Configuracao(...), "theme": Configuracao(...), "inexistente": None}
     """
-    resultado = {}
-    for chave in chaves:
-        resultado[chave] = obter_por_chave(chave)
+    resultado: dict[str, Optional[Configuracao]] = dict.fromkeys(chaves)
+    if not chaves:
+        return resultado
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_MULTIPLAS, (json.dumps(list(chaves)),))
+        for row in cursor.fetchall():
+            resultado[row["chave"]] = _row_to_configuracao(row)
     return resultado
 
 def atualizar(chave: str, valor: str) -> bool:
@@ -141,10 +178,15 @@ def atualizar(chave: str, valor: str) -> bool:
     Returns:
         True se atualização foi bem-sucedida, False se configuração não existe
     """
+    if _chave_reservada(chave):
+        return False
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(ATUALIZAR, (valor, chave))
-        return cursor.rowcount > 0
+        if cursor.rowcount == 0:
+            return False
+        _incrementar_versao(cursor)
+        return True
 
 
 def atualizar_multiplas(configs: dict[str, str]) -> tuple[int, list[str]]:
@@ -184,6 +226,11 @@ def atualizar_multiplas(configs: dict[str, str]) -> tuple[int, list[str]]:
         cursor = conn.cursor()
 
         for chave, valor in configs.items():
+            # A linha de versão é tratada como inexistente
+            if _chave_reservada(chave):
+                chaves_nao_encontradas.append(chave)
+                continue
+
             # Verificar se configuração existe
             cursor.execute(OBTER_POR_CHAVE, (chave,))
             if not cursor.fetchone():
@@ -197,6 +244,9 @@ def atualizar_multiplas(configs: dict[str, str]) -> tuple[int, list[str]]:
                 quantidade_atualizada += 1
                 logger.debug(f"Configuração '{chave}' atualizada para: {valor}")
 
+        if quantidade_atualizada > 0:
+            _incrementar_versao(cursor)
+
     logger.info(
         f"Atualização em lote concluída: {quantidade_atualizada} atualizadas, "
         f"{len(chaves_nao_encontradas)} não encontradas"
@@ -229,6 +279,9 @@ def inserir_ou_atualizar(chave: str, valor: str, descricao: str = "") -> bool:
         >>> inserir_ou_atualizar("theme", "flatly", "Tema visual")
         True
     """
+    if _chave_reservada(chave):
+        return False
+
     try:
         # Verificar se configuração já existe
         config_existente = obter_por_chave(chave)
@@ -243,7 +296,8 @@ def inserir_ou_atualizar(chave: str, valor: str, descricao: str = "") -> bool:
             with get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(INSERIR, (chave, valor, descricao))
-                return cursor.rowcount > 0
+                _incrementar_versao(cursor)
+                return True
 
     except Exception as e:
         logger.error(f"Erro ao inserir ou atualizar configuração '{chave}': {e}")
@@ -257,12 +311,16 @@ def excluir(id: int) -> bool:
         id: ID da configuração a ser excluída
 
     Returns:
-        True se exclusão foi bem-sucedida, False caso contrário
+        True se exclusão foi bem-sucedida, False caso contrário (inclusive
+        para a linha de versão, que não pode ser excluída)
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(EXCLUIR, (id,))
-        return cursor.rowcount > 0
+        cursor.execute(EXCLUIR, (id, CHAVE_VERSAO))
+        if cursor.rowcount == 0:
+            return False
+        _incrementar_versao(cursor)
+        return True
 
 
 def contar() -> int:
@@ -274,7 +332,7 @@ def contar() -> int:
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(CONTAR)
+        cursor.execute(CONTAR, (CHAVE_VERSAO,))
         return cursor.fetchone()[0]
 
 
@@ -291,7 +349,7 @@ def buscar_por_termo(termo: str) -> List[Configuracao]:
     with get_connection() as conn:
         cursor = conn.cursor()
         termo_like = f"%{termo}%"
-        cursor.execute(BUSCAR_POR_TERMO, (termo_like, termo_like, termo_like))
+        cursor.execute(BUSCAR_POR_TERMO, (termo_like, termo_like, termo_like, CHAVE_VERSAO))
         return [_row_to_configuracao(row) for row in cursor.fetchall()]
 
 
@@ -306,9 +364,11 @@ def inserir_padrao() -> None:
 
     with get_connection() as conn:
         cursor = conn.cursor()
+        inseridas = 0
         for chave, valor, descricao in configs_padrao:
             try:
                 cursor.execute(INSERIR, (chave, valor, descricao))
+                inseridas += 1
             except sqlite3.IntegrityError:
                 # Configuração já existe (violação de UNIQUE constraint)
                 logger.debug(f"Configuração '{chave}' já existe, pulando inserção")
@@ -316,3 +376,5 @@ def inserir_padrao() -> None:
                 # Outro tipo de erro - logar e re-raise para não mascarar problema
                 logger.error(f"Erro ao inserir configuração padrão '{chave}': {e}")
                 raise
+        if inseridas:
+            _incrementar_versao(cursor)
@@ -3,6 +3,14 @@
 from typing import List, Optional
 from model.endereco_model import Endereco
 from sql.endereco_sql import *
+from model.busca_model import PaginaBusca
+from util.busca_fts import (
+    BUSCA_POR_PAGINA,
+    criar_indice_fts,
+    executar_busca_paginada,
+    montar_consulta_fts,
+    reconstruir_indice_fts,
+)
 from util.db_util import get_connection
 
 
@@ -26,10 +34,11 @@ def _row_to_endereco(row) -> Endereco:
 
 
 def criar_tabela() -> bool:
-    """Cria a tabela endereco se não existir."""
+    """Cria a tabela endereco e o índice de busca textual se não existirem."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        criar_indice_fts(cursor, "endereco_fts", CRIAR_TABELA_FTS, TRIGGERS_FTS, POPULAR_FTS)
         return True
 
 
@@ -148,18 +157,57 @@ def contar() -> int:
         return cursor.fetchone()[0]
 
 
-def buscar_por_termo(termo: str) -> List[Endereco]:
+def buscar_por_termo(termo: str, limite: int = 50) -> List[Endereco]:
     """
     Busca endereços por termo (título, logradouro, bairro, cidade ou CEP).
 
+    Usa o índice FTS5: cada palavra é buscada por prefixo, sem diferenciar
+    maiúsculas nem acentos, e os resultados vêm ordenados por relevância.
+
+    Args:
+        termo: Termo de busca
+        limite: Número máximo de resultados
+
+    Returns:
+        Lista de objetos Endereco que correspondem ao termo (mais relevantes primeiro)
+    """
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return []
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(BUSCAR_POR_TERMO, (consulta, limite, 0))
+        return [_row_to_endereco(row) for row in cursor.fetchall()]
+
+
+def buscar_paginado(termo: str, pagina: int = 1, por_pagina: int = BUSCA_POR_PAGINA) -> PaginaBusca:
+    """
+    Busca endereços por termo com paginação, ranking e trechos destacados.
+
     Args:
         termo: Termo de busca
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade de itens por página
+
+    Returns:
+        PaginaBusca com objetos Endereco como itens
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        return executar_busca_paginada(
+            cursor, BUSCAR_POR_TERMO, CONTAR_POR_TERMO, termo, pagina, por_pagina, _row_to_endereco
+        )
+
+
+def reconstruir_indice_busca() -> int:
+    """
+    Reconstrói o índice de busca textual a partir da tabela endereco.
 
     Returns:
-        Lista de objetos Endereco que correspondem ao termo
+        Número de registros indexados
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        termo_like = f"%{termo}%"
-        cursor.execute(BUSCAR_POR_TERMO, (termo_like, termo_like, termo_like, termo_like, termo_like))
-        return [_row_to_endereco(row) for row in cursor.fetchall()]
\ No newline at end of file
+        cursor.execute(CRIAR_TABELA_FTS)
+        return reconstruir_indice_fts(cursor, "endereco_fts", [POPULAR_FTS])
@@ -0,0 +1,59 @@
+"""
+Repositório para operações com a tabela schema_versao.
+"""
+from typing import List
+
+from sql.migracao_sql import (
+    CRIAR_TABELA,
+    OBTER_VERSAO_ATUAL,
+    REGISTRAR,
+    LISTAR
+)
+from util.db_util import get_connection
+from util.datetime_util import agora
+
+
+def criar_tabela():
+    """Cria a tabela schema_versao se não existir."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA)
+
+
+def obter_versao_atual() -> int:
+    """
+    Retorna a versão de esquema mais recente aplicada ao banco.
+
+    Returns:
+        Número da versão (0 se nenhuma migração foi aplicada)
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_VERSAO_ATUAL)
+        return cursor.fetchone()["versao"]
+
+
+def registrar(versao: int, descricao: str) -> None:
+    """
+    Registra uma migração como aplicada.
+
+    Args:
+        versao: Número da versão
+        descricao: Descrição da migração
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(REGISTRAR, (versao, descricao, agora()))
+
+
+def listar() -> List[dict]:
+    """
+    Lista as migrações aplicadas, da mais antiga para a mais recente.
+
+    Returns:
+        Lista de dicionários com versao, descricao e aplicada_em
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(LISTAR)
+        return [dict(row) for row in cursor.fetchall()]
@@ -0,0 +1,107 @@
+"""
+Repositório para operações com a tabela rate_limit.
+"""
+from typing import Optional, Tuple
+
+from sql.rate_limit_sql import (
+    CRIAR_TABELA,
+    RESERVAR,
+    OBTER,
+    EXCLUIR,
+    EXCLUIR_POR_LIMITER,
+    EXCLUIR_INATIVOS
+)
+from util.db_util import get_connection
+
+
+def criar_tabela():
+    """Cria a tabela rate_limit se não existir."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA)
+
+
+def reservar(
+    limiter: str,
+    identificador: str,
+    capacidade: int,
+    fichas_por_segundo: float,
+    lote: int,
+    agora: float,
+) -> int:
+    """
+    Retira fichas do balde compartilhado de um identificador.
+
+    O balde é reabastecido até o instante atual e perde até 'lote' fichas
+    inteiras, em um único comando atômico. Um balde novo começa cheio.
+
+    Args:
+        limiter: Nome do limiter
+        identificador: Identificador do cliente (geralmente IP)
+        capacidade: Máximo de fichas do balde (max_tentativas)
+        fichas_por_segundo: Taxa de reabastecimento
+        lote: Máximo de fichas retiradas
+        agora: Instante atual (epoch em segundos, comum a todos os processos)
+
+    Returns:
+        Número de fichas concedidas (0 = bloqueado)
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(RESERVAR, (limiter, identificador, capacidade, fichas_por_segundo, lote, agora))
+        return cursor.fetchone()["concedidas"]
+
+
+def obter(limiter: str, identificador: str) -> Optional[Tuple[float, float]]:
+    """
+    Obtém o estado do balde compartilhado de um identificador.
+
+    Args:
+        limiter: Nome do limiter
+        identificador: Identificador do cliente
+
+    Returns:
+        Tupla (fichas, atualizado_em) ou None se não houver registro
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER, (limiter, identificador))
+        row = cursor.fetchone()
+        return (row["fichas"], row["atualizado_em"]) if row else None
+
+
+def excluir(limiter: str, identificador: Optional[str] = None) -> int:
+    """
+    Exclui o estado de um identificador (ou de todos, se None).
+
+    Args:
+        limiter: Nome do limiter
+        identificador: Identificador do cliente
+
+    Returns:
+        Número de registros excluídos
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if identificador is None:
+            cursor.execute(EXCLUIR_POR_LIMITER, (limiter,))
+        else:
+            cursor.execute(EXCLUIR, (limiter, identificador))
+        return cursor.rowcount
+
+
+def excluir_inativos(limiter: str, anterior_a: float) -> int:
+    """
+    Exclui os baldes sem atividade desde um instante.
+
+    Args:
+        limiter: Nome do limiter
+        anterior_a: Instante limite (epoch em segundos)
+
+    Returns:
+        Número de registros excluídos
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_INATIVOS, (limiter, anterior_a))
+        return cursor.rowcount
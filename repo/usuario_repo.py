@@ -1,8 +1,18 @@
+import os
 from typing import Optional
 from model.usuario_model import Usuario
 from sql.usuario_sql import *
+from util.busca_fts import criar_indice_fts, montar_consulta_fts, normalizar_termo, reconstruir_indice_fts
+from util.cache_lru import CacheLRU
 from util.db_util import get_connection
 from util.foto_util import criar_foto_padrao_usuario
+from util.perfis import Perfil
+
+# Cache dos resultados do autocomplete de usuários (chave: prefixo normalizado)
+USUARIO_BUSCA_CACHE_ITENS = int(os.getenv("USUARIO_BUSCA_CACHE_ITENS", "512"))
+USUARIO_BUSCA_CACHE_TTL_SEGUNDOS = float(os.getenv("USUARIO_BUSCA_CACHE_TTL_SEGUNDOS", "30"))
+
+cache_busca = CacheLRU(USUARIO_BUSCA_CACHE_ITENS, USUARIO_BUSCA_CACHE_TTL_SEGUNDOS)
 
 def _row_to_usuario(row) -> Usuario:
     return Usuario(
@@ -20,10 +30,38 @@ def _row_to_usuario(row) -> Usuario:
         data_cadastro=row["data_cadastro"]
     )
 
+def _campos_busca(nome: str, email: str) -> tuple[str, str]:
+    """Retorna nome e e-mail normalizados para as colunas de busca por prefixo."""
+    return normalizar_termo(nome), normalizar_termo(email)
+
+def _preencher_campos_busca(cursor) -> int:
+    """Recalcula nome_busca e email_busca de todos os usuários."""
+    usuarios = cursor.execute(LISTAR_PARA_NORMALIZAR).fetchall()
+    cursor.executemany(ATUALIZAR_CAMPOS_BUSCA, [
+        (*_campos_busca(row["nome"], row["email"]), row["id"]) for row in usuarios
+    ])
+    return len(usuarios)
+
 def criar_tabela() -> bool:
+    """
+    Cria a tabela usuario e os índices da busca do autocomplete se não existirem.
+
+    Em bancos criados antes da busca por prefixo, adiciona as colunas
+    normalizadas e as preenche a partir dos usuários existentes.
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+
+        colunas = [row["name"] for row in cursor.execute("PRAGMA table_info(usuario)")]
+        if "nome_busca" not in colunas:
+            cursor.execute(ADICIONAR_COLUNA_NOME_BUSCA)
+            cursor.execute(ADICIONAR_COLUNA_EMAIL_BUSCA)
+            _preencher_campos_busca(cursor)
+        cursor.execute(CRIAR_INDICE_NOME_BUSCA)
+        cursor.execute(CRIAR_INDICE_EMAIL_BUSCA)
+
+        criar_indice_fts(cursor, "usuario_fts", CRIAR_TABELA_FTS, TRIGGERS_FTS, POPULAR_FTS)
         return True
 
 def inserir(usuario: Usuario) -> int:
@@ -37,9 +75,12 @@ def inserir(usuario: Usuario) -> int:
             usuario.data_nascimento,
             usuario.numero_documento,
             usuario.telefone,
-            1 if usuario.confirmado else 0
+            1 if usuario.confirmado else 0,
+            *_campos_busca(usuario.nome, usuario.email)
         ))
-        return cursor.lastrowid
+        usuario_id = cursor.lastrowid
+    cache_busca.limpar()
+    return usuario_id
 
 def alterar(usuario: Usuario) -> bool:
     with get_connection() as conn:
@@ -48,9 +89,12 @@ def alterar(usuario: Usuario) -> bool:
             usuario.nome,
             usuario.email,
             usuario.perfil,
+            *_campos_busca(usuario.nome, usuario.email),
             usuario.id
         ))
-        return cursor.rowcount > 0
+        alterado = cursor.rowcount > 0
+    cache_busca.limpar()
+    return alterado
 
 def atualizar(usuario: Usuario) -> bool:
     """
@@ -71,9 +115,12 @@ def atualizar(usuario: Usuario) -> bool:
             usuario.data_nascimento,
             usuario.numero_documento,
             usuario.telefone,
+            *_campos_busca(usuario.nome, usuario.email),
             usuario.id
         ))
-        return cursor.rowcount > 0
+        atualizado = cursor.rowcount > 0
+    cache_busca.limpar()
+    return atualizado
 
 def atualizar_senha(id: int, senha_hash: str) -> bool:
     """Atualiza apenas a senha de um usuário"""
@@ -86,7 +133,9 @@ def excluir(id: int) -> bool:
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(EXCLUIR, (id,))
-        return cursor.rowcount > 0
+        excluido = cursor.rowcount > 0
+    cache_busca.limpar()
+    return excluido
 
 def obter_por_id(id: int) -> Optional[Usuario]:
     with get_connection() as conn:
@@ -194,3 +243,76 @@ def obter_todos_por_perfil(perfil: str) -> list[Usuario]:
             )
             for row in rows
         ]
+
+def buscar_por_prefixo(termo: str, excluir_usuario_id: int, limite: int = 10) -> list[dict]:
+    """
+    Busca usuários pelo início do nome, do e-mail ou de qualquer palavra deles (autocomplete).
+
+    Primeiro percorre os índices de prefixo do nome e do e-mail normalizados
+    (resultados em ordem alfabética); se faltarem resultados, completa com o
+    índice FTS5, que encontra o prefixo de qualquer palavra (ex.: sobrenome).
+    Administradores e o usuário que busca são excluídos no próprio SQL.
+
+    Os resultados ficam em um cache LRU com chave pelo termo normalizado,
+    limpo a cada alteração de usuário feita por este repositório.
+
+    Args:
+        termo: Texto digitado
+        excluir_usuario_id: ID do usuário que está buscando
+        limite: Número máximo de resultados
+
+    Returns:
+        Lista de dicionários com id, nome e email
+    """
+    prefixo = normalizar_termo(termo)
+    if not prefixo:
+        return []
+
+    chave = (prefixo, excluir_usuario_id, limite)
+    resultado = cache_busca.obter(chave)
+    if resultado is None:
+        resultado = _buscar_por_prefixo_no_banco(prefixo, excluir_usuario_id, limite)
+        cache_busca.definir(chave, resultado)
+
+    # Cópias, para que o chamador não altere os itens guardados no cache
+    return [dict(item) for item in resultado]
+
+def _buscar_por_prefixo_no_banco(prefixo: str, excluir_usuario_id: int, limite: int) -> tuple[dict, ...]:
+    """Executa as consultas de buscar_por_prefixo até reunir `limite` usuários."""
+    # Limite superior do intervalo: qualquer texto que comece com o prefixo é menor
+    intervalo = (prefixo, prefixo + "\U0010ffff")
+    filtros = (Perfil.ADMIN.value, excluir_usuario_id)
+    encontrados: dict[int, dict] = {}
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        consultas = [
+            (BUSCAR_POR_PREFIXO_NOME, intervalo),
+            (BUSCAR_POR_PREFIXO_EMAIL, intervalo),
+            (BUSCAR_POR_PALAVRA, (montar_consulta_fts(prefixo),)),
+        ]
+        for sql, criterio in consultas:
+            # Pede também os já encontrados, que podem se repetir nesta consulta
+            cursor.execute(sql, (*criterio, *filtros, limite + len(encontrados)))
+            for row in cursor.fetchall():
+                if row["id"] not in encontrados and len(encontrados) < limite:
+                    encontrados[row["id"]] = {"id": row["id"], "nome": row["nome"], "email": row["email"]}
+            if len(encontrados) >= limite:
+                break
+
+    return tuple(encontrados.values())
+
+def reconstruir_indice_busca() -> int:
+    """
+    Reconstrói os índices de busca de usuários (colunas normalizadas e FTS5).
+
+    Returns:
+        Número de usuários indexados
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA_FTS)
+        _preencher_campos_busca(cursor)
+        total = reconstruir_indice_fts(cursor, "usuario_fts", [POPULAR_FTS])
+    cache_busca.limpar()
+    return total
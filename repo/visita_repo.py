@@ -4,6 +4,14 @@ from typing import List, Optional
 from datetime import datetime
 from model.visita_model import Visita
 from sql.visita_sql import *
+from model.busca_model import PaginaBusca
+from util.busca_fts import (
+    BUSCA_POR_PAGINA,
+    criar_indice_fts,
+    executar_busca_paginada,
+    montar_consulta_fts,
+    reconstruir_indice_fts,
+)
 from util.db_util import get_connection
 
 
@@ -34,10 +42,11 @@ def _row_to_visita(row) -> Visita:
 
 
 def criar_tabela() -> bool:
-    """Cria a tabela visita se não existir."""
+    """Cria a tabela visita e o índice de busca textual se não existirem."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA)
+        criar_indice_fts(cursor, "visita_fts", CRIAR_TABELA_FTS, TRIGGERS_FTS, POPULAR_FTS)
         return True
 
 
@@ -154,23 +163,62 @@ def contar() -> int:
         return cursor.fetchone()[0]
 
 
-def buscar_por_termo(termo: str) -> List[dict]:
+def buscar_por_termo(termo: str, limite: int = 50) -> List[dict]:
     """
-    Busca visitas por termo (nome do adotante, abrigo ou observações).
+    Busca visitas por termo (nome do adotante, responsável pelo abrigo ou observações).
+
+    Usa o índice FTS5: cada palavra é buscada por prefixo, sem diferenciar
+    maiúsculas nem acentos, e os resultados vêm ordenados por relevância.
 
     Args:
         termo: Termo de busca
+        limite: Número máximo de resultados
 
     Returns:
-        Lista de dicionários com dados das visitas que correspondem ao termo
+        Lista de dicionários com dados das visitas que correspondem ao termo (mais relevantes primeiro)
     """
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return []
+
     with get_connection() as conn:
         cursor = conn.cursor()
-        termo_like = f"%{termo}%"
-        cursor.execute(BUSCAR_POR_TERMO, (termo_like, termo_like, termo_like))
+        cursor.execute(BUSCAR_POR_TERMO, (consulta, limite, 0))
         return [dict(row) for row in cursor.fetchall()]
 
 
+def buscar_paginado(termo: str, pagina: int = 1, por_pagina: int = BUSCA_POR_PAGINA) -> PaginaBusca:
+    """
+    Busca visitas por termo com paginação, ranking e trechos destacados.
+
+    Args:
+        termo: Termo de busca
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade de itens por página
+
+    Returns:
+        PaginaBusca com dicionários com dados das visitas como itens
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        return executar_busca_paginada(
+            cursor, BUSCAR_POR_TERMO, CONTAR_POR_TERMO, termo, pagina, por_pagina, dict
+        )
+
+
+def reconstruir_indice_busca() -> int:
+    """
+    Reconstrói o índice de busca textual a partir da tabela visita.
+
+    Returns:
+        Número de registros indexados
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA_FTS)
+        return reconstruir_indice_fts(cursor, "visita_fts", [LIMPAR_FTS, POPULAR_FTS])
+
+
 def excluir(id_visita: int) -> bool:
     """
     Exclui uma visita pelo ID.
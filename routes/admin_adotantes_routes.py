@@ -66,7 +66,7 @@ async def post_editar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_adotantes_limiter.verificar(ip):
+    if not await admin_adotantes_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/adotantes/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -186,7 +186,7 @@ async def post_cadastrar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_adotantes_limiter.verificar(ip):
+    if not await admin_adotantes_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/adotantes/listar", status_code=status.HTTP_303_SEE_OTHER)
 
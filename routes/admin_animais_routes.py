@@ -145,7 +145,7 @@ async def post_editar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_animais_limiter.verificar(ip):
+    if not await admin_animais_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/animais/listar", status_code=status.HTTP_303_SEE_OTHER)
 
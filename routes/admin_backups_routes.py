@@ -75,7 +75,7 @@ async def post_criar(request: Request, usuario_logado: Optional[dict] = None):
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_backups_limiter.verificar(ip):
+    if not await admin_backups_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações de backup. Aguarde alguns minutos e tente novamente.")
         return RedirectResponse("/admin/backups/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -115,7 +115,7 @@ async def post_restaurar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_backups_limiter.verificar(ip):
+    if not await admin_backups_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações de backup. Aguarde alguns minutos e tente novamente.")
         return RedirectResponse("/admin/backups/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -174,7 +174,7 @@ async def post_excluir(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_backups_limiter.verificar(ip):
+    if not await admin_backups_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações de backup. Aguarde alguns minutos e tente novamente.")
         return RedirectResponse("/admin/backups/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -214,7 +214,7 @@ async def get_download(
 
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not backup_download_limiter.verificar(ip):
+    if not await backup_download_limiter.verificar_async(ip):
         informar_erro(
             request,
             "Muitas tentativas de download. Aguarde alguns minutos.",
@@ -71,7 +71,7 @@ async def post_cadastrar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_categorias_limiter.verificar(ip):
+    if not await admin_categorias_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/categorias/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -156,7 +156,7 @@ async def post_editar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_categorias_limiter.verificar(ip):
+    if not await admin_categorias_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/categorias/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -218,7 +218,7 @@ async def excluir(request: Request, id: int, usuario_logado: Optional[dict] = No
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_categorias_limiter.verificar(ip):
+    if not await admin_categorias_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/categorias/listar", status_code=status.HTTP_303_SEE_OTHER)
 
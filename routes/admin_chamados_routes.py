@@ -91,7 +91,7 @@ async def post_responder(
 
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not admin_chamado_responder_limiter.verificar(ip):
+    if not await admin_chamado_responder_limiter.verificar_async(ip):
         informar_erro(
             request,
             "Muitas tentativas de resposta. Aguarde alguns minutos.",
@@ -88,7 +88,7 @@ async def post_salvar_lote_configuracoes(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_config_limiter.verificar(ip):
+    if not await admin_config_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/configuracoes", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -112,7 +112,7 @@ async def post_salvar_lote_configuracoes(
         # Atualizar configurações no banco
         quantidade_atualizada, chaves_nao_encontradas = configuracao_repo.atualizar_multiplas(dto.configs)
 
-        # Limpar cache de configurações
+        # Limpar cache de configurações (o cache de páginas é avisado)
         config.limpar()
 
         # Log de auditoria
@@ -221,7 +221,7 @@ async def post_aplicar_tema(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_config_limiter.verificar(ip):
+    if not await admin_config_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/tema", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -249,7 +249,7 @@ async def post_aplicar_tema(
         )
 
         if sucesso:
-            # Limpar cache de configurações
+            # Limpar cache de configurações e das páginas com o tema anterior
             config.limpar()
 
             logger.info(
@@ -356,7 +356,7 @@ async def post_filtrar_auditoria(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_config_limiter.verificar(ip):
+    if not await admin_config_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/auditoria", status_code=status.HTTP_303_SEE_OTHER)
 
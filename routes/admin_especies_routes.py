@@ -48,7 +48,7 @@ async def post_cadastrar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_especies_limiter.verificar(ip):
+    if not await admin_especies_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/especies/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -132,7 +132,7 @@ async def post_editar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_especies_limiter.verificar(ip):
+    if not await admin_especies_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/especies/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -179,7 +179,7 @@ async def post_excluir(request: Request, id: int, usuario_logado: Optional[dict]
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_especies_limiter.verificar(ip):
+    if not await admin_especies_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/especies/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -39,7 +39,7 @@ async def post_cadastrar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_racas_limiter.verificar(ip):
+    if not await admin_racas_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/racas/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -142,7 +142,7 @@ async def post_editar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_racas_limiter.verificar(ip):
+    if not await admin_racas_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/racas/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -226,7 +226,7 @@ async def post_excluir(request: Request, id: int, usuario_logado: Optional[dict]
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_racas_limiter.verificar(ip):
+    if not await admin_racas_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/racas/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -99,7 +99,7 @@ async def post_aprovar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_solicitacoes_limiter.verificar(ip):
+    if not await admin_solicitacoes_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/solicitacoes/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -147,7 +147,7 @@ async def post_rejeitar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_solicitacoes_limiter.verificar(ip):
+    if not await admin_solicitacoes_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/solicitacoes/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -189,7 +189,7 @@ async def post_cancelar(request: Request, id: int, usuario_logado: Optional[dict
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_solicitacoes_limiter.verificar(ip):
+    if not await admin_solicitacoes_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/solicitacoes/listar", status_code=status.HTTP_303_SEE_OTHER)
 
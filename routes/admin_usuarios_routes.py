@@ -69,7 +69,7 @@ async def post_cadastrar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_usuarios_limiter.verificar(ip):
+    if not await admin_usuarios_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/usuarios/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -167,7 +167,7 @@ async def post_editar(
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_usuarios_limiter.verificar(ip):
+    if not await admin_usuarios_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/usuarios/listar", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -238,7 +238,7 @@ async def post_excluir(request: Request, id: int, usuario_logado: Optional[dict]
 
     # Rate limiting
     ip = obter_identificador_cliente(request)
-    if not admin_usuarios_limiter.verificar(ip):
+    if not await admin_usuarios_limiter.verificar_async(ip):
         informar_erro(request, "Muitas operações. Aguarde um momento e tente novamente.")
         return RedirectResponse("/admin/usuarios/listar", status_code=status.HTTP_303_SEE_OTHER)
 
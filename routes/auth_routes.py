@@ -74,7 +74,7 @@ async def post_login(
     try:
         # Rate limiting por IP
         ip = obter_identificador_cliente(request)
-        if not login_limiter.verificar(ip):
+        if not await login_limiter.verificar_async(ip):
             informar_erro(
                 request, "Muitas tentativas de login. Aguarde alguns minutos."
             )
@@ -170,7 +170,7 @@ async def post_cadastrar(
     try:
         # Rate limiting por IP
         ip = obter_identificador_cliente(request)
-        if not cadastro_limiter.verificar(ip):
+        if not await cadastro_limiter.verificar_async(ip):
             informar_erro(
                 request,
                 f"Muitas tentativas de cadastro. Aguarde {cadastro_limiter.janela_minutos} minuto(s).",
@@ -247,7 +247,7 @@ async def post_esqueci_senha(request: Request, email: str = Form()):
     try:
         # Rate limiting por IP
         ip = obter_identificador_cliente(request)
-        if not esqueci_senha_limiter.verificar(ip):
+        if not await esqueci_senha_limiter.verificar_async(ip):
             informar_erro(
                 request,
                 f"Muitas tentativas de recuperação de senha. Aguarde {esqueci_senha_limiter.janela_minutos} minuto(s).",
@@ -85,7 +85,7 @@ async def post_cadastrar(
 
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not chamado_criar_limiter.verificar(ip):
+    if not await chamado_criar_limiter.verificar_async(ip):
         informar_erro(
             request,
             "Muitas tentativas de criação de chamados. Aguarde alguns minutos.",
@@ -195,7 +195,7 @@ async def post_responder(
 
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not chamado_responder_limiter.verificar(ip):
+    if not await chamado_responder_limiter.verificar_async(ip):
         informar_erro(
             request,
             "Muitas tentativas de resposta em chamados. Aguarde alguns minutos.",
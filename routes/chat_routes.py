@@ -2,6 +2,7 @@
 Rotas para o sistema de chat em tempo real.
 """
 import json
+import random
 import asyncio
 from fastapi import APIRouter, Request, status, HTTPException, Form
 from fastapi.responses import StreamingResponse, JSONResponse
@@ -11,14 +12,33 @@ from typing import Optional
 from dtos.chat_dto import CriarSalaDTO, EnviarMensagemDTO
 from repo import chat_sala_repo, chat_participante_repo, chat_mensagem_repo, usuario_repo
 from util.auth_decorator import requer_autenticacao
-from util.chat_manager import chat_manager
+from util.chat_manager import chat_manager, CHAT_SSE_HEARTBEAT_SEGUNDOS, MOTIVO_SUBSTITUIDA
+from util.db_util import unidade_de_trabalho
+from util.db_async import executar_db, repo_assincrono
 from util.foto_util import obter_caminho_foto_usuario
 from util.datetime_util import agora
 from util.logger_config import logger
-from util.perfis import Perfil
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Variantes assíncronas dos repositórios (executam fora do event loop)
+chat_sala_repo_async = repo_assincrono(chat_sala_repo)
+chat_participante_repo_async = repo_assincrono(chat_participante_repo)
+chat_mensagem_repo_async = repo_assincrono(chat_mensagem_repo)
+usuario_repo_async = repo_assincrono(usuario_repo)
+
+# Máximo de mensagens retornadas por página do histórico
+MENSAGENS_LIMITE_MAXIMO = 100
+# Máximo de conversas retornadas por página da lista de conversas
+CONVERSAS_LIMITE_MAXIMO = 100
+# Máximo de eventos SSE agrupados em uma única escrita no stream
+SSE_MAX_EVENTOS_POR_ESCRITA = 50
+# Máximo de mensagens reenviadas do banco na reconexão (acima disso o cliente recarrega)
+SSE_REPLAY_MAX_MENSAGENS = 100
+# Intervalo de reconexão sugerido ao navegador (sorteado para espalhar reconexões em massa)
+SSE_RETRY_MIN_MS = 1000
+SSE_RETRY_MAX_MS = 5000
+
 # Rate limiters
 from util.rate_limiter import DynamicRateLimiter, obter_identificador_cliente
 
@@ -52,34 +72,104 @@ chat_listagem_limiter = DynamicRateLimiter(
 )
 
 
+def _evento_nova_mensagem(mensagem) -> dict:
+    """Monta o evento SSE de uma nova mensagem."""
+    return {
+        "tipo": "nova_mensagem",
+        "sala_id": mensagem.sala_id,
+        "mensagem": {
+            "id": mensagem.id,
+            "sala_id": mensagem.sala_id,
+            "usuario_id": mensagem.usuario_id,
+            "mensagem": mensagem.mensagem,
+            "data_envio": mensagem.data_envio.isoformat() if mensagem.data_envio else None,
+            "lida_em": mensagem.lida_em.isoformat() if mensagem.lida_em else None
+        }
+    }
+
+
+def _formatar_sse(dados: dict, evento_id: Optional[str] = None) -> str:
+    """Formata um evento no protocolo SSE (com ID opcional)."""
+    linha_id = f"id: {evento_id}\n" if evento_id else ""
+    return f"{linha_id}data: {json.dumps(dados)}\n\n"
+
+
 @router.get("/stream")
 @requer_autenticacao()
 async def stream_mensagens(request: Request, usuario_logado: Optional[dict] = None):
     """
     Endpoint SSE para receber mensagens em tempo real.
-    Cada usuário mantém UMA conexão que recebe mensagens de TODAS as suas salas.
+    Cada conexão recebe mensagens de TODAS as salas do usuário; várias abas
+    podem ficar conectadas ao mesmo tempo (até CHAT_MAX_CONEXOES_POR_USUARIO).
+
+    Os eventos têm ID e, na reconexão, o cabeçalho Last-Event-ID enviado pelo
+    navegador é usado para reenviar o que foi perdido: do histórico em memória
+    do ChatManager ou, se indisponível, das mensagens em chat_mensagem.
+    Comentários de heartbeat mantêm a conexão viva através de proxies.
     """
     usuario_id = usuario_logado["id"]
+    ultimo_evento_id = request.headers.get("last-event-id")
 
     async def event_generator():
-        # Conectar usuário ao ChatManager
-        queue = await chat_manager.connect(usuario_id)
+        # Conectar usuário ao ChatManager (reenvia eventos do histórico em memória)
+        conexao = await chat_manager.connect(usuario_id, ultimo_evento_id)
+        ultima_mensagem_reenviada = 0
         try:
-            while True:
-                # Aguardar mensagem na fila
-                evento = await queue.get()
+            yield f"retry: {random.randint(SSE_RETRY_MIN_MS, SSE_RETRY_MAX_MS)}\n\n"
+
+            if conexao.replay_banco_desde is not None:
+                # Histórico em memória insuficiente: reenviar a partir do banco
+                mensagens = await chat_mensagem_repo_async.listar_por_usuario_apos(
+                    usuario_id, conexao.replay_banco_desde, SSE_REPLAY_MAX_MENSAGENS + 1
+                )
+                if len(mensagens) > SSE_REPLAY_MAX_MENSAGENS:
+                    ultima_mensagem_reenviada = await chat_mensagem_repo_async.obter_ultimo_id()
+                    yield _formatar_sse({"tipo": "resincronizar"})
+                else:
+                    ultima_mensagem_reenviada = max(
+                        [conexao.replay_banco_desde] + [m.id for m in mensagens]
+                    )
+                    if mensagens:
+                        yield "".join(_formatar_sse(_evento_nova_mensagem(m)) for m in mensagens)
+                yield f"id: {chat_manager.id_inicial(usuario_id, ultima_mensagem_reenviada)}\n\n"
+            elif not ultimo_evento_id:
+                # Primeira conexão: registrar um ID para que uma queda antes do
+                # primeiro evento ainda possa ser recuperada
+                ultimo_id = await chat_mensagem_repo_async.obter_ultimo_id()
+                yield f"id: {chat_manager.id_inicial(usuario_id, ultimo_id)}\n\n"
 
-                # Formatar como SSE
-                sse_data = f"data: {json.dumps(evento)}\n\n"
-                yield sse_data
-
-                # Pequeno delay para não sobrecarregar
-                await asyncio.sleep(0.1)
+            while True:
+                # Aguardar eventos e retirar todos os pendentes de uma vez
+                lote = await conexao.fila.obter_lote(
+                    SSE_MAX_EVENTOS_POR_ESCRITA, timeout=CHAT_SSE_HEARTBEAT_SEGUNDOS
+                )
+                if lote is None:
+                    if conexao.fila.motivo_encerramento == MOTIVO_SUBSTITUIDA:
+                        # Avisar a aba para não reconectar e derrubar outra
+                        yield _formatar_sse({"tipo": "conexao_encerrada"})
+                    break
+
+                if not lote:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                # Formatar como SSE (vários eventos em uma única escrita),
+                # ignorando mensagens já reenviadas a partir do banco
+                dados_sse = "".join(
+                    _formatar_sse(evento.dados, chat_manager.id_evento(evento))
+                    for evento in lote
+                    if not (
+                        evento.dados.get("tipo") == "nova_mensagem"
+                        and evento.dados["mensagem"]["id"] <= ultima_mensagem_reenviada
+                    )
+                )
+                if dados_sse:
+                    yield dados_sse
         except asyncio.CancelledError:
-            logger.info(f"[SSE] Conexão cancelada para usuário {usuario_id}")
+            logger.info(f"[SSE] Conexão {conexao.id} cancelada para usuário {usuario_id}")
         finally:
-            # Desconectar ao fechar stream
-            await chat_manager.disconnect(usuario_id)
+            # Desconectar apenas esta conexão ao fechar o stream
+            await chat_manager.disconnect(usuario_id, conexao.id)
 
     return StreamingResponse(
         event_generator(),
@@ -104,7 +194,7 @@ async def criar_ou_obter_sala(
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not chat_sala_limiter.verificar(ip):
+    if not await chat_sala_limiter.verificar_async(ip):
         logger.warning(f"Rate limit excedido para criação de sala de chat - IP: {ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -122,25 +212,32 @@ async def criar_ou_obter_sala(
                 detail="Não é possível criar chat consigo mesmo."
             )
 
-        # Verificar se outro usuário existe
-        outro_usuario = usuario_repo.obter_por_id(dto.outro_usuario_id)
-        if not outro_usuario:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Usuário não encontrado."
-            )
+        def _criar_sala():
+            # Sala e participantes são criados em uma única transação
+            with unidade_de_trabalho():
+                # Verificar se outro usuário existe
+                outro_usuario = usuario_repo.obter_por_id(dto.outro_usuario_id)
+                if not outro_usuario:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Usuário não encontrado."
+                    )
 
-        # Criar ou obter sala
-        sala = chat_sala_repo.criar_ou_obter_sala(usuario_logado["id"], dto.outro_usuario_id)
+                # Criar ou obter sala
+                sala = chat_sala_repo.criar_ou_obter_sala(usuario_logado["id"], dto.outro_usuario_id)
 
-        # Adicionar participantes se sala foi recém-criada
-        participante1 = chat_participante_repo.obter_por_sala_e_usuario(sala.id, usuario_logado["id"])
-        if not participante1:
-            chat_participante_repo.adicionar_participante(sala.id, usuario_logado["id"])
+                # Adicionar participantes se sala foi recém-criada
+                participante1 = chat_participante_repo.obter_por_sala_e_usuario(sala.id, usuario_logado["id"])
+                if not participante1:
+                    chat_participante_repo.adicionar_participante(sala.id, usuario_logado["id"])
 
-        participante2 = chat_participante_repo.obter_por_sala_e_usuario(sala.id, dto.outro_usuario_id)
-        if not participante2:
-            chat_participante_repo.adicionar_participante(sala.id, dto.outro_usuario_id)
+                participante2 = chat_participante_repo.obter_por_sala_e_usuario(sala.id, dto.outro_usuario_id)
+                if not participante2:
+                    chat_participante_repo.adicionar_participante(sala.id, dto.outro_usuario_id)
+
+                return sala
+
+        sala = await executar_db(_criar_sala)
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -167,7 +264,7 @@ async def listar_conversas(
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not chat_listagem_limiter.verificar(ip):
+    if not await chat_listagem_limiter.verificar_async(ip):
         logger.warning(f"Rate limit excedido para listagem de conversas - IP: {ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -176,63 +273,34 @@ async def listar_conversas(
 
     usuario_id = usuario_logado["id"]
 
-    # Obter todas as participações do usuário
-    participacoes = chat_participante_repo.listar_por_usuario(usuario_id)
-
-    conversas = []
-    for participacao in participacoes:
-        sala = chat_sala_repo.obter_por_id(participacao.sala_id)
-        if not sala:
-            continue
+    # Conversas já ordenadas e paginadas pelo banco (consulta única)
+    limit = max(1, min(limit, CONVERSAS_LIMITE_MAXIMO))
+    offset = max(0, offset)
+    conversas = await chat_sala_repo_async.listar_conversas_por_usuario(usuario_id, limit, offset)
 
-        # Obter o outro participante da sala
-        participantes = chat_participante_repo.listar_por_sala(sala.id)
-        outro_participante = next(
-            (p for p in participantes if p.usuario_id != usuario_id),
-            None
-        )
-
-        if not outro_participante:
-            continue
-
-        # Obter dados do outro usuário
-        outro_usuario = usuario_repo.obter_por_id(outro_participante.usuario_id)
-        if not outro_usuario:
-            continue
-
-        # Obter última mensagem
-        ultima_mensagem = chat_mensagem_repo.obter_ultima_mensagem_sala(sala.id)
-
-        # Contar não lidas
-        nao_lidas = chat_participante_repo.contar_mensagens_nao_lidas(sala.id, usuario_id)
-
-        conversa = {
-            "sala_id": sala.id,
+    conversas_json = [
+        {
+            "sala_id": c.sala_id,
             "outro_usuario": {
-                "id": outro_usuario.id,
-                "nome": outro_usuario.nome,
-                "email": outro_usuario.email,
-                "foto_url": obter_caminho_foto_usuario(outro_usuario.id)
+                "id": c.outro_usuario_id,
+                "nome": c.outro_usuario_nome,
+                "email": c.outro_usuario_email,
+                "foto_url": obter_caminho_foto_usuario(c.outro_usuario_id)
             },
             "ultima_mensagem": {
-                "mensagem": ultima_mensagem.mensagem,
-                "data_envio": ultima_mensagem.data_envio.isoformat() if ultima_mensagem.data_envio else None,
-                "usuario_id": ultima_mensagem.usuario_id
-            } if ultima_mensagem else None,
-            "nao_lidas": nao_lidas,
-            "ultima_atividade": sala.ultima_atividade.isoformat() if sala.ultima_atividade else ""
+                "mensagem": c.ultima_mensagem,
+                "data_envio": c.ultima_mensagem_data_envio.isoformat() if c.ultima_mensagem_data_envio else None,
+                "usuario_id": c.ultima_mensagem_usuario_id
+            } if c.ultima_mensagem is not None else None,
+            "nao_lidas": c.nao_lidas,
+            "ultima_atividade": c.ultima_atividade.isoformat() if c.ultima_atividade else ""
         }
-        conversas.append(conversa)
-
-    # Ordenar por última atividade (mais recente primeiro)
-    conversas.sort(key=lambda c: c["ultima_atividade"], reverse=True)
-
-    # Aplicar paginação
-    conversas_paginadas = conversas[offset:offset + limit]
+        for c in conversas
+    ]
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
-        content=conversas_paginadas
+        content=conversas_json
     )
 
 
@@ -242,15 +310,21 @@ async def listar_mensagens(
     request: Request,
     sala_id: str,
     limit: int = 50,
-    offset: int = 0,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
     usuario_logado: Optional[dict] = None
 ):
     """
-    Lista mensagens de uma sala específica com paginação.
+    Lista mensagens de uma sala específica com paginação por cursor.
+
+    Sem cursor, retorna as mensagens mais recentes. Use before_id com o ID da
+    mensagem mais antiga já exibida para carregar o histórico, ou after_id com
+    o ID da mais recente para buscar mensagens novas. A lista é sempre
+    retornada em ordem cronológica.
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not chat_listagem_limiter.verificar(ip):
+    if not await chat_listagem_limiter.verificar_async(ip):
         logger.warning(f"Rate limit excedido para listagem de mensagens - IP: {ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -260,15 +334,24 @@ async def listar_mensagens(
     usuario_id = usuario_logado["id"]
 
     # Verificar se usuário participa da sala
-    participante = chat_participante_repo.obter_por_sala_e_usuario(sala_id, usuario_id)
+    participante = await chat_participante_repo_async.obter_por_sala_e_usuario(sala_id, usuario_id)
     if not participante:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem acesso a esta sala."
         )
 
+    if before_id is not None and after_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe apenas um cursor: before_id ou after_id."
+        )
+
     # Obter mensagens
-    mensagens = chat_mensagem_repo.listar_por_sala(sala_id, limit, offset)
+    limit = max(1, min(limit, MENSAGENS_LIMITE_MAXIMO))
+    mensagens = await chat_mensagem_repo_async.listar_por_sala(
+        sala_id, limit, before_id=before_id, after_id=after_id
+    )
 
     mensagens_json = [
         {
@@ -301,7 +384,7 @@ async def enviar_mensagem(
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not chat_mensagem_limiter.verificar(ip):
+    if not await chat_mensagem_limiter.verificar_async(ip):
         logger.warning(f"Rate limit excedido para envio de mensagem no chat - IP: {ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -314,42 +397,37 @@ async def enviar_mensagem(
 
         usuario_id = usuario_logado["id"]
 
-        # Verificar se usuário participa da sala
-        participante = chat_participante_repo.obter_por_sala_e_usuario(dto.sala_id, usuario_id)
-        if not participante:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Você não tem acesso a esta sala."
-            )
+        def _gravar_mensagem():
+            # Uma conexão e um commit para todas as operações da requisição
+            with unidade_de_trabalho():
+                # Verificar se usuário participa da sala
+                participante = chat_participante_repo.obter_por_sala_e_usuario(dto.sala_id, usuario_id)
+                if not participante:
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail="Você não tem acesso a esta sala."
+                    )
 
-        # Verificar se sala existe
-        sala = chat_sala_repo.obter_por_id(dto.sala_id)
-        if not sala:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Sala não encontrada."
-            )
+                # Verificar se sala existe
+                sala = chat_sala_repo.obter_por_id(dto.sala_id)
+                if not sala:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Sala não encontrada."
+                    )
 
-        # Inserir mensagem
-        nova_mensagem = chat_mensagem_repo.inserir(dto.sala_id, usuario_id, dto.mensagem)
+                # Inserir mensagem
+                nova_mensagem = chat_mensagem_repo.inserir(dto.sala_id, usuario_id, dto.mensagem)
 
-        # Atualizar última atividade da sala
-        chat_sala_repo.atualizar_ultima_atividade(dto.sala_id)
+                # Atualizar última atividade da sala
+                chat_sala_repo.atualizar_ultima_atividade(dto.sala_id)
 
-        # Broadcast via SSE para ambos participantes
-        mensagem_sse = {
-            "tipo": "nova_mensagem",
-            "sala_id": nova_mensagem.sala_id,
-            "mensagem": {
-                "id": nova_mensagem.id,
-                "sala_id": nova_mensagem.sala_id,
-                "usuario_id": nova_mensagem.usuario_id,
-                "mensagem": nova_mensagem.mensagem,
-                "data_envio": nova_mensagem.data_envio.isoformat() if nova_mensagem.data_envio else None,
-                "lida_em": None
-            }
-        }
-        await chat_manager.broadcast_para_sala(dto.sala_id, mensagem_sse)
+                return nova_mensagem
+
+        nova_mensagem = await executar_db(_gravar_mensagem)
+
+        # Broadcast via SSE para ambos participantes (somente após o commit)
+        await chat_manager.broadcast_para_sala(dto.sala_id, _evento_nova_mensagem(nova_mensagem))
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -382,19 +460,23 @@ async def marcar_como_lidas(
     """
     usuario_id = usuario_logado["id"]
 
-    # Verificar se usuário participa da sala
-    participante = chat_participante_repo.obter_por_sala_e_usuario(sala_id, usuario_id)
-    if not participante:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Você não tem acesso a esta sala."
-        )
+    def _marcar_lidas():
+        with unidade_de_trabalho():
+            # Verificar se usuário participa da sala
+            participante = chat_participante_repo.obter_por_sala_e_usuario(sala_id, usuario_id)
+            if not participante:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Você não tem acesso a esta sala."
+                )
 
-    # Marcar mensagens como lidas
-    chat_mensagem_repo.marcar_como_lidas(sala_id, usuario_id)
+            # Marcar mensagens como lidas
+            chat_mensagem_repo.marcar_como_lidas(sala_id, usuario_id)
 
-    # Atualizar última leitura do participante
-    chat_participante_repo.atualizar_ultima_leitura(sala_id, usuario_id)
+            # Atualizar última leitura do participante
+            chat_participante_repo.atualizar_ultima_leitura(sala_id, usuario_id)
+
+    await executar_db(_marcar_lidas)
 
     # Notificar via SSE para atualizar contador
     await chat_manager.broadcast_para_sala(sala_id, {
@@ -422,36 +504,25 @@ async def buscar_usuarios(
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not busca_usuarios_limiter.verificar(ip):
+    if not await busca_usuarios_limiter.verificar_async(ip):
         logger.warning(f"Rate limit excedido para busca de usuários - IP: {ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Muitas buscas. Aguarde alguns minutos."
         )
 
-    if len(q) < 2:
+    if len(q.strip()) < 2:
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content=[]
         )
 
-    # Buscar usuários
-    usuarios = usuario_repo.buscar_por_termo(q, limit=10)
-
-    # Excluir o próprio usuário e administradores dos resultados
-    usuarios_filtrados = [
-        u for u in usuarios
-        if u.id != usuario_logado["id"] and u.perfil != Perfil.ADMIN.value
-    ]
+    # Administradores e o próprio usuário são excluídos na consulta
+    usuarios = await usuario_repo_async.buscar_por_prefixo(q, usuario_logado["id"], limite=10)
 
     usuarios_json = [
-        {
-            "id": u.id,
-            "nome": u.nome,
-            "email": u.email,
-            "foto_url": obter_caminho_foto_usuario(u.id)
-        }
-        for u in usuarios_filtrados
+        {**u, "foto_url": obter_caminho_foto_usuario(u["id"])}
+        for u in usuarios
     ]
 
     return JSONResponse(
@@ -471,16 +542,7 @@ async def contar_nao_lidas_total(
     """
     usuario_id = usuario_logado["id"]
 
-    # Obter todas as participações do usuário
-    participacoes = chat_participante_repo.listar_por_usuario(usuario_id)
-
-    total_nao_lidas = 0
-    for participacao in participacoes:
-        nao_lidas = chat_participante_repo.contar_mensagens_nao_lidas(
-            participacao.sala_id,
-            usuario_id
-        )
-        total_nao_lidas += nao_lidas
+    total_nao_lidas = await chat_participante_repo_async.contar_total_nao_lidas(usuario_id)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
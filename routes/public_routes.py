@@ -6,6 +6,7 @@ from util.auth_decorator import obter_usuario_logado
 from util.rate_limiter import DynamicRateLimiter, obter_identificador_cliente
 from util.flash_messages import informar_erro
 from util.logger_config import logger
+from util.cache_pagina import cache_pagina
 
 router = APIRouter()
 templates_public = criar_templates("templates")
@@ -21,13 +22,14 @@ public_limiter = DynamicRateLimiter(
 
 
 @router.get("/")
+@cache_pagina
 async def home(request: Request):
     """
     Rota inicial - Landing Page pública (sempre)
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not public_limiter.verificar(ip):
+    if not await public_limiter.verificar_async(ip):
         informar_erro(request, "Muitas requisições. Aguarde alguns minutos.")
         logger.warning(f"Rate limit excedido para página pública - IP: {ip}")
         return templates_public.TemplateResponse(
@@ -43,6 +45,7 @@ async def home(request: Request):
 
 
 @router.get("/index")
+@cache_pagina
 async def index(request: Request):
     """
     Página pública inicial (Landing Page)
@@ -50,7 +53,7 @@ async def index(request: Request):
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not public_limiter.verificar(ip):
+    if not await public_limiter.verificar_async(ip):
         informar_erro(request, "Muitas requisições. Aguarde alguns minutos.")
         logger.warning(f"Rate limit excedido para página pública - IP: {ip}")
         return templates_public.TemplateResponse(
@@ -66,13 +69,14 @@ async def index(request: Request):
 
 
 @router.get("/sobre")
+@cache_pagina
 async def sobre(request: Request):
     """
     Página "Sobre" com informações do projeto acadêmico
     """
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not public_limiter.verificar(ip):
+    if not await public_limiter.verificar_async(ip):
         informar_erro(request, "Muitas requisições. Aguarde alguns minutos.")
         logger.warning(f"Rate limit excedido para página pública - IP: {ip}")
         return templates_public.TemplateResponse(
@@ -91,7 +91,7 @@ async def get_visualizar_perfil(request: Request, usuario_logado: Optional[dict]
 async def get_editar_perfil(request: Request, usuario_logado: Optional[dict] = None):
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not form_get_limiter.verificar(ip):
+    if not await form_get_limiter.verificar_async(ip):
         informar_erro(request, f"Muitas requisições. Aguarde {form_get_limiter.janela_minutos} minuto(s).")
         logger.warning(f"Rate limit excedido para formulário GET - IP: {ip}")
         return RedirectResponse("/usuario", status_code=status.HTTP_303_SEE_OTHER)
@@ -195,7 +195,7 @@ async def get_alterar_senha(request: Request, usuario_logado: Optional[dict] = N
     """Formulário para alterar senha"""
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not form_get_limiter.verificar(ip):
+    if not await form_get_limiter.verificar_async(ip):
         informar_erro(request, f"Muitas requisições. Aguarde {form_get_limiter.janela_minutos} minuto(s).")
         logger.warning(f"Rate limit excedido para formulário GET - IP: {ip}")
         return RedirectResponse("/usuario", status_code=status.HTTP_303_SEE_OTHER)
@@ -218,7 +218,7 @@ async def post_alterar_senha(
 
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not alterar_senha_limiter.verificar(ip):
+    if not await alterar_senha_limiter.verificar_async(ip):
         informar_erro(
             request,
             f"Muitas tentativas de alteração de senha. Aguarde {alterar_senha_limiter.janela_minutos} minuto(s).",
@@ -320,7 +320,7 @@ async def post_atualizar_foto(
 
     # Rate limiting por IP
     ip = obter_identificador_cliente(request)
-    if not upload_foto_limiter.verificar(ip):
+    if not await upload_foto_limiter.verificar_async(ip):
         informar_erro(
             request,
             f"Muitas tentativas de upload de foto. Aguarde {upload_foto_limiter.janela_minutos} minuto(s).",
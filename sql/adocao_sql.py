@@ -50,15 +50,88 @@ INNER JOIN usuario u ON ad.id_adotante = u.id
 ORDER BY ad.data_adocao DESC
 """
 
-BUSCAR_POR_TERMO = """
+# Busca textual (FTS5)
+# adocao_fts guarda o nome do animal, o nome do adotante e as observações de
+# cada adoção (rowid = adocao.id). Triggers mantêm o índice sincronizado com
+# adocao, animal e usuario.
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS adocao_fts USING fts5(
+    animal, adotante, observacoes,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_DOCUMENTO_FTS = """
+    INSERT INTO adocao_fts (rowid, animal, adotante, observacoes)
+    SELECT ad.id, a.nome, u.nome, ad.observacoes
+    FROM adocao ad
+    LEFT JOIN animal a ON ad.id_animal = a.id
+    LEFT JOIN usuario u ON ad.id_adotante = u.id
+"""
+
+TRIGGERS_FTS = [
+    f"""
+CREATE TRIGGER IF NOT EXISTS adocao_fts_inserir AFTER INSERT ON adocao BEGIN
+    {_DOCUMENTO_FTS} WHERE ad.id = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS adocao_fts_atualizar
+AFTER UPDATE OF observacoes, id_animal, id_adotante ON adocao BEGIN
+    DELETE FROM adocao_fts WHERE rowid = old.id;
+    {_DOCUMENTO_FTS} WHERE ad.id = new.id;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS adocao_fts_excluir AFTER DELETE ON adocao BEGIN
+    DELETE FROM adocao_fts WHERE rowid = old.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS adocao_fts_animal AFTER UPDATE OF nome ON animal
+WHEN old.nome IS NOT new.nome BEGIN
+    DELETE FROM adocao_fts WHERE rowid IN (SELECT id FROM adocao WHERE id_animal = new.id);
+    {_DOCUMENTO_FTS} WHERE ad.id_animal = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS adocao_fts_usuario AFTER UPDATE OF nome ON usuario
+WHEN old.nome IS NOT new.nome BEGIN
+    DELETE FROM adocao_fts WHERE rowid IN (SELECT id FROM adocao WHERE id_adotante = new.id);
+    {_DOCUMENTO_FTS} WHERE ad.id_adotante = new.id;
+END
+""",
+]
+
+LIMPAR_FTS = """
+DELETE FROM adocao_fts
+"""
+
+POPULAR_FTS = _DOCUMENTO_FTS
+
+_FROM_BUSCA = """FROM adocao_fts
+INNER JOIN adocao ad ON ad.id = adocao_fts.rowid
+INNER JOIN animal a ON ad.id_animal = a.id
+INNER JOIN usuario u ON ad.id_adotante = u.id
+WHERE adocao_fts MATCH ?"""
+
+# Ranking bm25 com pesos por coluna: animal/adotante > observações
+BUSCAR_POR_TERMO = f"""
 SELECT
     ad.id, ad.id_adotante, ad.id_animal, ad.data_solicitacao,
     ad.data_adocao, ad.status, ad.observacoes, ad.data_atualizacao,
     a.nome as animal_nome,
-    u.nome as adotante_nome
-FROM adocao ad
-INNER JOIN animal a ON ad.id_animal = a.id
-INNER JOIN usuario u ON ad.id_adotante = u.id
-WHERE a.nome LIKE ? OR u.nome LIKE ? OR ad.observacoes LIKE ?
-ORDER BY ad.data_adocao DESC
-"""
\ No newline at end of file
+    u.nome as adotante_nome,
+    snippet(adocao_fts, -1, char(2), char(3), '…', 12) as trecho,
+    bm25(adocao_fts, 5.0, 5.0, 1.0) as relevancia
+{_FROM_BUSCA}
+ORDER BY relevancia, ad.data_adocao DESC
+LIMIT ? OFFSET ?
+"""
+
+CONTAR_POR_TERMO = f"""
+SELECT COUNT(*)
+{_FROM_BUSCA}
+"""
@@ -45,9 +45,75 @@ FROM adotante
 ORDER BY id_adotante
 """
 
-BUSCAR_POR_TERMO = """
-SELECT id_adotante, renda_media, tem_filhos, estado_de_saude, data_cadastro, data_atualizacao
-FROM adotante
-WHERE estado_de_saude LIKE ?
-ORDER BY id_adotante
-"""
\ No newline at end of file
+# Busca textual (FTS5)
+# adotante_fts guarda o nome e o e-mail do usuário e o estado de saúde de cada
+# adotante (rowid = adotante.id_adotante). Triggers mantêm o índice
+# sincronizado com adotante e usuario.
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS adotante_fts USING fts5(
+    nome, email, estado_de_saude,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_DOCUMENTO_FTS = """
+    INSERT INTO adotante_fts (rowid, nome, email, estado_de_saude)
+    SELECT ad.id_adotante, u.nome, u.email, ad.estado_de_saude
+    FROM adotante ad
+    LEFT JOIN usuario u ON ad.id_adotante = u.id
+"""
+
+TRIGGERS_FTS = [
+    f"""
+CREATE TRIGGER IF NOT EXISTS adotante_fts_inserir AFTER INSERT ON adotante BEGIN
+    {_DOCUMENTO_FTS} WHERE ad.id_adotante = new.id_adotante;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS adotante_fts_atualizar
+AFTER UPDATE OF estado_de_saude, id_adotante ON adotante BEGIN
+    DELETE FROM adotante_fts WHERE rowid = old.id_adotante;
+    {_DOCUMENTO_FTS} WHERE ad.id_adotante = new.id_adotante;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS adotante_fts_excluir AFTER DELETE ON adotante BEGIN
+    DELETE FROM adotante_fts WHERE rowid = old.id_adotante;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS adotante_fts_usuario AFTER UPDATE OF nome, email ON usuario
+WHEN old.nome IS NOT new.nome OR old.email IS NOT new.email BEGIN
+    DELETE FROM adotante_fts WHERE rowid = new.id;
+    {_DOCUMENTO_FTS} WHERE ad.id_adotante = new.id;
+END
+""",
+]
+
+LIMPAR_FTS = """
+DELETE FROM adotante_fts
+"""
+
+POPULAR_FTS = _DOCUMENTO_FTS
+
+_FROM_BUSCA = """FROM adotante_fts
+INNER JOIN adotante ad ON ad.id_adotante = adotante_fts.rowid
+WHERE adotante_fts MATCH ?"""
+
+# Ranking bm25 com pesos por coluna: nome > e-mail > estado de saúde
+BUSCAR_POR_TERMO = f"""
+SELECT ad.id_adotante, ad.renda_media, ad.tem_filhos, ad.estado_de_saude,
+       ad.data_cadastro, ad.data_atualizacao,
+       snippet(adotante_fts, -1, char(2), char(3), '…', 12) as trecho,
+       bm25(adotante_fts, 5.0, 3.0, 1.0) as relevancia
+{_FROM_BUSCA}
+ORDER BY relevancia, ad.id_adotante
+LIMIT ? OFFSET ?
+"""
+
+CONTAR_POR_TERMO = f"""
+SELECT COUNT(*)
+{_FROM_BUSCA}
+"""
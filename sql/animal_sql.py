@@ -104,17 +104,103 @@ CONTAR = """
 SELECT COUNT(*) FROM animal
 """
 
-BUSCAR_POR_TERMO = """
+# Busca textual (FTS5)
+# O índice animal_fts guarda uma cópia do nome do animal, da raça, da espécie,
+# do responsável pelo abrigo e das observações, com rowid = animal.id.
+# Triggers mantêm o índice sincronizado com animal e com as tabelas relacionadas
+# (estas só reindexam quando o texto indexado de fato muda).
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS animal_fts USING fts5(
+    nome, raca, especie, abrigo, observacoes,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+# Documento indexado de cada animal (filtrado pelo WHERE de quem usa)
+_DOCUMENTO_FTS = """
+    INSERT INTO animal_fts (rowid, nome, raca, especie, abrigo, observacoes)
+    SELECT a.id, a.nome, r.nome, e.nome, ab.responsavel, a.observacoes
+    FROM animal a
+    LEFT JOIN raca r ON a.id_raca = r.id
+    LEFT JOIN especie e ON r.id_especie = e.id
+    LEFT JOIN abrigo ab ON a.id_abrigo = ab.id_abrigo
+"""
+
+TRIGGERS_FTS = [
+    f"""
+CREATE TRIGGER IF NOT EXISTS animal_fts_inserir AFTER INSERT ON animal BEGIN
+    {_DOCUMENTO_FTS} WHERE a.id = new.id;
+END
+""",
+    # Mudanças apenas de status/foto não reindexam o animal
+    f"""
+CREATE TRIGGER IF NOT EXISTS animal_fts_atualizar
+AFTER UPDATE OF nome, observacoes, id_raca, id_abrigo ON animal BEGIN
+    DELETE FROM animal_fts WHERE rowid = old.id;
+    {_DOCUMENTO_FTS} WHERE a.id = new.id;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS animal_fts_excluir AFTER DELETE ON animal BEGIN
+    DELETE FROM animal_fts WHERE rowid = old.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS animal_fts_raca AFTER UPDATE OF nome, id_especie ON raca
+WHEN old.nome IS NOT new.nome OR old.id_especie IS NOT new.id_especie BEGIN
+    DELETE FROM animal_fts WHERE rowid IN (SELECT id FROM animal WHERE id_raca = new.id);
+    {_DOCUMENTO_FTS} WHERE a.id_raca = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS animal_fts_especie AFTER UPDATE OF nome ON especie
+WHEN old.nome IS NOT new.nome BEGIN
+    DELETE FROM animal_fts WHERE rowid IN (
+        SELECT a.id FROM animal a JOIN raca r ON a.id_raca = r.id WHERE r.id_especie = new.id
+    );
+    {_DOCUMENTO_FTS} WHERE r.id_especie = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS animal_fts_abrigo AFTER UPDATE OF responsavel ON abrigo
+WHEN old.responsavel IS NOT new.responsavel BEGIN
+    DELETE FROM animal_fts WHERE rowid IN (SELECT id FROM animal WHERE id_abrigo = new.id_abrigo);
+    {_DOCUMENTO_FTS} WHERE a.id_abrigo = new.id_abrigo;
+END
+""",
+]
+
+LIMPAR_FTS = """
+DELETE FROM animal_fts
+"""
+
+POPULAR_FTS = _DOCUMENTO_FTS
+
+_FROM_BUSCA = """FROM animal_fts
+JOIN animal a ON a.id = animal_fts.rowid
+LEFT JOIN raca r ON a.id_raca = r.id
+LEFT JOIN especie e ON r.id_especie = e.id
+LEFT JOIN abrigo ab ON a.id_abrigo = ab.id_abrigo
+WHERE animal_fts MATCH ?"""
+
+# Ranking bm25 com pesos por coluna: nome > raça/espécie > abrigo > observações
+BUSCAR_POR_TERMO = f"""
 SELECT
     a.*,
     r.id as id_raca, r.nome as raca_nome, r.descricao as raca_descricao,
     r.temperamento, r.expectativa_de_vida, r.porte,
     e.id as id_especie, e.nome as especie_nome,
-    ab.id_abrigo, ab.responsavel
-FROM animal a
-LEFT JOIN raca r ON a.id_raca = r.id
-LEFT JOIN especie e ON r.id_especie = e.id
-LEFT JOIN abrigo ab ON a.id_abrigo = ab.id_abrigo
-WHERE a.nome LIKE ? OR r.nome LIKE ? OR e.nome LIKE ? OR ab.responsavel LIKE ?
-ORDER BY a.data_entrada DESC
-"""
\ No newline at end of file
+    ab.id_abrigo, ab.responsavel,
+    snippet(animal_fts, -1, char(2), char(3), '…', 12) as trecho,
+    bm25(animal_fts, 10.0, 4.0, 4.0, 2.0, 1.0) as relevancia
+{_FROM_BUSCA}
+ORDER BY relevancia, a.data_entrada DESC
+LIMIT ? OFFSET ?
+"""
+
+CONTAR_POR_TERMO = f"""
+SELECT COUNT(*)
+{_FROM_BUSCA}
+"""
@@ -0,0 +1,36 @@
+"""
+SQL statements para a tabela chat_evento.
+Log de eventos do chat compartilhado entre processos (broadcast entre workers).
+"""
+
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS chat_evento (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario_id INTEGER NOT NULL,
+    dados TEXT NOT NULL,
+    criado_em TIMESTAMP NOT NULL
+)
+"""
+
+INSERIR = """
+INSERT INTO chat_evento (usuario_id, dados, criado_em)
+VALUES (?, ?, ?)
+"""
+
+LISTAR_POSTERIORES = """
+SELECT id, usuario_id, dados, criado_em
+FROM chat_evento
+WHERE id > ?
+ORDER BY id ASC
+LIMIT ?
+"""
+
+OBTER_ULTIMO_ID = """
+SELECT COALESCE(MAX(id), 0) as ultimo_id
+FROM chat_evento
+"""
+
+EXCLUIR_ANTERIORES = """
+DELETE FROM chat_evento
+WHERE criado_em < ?
+"""
@@ -22,17 +22,62 @@ VALUES (?, ?, ?, ?, ?)
 """
 
 OBTER_POR_ID = """
-SELECT id, sala_id, usuario_id, mensagem, data_envio[timestamp], lida_em[timestamp]
+SELECT id, sala_id, usuario_id, mensagem, data_envio, lida_em
 FROM chat_mensagem
 WHERE id = ?
 """
 
-LISTAR_POR_SALA = """
-SELECT id, sala_id, usuario_id, mensagem, data_envio[timestamp], lida_em[timestamp]
+OBTER_DADOS_CONTADOR = """
+SELECT sala_id, usuario_id, data_envio
+FROM chat_mensagem
+WHERE id = ?
+"""
+
+# Índice composto para paginação por cursor (keyset) dentro de uma sala
+CRIAR_INDICE_SALA_ID = """
+CREATE INDEX IF NOT EXISTS idx_chat_mensagem_sala_id
+ON chat_mensagem (sala_id, id)
+"""
+
+# Paginação por cursor: as consultas percorrem o índice (sala_id, id)
+# a partir do cursor, sem o custo linear de OFFSET.
+LISTAR_RECENTES_POR_SALA = """
+SELECT id, sala_id, usuario_id, mensagem, data_envio, lida_em
 FROM chat_mensagem
 WHERE sala_id = ?
+ORDER BY id DESC
+LIMIT ?
+"""
+
+LISTAR_ANTERIORES_POR_SALA = """
+SELECT id, sala_id, usuario_id, mensagem, data_envio, lida_em
+FROM chat_mensagem
+WHERE sala_id = ? AND id < ?
+ORDER BY id DESC
+LIMIT ?
+"""
+
+LISTAR_POSTERIORES_POR_SALA = """
+SELECT id, sala_id, usuario_id, mensagem, data_envio, lida_em
+FROM chat_mensagem
+WHERE sala_id = ? AND id > ?
 ORDER BY id ASC
-LIMIT ? OFFSET ?
+LIMIT ?
+"""
+
+# Reenvio após reconexão do stream SSE: mensagens de todas as salas do usuário
+LISTAR_POR_USUARIO_APOS_ID = """
+SELECT m.id, m.sala_id, m.usuario_id, m.mensagem, m.data_envio, m.lida_em
+FROM chat_mensagem m
+INNER JOIN chat_participante p ON p.sala_id = m.sala_id
+WHERE p.usuario_id = ? AND m.id > ?
+ORDER BY m.id ASC
+LIMIT ?
+"""
+
+OBTER_ULTIMO_ID = """
+SELECT COALESCE(MAX(id), 0) as ultimo_id
+FROM chat_mensagem
 """
 
 CONTAR_POR_SALA = """
@@ -50,7 +95,7 @@ WHERE sala_id = ?
 """
 
 OBTER_ULTIMA_MENSAGEM_SALA = """
-SELECT id, sala_id, usuario_id, mensagem, data_envio[timestamp], lida_em[timestamp]
+SELECT id, sala_id, usuario_id, mensagem, data_envio, lida_em
 FROM chat_mensagem
 WHERE sala_id = ?
 ORDER BY id DESC
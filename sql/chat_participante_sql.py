@@ -8,55 +8,96 @@ CREATE TABLE IF NOT EXISTS chat_participante (
     sala_id TEXT NOT NULL,
     usuario_id INTEGER NOT NULL,
     ultima_leitura TIMESTAMP,
+    nao_lidas INTEGER NOT NULL DEFAULT 0,
     PRIMARY KEY (sala_id, usuario_id),
     FOREIGN KEY (sala_id) REFERENCES chat_sala(id) ON DELETE CASCADE,
     FOREIGN KEY (usuario_id) REFERENCES usuario(id) ON DELETE CASCADE
 )
 """
 
+# Migração de bancos criados antes do contador materializado
+ADICIONAR_COLUNA_NAO_LIDAS = """
+ALTER TABLE chat_participante
+ADD COLUMN nao_lidas INTEGER NOT NULL DEFAULT 0
+"""
+
 INSERIR = """
 INSERT INTO chat_participante (sala_id, usuario_id, ultima_leitura)
 VALUES (?, ?, ?)
 """
 
 OBTER_POR_SALA_E_USUARIO = """
-SELECT sala_id, usuario_id, ultima_leitura[timestamp]
+SELECT sala_id, usuario_id, ultima_leitura AS "ultima_leitura [timestamp]", nao_lidas
 FROM chat_participante
 WHERE sala_id = ? AND usuario_id = ?
 """
 
 LISTAR_POR_SALA = """
-SELECT sala_id, usuario_id, ultima_leitura[timestamp]
+SELECT sala_id, usuario_id, ultima_leitura AS "ultima_leitura [timestamp]", nao_lidas
 FROM chat_participante
 WHERE sala_id = ?
 """
 
 LISTAR_POR_USUARIO = """
-SELECT sala_id, usuario_id, ultima_leitura[timestamp]
+SELECT sala_id, usuario_id, ultima_leitura AS "ultima_leitura [timestamp]", nao_lidas
 FROM chat_participante
 WHERE usuario_id = ?
 """
 
 ATUALIZAR_ULTIMA_LEITURA = """
 UPDATE chat_participante
-SET ultima_leitura = ?
+SET ultima_leitura = ?, nao_lidas = 0
+WHERE sala_id = ? AND usuario_id = ?
+"""
+
+ZERAR_NAO_LIDAS = """
+UPDATE chat_participante
+SET nao_lidas = 0
 WHERE sala_id = ? AND usuario_id = ?
 """
 
-CONTAR_MENSAGENS_NAO_LIDAS = """
-SELECT COUNT(*) as total
-FROM chat_mensagem m
-WHERE m.sala_id = ?
-  AND m.usuario_id != ?
-  AND (
-    (SELECT cp.ultima_leitura
-     FROM chat_participante cp
-     WHERE cp.sala_id = m.sala_id AND cp.usuario_id = ?) IS NULL
-    OR
-    (SELECT cp.ultima_leitura
-     FROM chat_participante cp
-     WHERE cp.sala_id = m.sala_id AND cp.usuario_id = ?) < m.data_envio
-  )
+# Nova mensagem: incrementa o contador dos demais participantes da sala
+INCREMENTAR_NAO_LIDAS = """
+UPDATE chat_participante
+SET nao_lidas = nao_lidas + 1
+WHERE sala_id = ? AND usuario_id != ?
+"""
+
+# Mensagem excluída: decrementa quem ainda não a tinha lido
+DECREMENTAR_NAO_LIDAS = """
+UPDATE chat_participante
+SET nao_lidas = MAX(nao_lidas - 1, 0)
+WHERE sala_id = ?
+  AND usuario_id != ?
+  AND (ultima_leitura IS NULL OR ultima_leitura < ?)
+"""
+
+OBTER_NAO_LIDAS = """
+SELECT nao_lidas
+FROM chat_participante
+WHERE sala_id = ? AND usuario_id = ?
+"""
+
+OBTER_TOTAL_NAO_LIDAS = """
+SELECT COALESCE(SUM(nao_lidas), 0) as total
+FROM chat_participante
+WHERE usuario_id = ?
+"""
+
+# Reparo de consistência: recalcula os contadores a partir de chat_mensagem
+_CONTAGEM_REAL = """(
+    SELECT COUNT(*)
+    FROM chat_mensagem m
+    WHERE m.sala_id = chat_participante.sala_id
+      AND m.usuario_id != chat_participante.usuario_id
+      AND (chat_participante.ultima_leitura IS NULL
+           OR chat_participante.ultima_leitura < m.data_envio)
+)"""
+
+RECALCULAR_NAO_LIDAS = f"""
+UPDATE chat_participante
+SET nao_lidas = {_CONTAGEM_REAL}
+WHERE nao_lidas != {_CONTAGEM_REAL}
 """
 
 EXCLUIR = """
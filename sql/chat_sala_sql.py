@@ -17,7 +17,7 @@ VALUES (?, ?, ?)
 """
 
 OBTER_POR_ID = """
-SELECT id, criada_em[timestamp], ultima_atividade[timestamp]
+SELECT id, criada_em, ultima_atividade
 FROM chat_sala
 WHERE id = ?
 """
@@ -28,6 +28,28 @@ SET ultima_atividade = ?
 WHERE id = ?
 """
 
+LISTAR_CONVERSAS_POR_USUARIO = """
+SELECT s.id AS sala_id,
+       s.ultima_atividade AS "ultima_atividade [timestamp]",
+       u.id AS outro_usuario_id,
+       u.nome AS outro_usuario_nome,
+       u.email AS outro_usuario_email,
+       m.mensagem AS ultima_mensagem,
+       m.data_envio AS "ultima_mensagem_data_envio [timestamp]",
+       m.usuario_id AS ultima_mensagem_usuario_id,
+       eu.nao_lidas AS nao_lidas
+FROM chat_participante eu
+INNER JOIN chat_sala s ON s.id = eu.sala_id
+INNER JOIN chat_participante outro ON outro.sala_id = eu.sala_id AND outro.usuario_id != eu.usuario_id
+INNER JOIN usuario u ON u.id = outro.usuario_id
+LEFT JOIN chat_mensagem m ON m.id = (
+    SELECT MAX(ult.id) FROM chat_mensagem ult WHERE ult.sala_id = eu.sala_id
+)
+WHERE eu.usuario_id = ?
+ORDER BY s.ultima_atividade DESC, s.id
+LIMIT ? OFFSET ?
+"""
+
 EXCLUIR = """
 DELETE FROM chat_sala
 WHERE id = ?
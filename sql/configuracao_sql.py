@@ -26,9 +26,17 @@ FROM configuracao
 WHERE chave = ?
 """
 
+# Parâmetro: lista de chaves em JSON (ex: '["app_name", "theme"]')
+OBTER_MULTIPLAS = """
+SELECT id, chave, valor, descricao, data_cadastro, data_atualizacao
+FROM configuracao
+WHERE chave IN (SELECT value FROM json_each(?))
+"""
+
 OBTER_TODOS = """
 SELECT id, chave, valor, descricao, data_cadastro, data_atualizacao
 FROM configuracao
+WHERE chave <> ?
 ORDER BY chave
 """
 
@@ -39,16 +47,35 @@ WHERE chave = ?
 """
 
 EXCLUIR = """
-DELETE FROM configuracao WHERE id = ?
+DELETE FROM configuracao WHERE id = ? AND chave <> ?
 """
 
 CONTAR = """
-SELECT COUNT(*) FROM configuracao
+SELECT COUNT(*) FROM configuracao WHERE chave <> ?
 """
 
 BUSCAR_POR_TERMO = """
 SELECT id, chave, valor, descricao, data_cadastro, data_atualizacao
 FROM configuracao
-WHERE chave LIKE ? OR valor LIKE ? OR descricao LIKE ?
+WHERE (chave LIKE ? OR valor LIKE ? OR descricao LIKE ?) AND chave <> ?
 ORDER BY chave
 """
+
+# Linha de controle com a versão das configurações: incrementada a cada
+# alteração feita pelo repositório e consultada periodicamente pelo
+# ConfigCache de cada processo. Fica fora das listagens e da contagem.
+CHAVE_VERSAO = "configuracao_versao"
+
+OBTER_VERSAO = """
+SELECT CAST(valor AS INTEGER) AS versao
+FROM configuracao
+WHERE chave = ?
+"""
+
+INCREMENTAR_VERSAO = """
+INSERT INTO configuracao (chave, valor, descricao)
+VALUES (?, '1', 'Versão das configurações (controle interno do cache)')
+ON CONFLICT (chave) DO UPDATE SET
+    valor = CAST(valor AS INTEGER) + 1,
+    data_atualizacao = CURRENT_TIMESTAMP
+"""
@@ -63,10 +63,65 @@ CONTAR = """
 SELECT COUNT(*) FROM endereco
 """
 
-BUSCAR_POR_TERMO = """
-SELECT id, id_usuario, titulo, logradouro, numero, complemento,
-       bairro, cidade, uf, cep, data_cadastro, data_atualizacao
-FROM endereco
-WHERE titulo LIKE ? OR logradouro LIKE ? OR bairro LIKE ? OR cidade LIKE ? OR cep LIKE ?
-ORDER BY titulo
-"""
\ No newline at end of file
+# Busca textual (FTS5)
+# endereco_fts é um índice de conteúdo externo: os textos ficam apenas na
+# tabela endereco (content_rowid = id) e os triggers atualizam o índice
+# usando os valores antigos da linha para remover a entrada anterior.
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS endereco_fts USING fts5(
+    titulo, logradouro, bairro, cidade, cep,
+    content = 'endereco', content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+TRIGGERS_FTS = [
+    """
+CREATE TRIGGER IF NOT EXISTS endereco_fts_inserir AFTER INSERT ON endereco BEGIN
+    INSERT INTO endereco_fts (rowid, titulo, logradouro, bairro, cidade, cep)
+    VALUES (new.id, new.titulo, new.logradouro, new.bairro, new.cidade, new.cep);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS endereco_fts_atualizar
+AFTER UPDATE OF titulo, logradouro, bairro, cidade, cep ON endereco BEGIN
+    INSERT INTO endereco_fts (endereco_fts, rowid, titulo, logradouro, bairro, cidade, cep)
+    VALUES ('delete', old.id, old.titulo, old.logradouro, old.bairro, old.cidade, old.cep);
+    INSERT INTO endereco_fts (rowid, titulo, logradouro, bairro, cidade, cep)
+    VALUES (new.id, new.titulo, new.logradouro, new.bairro, new.cidade, new.cep);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS endereco_fts_excluir AFTER DELETE ON endereco BEGIN
+    INSERT INTO endereco_fts (endereco_fts, rowid, titulo, logradouro, bairro, cidade, cep)
+    VALUES ('delete', old.id, old.titulo, old.logradouro, old.bairro, old.cidade, old.cep);
+END
+""",
+]
+
+# Em tabelas de conteúdo externo, 'rebuild' descarta o índice e relê a tabela endereco
+POPULAR_FTS = """
+INSERT INTO endereco_fts (endereco_fts) VALUES ('rebuild')
+"""
+
+_FROM_BUSCA = """FROM endereco_fts
+INNER JOIN endereco e ON e.id = endereco_fts.rowid
+WHERE endereco_fts MATCH ?"""
+
+# Ranking bm25 com pesos por coluna: título/cidade > bairro/CEP > logradouro
+BUSCAR_POR_TERMO = f"""
+SELECT e.id, e.id_usuario, e.titulo, e.logradouro, e.numero, e.complemento,
+       e.bairro, e.cidade, e.uf, e.cep, e.data_cadastro, e.data_atualizacao,
+       snippet(endereco_fts, -1, char(2), char(3), '…', 12) as trecho,
+       bm25(endereco_fts, 4.0, 1.0, 2.0, 4.0, 2.0) as relevancia
+{_FROM_BUSCA}
+ORDER BY relevancia, e.titulo
+LIMIT ? OFFSET ?
+"""
+
+CONTAR_POR_TERMO = f"""
+SELECT COUNT(*)
+{_FROM_BUSCA}
+"""
@@ -1,3 +1,16 @@
+# Plano de índices do banco.
+#
+# Cada índice atende a consultas de sql/*_sql.py (indicadas nos comentários)
+# e/ou à verificação de chaves estrangeiras: com PRAGMA foreign_keys = ON,
+# excluir um registro pai procura os filhos pela coluna da FK, o que sem
+# índice é uma varredura completa da tabela filha.
+#
+# Índices criados junto com a própria tabela (chat_mensagem(sala_id, id),
+# usuario(nome_busca), usuario(email_busca)) ficam nos respectivos módulos.
+#
+# util/plano_consultas.py roda EXPLAIN QUERY PLAN sobre todas as consultas e
+# falha se alguma consulta frequente fizer varredura completa de tabela.
+
 # Índices da tabela usuario
 CRIAR_INDICE_USUARIO_PERFIL = """
 CREATE INDEX IF NOT EXISTS idx_usuario_perfil
@@ -21,10 +34,137 @@ CREATE INDEX IF NOT EXISTS idx_tarefa_usuario_concluida
 ON tarefa(usuario_id, concluida, data_criacao DESC)
 """
 
+# Índices da tabela chamado
+# OBTER_POR_USUARIO e FK chamado.usuario_id
+CRIAR_INDICE_CHAMADO_USUARIO = """
+CREATE INDEX IF NOT EXISTS idx_chamado_usuario
+ON chamado(usuario_id)
+"""
+
+# Parcial: só chamados em aberto (CONTAR_PENDENTES, CONTAR_ABERTOS_POR_USUARIO).
+# A condição precisa ser idêntica à das consultas para o índice ser usado.
+CRIAR_INDICE_CHAMADO_PENDENTE = """
+CREATE INDEX IF NOT EXISTS idx_chamado_pendente
+ON chamado(usuario_id)
+WHERE status IN ('Aberto', 'Em Análise')
+"""
+
+# Índices da tabela chamado_interacao
+# OBTER_POR_CHAMADO (já na ordem de exibição), contagens, exclusão e FK
+CRIAR_INDICE_CHAMADO_INTERACAO_CHAMADO = """
+CREATE INDEX IF NOT EXISTS idx_chamado_interacao_chamado
+ON chamado_interacao(chamado_id, data_interacao)
+"""
+
+# FK chamado_interacao.usuario_id
+CRIAR_INDICE_CHAMADO_INTERACAO_USUARIO = """
+CREATE INDEX IF NOT EXISTS idx_chamado_interacao_usuario
+ON chamado_interacao(usuario_id)
+"""
+
+# Parcial e de cobertura: CONTAR_NAO_LIDAS_POR_CHAMADO lê só o índice,
+# já agrupado por chamado, e apenas as interações não lidas
+CRIAR_INDICE_CHAMADO_INTERACAO_NAO_LIDAS = """
+CREATE INDEX IF NOT EXISTS idx_chamado_interacao_nao_lidas
+ON chamado_interacao(chamado_id, usuario_id)
+WHERE data_leitura IS NULL
+"""
+
+# Índices das tabelas do chat
+# LISTAR_POR_USUARIO, OBTER_TOTAL_NAO_LIDAS, LISTAR_CONVERSAS_POR_USUARIO
+# (cobre a junção eu.usuario_id -> sala_id) e FK chat_participante.usuario_id
+CRIAR_INDICE_CHAT_PARTICIPANTE_USUARIO = """
+CREATE INDEX IF NOT EXISTS idx_chat_participante_usuario
+ON chat_participante(usuario_id, sala_id)
+"""
+
+# FK chat_mensagem.usuario_id (ON DELETE CASCADE ao excluir usuário)
+CRIAR_INDICE_CHAT_MENSAGEM_USUARIO = """
+CREATE INDEX IF NOT EXISTS idx_chat_mensagem_usuario
+ON chat_mensagem(usuario_id)
+"""
+
+# Índices da tabela endereco
+# OBTER_POR_USUARIO (já ordenado por título) e FK endereco.id_usuario
+CRIAR_INDICE_ENDERECO_USUARIO = """
+CREATE INDEX IF NOT EXISTS idx_endereco_usuario
+ON endereco(id_usuario, titulo)
+"""
+
+# Índices da tabela animal
+# Parcial: vitrine de animais disponíveis (OBTER_TODOS, BUSCAR_DISPONIVEIS),
+# já na ordem de exibição; animais adotados não ocupam espaço no índice
+CRIAR_INDICE_ANIMAL_DISPONIVEL = """
+CREATE INDEX IF NOT EXISTS idx_animal_disponivel
+ON animal(data_entrada DESC)
+WHERE status = 'Disponível'
+"""
+
+# OBTER_POR_ABRIGO, consultas por abrigo de solicitacao/adocao e FK animal.id_abrigo
+CRIAR_INDICE_ANIMAL_ABRIGO = """
+CREATE INDEX IF NOT EXISTS idx_animal_abrigo
+ON animal(id_abrigo, data_entrada DESC)
+"""
+
+# raca_sql.CONTAR_ANIMAIS e FK animal.id_raca
+CRIAR_INDICE_ANIMAL_RACA = """
+CREATE INDEX IF NOT EXISTS idx_animal_raca
+ON animal(id_raca)
+"""
+
+# Índices da tabela solicitacao
+# OBTER_POR_ADOTANTE (já ordenado por data) e FK solicitacao.id_adotante
+CRIAR_INDICE_SOLICITACAO_ADOTANTE = """
+CREATE INDEX IF NOT EXISTS idx_solicitacao_adotante
+ON solicitacao(id_adotante, data_solicitacao DESC)
+"""
+
+# OBTER_POR_ABRIGO (junção a partir de animal) e FK solicitacao.id_animal
+CRIAR_INDICE_SOLICITACAO_ANIMAL = """
+CREATE INDEX IF NOT EXISTS idx_solicitacao_animal
+ON solicitacao(id_animal)
+"""
+
+# Índices da tabela adocao (id_animal já é UNIQUE)
+# FK adocao.id_adotante
+CRIAR_INDICE_ADOCAO_ADOTANTE = """
+CREATE INDEX IF NOT EXISTS idx_adocao_adotante
+ON adocao(id_adotante)
+"""
+
+# Índices da tabela visita
+# OBTER_POR_ADOTANTE (já ordenado por data) e FK visita.id_adotante
+CRIAR_INDICE_VISITA_ADOTANTE = """
+CREATE INDEX IF NOT EXISTS idx_visita_adotante
+ON visita(id_adotante, data_agendada DESC)
+"""
+
+# OBTER_POR_ABRIGO (já ordenado por data) e FK visita.id_abrigo
+CRIAR_INDICE_VISITA_ABRIGO = """
+CREATE INDEX IF NOT EXISTS idx_visita_abrigo
+ON visita(id_abrigo, data_agendada DESC)
+"""
+
 # Lista de todos os índices para criação
 TODOS_INDICES = [
     CRIAR_INDICE_USUARIO_PERFIL,
     CRIAR_INDICE_USUARIO_TOKEN,
     CRIAR_INDICE_TAREFA_USUARIO,
     CRIAR_INDICE_TAREFA_USUARIO_CONCLUIDA,
+    CRIAR_INDICE_CHAMADO_USUARIO,
+    CRIAR_INDICE_CHAMADO_PENDENTE,
+    CRIAR_INDICE_CHAMADO_INTERACAO_CHAMADO,
+    CRIAR_INDICE_CHAMADO_INTERACAO_USUARIO,
+    CRIAR_INDICE_CHAMADO_INTERACAO_NAO_LIDAS,
+    CRIAR_INDICE_CHAT_PARTICIPANTE_USUARIO,
+    CRIAR_INDICE_CHAT_MENSAGEM_USUARIO,
+    CRIAR_INDICE_ENDERECO_USUARIO,
+    CRIAR_INDICE_ANIMAL_DISPONIVEL,
+    CRIAR_INDICE_ANIMAL_ABRIGO,
+    CRIAR_INDICE_ANIMAL_RACA,
+    CRIAR_INDICE_SOLICITACAO_ADOTANTE,
+    CRIAR_INDICE_SOLICITACAO_ANIMAL,
+    CRIAR_INDICE_ADOCAO_ADOTANTE,
+    CRIAR_INDICE_VISITA_ADOTANTE,
+    CRIAR_INDICE_VISITA_ABRIGO,
 ]
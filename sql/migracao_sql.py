@@ -0,0 +1,28 @@
+"""
+SQL statements para a tabela schema_versao.
+Registra as migrações de esquema já aplicadas ao banco.
+"""
+
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS schema_versao (
+    versao INTEGER PRIMARY KEY,
+    descricao TEXT NOT NULL,
+    aplicada_em TIMESTAMP NOT NULL
+)
+"""
+
+OBTER_VERSAO_ATUAL = """
+SELECT COALESCE(MAX(versao), 0) as versao
+FROM schema_versao
+"""
+
+REGISTRAR = """
+INSERT INTO schema_versao (versao, descricao, aplicada_em)
+VALUES (?, ?, ?)
+"""
+
+LISTAR = """
+SELECT versao, descricao, aplicada_em AS "aplicada_em [timestamp]"
+FROM schema_versao
+ORDER BY versao
+"""
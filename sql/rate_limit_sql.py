@@ -0,0 +1,56 @@
+"""
+SQL statements para a tabela rate_limit.
+Estado compartilhado entre processos dos rate limiters (token bucket por
+limiter e identificador), usado com RATE_LIMIT_BACKEND=sqlite.
+"""
+
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS rate_limit (
+    limiter TEXT NOT NULL,
+    identificador TEXT NOT NULL,
+    fichas REAL NOT NULL,
+    atualizado_em REAL NOT NULL,
+    concedidas INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (limiter, identificador)
+) WITHOUT ROWID
+"""
+
+# Reabastece o balde até agora e retira até "lote" fichas inteiras, em um
+# único comando (atômico entre processos). Parâmetros numerados:
+# ?1 limiter, ?2 identificador, ?3 capacidade, ?4 fichas por segundo,
+# ?5 lote, ?6 instante atual (epoch em segundos).
+# No UPDATE todas as expressões leem os valores anteriores da linha.
+# atualizado_em nunca retrocede: um worker com relógio atrasado (ou uma
+# reserva que chega depois de outra mais recente) não reabastece de novo o
+# intervalo já contado.
+RESERVAR = """
+INSERT INTO rate_limit (limiter, identificador, fichas, atualizado_em, concedidas)
+VALUES (?1, ?2, ?3 - MIN(?5, ?3), ?6, MIN(?5, ?3))
+ON CONFLICT (limiter, identificador) DO UPDATE SET
+    fichas = MIN(?3, fichas + (MAX(atualizado_em, ?6) - atualizado_em) * ?4)
+        - MIN(?5, CAST(MIN(?3, fichas + (MAX(atualizado_em, ?6) - atualizado_em) * ?4) AS INTEGER)),
+    concedidas = MIN(?5, CAST(MIN(?3, fichas + (MAX(atualizado_em, ?6) - atualizado_em) * ?4) AS INTEGER)),
+    atualizado_em = MAX(atualizado_em, ?6)
+RETURNING concedidas
+"""
+
+OBTER = """
+SELECT fichas, atualizado_em
+FROM rate_limit
+WHERE limiter = ? AND identificador = ?
+"""
+
+EXCLUIR = """
+DELETE FROM rate_limit
+WHERE limiter = ? AND identificador = ?
+"""
+
+EXCLUIR_POR_LIMITER = """
+DELETE FROM rate_limit
+WHERE limiter = ?
+"""
+
+EXCLUIR_INATIVOS = """
+DELETE FROM rate_limit
+WHERE limiter = ? AND atualizado_em < ?
+"""
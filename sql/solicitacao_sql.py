@@ -88,16 +88,89 @@ CONTAR = """
 SELECT COUNT(*) FROM solicitacao
 """
 
-BUSCAR_POR_TERMO = """
+# Busca textual (FTS5)
+# solicitacao_fts guarda o nome do animal, o nome e o e-mail do adotante e as
+# observações de cada solicitação (rowid = solicitacao.id). Triggers mantêm o
+# índice sincronizado com solicitacao, animal e usuario.
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS solicitacao_fts USING fts5(
+    animal, adotante, email, observacoes,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_DOCUMENTO_FTS = """
+    INSERT INTO solicitacao_fts (rowid, animal, adotante, email, observacoes)
+    SELECT s.id, a.nome, u.nome, u.email, s.observacoes
+    FROM solicitacao s
+    LEFT JOIN animal a ON s.id_animal = a.id
+    LEFT JOIN usuario u ON s.id_adotante = u.id
+"""
+
+TRIGGERS_FTS = [
+    f"""
+CREATE TRIGGER IF NOT EXISTS solicitacao_fts_inserir AFTER INSERT ON solicitacao BEGIN
+    {_DOCUMENTO_FTS} WHERE s.id = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS solicitacao_fts_atualizar
+AFTER UPDATE OF observacoes, id_animal, id_adotante ON solicitacao BEGIN
+    DELETE FROM solicitacao_fts WHERE rowid = old.id;
+    {_DOCUMENTO_FTS} WHERE s.id = new.id;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS solicitacao_fts_excluir AFTER DELETE ON solicitacao BEGIN
+    DELETE FROM solicitacao_fts WHERE rowid = old.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS solicitacao_fts_animal AFTER UPDATE OF nome ON animal
+WHEN old.nome IS NOT new.nome BEGIN
+    DELETE FROM solicitacao_fts WHERE rowid IN (SELECT id FROM solicitacao WHERE id_animal = new.id);
+    {_DOCUMENTO_FTS} WHERE s.id_animal = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS solicitacao_fts_usuario AFTER UPDATE OF nome, email ON usuario
+WHEN old.nome IS NOT new.nome OR old.email IS NOT new.email BEGIN
+    DELETE FROM solicitacao_fts WHERE rowid IN (SELECT id FROM solicitacao WHERE id_adotante = new.id);
+    {_DOCUMENTO_FTS} WHERE s.id_adotante = new.id;
+END
+""",
+]
+
+LIMPAR_FTS = """
+DELETE FROM solicitacao_fts
+"""
+
+POPULAR_FTS = _DOCUMENTO_FTS
+
+_FROM_BUSCA = """FROM solicitacao_fts
+INNER JOIN solicitacao s ON s.id = solicitacao_fts.rowid
+INNER JOIN animal a ON s.id_animal = a.id
+INNER JOIN adotante ad ON s.id_adotante = ad.id_adotante
+INNER JOIN usuario u ON ad.id_adotante = u.id
+WHERE solicitacao_fts MATCH ?"""
+
+# Ranking bm25 com pesos por coluna: animal/adotante > e-mail > observações
+BUSCAR_POR_TERMO = f"""
 SELECT
     s.id, s.id_adotante, s.id_animal, s.data_solicitacao,
     s.status, s.observacoes, s.resposta_abrigo, s.data_atualizacao,
     a.nome as animal_nome,
-    u.nome as adotante_nome, u.email as adotante_email
-FROM solicitacao s
-INNER JOIN animal a ON s.id_animal = a.id
-INNER JOIN adotante ad ON s.id_adotante = ad.id_adotante
-INNER JOIN usuario u ON ad.id_adotante = u.id
-WHERE a.nome LIKE ? OR u.nome LIKE ? OR u.email LIKE ? OR s.observacoes LIKE ?
-ORDER BY s.data_solicitacao DESC
-"""
\ No newline at end of file
+    u.nome as adotante_nome, u.email as adotante_email,
+    snippet(solicitacao_fts, -1, char(2), char(3), '…', 12) as trecho,
+    bm25(solicitacao_fts, 5.0, 5.0, 3.0, 1.0) as relevancia
+{_FROM_BUSCA}
+ORDER BY relevancia, s.data_solicitacao DESC
+LIMIT ? OFFSET ?
+"""
+
+CONTAR_POR_TERMO = f"""
+SELECT COUNT(*)
+{_FROM_BUSCA}
+"""
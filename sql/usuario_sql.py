@@ -14,28 +14,58 @@ CREATE TABLE IF NOT EXISTS usuario (
     confirmado INTEGER DEFAULT 0,
     token_redefinicao TEXT,
     data_token TEXT,
-    data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP
+    data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+    nome_busca TEXT,
+    email_busca TEXT
 )
 """
 
+# Colunas normalizadas (sem acentos, minúsculas, sem pontuação) para a busca
+# por prefixo do autocomplete; preenchidas pelo repositório a cada escrita
+ADICIONAR_COLUNA_NOME_BUSCA = """
+ALTER TABLE usuario ADD COLUMN nome_busca TEXT
+"""
+
+ADICIONAR_COLUNA_EMAIL_BUSCA = """
+ALTER TABLE usuario ADD COLUMN email_busca TEXT
+"""
+
+CRIAR_INDICE_NOME_BUSCA = """
+CREATE INDEX IF NOT EXISTS idx_usuario_nome_busca ON usuario(nome_busca)
+"""
+
+CRIAR_INDICE_EMAIL_BUSCA = """
+CREATE INDEX IF NOT EXISTS idx_usuario_email_busca ON usuario(email_busca)
+"""
+
+LISTAR_PARA_NORMALIZAR = """
+SELECT id, nome, email FROM usuario
+"""
+
+ATUALIZAR_CAMPOS_BUSCA = """
+UPDATE usuario SET nome_busca = ?, email_busca = ? WHERE id = ?
+"""
+
 INSERIR = """
 INSERT INTO usuario (
     nome, email, senha, perfil,
-    data_nascimento, numero_documento, telefone, confirmado
+    data_nascimento, numero_documento, telefone, confirmado,
+    nome_busca, email_busca
 )
-VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
 """
 
 ALTERAR = """
 UPDATE usuario
-SET nome = ?, email = ?, perfil = ?
+SET nome = ?, email = ?, perfil = ?, nome_busca = ?, email_busca = ?
 WHERE id = ?
 """
 
 ATUALIZAR = """
 UPDATE usuario
 SET nome = ?, email = ?, perfil = ?,
-    data_nascimento = ?, numero_documento = ?, telefone = ?
+    data_nascimento = ?, numero_documento = ?, telefone = ?,
+    nome_busca = ?, email_busca = ?
 WHERE id = ?
 """
 
@@ -77,3 +107,74 @@ SELECT * FROM usuario
 WHERE perfil = ?
 ORDER BY nome
 """
+
+# Busca de usuários para o autocomplete do chat
+# 1) Prefixo do nome ou do e-mail normalizados: varredura de intervalo nos
+#    índices idx_usuario_nome_busca/idx_usuario_email_busca, já na ordem
+#    alfabética e interrompida ao atingir o LIMIT.
+# 2) Complemento pelo índice FTS5 usuario_fts, que encontra o prefixo de
+#    qualquer palavra do nome (ex.: sobrenome). O e-mail fica fora do FTS:
+#    palavras como o domínio se repetem em quase todos os usuários e tornariam
+#    a consulta lenta sem ajudar o autocomplete.
+# Administradores e o usuário que busca são excluídos no próprio SQL.
+
+BUSCAR_POR_PREFIXO_NOME = """
+SELECT id, nome, email FROM usuario
+WHERE nome_busca >= ? AND nome_busca < ? AND perfil <> ? AND id <> ?
+ORDER BY nome_busca
+LIMIT ?
+"""
+
+BUSCAR_POR_PREFIXO_EMAIL = """
+SELECT id, nome, email FROM usuario
+WHERE email_busca >= ? AND email_busca < ? AND perfil <> ? AND id <> ?
+ORDER BY email_busca
+LIMIT ?
+"""
+
+# usuario_fts é um índice de conteúdo externo sobre o nome; os triggers
+# usam os valores antigos da linha para remover a entrada anterior.
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS usuario_fts USING fts5(
+    nome,
+    content = 'usuario', content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+TRIGGERS_FTS = [
+    """
+CREATE TRIGGER IF NOT EXISTS usuario_fts_inserir AFTER INSERT ON usuario BEGIN
+    INSERT INTO usuario_fts (rowid, nome) VALUES (new.id, new.nome);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS usuario_fts_atualizar AFTER UPDATE OF nome ON usuario
+WHEN old.nome IS NOT new.nome BEGIN
+    INSERT INTO usuario_fts (usuario_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+    INSERT INTO usuario_fts (rowid, nome) VALUES (new.id, new.nome);
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS usuario_fts_excluir AFTER DELETE ON usuario BEGIN
+    INSERT INTO usuario_fts (usuario_fts, rowid, nome) VALUES ('delete', old.id, old.nome);
+END
+""",
+]
+
+# Em tabelas de conteúdo externo, 'rebuild' descarta o índice e relê a tabela usuario
+POPULAR_FTS = """
+INSERT INTO usuario_fts (usuario_fts) VALUES ('rebuild')
+"""
+
+# Sem ORDER BY por relevância: calcular bm25 para todos os documentos de um
+# prefixo curto custa dezenas de ms; na ordem do rowid a consulta para no LIMIT
+BUSCAR_POR_PALAVRA = """
+SELECT u.id, u.nome, u.email
+FROM usuario_fts
+INNER JOIN usuario u ON u.id = usuario_fts.rowid
+WHERE usuario_fts MATCH ? AND u.perfil <> ? AND u.id <> ?
+LIMIT ?
+"""
@@ -62,17 +62,90 @@ INNER JOIN abrigo ab ON v.id_abrigo = ab.id_abrigo
 ORDER BY v.data_agendada DESC
 """
 
-BUSCAR_POR_TERMO = """
-SELECT v.id, v.id_adotante, v.id_abrigo, v.data_agendada,
-       v.observacoes, v.status, v.data_cadastro, v.data_atualizacao,
-       u.nome as adotante_nome, ab.responsavel as abrigo_nome
-FROM visita v
+# Busca textual (FTS5)
+# visita_fts guarda o nome do adotante, o responsável pelo abrigo e as
+# observações de cada visita (rowid = visita.id). Triggers mantêm o índice
+# sincronizado com visita, usuario e abrigo.
+
+CRIAR_TABELA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS visita_fts USING fts5(
+    adotante, abrigo, observacoes,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_DOCUMENTO_FTS = """
+    INSERT INTO visita_fts (rowid, adotante, abrigo, observacoes)
+    SELECT v.id, u.nome, ab.responsavel, v.observacoes
+    FROM visita v
+    LEFT JOIN usuario u ON v.id_adotante = u.id
+    LEFT JOIN abrigo ab ON v.id_abrigo = ab.id_abrigo
+"""
+
+TRIGGERS_FTS = [
+    f"""
+CREATE TRIGGER IF NOT EXISTS visita_fts_inserir AFTER INSERT ON visita BEGIN
+    {_DOCUMENTO_FTS} WHERE v.id = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS visita_fts_atualizar
+AFTER UPDATE OF observacoes, id_adotante, id_abrigo ON visita BEGIN
+    DELETE FROM visita_fts WHERE rowid = old.id;
+    {_DOCUMENTO_FTS} WHERE v.id = new.id;
+END
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS visita_fts_excluir AFTER DELETE ON visita BEGIN
+    DELETE FROM visita_fts WHERE rowid = old.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS visita_fts_usuario AFTER UPDATE OF nome ON usuario
+WHEN old.nome IS NOT new.nome BEGIN
+    DELETE FROM visita_fts WHERE rowid IN (SELECT id FROM visita WHERE id_adotante = new.id);
+    {_DOCUMENTO_FTS} WHERE v.id_adotante = new.id;
+END
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS visita_fts_abrigo AFTER UPDATE OF responsavel ON abrigo
+WHEN old.responsavel IS NOT new.responsavel BEGIN
+    DELETE FROM visita_fts WHERE rowid IN (SELECT id FROM visita WHERE id_abrigo = new.id_abrigo);
+    {_DOCUMENTO_FTS} WHERE v.id_abrigo = new.id_abrigo;
+END
+""",
+]
+
+LIMPAR_FTS = """
+DELETE FROM visita_fts
+"""
+
+POPULAR_FTS = _DOCUMENTO_FTS
+
+_FROM_BUSCA = """FROM visita_fts
+INNER JOIN visita v ON v.id = visita_fts.rowid
 INNER JOIN usuario u ON v.id_adotante = u.id
 INNER JOIN abrigo ab ON v.id_abrigo = ab.id_abrigo
-WHERE u.nome LIKE ? OR ab.responsavel LIKE ? OR v.observacoes LIKE ?
-ORDER BY v.data_agendada DESC
+WHERE visita_fts MATCH ?"""
+
+# Ranking bm25 com pesos por coluna: adotante/abrigo > observações
+BUSCAR_POR_TERMO = f"""
+SELECT v.id, v.id_adotante, v.id_abrigo, v.data_agendada,
+       v.observacoes, v.status, v.data_cadastro, v.data_atualizacao,
+       u.nome as adotante_nome, ab.responsavel as abrigo_nome,
+       snippet(visita_fts, -1, char(2), char(3), '…', 12) as trecho,
+       bm25(visita_fts, 5.0, 3.0, 1.0) as relevancia
+{_FROM_BUSCA}
+ORDER BY relevancia, v.data_agendada DESC
+LIMIT ? OFFSET ?
+"""
+
+CONTAR_POR_TERMO = f"""
+SELECT COUNT(*)
+{_FROM_BUSCA}
 """
 
 EXCLUIR = """
 DELETE FROM visita WHERE id = ?
-"""
\ No newline at end of file
+"""
@@ -9,7 +9,7 @@ const chatWidget = (() => {
     let conversaAtual = null;
     let conversasOffset = 0;
     let debounceTimer = null;
-    let mensagensOffset = 0;
+    let mensagemMaisAntigaId = null;
     let carregandoMensagens = false;
     let todasMensagensCarregadas = false;
 
@@ -75,7 +75,8 @@ const chatWidget = (() => {
 
         eventSource.onerror = (error) => {
             console.error('[Chat SSE] Erro na conexão:', error);
-            // EventSource reconecta automaticamente
+            // EventSource reconecta automaticamente, enviando Last-Event-ID
+            // para que o servidor reenvie os eventos perdidos
         };
     }
 
@@ -105,6 +106,19 @@ const chatWidget = (() => {
         } else if (mensagem.tipo === 'atualizar_contador') {
             // Atualizar contador de não lidas
             atualizarContadorNaoLidas();
+        } else if (mensagem.tipo === 'resincronizar') {
+            // Muitos eventos perdidos durante a desconexão: recarregar tudo
+            carregarConversas(0);
+            atualizarContadorNaoLidas();
+            if (conversaAtual) {
+                mensagemMaisAntigaId = null;
+                todasMensagensCarregadas = false;
+                carregarMensagens(conversaAtual.sala_id, true);
+            }
+        } else if (mensagem.tipo === 'conexao_encerrada') {
+            // Limite de abas atingido: esta aba deixa de receber em tempo real
+            // (reconectar derrubaria outra aba)
+            eventSource.close();
         }
     }
 
@@ -323,7 +337,7 @@ const chatWidget = (() => {
         conversaAtual = conversa;
 
         // Resetar estado de paginação
-        mensagensOffset = 0;
+        mensagemMaisAntigaId = null;
         todasMensagensCarregadas = false;
 
         // Marcar como ativa na lista
@@ -359,7 +373,11 @@ const chatWidget = (() => {
 
         try {
             const limit = 24;
-            const response = await fetch(`/chat/mensagens/${salaId}?limit=${limit}&offset=${mensagensOffset}`);
+            let url = `/chat/mensagens/${salaId}?limit=${limit}`;
+            if (!inicial && mensagemMaisAntigaId !== null) {
+                url += `&before_id=${mensagemMaisAntigaId}`;
+            }
+            const response = await fetch(url);
             const mensagens = await response.json();
 
             // Se retornou menos que o limite, não há mais mensagens
@@ -369,7 +387,6 @@ const chatWidget = (() => {
 
             if (inicial) {
                 elementos.messagesContainer.innerHTML = '';
-                mensagensOffset = 0;
             }
 
             // Salvar posição de scroll antes de adicionar
@@ -395,7 +412,10 @@ const chatWidget = (() => {
                 elementos.messagesContainer.scrollTop = scrollAntes + (alturaDepois - alturaAntes);
             }
 
-            mensagensOffset += mensagens.length;
+            // Cursor para a próxima página: mensagem mais antiga carregada
+            if (mensagens.length > 0) {
+                mensagemMaisAntigaId = mensagens[0].id;
+            }
 
         } catch (error) {
             console.error('[Chat] Erro ao carregar mensagens:', error);
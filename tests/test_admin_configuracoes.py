@@ -72,6 +72,21 @@ class TestTema:
             tema_atual = config.obter("theme", "default")
             assert tema_atual is not None
 
+    def test_aplicar_tema_invalida_cache_de_paginas(self, admin_autenticado):
+        """Aplicar tema deve descartar as páginas públicas em cache"""
+        from util import cache_pagina
+
+        css_original = Path("static/css/bootswatch/original.bootstrap.min.css")
+
+        if css_original.exists():
+            cache_pagina._paginas.definir("/sobre", "página com o tema anterior")
+
+            admin_autenticado.post("/admin/tema/aplicar", data={
+                "tema": "original"
+            })
+
+            assert cache_pagina._paginas.obter("/sobre") is None
+
     def test_cliente_nao_pode_aplicar_tema(self, cliente_autenticado):
         """Cliente não deve poder aplicar tema"""
         response = cliente_autenticado.post("/admin/tema/aplicar", data={
@@ -241,3 +241,38 @@ class TestIntegracao:
         adocoes = adocao_repo.obter_por_abrigo(setup_completo["id_abrigo"])
         assert len(adocoes) == 1
         assert adocoes[0]["id_adocao"] == id_inserido
+
+
+class TestBuscarPorTermo:
+    """Testes para a busca textual (FTS5)."""
+
+    def test_buscar_por_animal_adotante_e_observacoes(self, setup_completo):
+        """Deve encontrar pelo animal, pelo adotante e pelas observações."""
+        id_adocao = adocao_repo.inserir(Adocao(
+            id=0,
+            id_adotante=setup_completo["id_adotante"],
+            id_animal=setup_completo["id_animal"],
+            data_solicitacao=datetime.now(),
+            data_adocao=None,
+            status="Concluída",
+            observacoes="Adoção realizada com sucesso"
+        ))
+
+        for termo in ["mimi", "adotante", "adocao realizada"]:
+            assert [a["id"] for a in adocao_repo.buscar_por_termo(termo)] == [id_adocao], termo
+
+    def test_indice_acompanha_nome_do_animal(self, setup_completo):
+        """Renomear o animal deve reindexar suas adoções."""
+        id_adocao = adocao_repo.inserir(Adocao(
+            id=0,
+            id_adotante=setup_completo["id_adotante"],
+            id_animal=setup_completo["id_animal"],
+            data_solicitacao=datetime.now(),
+            data_adocao=None,
+            status="Concluída"
+        ))
+        with get_connection() as conn:
+            conn.execute("UPDATE animal SET nome = 'Pipoca' WHERE id = ?", (setup_completo["id_animal"],))
+
+        assert adocao_repo.buscar_por_termo("mimi") == []
+        assert [a["id"] for a in adocao_repo.buscar_por_termo("pipoca")] == [id_adocao]
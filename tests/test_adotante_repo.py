@@ -370,3 +370,35 @@ class TestIntegracaoCRUD:
 
             adotante_bd = adotante_repo.obter_por_id(usuario_adotante)
             assert adotante_bd.renda_media == renda
+
+
+class TestBuscarPorTermo:
+    """Testes para a busca textual (FTS5)."""
+
+    def test_buscar_por_nome_email_e_saude(self, usuario_adotante, usuario_adotante2):
+        """Deve encontrar pelo nome e e-mail do usuário e pelo estado de saúde."""
+        adotante_repo.inserir(Adotante(
+            id_adotante=usuario_adotante, renda_media=3000.0,
+            tem_filhos=False, estado_saude="Excelente saúde"
+        ))
+        adotante_repo.inserir(Adotante(
+            id_adotante=usuario_adotante2, renda_media=3000.0,
+            tem_filhos=False, estado_saude="Boa"
+        ))
+
+        assert [a.id_adotante for a in adotante_repo.buscar_por_termo("joão")] == [usuario_adotante]
+        assert [a.id_adotante for a in adotante_repo.buscar_por_termo("maria@email")] == [usuario_adotante2]
+        assert [a.id_adotante for a in adotante_repo.buscar_por_termo("saude")] == [usuario_adotante]
+
+    def test_busca_paginada_retorna_models(self, usuario_adotante):
+        """A busca paginada deve converter os itens em objetos Adotante."""
+        adotante_repo.inserir(Adotante(
+            id_adotante=usuario_adotante, renda_media=3000.0,
+            tem_filhos=True, estado_saude="Boa"
+        ))
+
+        pagina = adotante_repo.buscar_paginado("silva")
+
+        assert pagina.total == 1
+        assert isinstance(pagina.resultados[0].item, Adotante)
+        assert pagina.resultados[0].item.tem_filhos is True
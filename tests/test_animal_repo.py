@@ -294,3 +294,104 @@ class TestExcluir:
 
         assert resultado is True
         assert animal_repo.obter_por_id(id_inserido) is None
+
+
+def _inserir_animal(setup_completo, nome, observacoes=None, data_entrada="2024-01-01"):
+    """Insere um animal com os relacionamentos do setup e retorna o ID."""
+    return animal_repo.inserir(Animal(
+        id=0,
+        id_raca=setup_completo["id_raca"],
+        id_abrigo=setup_completo["id_abrigo"],
+        nome=nome,
+        sexo="M",
+        data_entrada=data_entrada,
+        observacoes=observacoes
+    ))
+
+
+class TestBuscarPorTermo:
+    """Testes para a busca textual (FTS5)."""
+
+    def test_buscar_por_prefixo_do_nome(self, setup_completo):
+        """Deve encontrar animal pelo início do nome."""
+        _inserir_animal(setup_completo, "Rex")
+        id_bolinha = _inserir_animal(setup_completo, "Bolinha")
+
+        resultado = animal_repo.buscar_por_termo("bol")
+
+        assert [a.id for a in resultado] == [id_bolinha]
+        assert resultado[0].raca.nome == "Labrador"
+
+    def test_buscar_ignora_acentos_e_maiusculas(self, setup_completo):
+        """Deve encontrar 'Frederico' buscando 'FRÉDER' e vice-versa."""
+        id_fred = _inserir_animal(setup_completo, "Frederico")
+        id_joao = _inserir_animal(setup_completo, "João")
+
+        assert [a.id for a in animal_repo.buscar_por_termo("FRÉDER")] == [id_fred]
+        assert [a.id for a in animal_repo.buscar_por_termo("joao")] == [id_joao]
+
+    def test_buscar_por_raca_especie_abrigo_e_observacoes(self, setup_completo):
+        """Deve encontrar animal pelos campos relacionados."""
+        id_animal = _inserir_animal(setup_completo, "Thor", observacoes="Adora crianças")
+
+        for termo in ["labra", "cachorro", "responsavel", "criancas"]:
+            assert [a.id for a in animal_repo.buscar_por_termo(termo)] == [id_animal], termo
+
+    def test_buscar_exige_todas_as_palavras(self, setup_completo):
+        """Cada palavra da busca restringe o resultado (AND)."""
+        id_thor = _inserir_animal(setup_completo, "Thor", observacoes="Muito calmo")
+        _inserir_animal(setup_completo, "Tobias", observacoes="Agitado")
+
+        resultado = animal_repo.buscar_por_termo("t calmo")
+
+        assert [a.id for a in resultado] == [id_thor]
+
+    def test_buscar_ordena_por_relevancia(self, setup_completo):
+        """Correspondência no nome deve vir antes de correspondência nas observações."""
+        id_obs = _inserir_animal(setup_completo, "Bidu", observacoes="Amigo do Pipoca", data_entrada="2024-06-01")
+        id_nome = _inserir_animal(setup_completo, "Pipoca", data_entrada="2024-01-01")
+
+        resultado = animal_repo.buscar_por_termo("pipoca")
+
+        assert [a.id for a in resultado] == [id_nome, id_obs]
+
+    def test_buscar_termo_com_sintaxe_fts(self, setup_completo):
+        """Caracteres especiais do FTS5 não devem gerar erro."""
+        id_rex = _inserir_animal(setup_completo, "Rex")
+
+        assert animal_repo.buscar_por_termo('"rex" OR (*') == []
+        assert [a.id for a in animal_repo.buscar_por_termo('rex"')] == [id_rex]
+        assert animal_repo.buscar_por_termo("  ") == []
+
+    def test_indice_acompanha_atualizacao_e_exclusao(self, setup_completo):
+        """Triggers devem manter o índice sincronizado com a tabela animal."""
+        id_animal = _inserir_animal(setup_completo, "Rex")
+        animal = animal_repo.obter_por_id(id_animal)
+        animal.nome = "Max"
+        animal_repo.atualizar(animal)
+
+        assert animal_repo.buscar_por_termo("rex") == []
+        assert [a.id for a in animal_repo.buscar_por_termo("max")] == [id_animal]
+
+        animal_repo.excluir(id_animal)
+        assert animal_repo.buscar_por_termo("max") == []
+
+    def test_indice_acompanha_tabelas_relacionadas(self, setup_completo):
+        """Renomear raça ou espécie deve reindexar os animais relacionados."""
+        id_animal = _inserir_animal(setup_completo, "Rex")
+        with get_connection() as conn:
+            conn.execute("UPDATE raca SET nome = 'Poodle' WHERE id = ?", (setup_completo["id_raca"],))
+            conn.execute("UPDATE especie SET nome = 'Cão' WHERE id = ?", (setup_completo["id_especie"],))
+
+        assert animal_repo.buscar_por_termo("labrador") == []
+        assert [a.id for a in animal_repo.buscar_por_termo("poodle cao")] == [id_animal]
+
+    def test_reconstruir_indice(self, setup_completo):
+        """Deve reindexar animais que estavam fora do índice."""
+        id_animal = _inserir_animal(setup_completo, "Rex")
+        with get_connection() as conn:
+            conn.execute("DELETE FROM animal_fts")
+
+        assert animal_repo.buscar_por_termo("rex") == []
+        assert animal_repo.reconstruir_indice_busca() == 1
+        assert [a.id for a in animal_repo.buscar_por_termo("rex")] == [id_animal]
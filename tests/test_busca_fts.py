@@ -0,0 +1,64 @@
+"""
+Testes para os utilitários de busca textual (util/busca_fts.py).
+"""
+from util.busca_fts import (
+    BUSCA_POR_PAGINA_MAXIMO,
+    MAX_TERMOS_BUSCA,
+    montar_consulta_fts,
+    normalizar_termo,
+    normalizar_paginacao,
+    trecho_para_html,
+)
+
+
+class TestMontarConsultaFts:
+    """Testes para o parser da consulta."""
+
+    def test_cada_palavra_vira_prefixo(self):
+        assert montar_consulta_fts("João lab") == '"João"* "lab"*'
+
+    def test_descarta_sintaxe_fts(self):
+        assert montar_consulta_fts('"rex" OR (gato*) -x') == '"rex"* "OR"* "gato"* "x"*'
+
+    def test_sem_palavras_retorna_none(self):
+        assert montar_consulta_fts("") is None
+        assert montar_consulta_fts(None) is None
+        assert montar_consulta_fts(" - ** ") is None
+
+    def test_limita_quantidade_de_termos(self):
+        consulta = montar_consulta_fts(" ".join(f"t{i}" for i in range(20)))
+        assert consulta.count("*") == MAX_TERMOS_BUSCA
+
+
+class TestPaginacao:
+    """Testes para a normalização da paginação."""
+
+    def test_calcula_offset(self):
+        assert normalizar_paginacao(3, 10) == (3, 10, 20)
+
+    def test_ajusta_limites(self):
+        assert normalizar_paginacao(0, 0) == (1, 1, 0)
+        assert normalizar_paginacao(1, 10_000) == (1, BUSCA_POR_PAGINA_MAXIMO, 0)
+
+
+class TestTrechoParaHtml:
+    """Testes para o destaque dos trechos."""
+
+    def test_destaca_termos_e_escapa_html(self):
+        html = trecho_para_html("<b>Rex</b> \x02dócil\x03")
+        assert str(html) == "&lt;b&gt;Rex&lt;/b&gt; <mark>dócil</mark>"
+
+    def test_trecho_vazio(self):
+        assert str(trecho_para_html(None)) == ""
+
+
+class TestNormalizarTermo:
+    """Testes para a normalização usada como chave de cache."""
+
+    def test_remove_acentos_maiusculas_e_pontuacao(self):
+        assert normalizar_termo("  João   S. ") == "joao s"
+        assert normalizar_termo("ÇÃO") == normalizar_termo("cao")
+
+    def test_vazio(self):
+        assert normalizar_termo(None) == ""
+        assert normalizar_termo("--") == ""
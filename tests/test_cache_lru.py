@@ -0,0 +1,76 @@
+"""
+Testes para o cache LRU com expiração (util/cache_lru.py).
+"""
+import time
+
+from util.cache_lru import CacheLRU
+
+
+class TestCacheLRU:
+    """Testes de armazenamento, descarte e expiração."""
+
+    def test_obter_e_definir(self):
+        cache = CacheLRU(max_itens=2)
+        cache.definir("a", 1)
+
+        assert cache.obter("a") == 1
+        assert cache.obter("b") is None
+        assert cache.obter("b", "padrao") == "padrao"
+
+    def test_descarta_menos_usado(self):
+        cache = CacheLRU(max_itens=2)
+        cache.definir("a", 1)
+        cache.definir("b", 2)
+        cache.obter("a")
+        cache.definir("c", 3)
+
+        assert cache.obter("b") is None
+        assert cache.obter("a") == 1
+        assert cache.obter("c") == 3
+        assert len(cache) == 2
+
+    def test_expira_apos_ttl(self):
+        cache = CacheLRU(max_itens=2, ttl_segundos=0.01)
+        cache.definir("a", 1)
+        time.sleep(0.02)
+
+        assert cache.obter("a") is None
+        assert len(cache) == 0
+
+    def test_estatisticas_e_limpar(self):
+        cache = CacheLRU(max_itens=2)
+        cache.definir("a", 1)
+        cache.obter("a")
+        cache.obter("x")
+        cache.limpar()
+
+        assert cache.obter_estatisticas() == {
+            "itens": 0, "max_itens": 2, "acertos": 1, "falhas": 1, "descartados": 0, "expirados": 0,
+        }
+
+    def test_remover_expirados_e_contadores(self):
+        cache = CacheLRU(max_itens=2, ttl_segundos=0.01)
+        cache.definir("a", 1)
+        cache.definir("b", 2)
+        cache.definir("c", 3)
+        time.sleep(0.02)
+
+        assert "c" not in cache
+        assert cache.remover_expirados() == 2
+        assert len(cache) == 0
+        estatisticas = cache.obter_estatisticas()
+        assert estatisticas["descartados"] == 1
+        assert estatisticas["expirados"] == 2
+
+    def test_remover(self):
+        cache = CacheLRU(max_itens=2)
+        cache.definir("a", 1)
+
+        assert cache.remover("a")
+        assert not cache.remover("a")
+        assert "a" not in cache
+
+    def test_max_itens_zero_desativa(self):
+        cache = CacheLRU(max_itens=0)
+        cache.definir("a", 1)
+        assert cache.obter("a") is None
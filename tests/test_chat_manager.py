@@ -0,0 +1,278 @@
+"""
+Testes do gerenciador de conexões SSE do chat (util/chat_manager).
+
+Verifica a entrega local e o broadcast entre processos pelo log de eventos.
+"""
+import asyncio
+import pytest
+
+from repo import chat_evento_repo
+from util.chat_broadcast import BroadcastLocal, BroadcastSQLite, criar_backend
+from util.chat_manager import ChatManager, EventoSSE, FilaEventos, COALESCIDO, DESCARTADO, MOTIVO_SUBSTITUIDA
+from util.db_util import get_connection
+
+
+class TestBroadcastLocal:
+    """Testes do backend de broadcast no próprio processo"""
+
+    async def test_entrega_aos_participantes_conectados(self):
+        manager = ChatManager(backend=BroadcastLocal())
+        conexao = await manager.connect(1)
+
+        await manager.broadcast_para_sala("1_2", {"tipo": "nova_mensagem"})
+
+        assert conexao.fila.obter_nowait().dados == {"tipo": "nova_mensagem"}
+
+    async def test_sala_invalida_e_ignorada(self):
+        manager = ChatManager(backend=BroadcastLocal())
+        conexao = await manager.connect(1)
+
+        await manager.broadcast_para_sala("invalida", {"tipo": "nova_mensagem"})
+
+        assert len(conexao.fila) == 0
+
+    def test_backend_desconhecido(self):
+        with pytest.raises(ValueError):
+            criar_backend("redis")
+
+
+class TestMultiplasConexoes:
+    """Testes de várias conexões SSE (abas) por usuário"""
+
+    async def test_entrega_para_todas_as_conexoes_do_usuario(self):
+        manager = ChatManager(backend=BroadcastLocal())
+        aba1 = await manager.connect(1)
+        aba2 = await manager.connect(1)
+
+        await manager.broadcast_para_sala("1_2", {"tipo": "nova_mensagem"})
+
+        assert aba1.id != aba2.id
+        assert aba1.fila.obter_nowait().dados == {"tipo": "nova_mensagem"}
+        assert aba2.fila.obter_nowait().dados == {"tipo": "nova_mensagem"}
+
+    async def test_desconectar_uma_aba_mantem_as_demais(self):
+        manager = ChatManager(backend=BroadcastLocal())
+        aba1 = await manager.connect(1)
+        aba2 = await manager.connect(1)
+
+        await manager.disconnect(1, aba1.id)
+        await manager.broadcast_para_sala("1_2", {"tipo": "nova_mensagem"})
+
+        assert manager.is_connected(1)
+        assert aba2.fila.obter_nowait().dados == {"tipo": "nova_mensagem"}
+        assert manager.obter_estatisticas()["total_conexoes"] == 1
+
+        await manager.disconnect(1, aba2.id)
+        assert not manager.is_connected(1)
+
+    async def test_limite_encerra_conexao_mais_antiga(self):
+        manager = ChatManager(backend=BroadcastLocal(), max_conexoes_por_usuario=2)
+        aba1 = await manager.connect(1)
+        await manager.connect(1)
+        await manager.connect(1)
+
+        assert aba1.fila.encerrada
+        assert aba1.fila.motivo_encerramento == MOTIVO_SUBSTITUIDA
+        estatisticas = manager.obter_estatisticas()
+        assert estatisticas["total_conexoes"] == 2
+        assert estatisticas["total_conexoes_substituidas"] == 1
+
+        # O finally do stream substituído não afeta as conexões restantes
+        await manager.disconnect(1, aba1.id)
+        assert manager.obter_estatisticas()["total_conexoes"] == 2
+
+
+class TestFilaEventos:
+    """Testes da fila limitada de eventos por conexão"""
+
+    def test_descartar_antigos_mantem_os_mais_recentes(self):
+        fila = FilaEventos(max_eventos=2, politica="descartar_antigos")
+        fila.colocar(EventoSSE(1, {}))
+        fila.colocar(EventoSSE(2, {}))
+
+        assert fila.colocar(EventoSSE(3, {})) == DESCARTADO
+        assert [fila.obter_nowait().seq for _ in range(2)] == [2, 3]
+
+    def test_descartar_novos_mantem_os_mais_antigos(self):
+        fila = FilaEventos(max_eventos=2, politica="descartar_novos")
+        fila.colocar(EventoSSE(1, {}))
+        fila.colocar(EventoSSE(2, {}))
+
+        assert fila.colocar(EventoSSE(3, {})) == DESCARTADO
+        assert [fila.obter_nowait().seq for _ in range(2)] == [1, 2]
+
+    def test_coalescer_ignora_evento_idempotente_pendente(self):
+        fila = FilaEventos(max_eventos=10, politica="coalescer")
+        fila.colocar(EventoSSE(1, {"tipo": "atualizar_contador", "sala_id": "1_2"}))
+
+        assert fila.colocar(EventoSSE(1, {"tipo": "atualizar_contador", "sala_id": "1_2"})) == COALESCIDO
+        assert len(fila) == 1
+
+    async def test_obter_lote_retira_todos_os_pendentes(self):
+        fila = FilaEventos(max_eventos=10)
+        for i in range(3):
+            fila.colocar(EventoSSE(i, {}))
+
+        lote = await fila.obter_lote()
+
+        assert [e.seq for e in lote] == [0, 1, 2]
+        assert len(fila) == 0
+
+    async def test_encerrar_libera_consumidor(self):
+        fila = FilaEventos()
+        consumidor = asyncio.create_task(fila.obter_lote())
+        await asyncio.sleep(0)
+
+        fila.encerrar()
+
+        assert await asyncio.wait_for(consumidor, timeout=1) is None
+
+    async def test_timeout_retorna_lote_vazio(self):
+        fila = FilaEventos()
+
+        assert await fila.obter_lote(timeout=0.01) == []
+
+    def test_politica_invalida(self):
+        with pytest.raises(ValueError):
+            FilaEventos(politica="bloquear")
+
+
+class TestConsumidorLento:
+    """Testes de backpressure e eviction no ChatManager"""
+
+    async def test_evicta_conexao_com_fila_cheia_alem_do_prazo(self):
+        manager = ChatManager(backend=BroadcastLocal(), max_eventos_por_fila=2, prazo_eviccao_segundos=0)
+        lenta = await manager.connect(1)
+
+        for i in range(3):
+            await manager.broadcast_para_sala("1_2", {"tipo": "nova_mensagem", "id": i})
+
+        assert lenta.fila.encerrada
+        assert not manager.is_connected(1)
+        estatisticas = manager.obter_estatisticas()
+        assert estatisticas["total_eventos_descartados"] == 1
+        assert estatisticas["total_conexoes_evictadas"] == 1
+
+    async def test_consumidor_que_drena_nao_e_evictado(self):
+        manager = ChatManager(backend=BroadcastLocal(), max_eventos_por_fila=2, prazo_eviccao_segundos=60)
+        conexao = await manager.connect(1)
+
+        for i in range(3):
+            await manager.broadcast_para_sala("1_2", {"tipo": "nova_mensagem", "id": i})
+        await conexao.fila.obter_lote()
+
+        assert conexao.fila.cheia_desde is None
+        assert manager.is_connected(1)
+
+
+class TestReenvioLastEventId:
+    """Testes do histórico em memória para reenvio na reconexão"""
+
+    async def _enviar(self, manager, mensagem_id):
+        await manager.broadcast_para_sala(
+            "1_2", {"tipo": "nova_mensagem", "mensagem": {"id": mensagem_id}}
+        )
+
+    async def test_reenvia_eventos_perdidos_durante_desconexao(self):
+        manager = ChatManager(backend=BroadcastLocal())
+        conexao = await manager.connect(1)
+        await self._enviar(manager, 10)
+        ultimo_id = manager.id_evento(conexao.fila.obter_nowait())
+        await manager.disconnect(1, conexao.id)
+
+        await self._enviar(manager, 11)
+        await self._enviar(manager, 12)
+        nova = await manager.connect(1, ultimo_evento_id=ultimo_id)
+
+        reenviados = [nova.fila.obter_nowait() for _ in range(2)]
+        assert [e.dados["mensagem"]["id"] for e in reenviados] == [11, 12]
+        assert nova.replay_banco_desde is None
+        assert manager.obter_estatisticas()["total_eventos_reenviados"] == 2
+
+    async def test_epoca_diferente_recorre_ao_banco(self):
+        manager = ChatManager(backend=BroadcastLocal())
+
+        conexao = await manager.connect(1, ultimo_evento_id="outraepoca-5-42")
+
+        assert conexao.replay_banco_desde == 42
+        assert len(conexao.fila) == 0
+
+    async def test_lacuna_no_historico_recorre_ao_banco(self):
+        manager = ChatManager(backend=BroadcastLocal(), replay_eventos=2)
+        conexao = await manager.connect(1)
+        await self._enviar(manager, 10)
+        ultimo_id = manager.id_evento(conexao.fila.obter_nowait())
+        await manager.disconnect(1, conexao.id)
+        for mensagem_id in (11, 12, 13):
+            await self._enviar(manager, mensagem_id)
+
+        nova = await manager.connect(1, ultimo_evento_id=ultimo_id)
+
+        assert nova.replay_banco_desde == 10
+
+    async def test_historico_expira_apos_desconexao(self):
+        manager = ChatManager(backend=BroadcastLocal(), replay_segundos=0)
+        conexao = await manager.connect(1)
+        await manager.disconnect(1, conexao.id)
+
+        await manager.connect(2)
+
+        assert manager.obter_estatisticas()["historicos_em_memoria"] == 1
+
+    async def test_id_invalido_e_ignorado(self):
+        manager = ChatManager(backend=BroadcastLocal())
+
+        conexao = await manager.connect(1, ultimo_evento_id="lixo")
+
+        assert conexao.replay_banco_desde is None
+
+
+class TestBroadcastSQLite:
+    """Testes do broadcast entre processos via tabela chat_evento"""
+
+    @pytest.fixture(autouse=True)
+    def limpar_eventos(self):
+        chat_evento_repo.criar_tabela()
+        yield
+        with get_connection() as conn:
+            conn.execute("DELETE FROM chat_evento")
+
+    async def test_entrega_para_conexao_em_outro_worker(self):
+        # Dois managers com backends próprios simulam dois workers
+        worker_a = ChatManager(backend=BroadcastSQLite(intervalo_poll=0.01))
+        worker_b = ChatManager(backend=BroadcastSQLite(intervalo_poll=0.01))
+        try:
+            conexao = await worker_b.connect(2)
+            await worker_a.broadcast_para_sala("1_2", {"tipo": "nova_mensagem", "id": 7})
+
+            lote = await asyncio.wait_for(conexao.fila.obter_lote(), timeout=2)
+            assert lote[0].dados == {"tipo": "nova_mensagem", "id": 7}
+        finally:
+            await worker_a.encerrar()
+            await worker_b.encerrar()
+
+    async def test_nao_reentrega_eventos_anteriores_ao_inicio(self):
+        chat_evento_repo.inserir([3], {"tipo": "antigo"})
+        backend = BroadcastSQLite(intervalo_poll=60)
+        recebidos = []
+
+        async def entregar(usuario_id, evento):
+            recebidos.append((usuario_id, evento))
+
+        await backend.iniciar(entregar)
+        try:
+            chat_evento_repo.inserir([3], {"tipo": "novo"})
+            await backend.processar_pendentes()
+            assert recebidos == [(3, {"tipo": "novo"})]
+        finally:
+            await backend.encerrar()
+
+    def test_inserir_retorna_id_do_ultimo_evento(self):
+        ultimo_id = chat_evento_repo.inserir([1, 2, 3], {"tipo": "lote"})
+
+        eventos = chat_evento_repo.listar_posteriores(0)
+        assert len(eventos) == 3
+        assert ultimo_id == eventos[-1].id
+
+    def test_inserir_sem_destinatarios_retorna_zero(self):
+        assert chat_evento_repo.inserir([], {"tipo": "vazio"}) == 0
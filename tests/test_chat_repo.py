@@ -0,0 +1,297 @@
+"""
+Testes para os repositórios do chat.
+
+Testa chat_sala_repo, chat_participante_repo e chat_mensagem_repo,
+incluindo a listagem de conversas em consulta única.
+"""
+
+import pytest
+from model.usuario_model import Usuario
+from repo import usuario_repo, chat_sala_repo, chat_participante_repo, chat_mensagem_repo
+from util.db_util import get_connection
+from util.perfis import Perfil
+
+
+@pytest.fixture(autouse=True)
+def limpar_chat():
+    """Cria as tabelas do chat e limpa os dados antes de cada teste."""
+    usuario_repo.criar_tabela()
+    chat_sala_repo.criar_tabela()
+    chat_participante_repo.criar_tabela()
+    chat_mensagem_repo.criar_tabela()
+    yield
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM chat_mensagem")
+        cursor.execute("DELETE FROM chat_participante")
+        cursor.execute("DELETE FROM chat_sala")
+
+
+@pytest.fixture
+def usuarios():
+    """Cria três usuários e retorna seus IDs."""
+    ids = []
+    for i in range(3):
+        ids.append(usuario_repo.inserir(Usuario(
+            id=0, nome=f"Usuario {i}", email=f"chat{i}@test.com",
+            senha="hash", perfil="ADOTANTE"
+        )))
+    return ids
+
+
+def _criar_sala(usuario1_id: int, usuario2_id: int) -> str:
+    """Cria sala com os dois participantes e retorna o ID."""
+    sala = chat_sala_repo.criar_ou_obter_sala(usuario1_id, usuario2_id)
+    chat_participante_repo.adicionar_participante(sala.id, usuario1_id)
+    chat_participante_repo.adicionar_participante(sala.id, usuario2_id)
+    return sala.id
+
+
+class TestListarConversasPorUsuario:
+    """Testes para a listagem de conversas em consulta única."""
+
+    def test_retorna_outro_usuario_ultima_mensagem_e_nao_lidas(self, usuarios):
+        """Deve trazer o outro participante, a última mensagem e as não lidas."""
+        eu, outro, _ = usuarios
+        sala_id = _criar_sala(eu, outro)
+        chat_mensagem_repo.inserir(sala_id, outro, "Primeira")
+        chat_mensagem_repo.inserir(sala_id, outro, "Segunda")
+        chat_mensagem_repo.inserir(sala_id, eu, "Resposta")
+
+        conversas = chat_sala_repo.listar_conversas_por_usuario(eu)
+
+        assert len(conversas) == 1
+        conversa = conversas[0]
+        assert conversa.sala_id == sala_id
+        assert conversa.outro_usuario_id == outro
+        assert conversa.outro_usuario_nome == "Usuario 1"
+        assert conversa.ultima_mensagem == "Resposta"
+        assert conversa.ultima_mensagem_usuario_id == eu
+        assert conversa.ultima_mensagem_data_envio is not None
+        assert conversa.nao_lidas == 2
+
+    def test_sala_sem_mensagens(self, usuarios):
+        """Conversa sem mensagens deve ter última mensagem None."""
+        eu, outro, _ = usuarios
+        _criar_sala(eu, outro)
+
+        conversa = chat_sala_repo.listar_conversas_por_usuario(eu)[0]
+
+        assert conversa.ultima_mensagem is None
+        assert conversa.nao_lidas == 0
+
+    def test_ordena_por_ultima_atividade_e_pagina(self, usuarios):
+        """Deve ordenar pela atividade mais recente e aplicar LIMIT/OFFSET."""
+        eu, outro1, outro2 = usuarios
+        sala1 = _criar_sala(eu, outro1)
+        sala2 = _criar_sala(eu, outro2)
+        chat_sala_repo.atualizar_ultima_atividade(sala1)
+
+        conversas = chat_sala_repo.listar_conversas_por_usuario(eu)
+        assert [c.sala_id for c in conversas] == [sala1, sala2]
+
+        pagina = chat_sala_repo.listar_conversas_por_usuario(eu, limit=1, offset=1)
+        assert [c.sala_id for c in pagina] == [sala2]
+
+
+class TestContadorNaoLidas:
+    """Testes do contador materializado de mensagens não lidas."""
+
+    def test_inserir_incrementa_apenas_destinatario(self, usuarios):
+        """Inserir mensagem deve incrementar o contador dos demais participantes."""
+        eu, outro, _ = usuarios
+        sala_id = _criar_sala(eu, outro)
+        chat_mensagem_repo.inserir(sala_id, outro, "Oi")
+        chat_mensagem_repo.inserir(sala_id, outro, "Tudo bem?")
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala_id, eu) == 2
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala_id, outro) == 0
+
+    def test_leitura_zera_contador(self, usuarios):
+        """Marcar como lidas deve zerar o contador do leitor."""
+        eu, outro, _ = usuarios
+        sala_id = _criar_sala(eu, outro)
+        chat_mensagem_repo.inserir(sala_id, outro, "Oi")
+
+        chat_mensagem_repo.marcar_como_lidas(sala_id, eu)
+        chat_participante_repo.atualizar_ultima_leitura(sala_id, eu)
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala_id, eu) == 0
+
+    def test_total_soma_todas_as_salas(self, usuarios):
+        """O total deve somar os contadores de todas as salas do usuário."""
+        eu, outro1, outro2 = usuarios
+        sala1 = _criar_sala(eu, outro1)
+        sala2 = _criar_sala(eu, outro2)
+        chat_mensagem_repo.inserir(sala1, outro1, "Oi")
+        chat_mensagem_repo.inserir(sala2, outro2, "Olá")
+        chat_mensagem_repo.inserir(sala2, outro2, "Tudo bem?")
+
+        assert chat_participante_repo.contar_total_nao_lidas(eu) == 3
+
+    def test_excluir_mensagem_nao_lida_decrementa(self, usuarios):
+        """Excluir uma mensagem ainda não lida deve decrementar o contador."""
+        eu, outro, _ = usuarios
+        sala_id = _criar_sala(eu, outro)
+        mensagem = chat_mensagem_repo.inserir(sala_id, outro, "Oi")
+
+        assert chat_mensagem_repo.excluir(mensagem.id)
+
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala_id, eu) == 0
+        assert not chat_mensagem_repo.excluir(mensagem.id)
+
+    def test_recalcular_corrige_divergencias(self, usuarios):
+        """O reparo deve reconstruir contadores a partir das mensagens."""
+        eu, outro, _ = usuarios
+        sala_id = _criar_sala(eu, outro)
+        chat_mensagem_repo.inserir(sala_id, outro, "Oi")
+        with get_connection() as conn:
+            conn.execute("UPDATE chat_participante SET nao_lidas = 42")
+
+        corrigidos = chat_participante_repo.recalcular_nao_lidas()
+
+        assert corrigidos == 2
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala_id, eu) == 1
+        assert chat_participante_repo.contar_mensagens_nao_lidas(sala_id, outro) == 0
+
+
+class TestListarMensagensPorCursor:
+    """Testes da paginação por cursor (keyset) das mensagens."""
+
+    @pytest.fixture
+    def sala_com_mensagens(self, usuarios):
+        """Cria uma sala com cinco mensagens e retorna (sala_id, ids)."""
+        eu, outro, _ = usuarios
+        sala_id = _criar_sala(eu, outro)
+        ids = [chat_mensagem_repo.inserir(sala_id, outro, f"Mensagem {i}").id for i in range(5)]
+        return sala_id, ids
+
+    def test_sem_cursor_retorna_mais_recentes_em_ordem_cronologica(self, sala_com_mensagens):
+        """Sem cursor deve trazer as N mais recentes, das mais antigas para as mais novas."""
+        sala_id, ids = sala_com_mensagens
+
+        mensagens = chat_mensagem_repo.listar_por_sala(sala_id, limit=2)
+
+        assert [m.id for m in mensagens] == ids[3:]
+        assert mensagens[0].data_envio is not None
+
+    def test_before_id_pagina_para_tras(self, sala_com_mensagens):
+        """before_id deve trazer as mensagens imediatamente anteriores ao cursor."""
+        sala_id, ids = sala_com_mensagens
+
+        pagina = chat_mensagem_repo.listar_por_sala(sala_id, limit=2, before_id=ids[3])
+        assert [m.id for m in pagina] == ids[1:3]
+
+        ultima = chat_mensagem_repo.listar_por_sala(sala_id, limit=2, before_id=ids[1])
+        assert [m.id for m in ultima] == ids[:1]
+
+    def test_after_id_busca_mensagens_novas(self, sala_com_mensagens):
+        """after_id deve trazer as mensagens imediatamente posteriores ao cursor."""
+        sala_id, ids = sala_com_mensagens
+
+        mensagens = chat_mensagem_repo.listar_por_sala(sala_id, limit=2, after_id=ids[1])
+
+        assert [m.id for m in mensagens] == ids[2:4]
+
+    def test_cursores_simultaneos_rejeitados(self, sala_com_mensagens):
+        """Informar before_id e after_id juntos deve lançar ValueError."""
+        sala_id, ids = sala_com_mensagens
+
+        with pytest.raises(ValueError):
+            chat_mensagem_repo.listar_por_sala(sala_id, before_id=ids[3], after_id=ids[1])
+
+    def test_consulta_usa_indice_composto(self):
+        """A listagem com cursor deve usar o índice (sala_id, id)."""
+        with get_connection() as conn:
+            plano = conn.execute(
+                "EXPLAIN QUERY PLAN "
+                "SELECT id FROM chat_mensagem WHERE sala_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                ("1_2", 10, 5)
+            ).fetchall()
+
+        detalhes = " ".join(row["detail"] for row in plano)
+        assert "idx_chat_mensagem_sala_id" in detalhes
+        assert "TEMP B-TREE" not in detalhes
+
+
+class TestListarPorUsuarioApos:
+    """Testes da listagem usada no reenvio após reconexão do SSE."""
+
+    def test_retorna_mensagens_das_salas_do_usuario_apos_cursor(self, usuarios):
+        """Deve trazer apenas mensagens posteriores ao cursor em salas do usuário."""
+        eu, outro1, outro2 = usuarios
+        sala1 = _criar_sala(eu, outro1)
+        sala_alheia = _criar_sala(outro1, outro2)
+        antiga = chat_mensagem_repo.inserir(sala1, outro1, "Antiga")
+        nova = chat_mensagem_repo.inserir(sala1, outro1, "Nova")
+        chat_mensagem_repo.inserir(sala_alheia, outro2, "Outra sala")
+
+        mensagens = chat_mensagem_repo.listar_por_usuario_apos(eu, antiga.id)
+
+        assert [m.id for m in mensagens] == [nova.id]
+        assert chat_mensagem_repo.obter_ultimo_id() > nova.id
+
+
+class TestBuscarUsuariosPorPrefixo:
+    """Testes para a busca de usuários do autocomplete do chat."""
+
+    @pytest.fixture
+    def candidatos(self):
+        """Cria usuários com nomes acentuados, incluindo um administrador."""
+        ids = {}
+        for chave, nome, email, perfil in [
+            ("quem_busca", "Zuleica Busca", "zuleica@test.com", Perfil.ADOTANTE.value),
+            ("zelia", "Zélia Antunes", "zelia@test.com", Perfil.ADOTANTE.value),
+            ("zeca", "José Zeca", "zeca.abrigo@test.com", Perfil.ABRIGO.value),
+            ("admin", "Zenon Admin", "zenon@test.com", Perfil.ADMIN.value),
+        ]:
+            ids[chave] = usuario_repo.inserir(Usuario(
+                id=0, nome=nome, email=email, senha="hash", perfil=perfil
+            ))
+        return ids
+
+    def test_busca_por_prefixo_sem_acento(self, candidatos):
+        """Deve encontrar pelo início do nome, ignorando acentos e maiúsculas."""
+        resultado = usuario_repo.buscar_por_prefixo("ZEL", candidatos["quem_busca"])
+
+        assert [u["id"] for u in resultado] == [candidatos["zelia"]]
+        assert resultado[0] == {"id": candidatos["zelia"], "nome": "Zélia Antunes", "email": "zelia@test.com"}
+
+    def test_exclui_admin_e_quem_busca(self, candidatos):
+        """Administradores e o próprio usuário não devem aparecer."""
+        ids = {u["id"] for u in usuario_repo.buscar_por_prefixo("ze", candidatos["quem_busca"])}
+        assert ids == {candidatos["zelia"], candidatos["zeca"]}
+
+        ids = {u["id"] for u in usuario_repo.buscar_por_prefixo("zu", candidatos["zelia"])}
+        assert ids == {candidatos["quem_busca"]}
+
+    def test_busca_por_sobrenome(self, candidatos):
+        """Deve encontrar pelo início de palavras posteriores do nome."""
+        resultado = usuario_repo.buscar_por_prefixo("antu", candidatos["quem_busca"])
+        assert [u["id"] for u in resultado] == [candidatos["zelia"]]
+
+    def test_busca_por_email(self, candidatos):
+        """Deve encontrar pelo início do e-mail."""
+        resultado = usuario_repo.buscar_por_prefixo("zeca.abr", candidatos["quem_busca"])
+        assert [u["id"] for u in resultado] == [candidatos["zeca"]]
+
+    def test_cache_por_termo_normalizado(self, candidatos):
+        """Termos equivalentes devem usar a mesma entrada do cache."""
+        usuario_repo.cache_busca.limpar()
+        usuario_repo.buscar_por_prefixo("Zélia", candidatos["quem_busca"])
+        acertos = usuario_repo.cache_busca.obter_estatisticas()["acertos"]
+
+        resultado = usuario_repo.buscar_por_prefixo("  zelia ", candidatos["quem_busca"])
+
+        assert [u["id"] for u in resultado] == [candidatos["zelia"]]
+        assert usuario_repo.cache_busca.obter_estatisticas()["acertos"] == acertos + 1
+
+    def test_alteracao_invalida_cache(self, candidatos):
+        """Alterar um usuário pelo repositório deve refletir na próxima busca."""
+        assert usuario_repo.buscar_por_prefixo("zelia", candidatos["quem_busca"])
+
+        usuario = usuario_repo.obter_por_id(candidatos["zelia"])
+        usuario.perfil = Perfil.ADMIN.value
+        usuario_repo.alterar(usuario)
+
+        assert usuario_repo.buscar_por_prefixo("zelia", candidatos["quem_busca"]) == []
@@ -0,0 +1,279 @@
+"""
+Testes para o cache de configurações (util/config_cache.py).
+"""
+import sqlite3
+import time
+
+import pytest
+
+from repo import configuracao_repo
+from util import config_cache
+from util.config_cache import config
+from util.db_util import get_connection
+from util.migracoes import aplicar_migracoes
+
+
+@pytest.fixture
+def banco():
+    """Banco migrado e cache vazio."""
+    aplicar_migracoes()
+    config.limpar()
+    yield
+    config.limpar()
+
+
+def _alterar_em_outro_worker(chave: str, valor: str) -> None:
+    """Altera a configuração pelo repositório, sem limpar o cache deste processo."""
+    configuracao_repo.inserir_ou_atualizar(chave, valor)
+
+
+@pytest.fixture
+def alteracoes():
+    """Registra um observador que guarda as chaves alteradas."""
+    recebidas = []
+    observador = recebidas.append
+    config.inscrever(observador)
+    yield recebidas
+    config.cancelar_inscricao(observador)
+
+
+class TestObservadores:
+    """Testes para o aviso de alterações aos observadores."""
+
+    def test_limpar_avisa_todas_as_chaves(self, alteracoes):
+        config.limpar()
+        assert alteracoes == [None]
+
+    def test_limpar_chave_avisa_a_chave(self, alteracoes):
+        config.limpar_chave("app_name")
+        assert alteracoes == ["app_name"]
+
+    def test_inscricao_duplicada_avisa_uma_vez(self, alteracoes):
+        config.inscrever(alteracoes.append)
+        config.limpar()
+        assert alteracoes == [None]
+
+    def test_falha_de_observador_nao_interrompe_os_demais(self, alteracoes):
+        def falhar(chave):
+            raise RuntimeError("falha no observador")
+
+        config.inscrever(falhar)
+        try:
+            config.limpar()
+        finally:
+            config.cancelar_inscricao(falhar)
+        assert alteracoes == [None]
+
+    def test_cancelar_inscricao(self, alteracoes):
+        config.cancelar_inscricao(alteracoes.append)
+        config.limpar()
+        assert alteracoes == []
+
+
+class TestVersaoConfiguracoes:
+    """Testes para a versão das configurações mantida pelo repositório."""
+
+    def test_alteracoes_incrementam_a_versao(self, banco):
+        versao = configuracao_repo.obter_versao()
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        configuracao_repo.atualizar("app_name", "PetLar Teste")
+        configuracao_repo.atualizar_multiplas({"app_name": "PetLar"})
+        assert configuracao_repo.obter_versao() == versao + 3
+
+    def test_atualizacao_sem_efeito_mantem_a_versao(self, banco):
+        versao = configuracao_repo.obter_versao()
+        assert not configuracao_repo.atualizar("inexistente", "1")
+        assert configuracao_repo.atualizar_multiplas({"inexistente": "1"}) == (0, ["inexistente"])
+        assert configuracao_repo.obter_versao() == versao
+
+    def test_linha_de_versao_nao_pode_ser_alterada(self, banco):
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        versao = configuracao_repo.obter_versao()
+        chave = configuracao_repo.CHAVE_VERSAO
+
+        assert not configuracao_repo.atualizar(chave, "0")
+        assert not configuracao_repo.inserir_ou_atualizar(chave, "0")
+        assert configuracao_repo.atualizar_multiplas({chave: "0", "app_name": "Novo"}) == (1, [chave])
+        with get_connection() as conn:
+            id_versao = conn.execute(
+                "SELECT id FROM configuracao WHERE chave = ?", (chave,)
+            ).fetchone()[0]
+        assert not configuracao_repo.excluir(id_versao)
+
+        # Apenas a atualização de app_name incrementou a versão
+        assert configuracao_repo.obter_versao() == versao + 1
+
+    def test_linha_de_versao_fica_fora_das_listagens(self, banco):
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        chaves = [c.chave for c in configuracao_repo.obter_todos()]
+        assert chaves == ["app_name"]
+        assert configuracao_repo.contar() == 1
+        assert configuracao_repo.buscar_por_termo("versao") == []
+
+
+class TestInvalidacaoEntreProcessos:
+    """Testes para a recarga quando outro worker altera as configurações."""
+
+    def test_recarrega_alteracao_de_outro_worker(self, banco, alteracoes):
+        configuracao_repo.inserir_ou_atualizar("rate_limit_login_max", "5")
+        assert config.obter_int("rate_limit_login_max", 1) == 5
+        alteracoes.clear()
+
+        _alterar_em_outro_worker("rate_limit_login_max", "8")
+        assert config.obter_int("rate_limit_login_max", 1) == 5
+
+        # Verificação periódica (verificador_configuracoes)
+        config.verificar_alteracoes()
+        assert config.obter_int("rate_limit_login_max", 1) == 8
+        assert alteracoes == [None]
+
+    def test_leituras_nao_consultam_a_versao(self, banco, monkeypatch):
+        config.obter("app_name")
+        monkeypatch.setattr(
+            configuracao_repo, "obter_versao", lambda: pytest.fail("consultou a versão")
+        )
+
+        for _ in range(10):
+            config.obter("app_name")
+            config.obter_int("rate_limit_login_max", 5)
+        config.obter_multiplos(["app_name", "theme"], ["", ""])
+
+    def test_verificador_executa_periodicamente(self, monkeypatch):
+        import asyncio
+
+        chamadas = []
+        monkeypatch.setattr(
+            config_cache.ConfigCache, "verificar_alteracoes", staticmethod(lambda: chamadas.append(1))
+        )
+
+        async def executar():
+            verificador = config_cache.VerificadorConfiguracoes(intervalo_segundos=0.01)
+            verificador.iniciar()
+            await asyncio.sleep(0.05)
+            await verificador.encerrar()
+
+        asyncio.run(executar())
+        assert len(chamadas) >= 2
+
+    def test_recarga_usa_uma_consulta_para_todas_as_chaves(self, banco, monkeypatch):
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        configuracao_repo.inserir_ou_atualizar("theme", "darkly")
+        consultas = []
+        monkeypatch.setattr(
+            configuracao_repo, "obter_por_chave", lambda chave: consultas.append(chave)
+        )
+
+        assert config.obter("app_name") == "PetLar"
+        assert config.obter("theme") == "darkly"
+        assert consultas == []
+
+    def test_ttl_recarrega_sem_mudanca_de_versao(self, banco, monkeypatch):
+        monkeypatch.setattr(config_cache, "CONFIG_CACHE_TTL_SEGUNDOS", 0.01)
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        assert config.obter("app_name") == "PetLar"
+
+        # Edição feita fora do repositório: a versão não muda
+        with get_connection() as conn:
+            conn.execute("UPDATE configuracao SET valor = 'Editado' WHERE chave = 'app_name'")
+        assert config.obter("app_name") == "PetLar"
+
+        time.sleep(0.02)
+        config.verificar_alteracoes()
+        assert config.obter("app_name") == "Editado"
+
+
+class TestValoresTipados:
+    """Testes para os valores convertidos guardados no cache."""
+
+    def test_conversao_feita_uma_vez(self, banco, monkeypatch):
+        configuracao_repo.inserir_ou_atualizar("rate_limit_login_max", "7")
+        assert config.obter_int("rate_limit_login_max", 5) == 7
+
+        monkeypatch.setattr(config, "obter", lambda *args: pytest.fail("não deveria reler"))
+        assert config.obter_int("rate_limit_login_max", 5) == 7
+
+    def test_valor_invalido_usa_padrao(self, banco):
+        configuracao_repo.inserir_ou_atualizar("rate_limit_login_max", "muitos")
+        assert config.obter_int("rate_limit_login_max", 5) == 5
+        assert config.obter_float("rate_limit_login_max", 1.5) == 1.5
+
+    def test_limpar_chave_descarta_valor_convertido(self, banco):
+        configuracao_repo.inserir_ou_atualizar("modo_manutencao", "sim")
+        assert config.obter_bool("modo_manutencao", False) is True
+
+        configuracao_repo.inserir_ou_atualizar("modo_manutencao", "nao")
+        config.limpar_chave("modo_manutencao")
+        assert config.obter_bool("modo_manutencao", False) is False
+
+
+class TestPrecarregamento:
+    """Testes para a carga da tabela inteira e as buscas em lote."""
+
+    @pytest.fixture
+    def sem_versao(self, monkeypatch):
+        """Impede a recarga por versão, como antes da tabela existir."""
+        def falhar():
+            raise sqlite3.OperationalError("no such table: configuracao")
+
+        monkeypatch.setattr(configuracao_repo, "obter_versao", falhar)
+
+    def test_precarregar_evita_consultas_por_chave(self, banco, alteracoes, monkeypatch):
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        configuracao_repo.inserir_ou_atualizar("theme", "darkly")
+        alteracoes.clear()
+
+        assert config.precarregar() == 2
+        assert alteracoes == [None]
+
+        monkeypatch.setattr(
+            configuracao_repo, "obter_por_chave", lambda chave: pytest.fail(f"consultou {chave}")
+        )
+        assert config.obter("theme") == "darkly"
+        assert config.obter("inexistente", "padrao") == "padrao"
+
+    def test_chave_ausente_respeita_o_padrao_de_cada_chamada(self, banco, sem_versao):
+        assert config.obter("inexistente", "a") == "a"
+        assert config.obter("inexistente", "b") == "b"
+        assert config.obter_int("inexistente", 3) == 3
+
+    def test_chave_ausente_consultada_uma_vez(self, banco, sem_versao, monkeypatch):
+        consultas = []
+        obter_por_chave = configuracao_repo.obter_por_chave
+        monkeypatch.setattr(
+            configuracao_repo, "obter_por_chave",
+            lambda chave: consultas.append(chave) or obter_por_chave(chave),
+        )
+
+        config.obter("inexistente")
+        config.obter("inexistente")
+        assert consultas == ["inexistente"]
+
+    def test_limpar_chave_volta_a_buscar_chave_ausente(self, banco, sem_versao):
+        assert config.obter("theme", "original") == "original"
+        configuracao_repo.inserir_ou_atualizar("theme", "darkly")
+        config.limpar_chave("theme")
+        assert config.obter("theme", "original") == "darkly"
+
+    def test_obter_multiplos_usa_uma_consulta(self, banco, sem_versao, monkeypatch):
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        configuracao_repo.inserir_ou_atualizar("theme", "darkly")
+        lotes = []
+        obter_multiplas = configuracao_repo.obter_multiplas
+        monkeypatch.setattr(
+            configuracao_repo, "obter_multiplas",
+            lambda chaves: lotes.append(chaves) or obter_multiplas(chaves),
+        )
+
+        chaves = ["app_name", "theme", "inexistente"]
+        esperado = {"app_name": "PetLar", "theme": "darkly", "inexistente": "x"}
+        assert config.obter_multiplos(chaves, ["a", "b", "x"]) == esperado
+        assert config.obter_multiplos(chaves, ["a", "b", "x"]) == esperado
+        assert lotes == [chaves]
+
+    def test_repositorio_obter_multiplas(self, banco):
+        configuracao_repo.inserir_ou_atualizar("app_name", "PetLar")
+        resultado = configuracao_repo.obter_multiplas(["app_name", "inexistente"])
+
+        assert resultado["app_name"].valor == "PetLar"
+        assert resultado["inexistente"] is None
+        assert configuracao_repo.obter_multiplas([]) == {}
@@ -0,0 +1,61 @@
+"""
+Testes da camada assíncrona de acesso ao banco (util/db_async).
+
+Verifica execução fora do event loop, propagação da unidade de trabalho,
+proxy de repositórios e limite da fila do executor.
+"""
+import asyncio
+import threading
+import pytest
+
+from repo import usuario_repo
+from util.db_async import ExecutorBanco, RepositorioAssincrono
+from util.db_util import unidade_de_trabalho, get_connection
+from util.exceptions import BancoSobrecarregadoError
+
+
+@pytest.fixture
+def executor():
+    """Executor isolado com fila pequena"""
+    e = ExecutorBanco(workers=1, max_pendentes=2)
+    yield e
+    e.encerrar()
+
+
+class TestExecutorBanco:
+    """Testes do ExecutorBanco"""
+
+    async def test_executa_fora_da_thread_do_loop(self, executor):
+        thread_loop = threading.get_ident()
+        thread_execucao = await executor.executar(threading.get_ident)
+        assert thread_execucao != thread_loop
+
+    async def test_propaga_unidade_de_trabalho(self, executor):
+        def _conexao_atual():
+            with get_connection() as conn:
+                return conn
+
+        with unidade_de_trabalho() as conn_unidade:
+            conn_thread = await executor.executar(_conexao_atual)
+        assert conn_thread is conn_unidade
+
+    async def test_rejeita_quando_fila_cheia(self, executor):
+        liberar = threading.Event()
+        tarefas = [asyncio.ensure_future(executor.executar(liberar.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(BancoSobrecarregadoError):
+            await executor.executar(lambda: None)
+        liberar.set()
+        await asyncio.gather(*tarefas)
+        estatisticas = executor.obter_estatisticas()
+        assert estatisticas["pendentes"] == 0
+        assert estatisticas["total_rejeitadas"] == 1
+
+
+class TestRepositorioAssincrono:
+    """Testes do proxy assíncrono de repositórios"""
+
+    async def test_funcoes_do_repositorio_viram_corrotinas(self, executor):
+        usuario_repo.criar_tabela()
+        repo_async = RepositorioAssincrono(usuario_repo, executor)
+        assert await repo_async.obter_por_id(999999) is None
@@ -0,0 +1,164 @@
+"""
+Testes do pool de conexões do util/db_util.
+
+Verifica reutilização de conexões, limite de tamanho, perfil de PRAGMAs,
+health check, encerramento do pool e unidade de trabalho.
+"""
+import sqlite3
+import pytest
+
+from util.db_util import (
+    ConnectionPool,
+    PERFIS_PRAGMA,
+    get_connection,
+    obter_pool,
+    obter_pragmas,
+    fechar_pool,
+    unidade_de_trabalho,
+)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Pool isolado apontando para um banco temporário"""
+    p = ConnectionPool(str(tmp_path / "pool.db"), tamanho=2, timeout=0.2)
+    yield p
+    p.fechar()
+
+
+class TestConnectionPool:
+    """Testes da classe ConnectionPool"""
+
+    def test_reutiliza_conexao_na_mesma_thread(self, pool):
+        conn1 = pool.obter()
+        pool.devolver(conn1)
+        conn2 = pool.obter()
+        assert conn1 is conn2
+        pool.devolver(conn2)
+        assert pool.obter_estatisticas()["abertas"] == 1
+
+    def test_timeout_quando_pool_esgotado(self, pool):
+        conn1 = pool.obter()
+        conn2 = pool.obter()
+        with pytest.raises(sqlite3.OperationalError):
+            pool.obter()
+        pool.devolver(conn1)
+        pool.devolver(conn2)
+
+    def test_descarta_conexao_com_falha_no_health_check(self, pool):
+        pool.health_check_segundos = 0
+        conn = pool.obter()
+        pool.devolver(conn)
+        conn.close()
+        nova = pool.obter()
+        assert nova is not conn
+        assert nova.execute("SELECT 1").fetchone()[0] == 1
+        pool.devolver(nova)
+
+    def test_restaura_foreign_keys_ao_devolver(self, pool):
+        conn = pool.obter()
+        conn.execute("PRAGMA foreign_keys = OFF")
+        pool.devolver(conn)
+        conn = pool.obter()
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        pool.devolver(conn)
+
+    def test_fechar_impede_novos_emprestimos(self, pool):
+        pool.fechar()
+        with pytest.raises(sqlite3.OperationalError):
+            pool.obter()
+
+
+class TestGetConnection:
+    """Testes do context manager get_connection sobre o pool global"""
+
+    def test_rollback_em_excecao(self):
+        with get_connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS teste_pool (valor INTEGER)")
+        with pytest.raises(ValueError):
+            with get_connection() as conn:
+                conn.execute("INSERT INTO teste_pool (valor) VALUES (1)")
+                raise ValueError("falha")
+        with get_connection() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM teste_pool").fetchone()[0]
+            conn.execute("DROP TABLE teste_pool")
+        assert total == 0
+
+    def test_fechar_pool_recria_sob_demanda(self):
+        pool_antigo = obter_pool()
+        fechar_pool()
+        with get_connection() as conn:
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+        assert obter_pool() is not pool_antigo
+
+
+class TestPerfilPragma:
+    """Testes do perfil de PRAGMAs aplicado às conexões"""
+
+    def test_perfil_producao_ativa_wal(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / "wal.db"), pragmas=PERFIS_PRAGMA["producao"])
+        conn = pool.obter()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        pool.devolver(conn)
+        pool.fechar()
+
+    def test_apenas_conexao_nao_altera_arquivo(self):
+        pragmas = obter_pragmas(apenas_conexao=True)
+        assert "journal_mode" not in pragmas
+        assert "synchronous" not in pragmas
+
+    def test_sobrescrita_por_variavel_de_ambiente(self, monkeypatch):
+        monkeypatch.setenv("DB_PRAGMA_CACHE_SIZE", "-1024")
+        assert obter_pragmas()["cache_size"] == "-1024"
+
+    def test_valor_invalido_rejeitado(self, monkeypatch):
+        monkeypatch.setenv("DB_PRAGMA_CACHE_SIZE", "1; DROP TABLE usuario")
+        with pytest.raises(ValueError):
+            obter_pragmas()
+
+
+class TestUnidadeDeTrabalho:
+    """Testes da unidade de trabalho (uma conexão e um commit por bloco)"""
+
+    @pytest.fixture(autouse=True)
+    def tabela(self):
+        with get_connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS teste_uow (valor INTEGER)")
+            conn.execute("DELETE FROM teste_uow")
+        yield
+        with get_connection() as conn:
+            conn.execute("DROP TABLE IF EXISTS teste_uow")
+
+    def _contar(self) -> int:
+        with get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM teste_uow").fetchone()[0]
+
+    def test_compartilha_conexao_e_commita_no_final(self):
+        with unidade_de_trabalho() as conn_unidade:
+            with get_connection() as conn1:
+                conn1.execute("INSERT INTO teste_uow (valor) VALUES (1)")
+            with get_connection() as conn2:
+                conn2.execute("INSERT INTO teste_uow (valor) VALUES (2)")
+            assert conn1 is conn_unidade and conn2 is conn_unidade
+            assert conn_unidade.in_transaction
+        assert self._contar() == 2
+
+    def test_excecao_desfaz_toda_a_unidade(self):
+        with pytest.raises(RuntimeError):
+            with unidade_de_trabalho():
+                with get_connection() as conn:
+                    conn.execute("INSERT INTO teste_uow (valor) VALUES (1)")
+                raise RuntimeError("falha")
+        assert self._contar() == 0
+
+    def test_excecao_em_bloco_interno_desfaz_apenas_o_bloco(self):
+        with unidade_de_trabalho():
+            with get_connection() as conn:
+                conn.execute("INSERT INTO teste_uow (valor) VALUES (1)")
+            with pytest.raises(ValueError):
+                with get_connection() as conn:
+                    conn.execute("INSERT INTO teste_uow (valor) VALUES (2)")
+                    raise ValueError("falha")
+        assert self._contar() == 1
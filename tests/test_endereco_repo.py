@@ -224,3 +224,37 @@ class TestExcluir:
         assert "End0" in titulos
         assert "End1" not in titulos
         assert "End2" in titulos
+
+
+class TestBuscarPorTermo:
+    """Testes para a busca textual (FTS5)."""
+
+    def _inserir(self, usuario_teste, titulo, cidade, cep):
+        return endereco_repo.inserir(Endereco(
+            id=0, id_usuario=usuario_teste, titulo=titulo,
+            logradouro="Rua das Flores", numero="10", complemento=None,
+            bairro="Centro", cidade=cidade, uf="ES", cep=cep
+        ))
+
+    def test_buscar_por_cidade_sem_acento_e_cep(self, usuario_teste):
+        """Deve encontrar por prefixo da cidade (sem acento) e pelo CEP."""
+        id_casa = self._inserir(usuario_teste, "Casa", "Vitória", "29000-000")
+        id_trabalho = self._inserir(usuario_teste, "Trabalho", "Serra", "29160-000")
+
+        assert [e.id for e in endereco_repo.buscar_por_termo("vitor")] == [id_casa]
+        assert [e.id for e in endereco_repo.buscar_por_termo("29160")] == [id_trabalho]
+        assert len(endereco_repo.buscar_por_termo("flores centro")) == 2
+
+    def test_indice_acompanha_atualizacao_e_exclusao(self, usuario_teste):
+        """O índice de conteúdo externo deve refletir alterações e exclusões."""
+        id_endereco = self._inserir(usuario_teste, "Casa", "Vitória", "29000-000")
+        endereco = endereco_repo.obter_por_id(id_endereco)
+        endereco.cidade = "Vila Velha"
+        endereco_repo.atualizar(endereco)
+
+        assert endereco_repo.buscar_por_termo("vitoria") == []
+        assert [e.id for e in endereco_repo.buscar_por_termo("vila velha")] == [id_endereco]
+
+        endereco_repo.excluir(id_endereco)
+        assert endereco_repo.buscar_por_termo("vila") == []
+        assert endereco_repo.reconstruir_indice_busca() == 0
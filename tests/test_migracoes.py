@@ -0,0 +1,108 @@
+"""
+Testes para as migrações versionadas do esquema (util/migracoes.py).
+"""
+import threading
+import time
+
+import pytest
+
+from repo import migracao_repo
+from util import migracoes
+from util.db_util import get_connection
+from util.migracoes import Migracao, aplicar_migracoes, obter_versao_mais_recente
+
+
+def _tabela_existe(nome: str) -> bool:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (nome,))
+        return cursor.fetchone() is not None
+
+
+@pytest.fixture
+def migracao_extra(monkeypatch):
+    """Permite acrescentar migrações de teste, removendo seus registros ao final."""
+    aplicar_migracoes()
+    versao_base = obter_versao_mais_recente()
+    extras = []
+
+    def acrescentar(descricao, aplicar):
+        migracao = Migracao(versao_base + len(extras) + 1, descricao, aplicar)
+        extras.append(migracao)
+        monkeypatch.setattr(migracoes, "MIGRACOES", [*migracoes.MIGRACOES, migracao])
+        return migracao
+
+    yield acrescentar
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM schema_versao WHERE versao > ?", (versao_base,))
+        cursor.execute("DROP TABLE IF EXISTS teste_migracao")
+
+
+class TestAplicarMigracoes:
+    """Testes para a aplicação das migrações pendentes."""
+
+    def test_banco_fica_na_versao_mais_recente(self):
+        aplicar_migracoes()
+        assert migracao_repo.obter_versao_atual() == obter_versao_mais_recente()
+        assert _tabela_existe("usuario")
+        assert _tabela_existe("visita")
+
+    def test_segunda_execucao_nao_aplica_nada(self):
+        aplicar_migracoes()
+        assert aplicar_migracoes() == 0
+
+    def test_versoes_sao_sequenciais(self):
+        versoes = [migracao.versao for migracao in migracoes.MIGRACOES]
+        assert versoes == list(range(1, len(versoes) + 1))
+
+    def test_aplica_apenas_pendentes(self, migracao_extra):
+        execucoes = []
+        migracao = migracao_extra("Teste", lambda: execucoes.append(1))
+
+        assert aplicar_migracoes() == 1
+        assert aplicar_migracoes() == 0
+        assert execucoes == [1]
+        registradas = migracao_repo.listar()
+        assert registradas[-1]["versao"] == migracao.versao
+        assert registradas[-1]["descricao"] == "Teste"
+
+    def test_falha_desfaz_todas_as_migracoes_da_execucao(self, migracao_extra):
+        def criar_tabela():
+            with get_connection() as conn:
+                conn.execute("CREATE TABLE teste_migracao (id INTEGER)")
+
+        def falhar():
+            raise RuntimeError("falha na migração")
+
+        versao_antes = migracao_repo.obter_versao_atual()
+        migracao_extra("Cria tabela", criar_tabela)
+        migracao_extra("Falha", falhar)
+
+        with pytest.raises(RuntimeError):
+            aplicar_migracoes()
+
+        assert migracao_repo.obter_versao_atual() == versao_antes
+        assert not _tabela_existe("teste_migracao")
+
+    def test_execucao_simultanea_aplica_uma_vez(self, migracao_extra):
+        execucoes = []
+
+        def lenta():
+            execucoes.append(1)
+            time.sleep(0.3)
+
+        migracao_extra("Lenta", lenta)
+        resultados = []
+        threads = [
+            threading.Thread(target=lambda: resultados.append(aplicar_migracoes()))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert execucoes == [1]
+        assert sorted(resultados) == [0, 0, 1]
@@ -0,0 +1,54 @@
+"""
+Testes para o perfil de inicialização (util/perfil_inicializacao.py).
+"""
+import subprocess
+import sys
+
+from util.perfil_inicializacao import (
+    RelatorioInicializacao,
+    TempoImportacao,
+    interpretar_importtime,
+    medir_inicializacao,
+)
+
+
+class TestInterpretarImporttime:
+    """Testes para a leitura da saída do -X importtime."""
+
+    def test_interpreta_linhas_e_ignora_o_restante(self):
+        linhas = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   encodings.idna",
+            "2026-01-01 10:00:00 - root - INFO - Servidor iniciado",
+            "import time:      1500 |      90000 | main",
+        ]
+        assert interpretar_importtime(linhas) == [
+            TempoImportacao("encodings.idna", 120, 120),
+            TempoImportacao("main", 1500, 90000),
+        ]
+
+    def test_mais_lentas_ordena_pelo_tempo_acumulado(self):
+        relatorio = RelatorioInicializacao(
+            tempo_health_ms=10,
+            importacoes=[TempoImportacao("a", 1, 10), TempoImportacao("b", 1, 30), TempoImportacao("c", 1, 20)],
+        )
+        assert [i.modulo for i in relatorio.mais_lentas(2)] == ["b", "c"]
+
+
+class TestInicializacao:
+    """Testes da inicialização real da aplicação."""
+
+    def test_dependencias_pesadas_nao_sao_importadas_com_as_rotas(self):
+        codigo = (
+            "import sys, routes.auth_routes, routes.usuario_routes; "
+            "print(','.join(m for m in ('PIL', 'resend', 'passlib', 'uvicorn') if m in sys.modules))"
+        )
+        resultado = subprocess.run(
+            [sys.executable, "-c", codigo], capture_output=True, text=True, check=True
+        )
+        assert resultado.stdout.strip() == ""
+
+    def test_mede_tempo_ate_health(self):
+        relatorio = medir_inicializacao()
+        assert relatorio.tempo_health_ms > 0
+        assert any(i.modulo == "main" for i in relatorio.importacoes)
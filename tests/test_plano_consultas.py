@@ -0,0 +1,74 @@
+"""
+Testes para a verificação dos planos de consulta (util/plano_consultas.py).
+"""
+import sqlite3
+
+import pytest
+
+from util.plano_consultas import (
+    VARREDURAS_PERMITIDAS,
+    encontrar_varreduras,
+    listar_comandos,
+    montar_esquema,
+    obter_plano,
+    verificar_planos,
+)
+
+
+@pytest.fixture
+def conn():
+    """Banco em memória com o esquema completo."""
+    conexao = sqlite3.connect(":memory:")
+    montar_esquema(conexao)
+    yield conexao
+    conexao.close()
+
+
+class TestPlanoDeIndices:
+    """Garante que as consultas frequentes usam índices."""
+
+    def test_nenhuma_consulta_frequente_faz_varredura(self):
+        problemas = verificar_planos()
+        assert problemas == {}, "\n".join(
+            f"{nome}: {'; '.join(varreduras)}" for nome, varreduras in problemas.items()
+        )
+
+    def test_varreduras_permitidas_existem(self):
+        nomes = {nome for nome, _ in listar_comandos()}
+        assert set(VARREDURAS_PERMITIDAS) - nomes == set()
+
+    def test_vitrine_usa_indice_parcial(self, conn):
+        from sql.animal_sql import OBTER_TODOS
+
+        plano = obter_plano(conn, OBTER_TODOS)
+        assert any("idx_animal_disponivel" in linha for linha in plano)
+        assert not any("TEMP B-TREE" in linha for linha in plano)
+
+    def test_excluir_usuario_busca_filhos_por_indice(self, conn):
+        from sql.usuario_sql import EXCLUIR
+
+        conn.execute("PRAGMA foreign_keys = ON")
+        plano = obter_plano(conn, EXCLUIR)
+        assert any("chat_mensagem" in linha for linha in plano)
+        assert encontrar_varreduras(plano, set()) == []
+
+
+class TestEncontrarVarreduras:
+    """Testes para a classificação das linhas do plano."""
+
+    def test_detecta_varredura_de_tabela(self, conn):
+        plano = obter_plano(conn, "SELECT * FROM animal WHERE nome = ?")
+        assert encontrar_varreduras(plano, set()) == ["SCAN animal"]
+
+    def test_ignora_indice_parcial(self):
+        plano = ["SCAN a USING INDEX idx_parcial"]
+        assert encontrar_varreduras(plano, {"idx_parcial"}) == []
+        assert encontrar_varreduras(plano, set()) == plano
+
+    def test_ignora_tabela_virtual_e_subconsulta(self):
+        plano = ["SCAN animal_fts VIRTUAL TABLE INDEX 0:M1", "SCAN (subquery-1)", "SCAN CONSTANT ROW"]
+        assert encontrar_varreduras(plano, set()) == []
+
+    def test_busca_por_indice_nao_e_varredura(self, conn):
+        plano = obter_plano(conn, "SELECT * FROM animal WHERE id = ?")
+        assert encontrar_varreduras(plano, set()) == []
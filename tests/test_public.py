@@ -63,6 +63,64 @@ class TestRotasPublicasComUsuarioLogado:
         assert response.status_code == status.HTTP_200_OK
 
 
+class TestCachePaginasPublicas:
+    """Testes do cache de páginas públicas (util/cache_pagina.py)"""
+
+    @pytest.fixture(autouse=True)
+    def cache_vazio(self):
+        from util.cache_pagina import invalidar_cache_paginas
+        invalidar_cache_paginas()
+        yield
+        invalidar_cache_paginas()
+
+    def test_pagina_anonima_tem_etag_e_cache_control(self, client):
+        """Página pública anônima deve enviar ETag e Cache-Control"""
+        response = client.get("/sobre")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"].startswith("private, max-age=")
+        assert response.headers["vary"] == "Cookie"
+
+    def test_if_none_match_retorna_304(self, client):
+        """Navegador com a versão atual deve receber 304 sem corpo"""
+        etag = client.get("/sobre").headers["etag"]
+        response = client.get("/sobre", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_segunda_requisicao_nao_renderiza_template(self, client):
+        """Página em cache deve ser servida sem renderizar o template"""
+        from routes import public_routes
+        from unittest.mock import patch
+
+        primeira = client.get("/sobre")
+        with patch.object(public_routes.templates_public, "TemplateResponse") as renderizar:
+            segunda = client.get("/sobre")
+        renderizar.assert_not_called()
+        assert segunda.text == primeira.text
+
+    def test_paginas_guardadas_por_caminho(self, client):
+        """"/" e "/index" marcam itens diferentes do menu e têm entradas próprias"""
+        assert client.get("/").headers["etag"] != client.get("/sobre").headers["etag"]
+
+    def test_usuario_logado_nao_recebe_pagina_anonima(self, cliente_autenticado):
+        """Usuário logado deve receber a página renderizada para ele"""
+        from util import cache_pagina
+
+        cache_pagina._paginas.definir("/sobre", cache_pagina.PaginaEmCache(b"anonima", '"x"', "text/html"))
+        response = cliente_autenticado.get("/sobre", headers={"If-None-Match": '"x"'})
+        assert response.status_code == status.HTTP_200_OK
+        assert "etag" not in response.headers
+
+    def test_fragmento_em_cache(self):
+        """A tag {% cache %} deve reaproveitar o conteúdo renderizado"""
+        from util.template_util import obter_ambiente
+
+        template = obter_ambiente().from_string('{% cache "teste_fragmento" %}{{ valor }}{% endcache %}')
+        assert template.render(valor="primeiro") == "primeiro"
+        assert template.render(valor="segundo") == "primeiro"
+
+
 class TestExemplos:
     """Testes de rotas de exemplos"""
 
@@ -0,0 +1,381 @@
+"""
+Testes para os algoritmos de rate limiting (util/rate_limiter.py).
+"""
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+from repo import configuracao_repo, rate_limit_repo
+from util import cache_lru, rate_limiter
+from util.config_cache import config
+from util.migracoes import aplicar_migracoes
+from util.rate_limiter import (
+    DynamicRateLimiter,
+    RateLimiter,
+    TokenBucket,
+    TokenBucketCompartilhado,
+    TokenBucketRateLimiter,
+    VarredorRateLimit,
+    obter_estatisticas_limiters,
+    varrer_limiters,
+)
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio monotônico controlado pelo teste (avançar com relogio.avancar)."""
+    class Relogio:
+        agora = 1000.0
+
+        def avancar(self, segundos: float) -> None:
+            self.agora += segundos
+
+    instancia = Relogio()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: instancia.agora)
+    monkeypatch.setattr(cache_lru.time, "monotonic", lambda: instancia.agora)
+    return instancia
+
+
+@pytest.fixture
+def compartilhado(relogio, monkeypatch):
+    """
+    Cria limiters com backend sqlite; limiters com o mesmo nome simulam
+    workers distintos. O relógio de parede acompanha o relógio monotônico.
+    """
+    aplicar_migracoes()
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: relogio.agora)
+    criados = []
+
+    def criar(max_tentativas: int, nome: str = "compartilhado_teste") -> RateLimiter:
+        limiter = RateLimiter(max_tentativas, janela_minutos=1, nome=nome, backend="sqlite")
+        criados.append(limiter)
+        return limiter
+
+    yield criar
+
+    for limiter in criados:
+        limiter.limpar()
+
+
+@pytest.mark.parametrize("algoritmo", ["janela", "token_bucket"])
+class TestAlgoritmos:
+    """Comportamento comum aos dois algoritmos."""
+
+    def test_bloqueia_apos_max_tentativas(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=3, janela_minutos=1, algoritmo=algoritmo)
+        assert [limiter.verificar("ip") for _ in range(4)] == [True, True, True, False]
+        assert limiter.obter_tentativas_restantes("ip") == 0
+
+    def test_identificadores_independentes(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, algoritmo=algoritmo)
+        assert limiter.verificar("a")
+        assert limiter.verificar("b")
+        assert not limiter.verificar("a")
+
+    def test_libera_apos_a_janela(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=2, janela_minutos=1, algoritmo=algoritmo)
+        limiter.verificar("ip")
+        limiter.verificar("ip")
+        assert not limiter.verificar("ip")
+
+        relogio.avancar(60)
+        assert limiter.verificar("ip")
+
+    def test_tempo_reset(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=2, janela_minutos=1, algoritmo=algoritmo)
+        assert limiter.obter_tempo_reset("ip") is None
+        limiter.verificar("ip")
+        assert limiter.obter_tempo_reset("ip") is None
+        limiter.verificar("ip")
+
+        tempo = limiter.obter_tempo_reset("ip")
+        assert tempo is not None and timedelta(0) < tempo <= timedelta(minutes=1)
+
+    def test_limpar(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, algoritmo=algoritmo)
+        limiter.verificar("a")
+        limiter.verificar("b")
+
+        limiter.limpar("a")
+        assert limiter.verificar("a")
+        assert not limiter.verificar("b")
+
+        limiter.limpar()
+        assert limiter.verificar("b")
+
+
+class TestTokenBucket:
+    """Testes específicos do algoritmo token bucket."""
+
+    def test_reabastece_uma_ficha_por_intervalo(self, relogio):
+        limiter = TokenBucketRateLimiter(max_tentativas=4, janela_minutos=1)
+        for _ in range(4):
+            assert limiter.verificar("ip")
+        assert not limiter.verificar("ip")
+
+        # 4 fichas por minuto: uma a cada 15 segundos
+        assert limiter.obter_tempo_reset("ip") == timedelta(seconds=15)
+        relogio.avancar(15)
+        assert limiter.verificar("ip")
+        assert not limiter.verificar("ip")
+
+    def test_balde_nao_passa_da_capacidade(self, relogio):
+        limiter = TokenBucketRateLimiter(max_tentativas=2, janela_minutos=1)
+        limiter.verificar("ip")
+        relogio.avancar(3600)
+        assert limiter.obter_tentativas_restantes("ip") == 2
+
+    def test_estado_constante_por_identificador(self, relogio):
+        limiter = TokenBucketRateLimiter(max_tentativas=1000, janela_minutos=1)
+        for _ in range(500):
+            limiter.verificar("ip")
+        estado = limiter._estado
+        assert isinstance(estado, TokenBucket)
+        assert len(estado) == 1
+        fichas, _ = estado.itens.obter("ip")
+        assert fichas == 500
+
+
+class TestSelecaoAlgoritmo:
+    """Testes para a escolha do algoritmo por configuração."""
+
+    def test_algoritmo_invalido(self):
+        with pytest.raises(ValueError):
+            RateLimiter(algoritmo="inexistente")
+
+    def test_verificar_async_local_nao_usa_executor(self, monkeypatch):
+        import asyncio
+
+        monkeypatch.setattr(rate_limiter, "executar_db", lambda *args: pytest.fail("usou executar_db"))
+        limiter = RateLimiter(max_tentativas=1, janela_minutos=1, backend="local")
+        assert asyncio.run(limiter.verificar_async("ip"))
+        assert not asyncio.run(limiter.verificar_async("ip"))
+
+    def test_padrao_vem_da_configuracao(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ALGORITMO", "token_bucket")
+        limiter = DynamicRateLimiter(
+            chave_max="rate_limit_teste_max",
+            chave_minutos="rate_limit_teste_minutos",
+            nome="teste",
+        )
+        assert limiter.algoritmo == "token_bucket"
+        assert isinstance(limiter._estado, TokenBucket)
+
+
+@pytest.mark.parametrize("algoritmo", ["janela", "token_bucket"])
+class TestEstadoLimitado:
+    """Testes para o limite de memória e a varredura do estado."""
+
+    def test_descarta_identificador_usado_ha_mais_tempo(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=1, algoritmo=algoritmo)
+        limiter._estado = rate_limiter.ALGORITMOS[algoritmo](max_identificadores=2)
+        for ip in ("a", "b", "c"):
+            limiter.verificar(ip)
+
+        estatisticas = limiter.obter_estatisticas()
+        assert estatisticas["identificadores"] == 2
+        assert estatisticas["descartados"] == 1
+        assert "a" not in limiter._estado
+
+    def test_varredura_remove_inativos(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=1, algoritmo=algoritmo)
+        limiter.verificar("antigo")
+        relogio.avancar(30)
+        limiter.verificar("recente")
+        relogio.avancar(30)
+
+        assert limiter.varrer() == 1
+        assert "recente" in limiter._estado
+        assert limiter.obter_estatisticas()["expirados"] == 1
+
+    def test_inativo_expirado_volta_com_limite_cheio(self, relogio, algoritmo):
+        limiter = RateLimiter(max_tentativas=2, janela_minutos=1, algoritmo=algoritmo)
+        limiter.verificar("ip")
+        limiter.verificar("ip")
+        relogio.avancar(60)
+        limiter.varrer()
+
+        assert limiter.obter_tentativas_restantes("ip") == 2
+
+
+class TestMetricasEVarredor:
+    """Testes para as métricas por nome e a tarefa de varredura."""
+
+    def test_metricas_por_nome(self, relogio):
+        primeiro = RateLimiter(max_tentativas=5, janela_minutos=1, nome="metricas_teste")
+        segundo = RateLimiter(max_tentativas=5, janela_minutos=1, nome="metricas_teste")
+        primeiro.verificar("a")
+        segundo.verificar("b")
+        segundo.verificar("c")
+
+        assert obter_estatisticas_limiters()["metricas_teste"]["identificadores"] == 3
+
+    def test_varrer_limiters(self, relogio):
+        limiter = RateLimiter(max_tentativas=5, janela_minutos=1, nome="varredura_teste")
+        limiter.verificar("a")
+        relogio.avancar(61)
+
+        assert varrer_limiters() >= 1
+        assert len(limiter._estado) == 0
+
+    def test_varredor_executa_periodicamente(self, monkeypatch):
+        import asyncio
+
+        chamadas = []
+        monkeypatch.setattr(rate_limiter, "varrer_limiters", lambda: chamadas.append(1) or 0)
+
+        async def executar():
+            varredor = VarredorRateLimit(intervalo_segundos=0.01)
+            varredor.iniciar()
+            await asyncio.sleep(0.05)
+            await varredor.encerrar()
+
+        asyncio.run(executar())
+        assert len(chamadas) >= 2
+
+
+class TestBackendCompartilhado:
+    """Testes para o estado comum a todos os workers (RATE_LIMIT_BACKEND=sqlite)."""
+
+    def test_limite_vale_para_todos_os_workers(self, compartilhado):
+        worker_a, worker_b = compartilhado(4), compartilhado(4)
+        assert isinstance(worker_a._estado, TokenBucketCompartilhado)
+        assert worker_a.algoritmo == "token_bucket"
+
+        permitidas = [limiter.verificar("ip") for limiter in (worker_a, worker_b) * 3]
+        assert permitidas.count(True) == 4
+        assert not worker_a.verificar("ip")
+        assert not worker_b.verificar("ip")
+        assert worker_b.obter_tempo_reset("ip") == timedelta(seconds=15)
+
+    def test_reserva_lote_por_ida_ao_banco(self, compartilhado, monkeypatch):
+        limiter = compartilhado(100)
+        chamadas = []
+        reservar = rate_limit_repo.reservar
+        monkeypatch.setattr(
+            rate_limit_repo, "reservar", lambda *args: chamadas.append(args) or reservar(*args)
+        )
+
+        assert all(limiter.verificar("ip") for _ in range(25))
+        assert len(chamadas) == 3
+        assert limiter.obter_tentativas_restantes("ip") == 75
+
+    def test_reabastece_apos_a_janela(self, compartilhado, relogio):
+        worker_a, worker_b = compartilhado(2), compartilhado(2)
+        worker_a.verificar("ip")
+        worker_b.verificar("ip")
+        assert not worker_a.verificar("ip")
+
+        relogio.avancar(60)
+        assert worker_b.verificar("ip")
+        assert worker_a.verificar("ip")
+
+    def test_limpar_remove_estado_compartilhado(self, compartilhado):
+        worker_a, worker_b = compartilhado(1), compartilhado(1)
+        worker_a.verificar("ip")
+        assert not worker_b.verificar("ip")
+
+        worker_a.limpar("ip")
+        assert rate_limit_repo.obter("compartilhado_teste", "ip") is None
+        assert worker_b.verificar("ip")
+
+    def test_varredura_remove_baldes_inativos(self, compartilhado, relogio):
+        limiter = compartilhado(5)
+        limiter.verificar("antigo")
+        relogio.avancar(30)
+        limiter.verificar("recente")
+        relogio.avancar(31)
+
+        limiter.varrer()
+        assert rate_limit_repo.obter("compartilhado_teste", "antigo") is None
+        assert rate_limit_repo.obter("compartilhado_teste", "recente") is not None
+
+    def test_falha_no_banco_limita_localmente(self, compartilhado, monkeypatch):
+        limiter = compartilhado(2)
+
+        def falhar(*args):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(rate_limit_repo, "reservar", falhar)
+        assert [limiter.verificar("ip") for _ in range(3)] == [True, True, False]
+
+    def test_ttl_do_cache_nao_depende_da_reserva(self, compartilhado):
+        limiter = compartilhado(100)
+        limiter.verificar("a")
+        limiter.verificar("b")
+        assert limiter._estado.itens.ttl_segundos == 60
+
+    def test_reserva_com_relogio_atrasado_nao_reabastece(self, compartilhado):
+        compartilhado(2)
+        assert rate_limit_repo.reservar("compartilhado_teste", "ip", 2, 2 / 60, 2, 1000.0) == 2
+        # Worker com relógio 30 s atrasado, depois o relógio correto de novo
+        assert rate_limit_repo.reservar("compartilhado_teste", "ip", 2, 2 / 60, 2, 970.0) == 0
+        assert rate_limit_repo.obter("compartilhado_teste", "ip") == (0.0, 1000.0)
+        assert rate_limit_repo.reservar("compartilhado_teste", "ip", 2, 2 / 60, 2, 1000.0) == 0
+
+    def test_verificar_async_reserva_fora_do_event_loop(self, compartilhado, monkeypatch):
+        import asyncio
+
+        limiter = compartilhado(100)
+        chamadas = []
+
+        async def executar_db(func, *args):
+            chamadas.append(func)
+            return func(*args)
+
+        monkeypatch.setattr(rate_limiter, "executar_db", executar_db)
+
+        async def verificar_varias():
+            return [await limiter.verificar_async("ip") for _ in range(25)]
+
+        assert all(asyncio.run(verificar_varias()))
+        # Uma ida ao banco por lote de 10 fichas
+        assert chamadas == [limiter._estado.registrar] * 3
+        assert asyncio.run(limiter.obter_tentativas_restantes_async("ip")) == 75
+        assert len(chamadas) == 4
+
+    def test_backend_invalido(self):
+        with pytest.raises(ValueError):
+            RateLimiter(backend="redis")
+
+
+class TestDynamicRateLimiter:
+    """Testes para a atualização dos limites vinda do config_cache."""
+
+    @pytest.fixture
+    def limiter(self):
+        aplicar_migracoes()
+        config.limpar()
+        yield DynamicRateLimiter(
+            chave_max="rate_limit_dinamico_teste_max",
+            chave_minutos="rate_limit_dinamico_teste_minutos",
+            padrao_max=2,
+            padrao_minutos=1,
+            nome="dinamico_teste",
+        )
+        config.limpar()
+
+    def test_verificacao_nao_consulta_configuracao(self, limiter, monkeypatch):
+        consultas = []
+        monkeypatch.setattr(config, "obter", lambda *args: consultas.append(args))
+
+        for _ in range(5):
+            limiter.verificar("ip")
+        limiter.obter_tentativas_restantes("ip")
+        assert consultas == []
+
+    def test_aplica_limite_alterado_apos_limpar_cache(self, limiter):
+        configuracao_repo.inserir_ou_atualizar("rate_limit_dinamico_teste_max", "4")
+        assert limiter.obter_tentativas_restantes("ip") == 2
+
+        config.limpar_chave("rate_limit_dinamico_teste_max")
+        assert limiter.obter_tentativas_restantes("ip") == 4
+        assert limiter.max_tentativas == 4
+
+    def test_ignora_chaves_de_outros_limiters(self, limiter):
+        config.limpar_chave("rate_limit_outro_max")
+        assert not limiter._desatualizado
+
+        config.limpar()
+        assert limiter._desatualizado
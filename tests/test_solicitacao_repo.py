@@ -246,3 +246,50 @@ class TestAtualizarStatus:
             99999, "Aprovada", "Teste"
         )
         assert resultado is False
+
+
+class TestBuscarPorTermo:
+    """Testes para a busca textual (FTS5)."""
+
+    def _inserir(self, setup_completo, observacoes):
+        return solicitacao_repo.inserir(Solicitacao(
+            id=0,
+            id_adotante=setup_completo["id_adotante"],
+            id_animal=setup_completo["id_animal"],
+            data_solicitacao=None,
+            status="Pendente",
+            observacoes=observacoes
+        ))
+
+    def test_buscar_por_animal_adotante_e_observacoes(self, setup_completo):
+        """Deve encontrar pelo animal, pelo adotante e pelas observações, ignorando acentos."""
+        id_solicitacao = self._inserir(setup_completo, "Tenho experiência com cães")
+
+        for termo in ["rex", "adot", "adotante@test", "experiencia caes"]:
+            resultado = solicitacao_repo.buscar_por_termo(termo)
+            assert [s["id"] for s in resultado] == [id_solicitacao], termo
+        assert solicitacao_repo.buscar_por_termo("gatos") == []
+
+    def test_busca_paginada_com_trecho(self, setup_completo):
+        """Deve paginar os resultados e destacar os termos no trecho."""
+        for i in range(3):
+            self._inserir(setup_completo, f"Quintal grande número {i}")
+
+        pagina = solicitacao_repo.buscar_paginado("quintal", pagina=2, por_pagina=2)
+
+        assert pagina.total == 3
+        assert pagina.total_paginas == 2
+        assert len(pagina.resultados) == 1
+        assert pagina.tem_anterior and not pagina.tem_proxima
+        assert "\x02Quintal\x03" in pagina.resultados[0].trecho
+
+    def test_indice_acompanha_nome_do_usuario(self, setup_completo):
+        """Alterar nome e e-mail do adotante deve reindexar suas solicitações."""
+        id_solicitacao = self._inserir(setup_completo, None)
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE usuario SET nome = 'Beatriz', email = 'bia@test.com' WHERE id = ?", (setup_completo["id_adotante"],)
+            )
+
+        assert solicitacao_repo.buscar_por_termo("adotante") == []
+        assert [s["id"] for s in solicitacao_repo.buscar_por_termo("beatriz")] == [id_solicitacao]
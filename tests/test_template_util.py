@@ -0,0 +1,55 @@
+"""
+Testes para o ambiente Jinja2 compartilhado (util/template_util.py).
+"""
+from pathlib import Path
+
+from jinja2 import FileSystemBytecodeCache
+
+from util import comandos
+from util.template_util import (
+    TEMPLATES_DIR,
+    criar_templates,
+    obter_ambiente,
+    precompilar_templates,
+)
+
+
+class TestAmbienteCompartilhado:
+    """Testes para o Environment único usado pelas rotas."""
+
+    def test_criar_templates_retorna_a_mesma_instancia(self):
+        assert criar_templates("templates/auth") is criar_templates("templates/admin")
+        assert criar_templates("templates").env is obter_ambiente()
+
+    def test_rotas_usam_o_mesmo_ambiente(self):
+        from routes import auth_routes, admin_usuarios_routes, public_routes
+
+        assert auth_routes.templates.env is admin_usuarios_routes.templates.env
+        assert public_routes.templates_public.env is obter_ambiente()
+
+    def test_ambiente_usa_cache_de_bytecode_e_filtros(self):
+        env = obter_ambiente()
+        assert isinstance(env.bytecode_cache, FileSystemBytecodeCache)
+        assert env.filters["data_br"]("2025-10-22") == "22/10/2025"
+        assert "csrf_input" in env.globals
+        assert "url_for" in env.globals
+
+
+class TestPrecompilarTemplates:
+    """Testes para a compilação antecipada dos templates."""
+
+    def test_compila_todos_os_templates_html(self):
+        total_html = len(list(Path(TEMPLATES_DIR).rglob("*.html")))
+        assert precompilar_templates() == total_html
+
+    def test_templates_compilados_ficam_em_memoria(self):
+        env = obter_ambiente()
+        precompilar_templates()
+        assert env.get_template("base_publica.html") is env.get_template("base_publica.html")
+
+    def test_comando_grava_bytecode_em_disco(self, capsys):
+        pasta = Path(obter_ambiente().bytecode_cache.directory)
+
+        assert comandos.main(["precompilar-templates"]) == 0
+        assert "Templates compilados" in capsys.readouterr().out
+        assert any(pasta.glob("__jinja2_*.cache"))
@@ -284,3 +284,37 @@ class TestIntegracao:
         # Marcar como realizada
         resultado_status = visita_repo.atualizar_status(id_inserido, "Realizada")
         assert resultado_status is True
+
+
+class TestBuscarPorTermo:
+    """Testes para a busca textual (FTS5)."""
+
+    def test_buscar_por_adotante_abrigo_e_observacoes(self, setup_visita):
+        """Deve encontrar pelo adotante, pelo abrigo e pelas observações."""
+        id_visita = visita_repo.inserir(Visita(
+            id=0,
+            id_adotante=setup_visita["id_adotante"],
+            id_abrigo=setup_visita["id_abrigo"],
+            data_agendada=datetime(2024, 12, 20, 14, 0, 0),
+            observacoes="Gostaria de conhecer os gatos"
+        ))
+
+        for termo in ["visitante", "resp visitas", "gato"]:
+            assert [v["id"] for v in visita_repo.buscar_por_termo(termo)] == [id_visita], termo
+
+        visita_repo.excluir(id_visita)
+        assert visita_repo.buscar_por_termo("visitante") == []
+
+    def test_reconstruir_indice(self, setup_visita):
+        """Deve reindexar visitas que estavam fora do índice."""
+        visita_repo.inserir(Visita(
+            id=0,
+            id_adotante=setup_visita["id_adotante"],
+            id_abrigo=setup_visita["id_abrigo"],
+            data_agendada=datetime(2024, 12, 20, 14, 0, 0)
+        ))
+        with get_connection() as conn:
+            conn.execute("DELETE FROM visita_fts")
+
+        assert visita_repo.reconstruir_indice_busca() == 1
+        assert len(visita_repo.buscar_por_termo("visitante")) == 1
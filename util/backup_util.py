@@ -5,7 +5,6 @@ Fornece funções para criar, listar, restaurar e excluir backups do banco de da
 Os backups são armazenados no diretório 'backups/' com nomenclatura padronizada.
 """
 import os
-import shutil
 import sqlite3
 from pathlib import Path
 from datetime import datetime
@@ -13,6 +12,7 @@ from typing import Optional, List
 from dataclasses import dataclass
 
 from util.config import DATABASE_PATH
+from util.db_util import fechar_pool, aplicar_pragmas, obter_pragmas
 from util.logger_config import logger
 from util.datetime_util import agora
 
@@ -127,6 +127,28 @@ def _extrair_data_do_nome(nome_arquivo: str) -> Optional[datetime]:
         return None
 
 
+def _copiar_banco(origem: Path, destino: Path) -> None:
+    """
+    Copia um banco SQLite usando a API de backup online do SQLite
+
+    Diferente de copiar o arquivo, inclui alterações ainda no arquivo -wal
+    (modo WAL) e não corrompe leitores/escritores concorrentes do destino.
+
+    Args:
+        origem: Path do banco de origem
+        destino: Path do banco de destino (criado se não existir)
+    """
+    conn_origem = sqlite3.connect(str(origem))
+    conn_destino = sqlite3.connect(str(destino))
+    try:
+        aplicar_pragmas(conn_origem, obter_pragmas(apenas_conexao=True))
+        aplicar_pragmas(conn_destino, obter_pragmas(apenas_conexao=True))
+        conn_origem.backup(conn_destino)
+    finally:
+        conn_origem.close()
+        conn_destino.close()
+
+
 def _validar_integridade_backup(caminho: Path) -> tuple[bool, str]:
     """
     Valida a integridade de um arquivo de backup SQLite
@@ -150,6 +172,7 @@ def _validar_integridade_backup(caminho: Path) -> tuple[bool, str]:
 
         # Tentar abrir e validar integridade do banco
         conn = sqlite3.connect(str(caminho))
+        aplicar_pragmas(conn, obter_pragmas(apenas_conexao=True))
         cursor = conn.cursor()
 
         # PRAGMA integrity_check retorna "ok" se banco está íntegro
@@ -216,8 +239,13 @@ def criar_backup(automatico: bool = False) -> tuple[bool, str]:
         nome_backup = agora().strftime(formato)
         caminho_backup = BACKUP_DIR / nome_backup
 
-        # Copiar arquivo do banco de dados
-        shutil.copy2(db_path, caminho_backup)
+        # Copiar banco de dados (consistente mesmo em modo WAL)
+        _copiar_banco(db_path, caminho_backup)
+
+        # Backup deve ser um arquivo único e autocontido (sem -wal/-shm)
+        conn_backup = sqlite3.connect(str(caminho_backup))
+        conn_backup.execute("PRAGMA journal_mode = DELETE")
+        conn_backup.close()
 
         # Obter tamanho do backup
         tamanho = caminho_backup.stat().st_size
@@ -343,8 +371,10 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
                 # Continua mesmo se falhar o backup automático
 
         # Restaurar backup (copiar sobre o arquivo atual)
+        # Fecha as conexões do pool para que nenhuma continue apontando para o arquivo antigo
+        fechar_pool()
         db_path = Path(DATABASE_PATH)
-        shutil.copy2(caminho_backup, db_path)
+        _copiar_banco(caminho_backup, db_path)
 
         # VALIDAÇÃO PÓS-RESTAURAÇÃO: Verificar se banco restaurado está válido
         logger.info("Verificando integridade do banco após restauração...")
@@ -353,7 +383,8 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
             logger.error("Banco corrompido após restauração! Executando rollback...")
 
             if caminho_backup_seguranca and caminho_backup_seguranca.exists():
-                shutil.copy2(caminho_backup_seguranca, db_path)
+                fechar_pool()
+                _copiar_banco(caminho_backup_seguranca, db_path)
                 mensagem = f"Restauração falhou! Banco revertido para estado anterior. Backup '{nome_arquivo}' pode estar corrompido."
                 logger.error(mensagem)
                 return False, mensagem, nome_backup_automatico
@@ -374,8 +405,9 @@ def restaurar_backup(nome_arquivo: str, criar_backup_antes: bool = True) -> tupl
         # Tentar rollback em caso de exceção
         if caminho_backup_seguranca and caminho_backup_seguranca.exists():
             try:
+                fechar_pool()
                 db_path = Path(DATABASE_PATH)
-                shutil.copy2(caminho_backup_seguranca, db_path)
+                _copiar_banco(caminho_backup_seguranca, db_path)
                 logger.info("Rollback executado com sucesso após exceção")
                 mensagem += " (Banco revertido para estado anterior)"
             except Exception as rollback_error:
@@ -0,0 +1,219 @@
+"""
+Utilitários para busca textual com SQLite FTS5.
+
+Converte o texto digitado pelo usuário em uma expressão MATCH segura:
+cada palavra vira um termo entre aspas com busca por prefixo, de modo que
+caracteres especiais da sintaxe FTS5 (aspas, parênteses, operadores como
+AND/OR/NOT, asteriscos) nunca são interpretados e a busca funciona enquanto
+o usuário digita ("lab" encontra "Labrador").
+
+A normalização de acentos fica a cargo do tokenizador das tabelas virtuais
+(unicode61 remove_diacritics 2), aplicado tanto ao índice quanto à consulta.
+
+Cada entidade pesquisável declara em seu módulo sql/*_sql.py a tabela FTS5
+(CRIAR_TABELA_FTS), os triggers de sincronização (TRIGGERS_FTS), a carga
+inicial (POPULAR_FTS) e as consultas BUSCAR_POR_TERMO e CONTAR_POR_TERMO.
+Este módulo reúne o que é comum: criação e reconstrução dos índices, parser
+da consulta, paginação e destaque dos trechos encontrados.
+"""
+import re
+import unicodedata
+from sqlite3 import Cursor, Row
+from typing import Any, Callable, List, Optional, Sequence
+
+from markupsafe import Markup, escape
+
+from model.busca_model import PaginaBusca, ResultadoBusca
+
+# Máximo de palavras consideradas em uma consulta
+MAX_TERMOS_BUSCA = 8
+
+# Itens por página: padrão e máximo aceito
+BUSCA_POR_PAGINA = 20
+BUSCA_POR_PAGINA_MAXIMO = 100
+
+# Delimitadores dos termos encontrados nos trechos gerados por snippet()
+# (char(2)/char(3) no SQL: caracteres de controle que não aparecem em texto digitado)
+MARCADOR_INICIO = "\x02"
+MARCADOR_FIM = "\x03"
+
+_PADRAO_PALAVRA = re.compile(r"\w+", re.UNICODE)
+
+
+def extrair_termos(texto: Optional[str]) -> List[str]:
+    """
+    Extrai as palavras de um texto de busca, descartando pontuação.
+
+    Args:
+        texto: Texto digitado pelo usuário
+
+    Returns:
+        Lista de palavras (no máximo MAX_TERMOS_BUSCA)
+    """
+    if not texto:
+        return []
+    return _PADRAO_PALAVRA.findall(texto)[:MAX_TERMOS_BUSCA]
+
+
+def normalizar_termo(texto: Optional[str]) -> str:
+    """
+    Normaliza um texto de busca do mesmo modo que o tokenizador do FTS5.
+
+    Remove acentos, ignora maiúsculas e pontuação; textos que produzem a
+    mesma consulta ("João  S." e "joao s") resultam na mesma chave, o que
+    permite usá-la em caches de resultado.
+
+    Args:
+        texto: Texto digitado pelo usuário
+
+    Returns:
+        Palavras normalizadas separadas por um espaço
+    """
+    sem_acentos = "".join(
+        c for c in unicodedata.normalize("NFKD", texto or "") if not unicodedata.combining(c)
+    )
+    return " ".join(extrair_termos(sem_acentos.casefold()))
+
+
+def montar_consulta_fts(texto: Optional[str]) -> Optional[str]:
+    """
+    Monta a expressão MATCH do FTS5 a partir do texto de busca.
+
+    Todas as palavras precisam aparecer (AND implícito), cada uma como prefixo.
+
+    Args:
+        texto: Texto digitado pelo usuário
+
+    Returns:
+        Expressão MATCH (ex.: '"joao"* "lab"*') ou None se não houver palavras
+    """
+    termos = extrair_termos(texto)
+    if not termos:
+        return None
+    return " ".join(f'"{termo}"*' for termo in termos)
+
+
+def criar_indice_fts(cursor: Cursor, tabela_fts: str, sql_criar: str, triggers: Sequence[str], sql_popular: str) -> bool:
+    """
+    Cria a tabela FTS5 e seus triggers, populando o índice se ele for novo.
+
+    Em bancos criados antes do índice, a carga inicial indexa os registros
+    existentes; nas execuções seguintes nada é reprocessado.
+
+    Args:
+        cursor: Cursor da conexão em uso
+        tabela_fts: Nome da tabela virtual
+        sql_criar: CREATE VIRTUAL TABLE do índice
+        triggers: CREATE TRIGGER que mantêm o índice sincronizado
+        sql_popular: Comando que indexa todos os registros existentes
+
+    Returns:
+        True se o índice foi criado (e populado) nesta chamada
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela_fts,))
+    existia = cursor.fetchone() is not None
+    cursor.execute(sql_criar)
+    for trigger in triggers:
+        cursor.execute(trigger)
+    if not existia:
+        cursor.execute(sql_popular)
+    return not existia
+
+
+def reconstruir_indice_fts(cursor: Cursor, tabela_fts: str, comandos: Sequence[str]) -> int:
+    """
+    Reconstrói um índice FTS5 e compacta seus segmentos.
+
+    Args:
+        cursor: Cursor da conexão em uso
+        tabela_fts: Nome da tabela virtual
+        comandos: Comandos que limpam e repopulam o índice, em ordem
+
+    Returns:
+        Número de registros indexados
+    """
+    for comando in comandos:
+        cursor.execute(comando)
+    cursor.execute(f"INSERT INTO {tabela_fts} ({tabela_fts}) VALUES ('optimize')")
+    cursor.execute(f"SELECT COUNT(*) FROM {tabela_fts}")
+    return cursor.fetchone()[0]
+
+
+def normalizar_paginacao(pagina: int, por_pagina: int) -> tuple[int, int, int]:
+    """
+    Ajusta página e tamanho de página aos limites aceitos.
+
+    Args:
+        pagina: Número da página solicitada (começando em 1)
+        por_pagina: Quantidade de itens por página solicitada
+
+    Returns:
+        Tupla (pagina, por_pagina, offset)
+    """
+    pagina = max(1, pagina)
+    por_pagina = max(1, min(por_pagina, BUSCA_POR_PAGINA_MAXIMO))
+    return pagina, por_pagina, (pagina - 1) * por_pagina
+
+
+def executar_busca_paginada(
+    cursor: Cursor,
+    sql_busca: str,
+    sql_contar: str,
+    termo: str,
+    pagina: int,
+    por_pagina: int,
+    converter: Callable[[Row], Any],
+) -> PaginaBusca:
+    """
+    Executa uma busca FTS5 paginada.
+
+    sql_busca recebe (consulta, limite, offset) e deve retornar as colunas
+    "trecho" e "relevancia" além das colunas do registro; sql_contar recebe
+    (consulta,) e retorna o total na primeira coluna.
+
+    Args:
+        cursor: Cursor da conexão em uso
+        sql_busca: Consulta ordenada por relevância
+        sql_contar: Consulta que conta os itens encontrados
+        termo: Texto digitado pelo usuário
+        pagina: Número da página (começando em 1)
+        por_pagina: Quantidade de itens por página
+        converter: Função que converte a linha no item do resultado
+
+    Returns:
+        PaginaBusca (vazia se o termo não tiver palavras)
+    """
+    pagina, por_pagina, offset = normalizar_paginacao(pagina, por_pagina)
+    resultado = PaginaBusca(termo=termo, pagina=pagina, por_pagina=por_pagina)
+
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return resultado
+
+    cursor.execute(sql_contar, (consulta,))
+    resultado.total = cursor.fetchone()[0]
+    if resultado.total <= offset:
+        return resultado
+
+    cursor.execute(sql_busca, (consulta, por_pagina, offset))
+    resultado.resultados = [
+        ResultadoBusca(item=converter(row), trecho=row["trecho"] or "", relevancia=row["relevancia"])
+        for row in cursor.fetchall()
+    ]
+    return resultado
+
+
+def trecho_para_html(trecho: Optional[str]) -> Markup:
+    """
+    Converte um trecho da busca em HTML seguro, destacando os termos com <mark>.
+
+    Args:
+        trecho: Trecho retornado pela busca (com MARCADOR_INICIO/MARCADOR_FIM)
+
+    Returns:
+        Markup com o texto escapado e os termos destacados
+    """
+    if not trecho:
+        return Markup("")
+    html = str(escape(trecho))
+    return Markup(html.replace(MARCADOR_INICIO, "<mark>").replace(MARCADOR_FIM, "</mark>"))
@@ -0,0 +1,150 @@
+"""
+Cache LRU em memória com expiração por tempo.
+
+Guarda até max_itens entradas; ao exceder, descarta a usada há mais tempo.
+Cada entrada expira ttl_segundos após ser gravada, o que limita quanto tempo
+um processo pode servir um resultado desatualizado por alterações feitas em
+outro worker. É seguro para uso a partir das threads do ExecutorBanco.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class CacheLRU:
+    """
+    Cache LRU com TTL, protegido por lock.
+
+    Attributes:
+        max_itens: Número máximo de entradas mantidas
+        ttl_segundos: Validade de cada entrada (0 = sem expiração)
+    """
+
+    def __init__(self, max_itens: int = 256, ttl_segundos: float = 30.0):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_itens: Número máximo de entradas mantidas
+            ttl_segundos: Validade de cada entrada (0 = sem expiração)
+        """
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._falhas = 0
+        self._descartados = 0
+        self._expirados = 0
+
+    def obter(self, chave: Hashable, padrao: Optional[Any] = None) -> Any:
+        """
+        Retorna o valor da chave, marcando-a como usada recentemente.
+
+        Args:
+            chave: Chave da entrada
+            padrao: Valor retornado se a chave não existir ou tiver expirado
+
+        Returns:
+            Valor armazenado ou padrao
+        """
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is None:
+                self._falhas += 1
+                return padrao
+
+            expira_em, valor = entrada
+            if self.ttl_segundos and time.monotonic() >= expira_em:
+                del self._itens[chave]
+                self._falhas += 1
+                self._expirados += 1
+                return padrao
+
+            self._itens.move_to_end(chave)
+            self._acertos += 1
+            return valor
+
+    def definir(self, chave: Hashable, valor: Any) -> None:
+        """
+        Grava um valor, descartando a entrada menos usada se o cache estiver cheio.
+
+        Args:
+            chave: Chave da entrada
+            valor: Valor a armazenar
+        """
+        if self.max_itens <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self._descartados += 1
+
+    def remover(self, chave: Hashable) -> bool:
+        """
+        Remove uma entrada.
+
+        Args:
+            chave: Chave da entrada
+
+        Returns:
+            True se a chave existia
+        """
+        with self._lock:
+            if chave not in self._itens:
+                return False
+            del self._itens[chave]
+            return True
+
+    def remover_expirados(self) -> int:
+        """
+        Remove as entradas com TTL vencido (sem esperar que sejam lidas).
+
+        Returns:
+            Número de entradas removidas
+        """
+        if not self.ttl_segundos:
+            return 0
+        with self._lock:
+            agora = time.monotonic()
+            vencidas = [chave for chave, (expira_em, _) in self._itens.items() if agora >= expira_em]
+            for chave in vencidas:
+                del self._itens[chave]
+            self._expirados += len(vencidas)
+            return len(vencidas)
+
+    def limpar(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._itens.clear()
+
+    def __contains__(self, chave: Hashable) -> bool:
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is None:
+                return False
+            return not self.ttl_segundos or time.monotonic() < entrada[0]
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            Dicionário com itens, max_itens, acertos, falhas, descartados
+            (removidos por falta de espaço) e expirados (removidos pelo TTL)
+        """
+        with self._lock:
+            return {
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "descartados": self._descartados,
+                "expirados": self._expirados,
+            }
@@ -0,0 +1,216 @@
+"""
+Cache de páginas e fragmentos de templates.
+
+Páginas públicas que não dependem do usuário (landing page, "Sobre") são
+renderizadas uma vez e servidas da memória para visitantes anônimos, com
+ETag/If-None-Match (304 sem corpo) e Cache-Control. Requisições de usuários
+logados ou com mensagens flash pendentes sempre renderizam o template.
+
+Trechos caros de templates podem ser guardados com a tag {% cache %}:
+
+    {% cache "modais_base" %}
+        {% include 'components/modal_confirmacao.html' %}
+    {% endcache %}
+
+O nome do fragmento é global (o mesmo nome em dois templates compartilha a
+entrada) e o conteúdo não pode depender da requisição.
+
+Os dois caches expiram por TTL e são esvaziados por invalidar_cache_paginas()
+sempre que o config_cache avisa que o tema ou as configurações mudaram
+(inclusive quando a alteração foi feita em outro worker).
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Optional
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+from markupsafe import Markup
+
+from util.cache_lru import CacheLRU
+from util.config_cache import config
+
+# Validade das páginas e fragmentos em memória
+CACHE_PAGINAS_TTL_SEGUNDOS = float(os.getenv('CACHE_PAGINAS_TTL_SEGUNDOS', '300'))
+
+# Número máximo de páginas e de fragmentos guardados (cada um)
+CACHE_PAGINAS_MAX_ITENS = int(os.getenv('CACHE_PAGINAS_MAX_ITENS', '64'))
+
+# max-age enviado no Cache-Control (0 = o navegador revalida sempre com If-None-Match)
+CACHE_PAGINAS_MAX_AGE_SEGUNDOS = int(os.getenv('CACHE_PAGINAS_MAX_AGE_SEGUNDOS', '0'))
+
+
+@dataclass(frozen=True)
+class PaginaEmCache:
+    """
+    Página renderizada guardada em memória.
+
+    Attributes:
+        corpo: Conteúdo da resposta
+        etag: ETag (entre aspas) calculado sobre o corpo
+        media_type: Tipo de conteúdo da resposta
+    """
+    corpo: bytes
+    etag: str
+    media_type: str
+
+
+_paginas = CacheLRU(max_itens=CACHE_PAGINAS_MAX_ITENS, ttl_segundos=CACHE_PAGINAS_TTL_SEGUNDOS)
+_fragmentos = CacheLRU(max_itens=CACHE_PAGINAS_MAX_ITENS, ttl_segundos=CACHE_PAGINAS_TTL_SEGUNDOS)
+
+
+def requisicao_anonima(request: Request) -> bool:
+    """
+    Indica se a requisição pode receber uma página compartilhada.
+
+    Args:
+        request: Requisição atual
+
+    Returns:
+        True se não há usuário logado nem mensagens flash pendentes
+    """
+    return not request.session.get("usuario_logado") and not request.session.get("mensagens")
+
+
+def calcular_etag(corpo: bytes) -> str:
+    """
+    Calcula o ETag forte de um conteúdo.
+
+    Args:
+        corpo: Conteúdo da resposta
+
+    Returns:
+        ETag entre aspas, ex: '"3f2a..."'
+    """
+    return f'"{hashlib.blake2b(corpo, digest_size=16).hexdigest()}"'
+
+
+def _etag_confere(request: Request, etag: str) -> bool:
+    """Verifica se o If-None-Match da requisição contém o ETag informado."""
+    cabecalho = request.headers.get("if-none-match")
+    if not cabecalho:
+        return False
+    for valor in cabecalho.split(","):
+        valor = valor.strip()
+        if valor == "*" or valor.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _responder(request: Request, pagina: PaginaEmCache) -> Response:
+    """Monta a resposta 200 (ou 304, se o navegador já tem a versão atual)."""
+    cabecalhos = {
+        "ETag": pagina.etag,
+        "Cache-Control": f"private, max-age={CACHE_PAGINAS_MAX_AGE_SEGUNDOS}",
+        # A mesma URL tem outro conteúdo para quem está logado
+        "Vary": "Cookie",
+    }
+    if _etag_confere(request, pagina.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+    return Response(content=pagina.corpo, media_type=pagina.media_type, headers=cabecalhos)
+
+
+def cache_pagina(func: Callable) -> Callable:
+    """
+    Decorator que guarda em memória a página de uma rota GET pública.
+
+    Visitantes anônimos recebem a página do cache, sem renderizar o template
+    nem passar pelo rate limiter da rota. Apenas respostas 200 são guardadas,
+    indexadas pelo caminho da URL.
+
+    Args:
+        func: Função da rota (deve receber 'request')
+
+    Returns:
+        Função decorada
+
+    Example:
+        @router.get("/sobre")
+        @cache_pagina
+        async def sobre(request: Request):
+            ...
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        request: Request = kwargs.get('request') or args[0]
+        if not requisicao_anonima(request):
+            return await func(*args, **kwargs)
+
+        chave = request.url.path
+        pagina: Optional[PaginaEmCache] = _paginas.obter(chave)
+        if pagina is not None:
+            return _responder(request, pagina)
+
+        resposta = await func(*args, **kwargs)
+        # A rota pode ter registrado uma mensagem flash (ex: rate limit excedido)
+        if resposta.status_code != status.HTTP_200_OK or not requisicao_anonima(request):
+            return resposta
+
+        pagina = PaginaEmCache(
+            corpo=bytes(resposta.body),
+            etag=calcular_etag(resposta.body),
+            media_type=resposta.media_type or "text/html",
+        )
+        _paginas.definir(chave, pagina)
+        return _responder(request, pagina)
+
+    return wrapper
+
+
+class FragmentoCacheExtension(Extension):
+    """
+    Extensão Jinja2 que adiciona a tag {% cache "nome" %}...{% endcache %}.
+
+    O conteúdo do bloco é renderizado na primeira vez e reaproveitado até
+    expirar ou até invalidar_cache_paginas().
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser: Parser) -> nodes.Node:
+        lineno = next(parser.stream).lineno
+        nome = parser.parse_expression()
+        corpo = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_renderizar_fragmento", [nome]), [], [], corpo
+        ).set_lineno(lineno)
+
+    def _renderizar_fragmento(self, nome: str, caller: Callable[[], str]) -> str:
+        """Retorna o fragmento do cache ou renderiza o bloco e o guarda."""
+        fragmento = _fragmentos.obter(nome)
+        if fragmento is None:
+            fragmento = caller()
+            _fragmentos.definir(nome, fragmento)
+        return Markup(fragmento)
+
+
+def invalidar_cache_paginas() -> None:
+    """Descarta todas as páginas e fragmentos guardados neste processo."""
+    _paginas.limpar()
+    _fragmentos.limpar()
+
+
+def _configuracao_alterada(chave: Optional[str]) -> None:
+    """Descarta as páginas renderizadas com as configurações anteriores."""
+    invalidar_cache_paginas()
+
+
+config.inscrever(_configuracao_alterada)
+
+
+def obter_estatisticas() -> dict:
+    """
+    Retorna estatísticas de uso dos caches de páginas e fragmentos.
+
+    Returns:
+        Dicionário com as estatísticas de "paginas" e "fragmentos"
+    """
+    return {
+        "paginas": _paginas.obter_estatisticas(),
+        "fragmentos": _fragmentos.obter_estatisticas(),
+    }
@@ -0,0 +1,244 @@
+"""
+Backends de broadcast do chat.
+
+O ChatManager guarda as filas SSE em memória do processo. Com vários workers
+(uvicorn --workers N), uma mensagem publicada em um worker precisa chegar às
+conexões mantidas pelos demais. O backend de broadcast desacopla a publicação
+da entrega local:
+
+- BroadcastLocal: entrega direta no próprio processo (um único worker).
+- BroadcastSQLite: publica em um log de eventos no banco (tabela chat_evento);
+  cada worker acompanha o log por polling e entrega às suas conexões locais.
+
+O backend é escolhido pela variável CHAT_BROADCAST_BACKEND (local ou sqlite).
+"""
+import asyncio
+import os
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Type
+
+from repo import chat_evento_repo
+from util.datetime_util import agora
+from util.db_async import executar_db
+from util.logger_config import logger
+
+# Backend de broadcast: local (um processo) ou sqlite (vários workers)
+CHAT_BROADCAST_BACKEND = os.getenv("CHAT_BROADCAST_BACKEND", "local")
+# Intervalo de polling do log de eventos (backend sqlite)
+CHAT_BROADCAST_POLL_MS = int(os.getenv("CHAT_BROADCAST_POLL_MS", "200"))
+# Tempo que os eventos permanecem no log antes da limpeza (backend sqlite)
+CHAT_BROADCAST_RETENCAO_SEGUNDOS = int(os.getenv("CHAT_BROADCAST_RETENCAO_SEGUNDOS", "300"))
+
+# Função de entrega local: (usuario_id, evento) -> None
+Entregador = Callable[[int, dict], Awaitable[None]]
+
+
+class BroadcastBackend:
+    """
+    Interface dos backends de broadcast.
+
+    Attributes:
+        nome: Identificador do backend (valor de CHAT_BROADCAST_BACKEND)
+    """
+
+    nome = "base"
+
+    def __init__(self):
+        self._entregar: Optional[Entregador] = None
+
+    async def iniciar(self, entregar: Entregador) -> None:
+        """
+        Registra a função de entrega local (chamada de forma idempotente).
+
+        Args:
+            entregar: Corrotina que coloca o evento nas filas do usuário neste processo
+        """
+        self._entregar = entregar
+
+    async def publicar(self, usuario_ids: List[int], evento: dict) -> None:
+        """
+        Publica um evento para usuários, onde quer que estejam conectados.
+
+        Args:
+            usuario_ids: IDs dos usuários destinatários
+            evento: Dicionário do evento SSE
+        """
+        raise NotImplementedError
+
+    async def encerrar(self) -> None:
+        """Libera recursos do backend."""
+
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna estatísticas do backend.
+
+        Returns:
+            Dicionário com o nome do backend
+        """
+        return {"backend": self.nome}
+
+
+class BroadcastLocal(BroadcastBackend):
+    """Entrega os eventos diretamente no processo atual."""
+
+    nome = "local"
+
+    async def publicar(self, usuario_ids: List[int], evento: dict) -> None:
+        for usuario_id in usuario_ids:
+            await self._entregar(usuario_id, evento)
+
+
+class BroadcastSQLite(BroadcastBackend):
+    """
+    Broadcast entre processos usando a tabela chat_evento como log.
+
+    Cada publicação grava uma linha por destinatário. Cada processo mantém
+    uma tarefa que lê os eventos posteriores ao seu cursor e os entrega às
+    conexões locais; o processo que publicou é acordado imediatamente, os
+    demais recebem no próximo ciclo de polling.
+    """
+
+    nome = "sqlite"
+
+    def __init__(
+        self,
+        intervalo_poll: float = CHAT_BROADCAST_POLL_MS / 1000,
+        retencao_segundos: int = CHAT_BROADCAST_RETENCAO_SEGUNDOS,
+        lote: int = 500,
+    ):
+        """
+        Inicializa o backend.
+
+        Args:
+            intervalo_poll: Segundos entre leituras do log
+            retencao_segundos: Idade máxima dos eventos mantidos no log
+            lote: Máximo de eventos lidos por consulta
+        """
+        super().__init__()
+        self.intervalo_poll = intervalo_poll
+        self.retencao_segundos = retencao_segundos
+        self.lote = lote
+        self._ultimo_id = 0
+        self._tarefa: Optional[asyncio.Task] = None
+        self._despertar: Optional[asyncio.Future] = None
+        self._leitura: Optional[asyncio.Lock] = None
+        self._proxima_limpeza = 0.0
+        self._total_publicados = 0
+        self._total_entregues = 0
+
+    async def iniciar(self, entregar: Entregador) -> None:
+        self._entregar = entregar
+        loop = asyncio.get_running_loop()
+        if self._tarefa is not None and not self._tarefa.done() and self._tarefa.get_loop() is loop:
+            return
+
+        await executar_db(chat_evento_repo.criar_tabela)
+        # Eventos anteriores à inicialização não são reentregues
+        self._ultimo_id = await executar_db(chat_evento_repo.obter_ultimo_id)
+        self._leitura = asyncio.Lock()
+        self._tarefa = loop.create_task(self._acompanhar_log())
+        logger.info(f"[ChatBroadcast] Backend sqlite iniciado a partir do evento {self._ultimo_id}")
+
+    async def publicar(self, usuario_ids: List[int], evento: dict) -> None:
+        await executar_db(chat_evento_repo.inserir, usuario_ids, evento)
+        self._total_publicados += len(usuario_ids)
+        self._acordar()
+
+    def _acordar(self) -> None:
+        """Interrompe a espera da tarefa de polling para processar o log imediatamente."""
+        if self._despertar is not None and not self._despertar.done():
+            self._despertar.set_result(None)
+
+    async def processar_pendentes(self) -> int:
+        """
+        Lê os eventos novos do log e os entrega localmente.
+
+        Returns:
+            Número de eventos processados
+        """
+        # Serializa leituras para que o mesmo evento não seja entregue duas vezes
+        async with self._leitura:
+            eventos = await executar_db(chat_evento_repo.listar_posteriores, self._ultimo_id, self.lote)
+            for evento in eventos:
+                self._ultimo_id = evento.id
+                await self._entregar(evento.usuario_id, evento.dados)
+            self._total_entregues += len(eventos)
+            return len(eventos)
+
+    async def _limpar_log(self) -> None:
+        """Remove eventos mais antigos que a retenção (no máximo uma vez por minuto)."""
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._proxima_limpeza:
+            return
+        self._proxima_limpeza = loop.time() + 60
+        limite = agora() - timedelta(seconds=self.retencao_segundos)
+        removidos = await executar_db(chat_evento_repo.excluir_anteriores, limite)
+        if removidos:
+            logger.debug(f"[ChatBroadcast] {removidos} eventos antigos removidos do log")
+
+    async def _acompanhar_log(self) -> None:
+        """Tarefa de polling: entrega eventos novos e limpa o log periodicamente."""
+        while True:
+            try:
+                # Esvazia o backlog antes de voltar a dormir
+                while await self.processar_pendentes() >= self.lote:
+                    pass
+                await self._limpar_log()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[ChatBroadcast] Erro ao processar log de eventos: {e}")
+
+            # Dorme até o próximo ciclo ou até uma publicação local
+            loop = asyncio.get_running_loop()
+            self._despertar = loop.create_future()
+            temporizador = loop.call_later(self.intervalo_poll, self._acordar)
+            try:
+                await self._despertar
+            finally:
+                temporizador.cancel()
+
+    async def encerrar(self) -> None:
+        tarefa, self._tarefa = self._tarefa, None
+        if tarefa is not None and not tarefa.done():
+            tarefa.cancel()
+            try:
+                await tarefa
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+
+    def obter_estatisticas(self) -> dict:
+        return {
+            "backend": self.nome,
+            "ultimo_evento_id": self._ultimo_id,
+            "total_publicados": self._total_publicados,
+            "total_entregues": self._total_entregues,
+        }
+
+
+# Registro de backends disponíveis: nome -> classe
+BACKENDS: Dict[str, Type[BroadcastBackend]] = {
+    BroadcastLocal.nome: BroadcastLocal,
+    BroadcastSQLite.nome: BroadcastSQLite,
+}
+
+
+def criar_backend(nome: str = CHAT_BROADCAST_BACKEND) -> BroadcastBackend:
+    """
+    Cria o backend de broadcast configurado.
+
+    Args:
+        nome: Nome do backend (local ou sqlite)
+
+    Returns:
+        Instância do backend
+
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    classe = BACKENDS.get(nome.strip().lower())
+    if classe is None:
+        raise ValueError(
+            f"CHAT_BROADCAST_BACKEND inválido: {nome!r} (opções: {', '.join(BACKENDS)})"
+        )
+    return classe()
@@ -1,64 +1,521 @@
 """
 Gerenciador de conexões SSE do chat.
 Mantém conexões ativas e faz broadcast de mensagens para usuários conectados.
+
+A publicação passa por um backend de broadcast (util.chat_broadcast), o que
+permite entregar mensagens a conexões mantidas por outros workers.
+
+Cada evento recebe um ID no formato "<epoca>-<seq>-<ultima_mensagem_id>":
+- epoca: identifica esta instância do ChatManager (muda a cada processo)
+- seq: sequência de eventos do usuário nesta instância
+- ultima_mensagem_id: maior ID de chat_mensagem entregue ao usuário até o evento
+
+Ao reconectar, o navegador envia o último ID recebido (Last-Event-ID). Se a
+época for a mesma e os eventos seguintes ainda estiverem no histórico em
+memória do usuário, eles são reenviados; caso contrário, a rota reenvia as
+mensagens de chat_mensagem posteriores a ultima_mensagem_id.
 """
 import asyncio
-from typing import Dict, Set
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+from util.chat_broadcast import BroadcastBackend, criar_backend
 from util.logger_config import logger
 
+# Máximo de conexões SSE simultâneas por usuário (abas/dispositivos)
+CHAT_MAX_CONEXOES_POR_USUARIO = int(os.getenv("CHAT_MAX_CONEXOES_POR_USUARIO", "5"))
+# Máximo de eventos pendentes por conexão
+CHAT_FILA_MAX_EVENTOS = int(os.getenv("CHAT_FILA_MAX_EVENTOS", "100"))
+# Política com a fila cheia: coalescer, descartar_antigos ou descartar_novos
+CHAT_FILA_POLITICA = os.getenv("CHAT_FILA_POLITICA", "coalescer")
+# Segundos com a fila cheia até a conexão ser encerrada (consumidor lento)
+CHAT_FILA_PRAZO_EVICCAO_SEGUNDOS = float(os.getenv("CHAT_FILA_PRAZO_EVICCAO_SEGUNDOS", "30"))
+# Intervalo entre comentários de heartbeat no stream SSE
+CHAT_SSE_HEARTBEAT_SEGUNDOS = float(os.getenv("CHAT_SSE_HEARTBEAT_SEGUNDOS", "15"))
+# Eventos recentes mantidos em memória por usuário para reenvio (Last-Event-ID)
+CHAT_SSE_REPLAY_EVENTOS = int(os.getenv("CHAT_SSE_REPLAY_EVENTOS", "100"))
+# Por quanto tempo o histórico é mantido após o usuário desconectar
+CHAT_SSE_REPLAY_SEGUNDOS = float(os.getenv("CHAT_SSE_REPLAY_SEGUNDOS", "120"))
+
+POLITICAS_FILA = ("coalescer", "descartar_antigos", "descartar_novos")
+
+# Eventos idempotentes: um pendente por sala basta
+EVENTOS_COALESCIVEIS = {"atualizar_contador"}
+
+# Resultados de FilaEventos.colocar()
+ENFILEIRADO = "enfileirado"
+COALESCIDO = "coalescido"
+DESCARTADO = "descartado"
+
+# Motivos de encerramento de uma conexão pelo servidor
+MOTIVO_SUBSTITUIDA = "substituida"
+MOTIVO_LENTIDAO = "lentidao"
+
+
+@dataclass
+class EventoSSE:
+    """
+    Evento SSE numerado.
+
+    Attributes:
+        seq: Sequência do evento para o usuário
+        dados: Dicionário enviado no campo data
+        ultima_mensagem_id: Maior ID de mensagem entregue ao usuário até este evento
+    """
+    seq: int
+    dados: dict
+    ultima_mensagem_id: int = 0
+
+
+class HistoricoUsuario:
+    """
+    Eventos recentes de um usuário, usados para reenvio após reconexão.
+
+    Attributes:
+        eventos: Últimos eventos (tamanho limitado)
+        ultimo_seq: Sequência do último evento registrado
+        ultima_mensagem_id: Maior ID de mensagem registrado
+        desconectado_em: Instante (time.monotonic) da última desconexão, None se conectado
+    """
+
+    def __init__(self, max_eventos: int = CHAT_SSE_REPLAY_EVENTOS):
+        self.eventos: Deque[EventoSSE] = deque(maxlen=max_eventos)
+        self.ultimo_seq = 0
+        self.ultima_mensagem_id = 0
+        self.desconectado_em: Optional[float] = None
+
+    def registrar(self, dados: dict) -> EventoSSE:
+        """
+        Numera e guarda um evento.
+
+        Args:
+            dados: Dicionário do evento
+
+        Returns:
+            EventoSSE numerado
+        """
+        mensagem_id = (dados.get("mensagem") or {}).get("id")
+        if isinstance(mensagem_id, int):
+            self.ultima_mensagem_id = max(self.ultima_mensagem_id, mensagem_id)
+        self.ultimo_seq += 1
+        evento = EventoSSE(self.ultimo_seq, dados, self.ultima_mensagem_id)
+        self.eventos.append(evento)
+        return evento
+
+    def eventos_apos(self, seq: int) -> Optional[List[EventoSSE]]:
+        """
+        Retorna os eventos posteriores a uma sequência.
+
+        Args:
+            seq: Última sequência recebida pelo cliente
+
+        Returns:
+            Eventos com sequência maior que seq, ou None se parte deles
+            já saiu do histórico (ou seq é desconhecida)
+        """
+        if seq > self.ultimo_seq:
+            return None
+        primeiro_seq = self.eventos[0].seq if self.eventos else self.ultimo_seq + 1
+        if seq + 1 < primeiro_seq:
+            return None
+        return [evento for evento in self.eventos if evento.seq > seq]
+
+
+class FilaEventos:
+    """
+    Fila limitada de eventos SSE de uma conexão.
+
+    Com a fila cheia, aplica a política configurada em vez de crescer sem
+    limite:
+    - coalescer: ignora eventos idempotentes já pendentes (ex: atualizar_contador
+      da mesma sala) e, se ainda estiver cheia, descarta o evento mais antigo
+    - descartar_antigos: descarta o evento mais antigo
+    - descartar_novos: descarta o evento recebido
+
+    O consumidor retira todos os eventos pendentes de uma vez (obter_lote),
+    para que sejam enviados em uma única escrita. Há um único consumidor
+    por fila (o stream SSE da conexão).
+    """
+
+    def __init__(self, max_eventos: int = CHAT_FILA_MAX_EVENTOS, politica: str = CHAT_FILA_POLITICA):
+        """
+        Inicializa a fila.
+
+        Args:
+            max_eventos: Capacidade máxima
+            politica: Política aplicada com a fila cheia
+        """
+        if max_eventos <= 0:
+            raise ValueError("max_eventos deve ser positivo")
+        if politica not in POLITICAS_FILA:
+            raise ValueError(f"Política de fila inválida: {politica!r} (opções: {', '.join(POLITICAS_FILA)})")
+
+        self.max_eventos = max_eventos
+        self.politica = politica
+        self._eventos: Deque[EventoSSE] = deque()
+        self._aguardando: Optional[asyncio.Future] = None
+        self._encerrada = False
+        self.motivo_encerramento: Optional[str] = None
+        # Instante (time.monotonic) em que a fila ficou cheia; None se há espaço
+        self.cheia_desde: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._eventos)
+
+    def _chave_coalescencia(self, evento: EventoSSE) -> Optional[tuple]:
+        tipo = evento.dados.get("tipo")
+        if tipo in EVENTOS_COALESCIVEIS:
+            return (tipo, evento.dados.get("sala_id"))
+        return None
+
+    def _acordar(self):
+        """Libera o consumidor que aguarda em obter_lote()."""
+        if self._aguardando is not None and not self._aguardando.done():
+            self._aguardando.set_result(None)
+
+    def colocar(self, evento: EventoSSE) -> str:
+        """
+        Enfileira um evento sem bloquear.
+
+        Args:
+            evento: Evento SSE numerado
+
+        Returns:
+            ENFILEIRADO, COALESCIDO (evento equivalente já pendente)
+            ou DESCARTADO (um evento foi perdido por falta de espaço)
+        """
+        if self._encerrada:
+            return DESCARTADO
+
+        if self.politica == "coalescer":
+            chave = self._chave_coalescencia(evento)
+            if chave is not None and any(self._chave_coalescencia(e) == chave for e in self._eventos):
+                return COALESCIDO
+
+        resultado = ENFILEIRADO
+        if len(self._eventos) >= self.max_eventos:
+            if self.cheia_desde is None:
+                self.cheia_desde = time.monotonic()
+            if self.politica == "descartar_novos":
+                return DESCARTADO
+            self._eventos.popleft()
+            resultado = DESCARTADO
+
+        self._eventos.append(evento)
+        self._acordar()
+        return resultado
+
+    async def obter_lote(
+        self,
+        max_lote: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Optional[List[EventoSSE]]:
+        """
+        Aguarda e retira os eventos pendentes.
+
+        Args:
+            max_lote: Máximo de eventos retirados de uma vez (padrão: todos)
+            timeout: Segundos máximos de espera (padrão: sem limite)
+
+        Returns:
+            Lista de eventos (vazia se o timeout expirar), ou None se a fila foi encerrada
+        """
+        if not self._eventos and not self._encerrada:
+            loop = asyncio.get_running_loop()
+            self._aguardando = loop.create_future()
+            temporizador = loop.call_later(timeout, self._acordar) if timeout is not None else None
+            try:
+                await self._aguardando
+            finally:
+                self._aguardando = None
+                if temporizador is not None:
+                    temporizador.cancel()
+
+        if self._encerrada:
+            return None
+
+        quantidade = len(self._eventos) if max_lote is None else min(max_lote, len(self._eventos))
+        lote = [self._eventos.popleft() for _ in range(quantidade)]
+        self.cheia_desde = None
+        return lote
+
+    def obter_nowait(self) -> Optional[EventoSSE]:
+        """
+        Retira o próximo evento sem aguardar.
+
+        Returns:
+            Próximo evento, ou None se a fila estiver vazia ou encerrada
+        """
+        if self._encerrada or not self._eventos:
+            return None
+        self.cheia_desde = None
+        return self._eventos.popleft()
+
+    def encerrar(self, motivo: Optional[str] = None):
+        """
+        Encerra a fila: o consumidor recebe None e os eventos pendentes são descartados.
+
+        Args:
+            motivo: Motivo do encerramento (MOTIVO_SUBSTITUIDA ou MOTIVO_LENTIDAO)
+        """
+        self._encerrada = True
+        self.motivo_encerramento = motivo
+        self._eventos.clear()
+        self._acordar()
+
+    @property
+    def encerrada(self) -> bool:
+        return self._encerrada
+
+
+@dataclass
+class ConexaoSSE:
+    """
+    Uma conexão SSE aberta (uma aba ou dispositivo do usuário).
+
+    Attributes:
+        id: Identificador único da conexão
+        usuario_id: ID do usuário dono da conexão
+        fila: Fila limitada de eventos a enviar
+        replay_banco_desde: Se definido, as mensagens com ID maior que este
+            devem ser reenviadas a partir do banco (histórico em memória insuficiente)
+    """
+    usuario_id: int
+    fila: FilaEventos = field(default_factory=FilaEventos)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    replay_banco_desde: Optional[int] = None
+
+    def encerrar(self, motivo: Optional[str] = None):
+        """
+        Sinaliza ao stream SSE que a conexão deve ser finalizada.
+
+        Args:
+            motivo: Motivo do encerramento
+        """
+        self.fila.encerrar(motivo)
+
 
 class ChatManager:
     """
     Gerencia conexões SSE para o sistema de chat.
 
-    Cada usuário tem UMA conexão SSE que recebe mensagens de TODAS as suas salas.
-    Quando uma mensagem é enviada em uma sala, o ChatManager faz broadcast
-    para ambos os participantes da sala (se estiverem conectados).
+    Cada conexão SSE recebe mensagens de TODAS as salas do usuário, e um
+    usuário pode manter várias conexões (abas) ao mesmo tempo, até o limite
+    max_conexoes_por_usuario. Quando uma mensagem é enviada em uma sala, o
+    ChatManager faz broadcast para todas as conexões dos dois participantes.
+
+    Os eventos de cada usuário são numerados e os mais recentes ficam em
+    memória por replay_segundos após a desconexão, para reenvio na reconexão.
     """
 
-    def __init__(self):
-        # Dicionário de filas: usuario_id -> asyncio.Queue
-        self._connections: Dict[int, asyncio.Queue] = {}
-        # Set de usuários com conexão ativa
-        self._active_connections: Set[int] = set()
+    def __init__(
+        self,
+        backend: Optional[BroadcastBackend] = None,
+        max_conexoes_por_usuario: int = CHAT_MAX_CONEXOES_POR_USUARIO,
+        max_eventos_por_fila: int = CHAT_FILA_MAX_EVENTOS,
+        politica_fila: str = CHAT_FILA_POLITICA,
+        prazo_eviccao_segundos: float = CHAT_FILA_PRAZO_EVICCAO_SEGUNDOS,
+        replay_eventos: int = CHAT_SSE_REPLAY_EVENTOS,
+        replay_segundos: float = CHAT_SSE_REPLAY_SEGUNDOS
+    ):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            backend: Backend de broadcast (padrão: definido por CHAT_BROADCAST_BACKEND)
+            max_conexoes_por_usuario: Limite de conexões simultâneas por usuário
+            max_eventos_por_fila: Capacidade da fila de cada conexão
+            politica_fila: Política aplicada quando a fila está cheia
+            prazo_eviccao_segundos: Tempo com a fila cheia até encerrar a conexão
+            replay_eventos: Eventos mantidos em memória por usuário para reenvio
+            replay_segundos: Tempo que o histórico é mantido após a desconexão
+        """
+        if max_conexoes_por_usuario <= 0:
+            raise ValueError("max_conexoes_por_usuario deve ser positivo")
+        # Valida os parâmetros da fila antes da primeira conexão
+        FilaEventos(max_eventos_por_fila, politica_fila)
+
+        # usuario_id -> {conexao_id: ConexaoSSE}, em ordem de abertura
+        self._connections: Dict[int, Dict[str, ConexaoSSE]] = {}
+        self.max_conexoes_por_usuario = max_conexoes_por_usuario
+        self.max_eventos_por_fila = max_eventos_por_fila
+        self.politica_fila = politica_fila
+        self.prazo_eviccao_segundos = prazo_eviccao_segundos
+        self._total_substituidas = 0
+        self._total_descartados = 0
+        self._total_coalescidos = 0
+        self._total_evictadas = 0
+        # Histórico de eventos para reenvio (Last-Event-ID)
+        self._epoca = uuid.uuid4().hex[:8]
+        self._historicos: Dict[int, HistoricoUsuario] = {}
+        self.replay_eventos = replay_eventos
+        self.replay_segundos = replay_segundos
+        self._total_reenviados = 0
+        # Backend que distribui os eventos entre processos
+        self._backend = backend or criar_backend()
+
+    async def _garantir_backend(self):
+        """Inicia o backend de broadcast no event loop atual (idempotente)."""
+        await self._backend.iniciar(self._entregar_local)
+
+    def id_evento(self, evento: EventoSSE) -> str:
+        """
+        Formata o ID SSE de um evento.
+
+        Args:
+            evento: Evento numerado
+
+        Returns:
+            ID no formato "<epoca>-<seq>-<ultima_mensagem_id>"
+        """
+        return f"{self._epoca}-{evento.seq}-{evento.ultima_mensagem_id}"
+
+    def id_inicial(self, usuario_id: int, ultima_mensagem_id: int) -> str:
+        """
+        Formata o ID enviado na abertura do stream, antes de qualquer evento.
+
+        Garante que o navegador tenha um Last-Event-ID mesmo que a conexão
+        caia antes do primeiro evento.
+
+        Args:
+            usuario_id: ID do usuário
+            ultima_mensagem_id: Maior ID de chat_mensagem no momento da conexão
+
+        Returns:
+            ID no formato "<epoca>-<seq>-<ultima_mensagem_id>"
+        """
+        historico = self._historicos.get(usuario_id) or HistoricoUsuario(self.replay_eventos)
+        ultima = max(historico.ultima_mensagem_id, ultima_mensagem_id)
+        return f"{self._epoca}-{historico.ultimo_seq}-{ultima}"
+
+    def _limpar_historicos(self):
+        """Remove históricos de usuários desconectados há mais de replay_segundos."""
+        limite = time.monotonic() - self.replay_segundos
+        expirados = [
+            usuario_id for usuario_id, historico in self._historicos.items()
+            if historico.desconectado_em is not None and historico.desconectado_em < limite
+        ]
+        for usuario_id in expirados:
+            del self._historicos[usuario_id]
 
-    async def connect(self, usuario_id: int) -> asyncio.Queue:
+    def _preparar_replay(self, conexao: ConexaoSSE, historico: HistoricoUsuario, ultimo_evento_id: str):
+        """
+        Enfileira na nova conexão os eventos perdidos desde ultimo_evento_id.
+
+        Usa o histórico em memória quando possível; caso contrário marca a
+        conexão para reenvio a partir do banco (replay_banco_desde).
+
+        Args:
+            conexao: Conexão recém-criada
+            historico: Histórico do usuário
+            ultimo_evento_id: Valor do cabeçalho Last-Event-ID
+        """
+        try:
+            epoca, seq, ultima_mensagem_id = ultimo_evento_id.split("-")
+            seq = int(seq)
+            ultima_mensagem_id = int(ultima_mensagem_id)
+        except ValueError:
+            logger.debug(f"[ChatManager] Last-Event-ID inválido ignorado: {ultimo_evento_id!r}")
+            return
+
+        eventos = historico.eventos_apos(seq) if epoca == self._epoca else None
+        if eventos is None:
+            conexao.replay_banco_desde = ultima_mensagem_id
+            return
+
+        for evento in eventos:
+            conexao.fila.colocar(evento)
+        self._total_reenviados += len(eventos)
+
+    async def connect(self, usuario_id: int, ultimo_evento_id: Optional[str] = None) -> ConexaoSSE:
         """
         Registra nova conexão SSE para um usuário.
 
+        Se o usuário já estiver no limite de conexões, a conexão mais antiga
+        é encerrada para dar lugar à nova.
+
         Args:
             usuario_id: ID do usuário conectando
+            ultimo_evento_id: Last-Event-ID enviado pelo navegador na reconexão
 
         Returns:
-            Queue para envio de mensagens SSE
+            ConexaoSSE com a fila de eventos da nova conexão (já contendo os
+            eventos reenviados do histórico em memória, se houver)
         """
-        queue = asyncio.Queue()
-        self._connections[usuario_id] = queue
-        self._active_connections.add(usuario_id)
+        await self._garantir_backend()
+        self._limpar_historicos()
+
+        conexoes = self._connections.setdefault(usuario_id, {})
+        while len(conexoes) >= self.max_conexoes_por_usuario:
+            mais_antiga_id = next(iter(conexoes))
+            mais_antiga = conexoes.pop(mais_antiga_id)
+            mais_antiga.encerrar(MOTIVO_SUBSTITUIDA)
+            self._total_substituidas += 1
+            logger.info(
+                f"[ChatManager] Limite de {self.max_conexoes_por_usuario} conexões atingido para "
+                f"usuário {usuario_id}. Conexão {mais_antiga_id} encerrada"
+            )
+
+        conexao = ConexaoSSE(
+            usuario_id=usuario_id,
+            fila=FilaEventos(self.max_eventos_por_fila, self.politica_fila)
+        )
+        conexoes[conexao.id] = conexao
 
-        logger.info(f"[ChatManager] Usuário {usuario_id} conectado. Total conexões: {len(self._active_connections)}")
+        historico = self._historicos.get(usuario_id)
+        if historico is None:
+            historico = self._historicos[usuario_id] = HistoricoUsuario(self.replay_eventos)
+        historico.desconectado_em = None
+        if ultimo_evento_id:
+            self._preparar_replay(conexao, historico, ultimo_evento_id)
 
-        return queue
+        logger.info(
+            f"[ChatManager] Usuário {usuario_id} conectado (conexão {conexao.id}, "
+            f"{len(conexoes)} do usuário). Total usuários: {len(self._connections)}"
+        )
 
-    async def disconnect(self, usuario_id: int):
+        return conexao
+
+    async def disconnect(self, usuario_id: int, conexao_id: str):
         """
-        Remove conexão SSE de um usuário.
+        Remove uma conexão SSE de um usuário.
+
+        As demais conexões do usuário permanecem ativas.
 
         Args:
             usuario_id: ID do usuário desconectando
+            conexao_id: ID da conexão retornada por connect()
         """
-        if usuario_id in self._connections:
+        conexoes = self._connections.get(usuario_id)
+        if conexoes is None:
+            return
+
+        conexoes.pop(conexao_id, None)
+        if not conexoes:
             del self._connections[usuario_id]
+            self._marcar_desconectado(usuario_id)
 
-        if usuario_id in self._active_connections:
-            self._active_connections.remove(usuario_id)
+        logger.info(
+            f"[ChatManager] Usuário {usuario_id} desconectado (conexão {conexao_id}). "
+            f"Total usuários: {len(self._connections)}"
+        )
 
-        logger.info(f"[ChatManager] Usuário {usuario_id} desconectado. Total conexões: {len(self._active_connections)}")
+    def _marcar_desconectado(self, usuario_id: int):
+        """Inicia a contagem de retenção do histórico do usuário."""
+        historico = self._historicos.get(usuario_id)
+        if historico is not None:
+            historico.desconectado_em = time.monotonic()
 
     async def broadcast_para_sala(self, sala_id: str, mensagem_dict: dict):
         """
         Envia mensagem SSE para ambos os participantes de uma sala.
 
+        A mensagem é publicada no backend de broadcast, que a entrega às
+        conexões de cada participante em qualquer worker.
+
         Args:
             sala_id: ID da sala (formato: "menor_id_maior_id")
             mensagem_dict: Dicionário com dados da mensagem a enviar
@@ -76,13 +533,62 @@ class ChatManager:
             logger.error(f"[ChatManager] Erro ao parsear IDs do sala_id: {sala_id}")
             return
 
-        # Enviar para cada participante se estiver conectado
-        for usuario_id in [usuario1_id, usuario2_id]:
-            if usuario_id in self._connections:
-                await self._connections[usuario_id].put(mensagem_dict)
-                logger.debug(f"[ChatManager] Mensagem enviada para usuário {usuario_id} via SSE")
-            else:
-                logger.debug(f"[ChatManager] Usuário {usuario_id} não está conectado (não receberá via SSE)")
+        await self._garantir_backend()
+        await self._backend.publicar([usuario1_id, usuario2_id], mensagem_dict)
+
+    async def _entregar_local(self, usuario_id: int, mensagem_dict: dict):
+        """
+        Numera o evento no histórico do usuário e o coloca na fila de cada
+        conexão dele neste processo. Usuários desconectados recentemente só
+        têm o evento guardado no histórico, para reenvio na reconexão.
+
+        Nunca bloqueia: filas cheias aplicam a política configurada, e conexões
+        cuja fila permanece cheia além do prazo são encerradas (consumidor lento).
+
+        Args:
+            usuario_id: ID do usuário destinatário
+            mensagem_dict: Dicionário com dados da mensagem
+        """
+        historico = self._historicos.get(usuario_id)
+        if historico is None:
+            logger.debug(f"[ChatManager] Usuário {usuario_id} não está conectado (não receberá via SSE)")
+            return
+
+        evento = historico.registrar(mensagem_dict)
+        conexoes = self._connections.get(usuario_id)
+        if not conexoes:
+            return
+
+        for conexao in list(conexoes.values()):
+            resultado = conexao.fila.colocar(evento)
+            if resultado == COALESCIDO:
+                self._total_coalescidos += 1
+            elif resultado == DESCARTADO:
+                self._total_descartados += 1
+
+            cheia_desde = conexao.fila.cheia_desde
+            if cheia_desde is not None and time.monotonic() - cheia_desde >= self.prazo_eviccao_segundos:
+                self._evictar(conexao)
+        logger.debug(f"[ChatManager] Mensagem enviada para usuário {usuario_id} via SSE ({len(conexoes)} conexões)")
+
+    def _evictar(self, conexao: ConexaoSSE):
+        """
+        Encerra uma conexão cujo consumidor não acompanha o ritmo dos eventos.
+
+        Args:
+            conexao: Conexão a encerrar
+        """
+        conexoes = self._connections.get(conexao.usuario_id, {})
+        conexoes.pop(conexao.id, None)
+        if not conexoes:
+            self._connections.pop(conexao.usuario_id, None)
+            self._marcar_desconectado(conexao.usuario_id)
+        conexao.encerrar(MOTIVO_LENTIDAO)
+        self._total_evictadas += 1
+        logger.warning(
+            f"[ChatManager] Conexão {conexao.id} do usuário {conexao.usuario_id} encerrada: "
+            f"fila cheia há mais de {self.prazo_eviccao_segundos}s"
+        )
 
     def is_connected(self, usuario_id: int) -> bool:
         """
@@ -94,7 +600,7 @@ class ChatManager:
         Returns:
             True se conectado, False caso contrário
         """
-        return usuario_id in self._active_connections
+        return usuario_id in self._connections
 
     def obter_estatisticas(self) -> dict:
         """
@@ -103,12 +609,28 @@ class ChatManager:
         Returns:
             Dicionário com estatísticas
         """
+        filas = [len(conexao.fila) for conexoes in self._connections.values() for conexao in conexoes.values()]
         return {
-            "total_conexoes": len(self._connections),
-            "usuarios_ativos": list(self._active_connections),
-            "total_usuarios_ativos": len(self._active_connections)
+            "total_conexoes": len(filas),
+            "usuarios_ativos": list(self._connections),
+            "total_usuarios_ativos": len(self._connections),
+            "max_conexoes_por_usuario": self.max_conexoes_por_usuario,
+            "total_conexoes_substituidas": self._total_substituidas,
+            "politica_fila": self.politica_fila,
+            "max_eventos_por_fila": self.max_eventos_por_fila,
+            "maior_fila": max(filas, default=0),
+            "total_eventos_descartados": self._total_descartados,
+            "total_eventos_coalescidos": self._total_coalescidos,
+            "total_conexoes_evictadas": self._total_evictadas,
+            "historicos_em_memoria": len(self._historicos),
+            "total_eventos_reenviados": self._total_reenviados,
+            "broadcast": self._backend.obter_estatisticas()
         }
 
+    async def encerrar(self):
+        """Encerra o backend de broadcast (chamado no shutdown da aplicação)."""
+        await self._backend.encerrar()
+
 
 # Instância singleton global
 chat_manager = ChatManager()
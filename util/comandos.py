@@ -0,0 +1,279 @@
+"""
+Comandos administrativos de manutenção executados pela linha de comando.
+
+Uso:
+    python -m util.comandos <comando>
+
+Comandos disponíveis:
+    migrar                    Aplica as migrações de esquema pendentes
+    reparar-contadores-chat   Recalcula os contadores de mensagens não lidas do chat
+    reconstruir-busca [entidade ...]
+                              Reconstrói os índices de busca textual (FTS5)
+    verificar-indices         Aponta consultas de sql/ que fazem varredura completa
+    perfil-inicializacao [--top N] [--orcamento-ms MS]
+                              Mede o tempo até /health responder e as importações mais lentas
+    precompilar-templates     Compila os templates e grava o bytecode em TEMPLATES_CACHE_DIR
+"""
+import argparse
+import importlib
+import sys
+from typing import Callable, Dict, Optional, Sequence
+
+from util.logger_config import logger
+
+
+def reparar_contadores_chat(args: argparse.Namespace) -> int:
+    """
+    Recalcula os contadores materializados de não lidas do chat.
+
+    Args:
+        args: Argumentos da linha de comando
+
+    Returns:
+        Código de saída (0 = sucesso)
+    """
+    from repo import chat_participante_repo
+    from util.migracoes import aplicar_migracoes
+
+    aplicar_migracoes()
+    corrigidos = chat_participante_repo.recalcular_nao_lidas()
+    logger.info(f"Contadores de não lidas corrigidos: {corrigidos}")
+    print(f"Contadores de não lidas corrigidos: {corrigidos}")
+    return 0
+
+
+# Entidades com índice de busca textual: nome -> módulo do repositório
+INDICES_BUSCA: Dict[str, str] = {
+    "usuario": "repo.usuario_repo",
+    "animal": "repo.animal_repo",
+    "adotante": "repo.adotante_repo",
+    "endereco": "repo.endereco_repo",
+    "solicitacao": "repo.solicitacao_repo",
+    "adocao": "repo.adocao_repo",
+    "visita": "repo.visita_repo",
+}
+
+
+def migrar(args: argparse.Namespace) -> int:
+    """
+    Aplica as migrações de esquema pendentes e lista as já aplicadas.
+
+    Args:
+        args: Argumentos da linha de comando
+
+    Returns:
+        Código de saída (0 = sucesso)
+    """
+    from repo import migracao_repo
+    from util.migracoes import aplicar_migracoes
+
+    aplicadas = aplicar_migracoes()
+    for migracao in migracao_repo.listar():
+        print(f"{migracao['versao']:>4}  {migracao['aplicada_em']:%Y-%m-%d %H:%M:%S}  {migracao['descricao']}")
+    print(f"Migrações aplicadas agora: {aplicadas}")
+    return 0
+
+
+def reconstruir_busca(args: argparse.Namespace) -> int:
+    """
+    Reconstrói os índices FTS5 de busca textual.
+
+    Args:
+        args: Argumentos da linha de comando (entidades: lista opcional de
+            entidades; vazia reconstrói todas)
+
+    Returns:
+        Código de saída (0 = sucesso)
+    """
+    from util.migracoes import aplicar_migracoes
+
+    aplicar_migracoes()
+    for entidade in args.entidades or list(INDICES_BUSCA):
+        repo = importlib.import_module(INDICES_BUSCA[entidade])
+        indexados = repo.reconstruir_indice_busca()
+        logger.info(f"Índice de busca de {entidade} reconstruído: {indexados} registros")
+        print(f"Índice de busca de {entidade} reconstruído: {indexados} registros")
+    return 0
+
+
+def _entidade_busca(valor: str) -> str:
+    """Valida o nome de uma entidade com índice de busca (argparse type)."""
+    if valor not in INDICES_BUSCA:
+        raise argparse.ArgumentTypeError(
+            f"entidade inválida: {valor!r} (opções: {', '.join(INDICES_BUSCA)})"
+        )
+    return valor
+
+
+def _argumentos_reconstruir_busca(parser: argparse.ArgumentParser) -> None:
+    """Declara os argumentos do comando reconstruir-busca."""
+    # choices com nargs="*" rejeita a lista vazia no argparse; valida via type
+    parser.add_argument(
+        "entidades",
+        nargs="*",
+        type=_entidade_busca,
+        metavar="entidade",
+        help=f"Entidades a reconstruir ({', '.join(INDICES_BUSCA)}); padrão: todas",
+    )
+
+
+def verificar_indices(args: argparse.Namespace) -> int:
+    """
+    Roda EXPLAIN QUERY PLAN sobre as consultas de sql/ e aponta varreduras completas.
+
+    Args:
+        args: Argumentos da linha de comando
+
+    Returns:
+        Código de saída (0 = nenhuma varredura, 1 = consultas sem índice)
+    """
+    from util.plano_consultas import verificar_planos
+
+    problemas = verificar_planos()
+    for nome, varreduras in problemas.items():
+        print(f"{nome}: {'; '.join(varreduras)}")
+    if problemas:
+        logger.warning(f"Consultas com varredura completa: {len(problemas)}")
+        return 1
+    print("Nenhuma consulta frequente faz varredura completa")
+    return 0
+
+
+def perfil_inicializacao(args: argparse.Namespace) -> int:
+    """
+    Mede a inicialização da aplicação e lista as importações mais lentas.
+
+    Args:
+        args: Argumentos da linha de comando (top, orcamento_ms)
+
+    Returns:
+        Código de saída (0 = dentro do orçamento, 1 = acima do orçamento)
+    """
+    from util.perfil_inicializacao import medir_inicializacao
+
+    relatorio = medir_inicializacao()
+    print(f"{'acumulado':>10} {'próprio':>9}  módulo (ms)")
+    for importacao in relatorio.mais_lentas(args.top):
+        print(
+            f"{importacao.acumulado_us / 1000:>10.1f} {importacao.proprio_us / 1000:>9.1f}  "
+            f"{importacao.modulo}"
+        )
+    print(f"Tempo até /health responder: {relatorio.tempo_health_ms:.0f} ms "
+          f"(orçamento: {args.orcamento_ms} ms)")
+    if relatorio.tempo_health_ms > args.orcamento_ms:
+        logger.warning(f"Inicialização acima do orçamento: {relatorio.tempo_health_ms:.0f} ms")
+        return 1
+    return 0
+
+
+def _argumentos_perfil_inicializacao(parser: argparse.ArgumentParser) -> None:
+    """Declara os argumentos do comando perfil-inicializacao."""
+    from util.perfil_inicializacao import INICIALIZACAO_ORCAMENTO_MS
+
+    parser.add_argument("--top", type=int, default=25, help="Quantidade de módulos listados")
+    parser.add_argument(
+        "--orcamento-ms",
+        type=int,
+        default=INICIALIZACAO_ORCAMENTO_MS,
+        help="Tempo máximo até /health responder (padrão: INICIALIZACAO_ORCAMENTO_MS)",
+    )
+
+
+def precompilar_templates(args: argparse.Namespace) -> int:
+    """
+    Compila todos os templates, gravando o bytecode no cache em disco.
+
+    Args:
+        args: Argumentos da linha de comando
+
+    Returns:
+        Código de saída (0 = sucesso, 1 = template com erro de sintaxe)
+    """
+    from jinja2 import TemplateSyntaxError
+    from util.template_util import TEMPLATES_CACHE_DIR, precompilar_templates as precompilar
+
+    try:
+        compilados = precompilar()
+    except TemplateSyntaxError as e:
+        logger.error(f"Erro de sintaxe no template {e.name}, linha {e.lineno}: {e.message}")
+        print(f"{e.name}:{e.lineno}: {e.message}")
+        return 1
+    destino = TEMPLATES_CACHE_DIR or "cache em disco desativado"
+    print(f"Templates compilados: {compilados} ({destino})")
+    return 0
+
+
+# Registro de comandos: nome -> (função, descrição, declaração de argumentos opcional)
+COMANDOS: Dict[
+    str,
+    tuple[Callable[[argparse.Namespace], int], str, Optional[Callable[[argparse.ArgumentParser], None]]],
+] = {
+    "migrar": (
+        migrar,
+        "Aplica as migrações de esquema pendentes",
+        None,
+    ),
+    "reparar-contadores-chat": (
+        reparar_contadores_chat,
+        "Recalcula os contadores de mensagens não lidas do chat",
+        None,
+    ),
+    "reconstruir-busca": (
+        reconstruir_busca,
+        "Reconstrói os índices de busca textual (FTS5)",
+        _argumentos_reconstruir_busca,
+    ),
+    "verificar-indices": (
+        verificar_indices,
+        "Aponta consultas de sql/ que fazem varredura completa de tabela",
+        None,
+    ),
+    "perfil-inicializacao": (
+        perfil_inicializacao,
+        "Mede o tempo até /health responder e as importações mais lentas",
+        _argumentos_perfil_inicializacao,
+    ),
+    "precompilar-templates": (
+        precompilar_templates,
+        "Compila os templates e grava o bytecode em TEMPLATES_CACHE_DIR",
+        None,
+    ),
+}
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Cria o parser de argumentos com um subcomando por entrada de COMANDOS.
+
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m util.comandos",
+        description="Comandos de manutenção do PetLar",
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    for nome, (funcao, descricao, declarar_argumentos) in COMANDOS.items():
+        subparser = subparsers.add_parser(nome, help=descricao)
+        if declarar_argumentos is not None:
+            declarar_argumentos(subparser)
+        subparser.set_defaults(funcao=funcao)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Ponto de entrada da linha de comando.
+
+    Args:
+        argv: Argumentos (padrão: sys.argv[1:])
+
+    Returns:
+        Código de saída
+    """
+    args = criar_parser().parse_args(argv)
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
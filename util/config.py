@@ -63,6 +63,17 @@ PASSWORD_MAX_LENGTH = int(os.getenv("PASSWORD_MAX_LENGTH", "128"))
 TOAST_AUTO_HIDE_DELAY_MS = int(os.getenv("TOAST_AUTO_HIDE_DELAY_MS", "5000"))
 
 # === Configurações de Rate Limiting ===
+# Algoritmo dos limiters: "janela" (janela deslizante) ou "token_bucket"
+RATE_LIMIT_ALGORITMO = os.getenv("RATE_LIMIT_ALGORITMO", "janela").lower()
+# Identificadores (IPs) mantidos por limiter; acima disso descarta o usado há mais tempo
+RATE_LIMIT_MAX_IDENTIFICADORES = int(os.getenv("RATE_LIMIT_MAX_IDENTIFICADORES", "10000"))
+# Intervalo da varredura que remove identificadores inativos (0 desativa)
+RATE_LIMIT_VARREDURA_SEGUNDOS = float(os.getenv("RATE_LIMIT_VARREDURA_SEGUNDOS", "60"))
+# Onde fica o estado: "local" (memória de cada worker) ou "sqlite" (comum a todos os workers)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "local").lower()
+# Máximo de fichas que um worker reserva por ida ao banco (backend sqlite)
+RATE_LIMIT_LOTE_MAX = int(os.getenv("RATE_LIMIT_LOTE_MAX", "10"))
+
 # Autenticação
 RATE_LIMIT_LOGIN_MAX = int(os.getenv("RATE_LIMIT_LOGIN_MAX", "5"))
 RATE_LIMIT_LOGIN_MINUTOS = int(os.getenv("RATE_LIMIT_LOGIN_MINUTOS", "5"))
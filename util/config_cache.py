@@ -1,11 +1,149 @@
-from typing import Dict, Any, List
+"""
+Cache de configurações do sistema (tabela configuracao).
+
+Cada processo (worker do uvicorn) mantém as configurações em memória. Toda
+alteração feita por configuracao_repo incrementa a versão das configurações
+no banco. A tarefa verificador_configuracoes compara, a cada
+CONFIG_CACHE_VERIFICACAO_SEGUNDOS, essa versão com a carregada (com
+executar_db, fora do event loop) e, se mudou, recarrega a tabela inteira com
+uma consulta e avisa os observadores. Assim, uma alteração salva em um
+worker chega aos demais sem reiniciar o servidor, e as leituras feitas
+durante as requisições não consultam a versão.
+
+CONFIG_CACHE_TTL_SEGUNDOS força a recarga periódica mesmo sem mudança de
+versão (útil quando o banco é editado por fora da aplicação).
+
+A primeira leitura (e a primeira depois de limpar()) carrega a tabela
+inteira; precarregar() faz o mesmo na inicialização, depois das migrações.
+Com a tabela carregada por inteiro, chaves ausentes retornam o padrão sem
+consultar o banco. Fora disso, a ausência de cada chave consultada fica
+registrada.
+
+obter_int(), obter_float() e obter_bool() guardam o valor já convertido,
+descartado junto com o restante do cache.
+"""
+import asyncio
+import math
+import os
+import time
+from typing import Dict, Any, List, Callable, Optional, Set, Tuple
 import sqlite3
 from repo import configuracao_repo
+from util.db_async import executar_db
 from util.logger_config import logger
 
+# Intervalo entre as consultas à versão das configurações (0 desativa)
+CONFIG_CACHE_VERIFICACAO_SEGUNDOS = float(os.getenv('CONFIG_CACHE_VERIFICACAO_SEGUNDOS', '5'))
+
+# Validade do cache mesmo sem mudança de versão (0 = sem limite)
+CONFIG_CACHE_TTL_SEGUNDOS = float(os.getenv('CONFIG_CACHE_TTL_SEGUNDOS', '0'))
+
+# Observador de alterações: recebe a chave alterada (None = todas)
+Observador = Callable[[Optional[str]], None]
+
+
 class ConfigCache:
     """Cache de configurações do sistema para melhor performance"""
     _cache: Dict[str, Any] = {}
+    # Chaves consultadas que não existem no banco
+    _ausentes: Set[str] = set()
+    # True se _cache contém a tabela inteira (chave fora dele não existe)
+    _completo: bool = False
+    # Valores convertidos: (chave, tipo, padrão) -> valor
+    _tipados: Dict[Tuple[str, str, Any], Any] = {}
+    _observadores: List[Observador] = []
+    # Versão carregada (None = desconhecida, recarrega na próxima verificação)
+    _versao: Optional[int] = None
+    # True até a primeira leitura carregar a tabela (de novo após limpar)
+    _carga_pendente: bool = True
+    _expira_em: float = math.inf
+
+    @classmethod
+    def verificar_alteracoes(cls) -> None:
+        """
+        Recarrega as configurações se a versão no banco mudou ou o TTL venceu
+
+        Acessa o banco: é chamado pela tarefa verificador_configuracoes com
+        executar_db, nunca durante as requisições.
+
+        Raises:
+            Nenhuma exceção - mantém o cache atual em caso de erro
+        """
+        agora = time.monotonic()
+        versao = cls._obter_versao()
+        if versao is None:
+            return
+        if versao != cls._versao or agora >= cls._expira_em:
+            cls._recarregar(versao, agora)
+
+    @classmethod
+    def _obter_versao(cls) -> Optional[int]:
+        """Lê a versão das configurações no banco (None em caso de erro)"""
+        try:
+            return configuracao_repo.obter_versao()
+        except sqlite3.Error as e:
+            if "no such table" in str(e).lower():
+                logger.debug("Tabela 'configuracao' ainda não existe, carga das configurações adiada")
+            else:
+                logger.error(f"Erro ao verificar versão das configurações: {e}")
+            return None
+
+    @classmethod
+    def _carregar_se_pendente(cls) -> None:
+        """Carrega a tabela inteira na primeira leitura (ou na primeira após limpar)"""
+        if not cls._carga_pendente:
+            return
+        cls._carga_pendente = False
+        versao = cls._obter_versao()
+        if versao is not None:
+            cls._recarregar(versao, time.monotonic())
+
+    @classmethod
+    def precarregar(cls) -> int:
+        """
+        Carrega a tabela configuracao inteira com uma única consulta
+
+        Chamado na inicialização, depois das migrações, para que as leituras
+        seguintes (inclusive de chaves inexistentes) não consultem o banco.
+        Os observadores são avisados, pois objetos criados antes da tabela
+        existir podem estar usando valores padrão.
+
+        Returns:
+            Número de configurações carregadas (0 em caso de erro)
+        """
+        cls._carga_pendente = False
+        versao = cls._obter_versao()
+        if versao is None:
+            return 0
+
+        cls._versao = None
+        if not cls._recarregar(versao, time.monotonic()):
+            return 0
+        cls._notificar(None)
+        return len(cls._cache)
+
+    @classmethod
+    def _recarregar(cls, versao: int, agora: float) -> bool:
+        """Substitui o cache pela tabela inteira e avisa os observadores"""
+        try:
+            configuracoes = configuracao_repo.obter_todos()
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao recarregar configurações: {e}")
+            return False
+
+        anterior = cls._versao
+        cls._cache = {c.chave: c.valor for c in configuracoes}
+        cls._ausentes = set()
+        cls._completo = True
+        cls._tipados = {}
+        cls._versao = versao
+        cls._expira_em = agora + CONFIG_CACHE_TTL_SEGUNDOS if CONFIG_CACHE_TTL_SEGUNDOS > 0 else math.inf
+
+        # Na primeira carga (ou logo após limpar) não há valores antigos em uso
+        if anterior is not None:
+            logger.debug(f"Configurações recarregadas (versão {anterior} -> {versao})")
+            cls._notificar(None)
+        return True
 
     @classmethod
     def obter(cls, chave: str, padrao: str = "") -> str:
@@ -22,9 +160,13 @@ class ConfigCache:
         Raises:
             Nenhuma exceção - retorna padrao em caso de erro
         """
+        cls._carregar_se_pendente()
+
         # Retorna do cache se disponível
         if chave in cls._cache:
             return cls._cache[chave]
+        if cls._completo or chave in cls._ausentes:
+            return padrao
 
         # Tenta buscar do banco com error handling
         try:
@@ -33,7 +175,7 @@ class ConfigCache:
                 cls._cache[chave] = config.valor
                 return config.valor
             else:
-                cls._cache[chave] = padrao
+                cls._ausentes.add(chave)
                 return padrao
 
         except sqlite3.Error as e:
@@ -65,12 +207,7 @@ class ConfigCache:
         Raises:
             Nenhuma exceção - retorna padrao em caso de erro
         """
-        try:
-            valor_str = cls.obter(chave, str(padrao))
-            return int(valor_str)
-        except ValueError as e:
-            logger.error(f"Erro ao converter configuração '{chave}' para int: {e}")
-            return padrao
+        return cls._obter_tipado(chave, padrao, "int", int)
 
     @classmethod
     def obter_bool(cls, chave: str, padrao: bool) -> bool:
@@ -87,13 +224,11 @@ class ConfigCache:
         Raises:
             Nenhuma exceção - retorna padrao em caso de erro
         """
-        try:
-            valor_str = cls.obter(chave, str(padrao)).lower()
-            # Aceita "true", "1", "yes", "sim" como verdadeiro
-            return valor_str in ("true", "1", "yes", "sim", "verdadeiro")
-        except Exception as e:
-            logger.error(f"Erro ao converter configuração '{chave}' para bool: {e}")
-            return padrao
+        # Aceita "true", "1", "yes", "sim" como verdadeiro
+        return cls._obter_tipado(
+            chave, padrao, "bool",
+            lambda valor: valor.lower() in ("true", "1", "yes", "sim", "verdadeiro"),
+        )
 
     @classmethod
     def obter_float(cls, chave: str, padrao: float) -> float:
@@ -110,18 +245,41 @@ class ConfigCache:
         Raises:
             Nenhuma exceção - retorna padrao em caso de erro
         """
+        return cls._obter_tipado(chave, padrao, "float", float)
+
+    @classmethod
+    def _obter_tipado(cls, chave: str, padrao: Any, tipo: str, converter: Callable[[str], Any]) -> Any:
+        """
+        Obtém configuração convertida, guardando o resultado da conversão
+
+        Args:
+            chave: Chave da configuração
+            padrao: Valor padrão se não encontrado ou inválido
+            tipo: Nome do tipo (para o índice do cache e logs)
+            converter: Função que converte o texto no tipo desejado
+
+        Returns:
+            Valor convertido ou padrão
+        """
+        indice = (chave, tipo, padrao)
+        if indice in cls._tipados:
+            return cls._tipados[indice]
+
         try:
-            valor_str = cls.obter(chave, str(padrao))
-            return float(valor_str)
+            valor = converter(cls.obter(chave, str(padrao)))
         except ValueError as e:
-            logger.error(f"Erro ao converter configuração '{chave}' para float: {e}")
-            return padrao
+            logger.error(f"Erro ao converter configuração '{chave}' para {tipo}: {e}")
+            valor = padrao
+        cls._tipados[indice] = valor
+        return valor
 
     @classmethod
     def obter_multiplos(cls, chaves: List[str], padroes: List[str]) -> Dict[str, str]:
         """
         Obtém múltiplas configurações de uma vez para melhor performance
 
+        As chaves que não estão no cache são buscadas com uma única consulta.
+
         Args:
             chaves: Lista de chaves a buscar
             padroes: Lista de valores padrão correspondentes
@@ -136,22 +294,127 @@ class ConfigCache:
             logger.error("obter_multiplos: número de chaves diferente de padrões")
             return dict(zip(chaves, padroes))
 
-        resultado = {}
-        for chave, padrao in zip(chaves, padroes):
-            resultado[chave] = cls.obter(chave, padrao)
+        cls._carregar_se_pendente()
+        faltantes = [] if cls._completo else [
+            chave for chave in chaves if chave not in cls._cache and chave not in cls._ausentes
+        ]
+        if faltantes:
+            try:
+                encontradas = configuracao_repo.obter_multiplas(faltantes)
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao buscar configurações {faltantes} do banco: {e}")
+                encontradas = {}
+            else:
+                for chave, config in encontradas.items():
+                    if config:
+                        cls._cache[chave] = config.valor
+                    else:
+                        cls._ausentes.add(chave)
 
-        return resultado
+        return {chave: cls._cache.get(chave, padrao) for chave, padrao in zip(chaves, padroes)}
+
+    @classmethod
+    def inscrever(cls, observador: Observador) -> None:
+        """
+        Registra uma função chamada sempre que o cache é limpo
+
+        Permite que valores derivados das configurações (ex: limites dos
+        rate limiters) sejam recalculados apenas quando algo muda, em vez
+        de consultar o cache a cada uso.
+
+        Args:
+            observador: Função que recebe a chave alterada (None = todas)
+        """
+        if observador not in cls._observadores:
+            cls._observadores.append(observador)
+
+    @classmethod
+    def cancelar_inscricao(cls, observador: Observador) -> None:
+        """Remove um observador registrado com inscrever()"""
+        if observador in cls._observadores:
+            cls._observadores.remove(observador)
+
+    @classmethod
+    def _notificar(cls, chave: Optional[str]) -> None:
+        """Avisa os observadores; a falha de um não impede os demais"""
+        for observador in list(cls._observadores):
+            try:
+                observador(chave)
+            except Exception as e:
+                logger.error(f"Erro ao notificar alteração de configuração '{chave}': {e}")
 
     @classmethod
     def limpar(cls):
-        """Limpa todo o cache de configurações"""
+        """Limpa todo o cache de configurações e avisa os observadores"""
         cls._cache = {}
+        cls._ausentes = set()
+        cls._completo = False
+        cls._tipados = {}
+        # Recarrega tudo na próxima leitura
+        cls._versao = None
+        cls._carga_pendente = True
+        cls._notificar(None)
 
     @classmethod
     def limpar_chave(cls, chave: str):
-        """Limpa cache de uma chave específica"""
+        """Limpa cache de uma chave específica e avisa os observadores"""
         if chave in cls._cache:
             del cls._cache[chave]
+        # A chave pode ter sido criada: volta a ser buscada no banco
+        cls._ausentes.discard(chave)
+        cls._completo = False
+        cls._tipados = {indice: valor for indice, valor in cls._tipados.items() if indice[0] != chave}
+        cls._notificar(chave)
 
 # Instância global para uso em toda a aplicação
 config = ConfigCache()
+
+
+class VerificadorConfiguracoes:
+    """
+    Tarefa assíncrona que verifica periodicamente a versão das configurações.
+
+    A consulta roda com executar_db; as requisições só leem o cache em memória.
+    """
+
+    def __init__(self, intervalo_segundos: float = CONFIG_CACHE_VERIFICACAO_SEGUNDOS):
+        """
+        Inicializa o verificador.
+
+        Args:
+            intervalo_segundos: Intervalo entre verificações (0 desativa)
+        """
+        self.intervalo_segundos = intervalo_segundos
+        self._tarefa: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        """Inicia a tarefa no event loop atual (sem efeito se já estiver rodando)."""
+        if self.intervalo_segundos <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        if self._tarefa is not None and not self._tarefa.done() and self._tarefa.get_loop() is loop:
+            return
+        self._tarefa = loop.create_task(self._verificar_periodicamente())
+
+    async def _verificar_periodicamente(self) -> None:
+        """Laço da tarefa: verifica a versão a cada intervalo."""
+        while True:
+            await asyncio.sleep(self.intervalo_segundos)
+            try:
+                await executar_db(config.verificar_alteracoes)
+            except Exception as e:
+                logger.error(f"Erro na verificação periódica das configurações: {e}")
+
+    async def encerrar(self) -> None:
+        """Cancela a tarefa de verificação."""
+        tarefa, self._tarefa = self._tarefa, None
+        if tarefa is not None and not tarefa.done():
+            tarefa.cancel()
+            try:
+                await tarefa
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+
+
+# Instância global usada pela aplicação
+verificador_configuracoes = VerificadorConfiguracoes()
@@ -0,0 +1,224 @@
+"""
+Camada assíncrona de acesso ao banco de dados.
+
+As funções dos repositórios usam sqlite3 (síncrono). Chamá-las diretamente
+em rotas `async def` bloqueia o event loop: uma consulta lenta congela
+todas as outras requisições e streams SSE do worker.
+
+Este módulo executa as chamadas de banco em um ThreadPoolExecutor dedicado,
+com limite de profundidade da fila (backpressure): quando há chamadas
+pendentes demais, novas chamadas falham imediatamente com
+BancoSobrecarregadoError (HTTP 503) em vez de acumular latência.
+
+A migração pode ser feita módulo a módulo:
+
+    from util.db_async import repo_assincrono, executar_db
+    from repo import chat_mensagem_repo
+
+    chat_mensagem_repo_async = repo_assincrono(chat_mensagem_repo)
+
+    @router.get("/mensagens/{sala_id}")
+    async def listar_mensagens(...):
+        mensagens = await chat_mensagem_repo_async.listar_por_sala(sala_id)
+
+        # Ou, para várias operações em uma única unidade de trabalho:
+        def _enviar():
+            with unidade_de_trabalho():
+                ...
+        resultado = await executar_db(_enviar)
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Callable, Optional, TypeVar
+
+from util.db_util import DB_POOL_SIZE
+from util.exceptions import BancoSobrecarregadoError
+from util.logger_config import logger
+
+T = TypeVar("T")
+
+# Threads dedicadas ao banco (não faz sentido exceder o tamanho do pool)
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))
+# Máximo de chamadas em execução + aguardando na fila antes de rejeitar
+DB_EXECUTOR_MAX_PENDENTES = int(os.getenv("DB_EXECUTOR_MAX_PENDENTES", "64"))
+
+
+class ExecutorBanco:
+    """
+    Executor de chamadas de banco com fila limitada.
+
+    Attributes:
+        workers: Número de threads do executor
+        max_pendentes: Limite de chamadas simultâneas (executando + na fila)
+    """
+
+    def __init__(
+        self,
+        workers: int = DB_EXECUTOR_WORKERS,
+        max_pendentes: int = DB_EXECUTOR_MAX_PENDENTES,
+    ):
+        """
+        Inicializa o executor (as threads são criadas sob demanda).
+
+        Args:
+            workers: Número de threads dedicadas ao banco
+            max_pendentes: Profundidade máxima da fila
+        """
+        if workers <= 0:
+            raise ValueError("workers deve ser positivo")
+        if max_pendentes < workers:
+            raise ValueError("max_pendentes deve ser maior ou igual a workers")
+
+        self.workers = workers
+        self.max_pendentes = max_pendentes
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._total_rejeitadas = 0
+
+    def _obter_executor(self) -> ThreadPoolExecutor:
+        """Cria o ThreadPoolExecutor na primeira utilização."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="db",
+            )
+        return self._executor
+
+    def _reservar(self) -> ThreadPoolExecutor:
+        """Reserva uma vaga na fila ou lança BancoSobrecarregadoError."""
+        with self._lock:
+            if self._pendentes >= self.max_pendentes:
+                self._total_rejeitadas += 1
+                logger.warning(
+                    f"[ExecutorBanco] Fila cheia ({self._pendentes}/{self.max_pendentes}), "
+                    f"chamada rejeitada"
+                )
+                raise BancoSobrecarregadoError(self._pendentes)
+            self._pendentes += 1
+            executor = self._obter_executor()
+        return executor
+
+    def _liberar(self, *_: Any) -> None:
+        """Libera a vaga reservada (callback de conclusão do future)."""
+        with self._lock:
+            self._pendentes -= 1
+
+    async def executar(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Executa uma função síncrona de banco fora do event loop.
+
+        O contexto (contextvars) é propagado para a thread, de modo que uma
+        unidade_de_trabalho() ativa no chamador continua válida.
+
+        Args:
+            func: Função síncrona (ex: função de repositório)
+            *args: Argumentos posicionais
+            **kwargs: Argumentos nomeados
+
+        Returns:
+            Retorno de func
+
+        Raises:
+            BancoSobrecarregadoError: Se a fila estiver cheia
+        """
+        executor = self._reservar()
+        loop = asyncio.get_running_loop()
+        contexto = contextvars.copy_context()
+        chamada = functools.partial(contexto.run, func, *args, **kwargs)
+        try:
+            future = executor.submit(chamada)
+        except Exception:
+            self._liberar()
+            raise
+        future.add_done_callback(self._liberar)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna estatísticas do executor.
+
+        Returns:
+            Dicionário com workers, limite, pendentes e rejeitadas
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pendentes": self.max_pendentes,
+                "pendentes": self._pendentes,
+                "total_rejeitadas": self._total_rejeitadas,
+            }
+
+    def encerrar(self) -> None:
+        """Encerra as threads do executor (aguarda chamadas em andamento)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class RepositorioAssincrono:
+    """
+    Proxy que expõe as funções públicas de um módulo de repositório como corrotinas.
+
+    Example:
+        >>> chat_sala_repo_async = repo_assincrono(chat_sala_repo)
+        >>> sala = await chat_sala_repo_async.obter_por_id("3_7")
+    """
+
+    def __init__(self, modulo: ModuleType, executor: "ExecutorBanco"):
+        self._modulo = modulo
+        self._executor = executor
+
+    def __getattr__(self, nome: str) -> Callable[..., Any]:
+        atributo = getattr(self._modulo, nome)
+        if nome.startswith("_") or not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await self._executor.executar(atributo, *args, **kwargs)
+
+        # Cache no próprio proxy para não recriar o wrapper a cada acesso
+        setattr(self, nome, wrapper)
+        return wrapper
+
+    def __repr__(self) -> str:
+        return f"RepositorioAssincrono({self._modulo.__name__})"
+
+
+# Instância global usada por toda a aplicação
+executor_banco = ExecutorBanco()
+
+
+async def executar_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executa uma função síncrona de banco no executor global.
+
+    Args:
+        func: Função síncrona
+        *args: Argumentos posicionais
+        **kwargs: Argumentos nomeados
+
+    Returns:
+        Retorno de func
+    """
+    return await executor_banco.executar(func, *args, **kwargs)
+
+
+def repo_assincrono(modulo: ModuleType) -> RepositorioAssincrono:
+    """
+    Cria a variante assíncrona de um módulo de repositório.
+
+    Args:
+        modulo: Módulo de repositório (ex: repo.chat_sala_repo)
+
+    Returns:
+        Proxy cujas funções públicas podem ser aguardadas com await
+    """
+    return RepositorioAssincrono(modulo, executor_banco)
@@ -1,7 +1,13 @@
 import sqlite3
 import os
+import re
+import threading
+import time
 from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
 from datetime import datetime
+from typing import Dict, List, Optional
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
@@ -12,16 +18,394 @@ DATABASE_PATH = os.getenv('DATABASE_PATH', 'dados.db')
 TIMEZONE = os.getenv('TIMEZONE', 'America/Sao_Paulo')
 APP_TIMEZONE = ZoneInfo(TIMEZONE)
 
+# === Configurações do Pool de Conexões ===
+# Número máximo de conexões abertas simultaneamente
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+# Tempo máximo (segundos) aguardando uma conexão livre antes de falhar
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+# Conexões ociosas há mais tempo que isso (segundos) são verificadas antes do uso
+DB_POOL_HEALTH_CHECK_SEGUNDOS = float(os.getenv('DB_POOL_HEALTH_CHECK_SEGUNDOS', '60'))
+
+# === Perfis de PRAGMA ===
+# Aplicados uma única vez por conexão do pool (journal_mode é persistente no arquivo)
+PERFIS_PRAGMA: Dict[str, Dict[str, str]] = {
+    # Comportamento padrão do SQLite (rollback journal)
+    "padrao": {
+        "busy_timeout": "5000",
+    },
+    # Leitores não bloqueiam escritores (WAL) e menos fsyncs por commit
+    "producao": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": str(256 * 1024 * 1024),
+        "cache_size": "-65536",  # Negativo = KiB (64 MB)
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+    },
+}
+
+# PRAGMAs que só afetam a conexão (seguros para abrir arquivos de backup)
+PRAGMAS_APENAS_CONEXAO = ("mmap_size", "cache_size", "temp_store", "busy_timeout")
+
+# Perfil selecionado e sobrescritas individuais (ex: DB_PRAGMA_CACHE_SIZE=-32768)
+DB_PRAGMA_PERFIL = os.getenv('DB_PRAGMA_PERFIL', 'producao').lower()
+
+_VALOR_PRAGMA_VALIDO = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def obter_pragmas(apenas_conexao: bool = False) -> Dict[str, str]:
+    """
+    Monta o conjunto de PRAGMAs do perfil configurado, com sobrescritas do .env.
+
+    Args:
+        apenas_conexao: Se True, retorna apenas PRAGMAs que não alteram o
+                        arquivo do banco (sem journal_mode/synchronous)
+
+    Returns:
+        Dicionário {pragma: valor} na ordem em que devem ser aplicados
+
+    Raises:
+        ValueError: Se o perfil não existir ou algum valor for inválido
+    """
+    if DB_PRAGMA_PERFIL not in PERFIS_PRAGMA:
+        raise ValueError(
+            f"DB_PRAGMA_PERFIL inválido: '{DB_PRAGMA_PERFIL}'. "
+            f"Opções: {', '.join(PERFIS_PRAGMA)}"
+        )
+
+    pragmas = dict(PERFIS_PRAGMA[DB_PRAGMA_PERFIL])
+    for nome in ("journal_mode", "synchronous", *PRAGMAS_APENAS_CONEXAO):
+        valor = os.getenv(f"DB_PRAGMA_{nome.upper()}")
+        if valor:
+            pragmas[nome] = valor
+
+    for nome, valor in pragmas.items():
+        if not _VALOR_PRAGMA_VALIDO.match(valor):
+            raise ValueError(f"Valor inválido para PRAGMA {nome}: '{valor}'")
+
+    if apenas_conexao:
+        return {k: v for k, v in pragmas.items() if k in PRAGMAS_APENAS_CONEXAO}
+    return pragmas
+
+
+def aplicar_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, str]) -> None:
+    """
+    Aplica PRAGMAs a uma conexão recém-aberta (fora de transação).
+
+    Args:
+        conn: Conexão SQLite
+        pragmas: Dicionário {pragma: valor}, ex: obter_pragmas()
+    """
+    for nome, valor in pragmas.items():
+        conn.execute(f"PRAGMA {nome} = {valor}")
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite de longa duração.
+
+    Mantém até `tamanho` conexões abertas e as reutiliza entre chamadas,
+    evitando o custo de abrir/fechar o arquivo, registrar adaptadores e
+    reconfigurar PRAGMAs a cada operação de repositório.
+
+    Cada thread tem preferência pela última conexão que usou (afinidade por
+    thread), o que mantém o cache de páginas do SQLite "quente". Conexões
+    ociosas por muito tempo passam por um health check (SELECT 1) antes de
+    serem entregues; conexões com falha são descartadas e recriadas.
+    O perfil de PRAGMAs (WAL, cache, mmap...) é aplicado uma única vez,
+    na abertura de cada conexão.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        tamanho: int = DB_POOL_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        health_check_segundos: float = DB_POOL_HEALTH_CHECK_SEGUNDOS,
+        pragmas: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Inicializa o pool (as conexões são criadas sob demanda).
+
+        Args:
+            database_path: Caminho do arquivo do banco de dados
+            tamanho: Número máximo de conexões abertas
+            timeout: Segundos aguardando conexão livre antes de lançar erro
+            health_check_segundos: Ociosidade a partir da qual a conexão é verificada
+            pragmas: PRAGMAs aplicados a cada nova conexão (padrão: obter_pragmas())
+        """
+        if tamanho <= 0:
+            raise ValueError("tamanho do pool deve ser positivo")
+
+        self.database_path = database_path
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self.health_check_segundos = health_check_segundos
+        self.pragmas = obter_pragmas() if pragmas is None else pragmas
+
+        self._condicao = threading.Condition(threading.Lock())
+        # Conexões ociosas: lista de (conexão, instante em que foi devolvida)
+        self._ociosas: List[tuple[sqlite3.Connection, float]] = []
+        self._total_abertas = 0
+        self._fechado = False
+        self._local = threading.local()
+
+    def _criar_conexao(self) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão SQLite."""
+        conn = sqlite3.connect(
+            self.database_path,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,
+        )
+        aplicar_pragmas(conn, self.pragmas)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _conexao_saudavel(conn: sqlite3.Connection) -> bool:
+        """Verifica se a conexão ainda responde."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _descartar(self, conn: sqlite3.Connection) -> None:
+        """Fecha uma conexão e libera sua vaga no pool (requer lock)."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._total_abertas -= 1
+        self._condicao.notify()
+
+    def _retirar_ociosa(self) -> Optional[tuple[sqlite3.Connection, float]]:
+        """Retira uma conexão ociosa, preferindo a última usada pela thread atual."""
+        preferida = getattr(self._local, "conexao", None)
+        if preferida is not None:
+            for i, (conn, devolvida_em) in enumerate(self._ociosas):
+                if conn is preferida:
+                    return self._ociosas.pop(i)
+        if self._ociosas:
+            return self._ociosas.pop()
+        return None
+
+    def obter(self) -> sqlite3.Connection:
+        """
+        Obtém uma conexão do pool, aguardando se todas estiverem em uso.
+
+        Returns:
+            Conexão SQLite pronta para uso
+
+        Raises:
+            sqlite3.OperationalError: Se o pool estiver fechado ou o timeout expirar
+        """
+        limite = time.monotonic() + self.timeout
+        with self._condicao:
+            while True:
+                if self._fechado:
+                    raise sqlite3.OperationalError("Pool de conexões encerrado")
+
+                ociosa = self._retirar_ociosa()
+                if ociosa is not None:
+                    conn, devolvida_em = ociosa
+                    ociosa_ha = time.monotonic() - devolvida_em
+                    if ociosa_ha > self.health_check_segundos and not self._conexao_saudavel(conn):
+                        self._descartar(conn)
+                        continue
+                    break
+
+                if self._total_abertas < self.tamanho:
+                    # Reserva a vaga antes de abrir (a abertura ocorre fora do lock)
+                    self._total_abertas += 1
+                    conn = None
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise sqlite3.OperationalError(
+                        f"Timeout aguardando conexão do pool ({self.tamanho} em uso)"
+                    )
+                self._condicao.wait(restante)
+
+        if conn is None:
+            try:
+                conn = self._criar_conexao()
+            except Exception:
+                with self._condicao:
+                    self._total_abertas -= 1
+                    self._condicao.notify()
+                raise
+
+        self._local.conexao = conn
+        return conn
+
+    def devolver(self, conn: sqlite3.Connection) -> None:
+        """
+        Devolve uma conexão ao pool.
+
+        Conexões com transação pendente (não foi possível finalizar) ou que
+        foram devolvidas após o fechamento do pool são descartadas.
+
+        Args:
+            conn: Conexão obtida via obter()
+        """
+        with self._condicao:
+            if self._fechado or conn.in_transaction:
+                self._descartar(conn)
+                return
+            try:
+                # Garante estado padrão caso o chamador tenha alterado o PRAGMA
+                conn.execute("PRAGMA foreign_keys = ON")
+            except sqlite3.Error:
+                self._descartar(conn)
+                return
+            self._ociosas.append((conn, time.monotonic()))
+            self._condicao.notify()
+
+    def fechar(self) -> None:
+        """
+        Fecha todas as conexões ociosas e impede novos empréstimos.
+
+        Conexões em uso são fechadas quando forem devolvidas.
+        """
+        with self._condicao:
+            self._fechado = True
+            while self._ociosas:
+                conn, _ = self._ociosas.pop()
+                self._descartar(conn)
+            self._condicao.notify_all()
+
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna estatísticas do pool.
+
+        Returns:
+            Dicionário com tamanho, conexões abertas, ociosas e em uso
+        """
+        with self._condicao:
+            return {
+                "tamanho": self.tamanho,
+                "abertas": self._total_abertas,
+                "ociosas": len(self._ociosas),
+                "em_uso": self._total_abertas - len(self._ociosas),
+                "fechado": self._fechado,
+            }
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool() -> ConnectionPool:
+    """
+    Retorna o pool global, criando-o (ou recriando-o após fechar_pool) se necessário.
+
+    Returns:
+        Instância de ConnectionPool para DATABASE_PATH
+    """
+    global _pool
+    pool = _pool
+    if pool is not None and not pool._fechado:
+        return pool
+    with _pool_lock:
+        if _pool is None or _pool._fechado:
+            register_adapters()
+            _pool = ConnectionPool(DATABASE_PATH)
+        return _pool
+
+
+def fechar_pool() -> None:
+    """
+    Fecha todas as conexões do pool global.
+
+    Deve ser chamado no shutdown da aplicação e antes de operações que
+    substituem o arquivo do banco (ex: restauração de backup). Uma chamada
+    posterior a get_connection() cria um novo pool automaticamente.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+            _pool = None
+
+
+# Conexão da unidade de trabalho ativa no contexto atual (requisição/task)
+_conexao_unidade: ContextVar[Optional[sqlite3.Connection]] = ContextVar(
+    "conexao_unidade_de_trabalho", default=None
+)
+_contador_savepoint = count(1)
+
+
+@contextmanager
+def unidade_de_trabalho(imediata: bool = True):
+    """
+    Context manager de unidade de trabalho: uma conexão e uma transação.
+
+    Enquanto o bloco estiver ativo, toda chamada a get_connection() feita no
+    mesmo contexto (mesma requisição/task) reutiliza a mesma conexão, sem
+    commit próprio. O commit acontece uma única vez ao final do bloco, e
+    qualquer exceção desfaz todas as operações (escritas em várias tabelas
+    ficam atômicas). Blocos aninhados participam da unidade externa.
+
+    Exemplo:
+        with unidade_de_trabalho():
+            mensagem = chat_mensagem_repo.inserir(sala_id, usuario_id, texto)
+            chat_sala_repo.atualizar_ultima_atividade(sala_id)
+        # commit já realizado aqui
+
+    Args:
+        imediata: Se True, inicia com BEGIN IMMEDIATE (reserva a escrita no
+                  início e evita SQLITE_BUSY ao promover leitura para escrita)
+
+    Yields:
+        Conexão compartilhada pela unidade de trabalho
+    """
+    conn_externa = _conexao_unidade.get()
+    if conn_externa is not None:
+        yield conn_externa
+        return
+
+    pool = obter_pool()
+    conn = pool.obter()
+    token = _conexao_unidade.set(conn)
+    try:
+        conn.execute("BEGIN IMMEDIATE" if imediata else "BEGIN")
+        yield conn
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        _conexao_unidade.reset(token)
+        pool.devolver(conn)
+
+
 @contextmanager
 def get_connection():
-    """Context manager para conexão com banco de dados"""
-    register_adapters()
-    conn = sqlite3.connect(
-        DATABASE_PATH,
-        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-    )
-    conn.execute("PRAGMA foreign_keys = ON")
-    conn.row_factory = sqlite3.Row
+    """
+    Context manager para conexão com banco de dados (emprestada do pool)
+
+    Dentro de unidade_de_trabalho() reutiliza a conexão da unidade e isola
+    o bloco em um SAVEPOINT: uma exceção desfaz apenas as operações do bloco,
+    e o commit fica a cargo da unidade de trabalho.
+    """
+    conn_unidade = _conexao_unidade.get()
+    if conn_unidade is not None:
+        savepoint = f"sp_{next(_contador_savepoint)}"
+        conn_unidade.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield conn_unidade
+            conn_unidade.execute(f"RELEASE {savepoint}")
+        except Exception as e:
+            conn_unidade.execute(f"ROLLBACK TO {savepoint}")
+            conn_unidade.execute(f"RELEASE {savepoint}")
+            raise e
+        return
+
+    pool = obter_pool()
+    conn = pool.obter()
     try:
         yield conn
         conn.commit()
@@ -29,7 +413,7 @@ def get_connection():
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        pool.devolver(conn)
 
 
 def adapt_datetime(dt: datetime) -> str:
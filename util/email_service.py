@@ -1,5 +1,4 @@
 import os
-import resend
 from typing import Optional
 from util.logger_config import logger
 
@@ -9,10 +8,6 @@ class EmailService:
         self.from_email = os.getenv('RESEND_FROM_EMAIL', 'noreply@seudominio.com')
         self.from_name = os.getenv('RESEND_FROM_NAME', 'Sistema')
 
-        # Configura a API key do Resend
-        if self.api_key:
-            resend.api_key = self.api_key
-
     def enviar_email(
         self,
         para_email: str,
@@ -34,6 +29,10 @@ class EmailService:
         }
 
         try:
+            # SDK carregado só no primeiro envio (traz o requests junto)
+            import resend
+
+            resend.api_key = self.api_key
             email = resend.Emails.send(params)  # type: ignore[arg-type]
             logger.info(f"E-mail enviado para {para_email} - ID: {email.get('id', 'N/A')}")
             return True
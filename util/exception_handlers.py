@@ -7,7 +7,7 @@ from util.flash_messages import informar_erro, informar_aviso
 from util.logger_config import logger
 from util.config import IS_DEVELOPMENT
 from util.validation_util import processar_erros_validacao
-from util.exceptions import FormValidationError
+from util.exceptions import FormValidationError, BancoSobrecarregadoError
 import traceback
 
 # Configurar templates de erro
@@ -244,3 +244,21 @@ async def form_validation_exception_handler(request: Request, exc: FormValidatio
         exc.template_path,
         context,
     )
+
+
+async def banco_sobrecarregado_exception_handler(request: Request, exc: BancoSobrecarregadoError) -> Response:
+    """
+    Handler para BancoSobrecarregadoError (fila do executor de banco cheia)
+
+    Responde 503 (Service Unavailable) com header Retry-After, reutilizando
+    a página de erro genérica do http_exception_handler.
+    """
+    response = await http_exception_handler(
+        request,
+        StarletteHTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes."
+        )
+    )
+    response.headers["Retry-After"] = "1"
+    return response
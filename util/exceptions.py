@@ -72,3 +72,20 @@ class FormValidationError(Exception):
         super().__init__(
             f"Erro de validação em '{template_path}': {len(validation_error.errors())} erro(s)"
         )
+
+
+class BancoSobrecarregadoError(Exception):
+    """
+    Exceção lançada quando a fila do executor de banco de dados está cheia.
+
+    Indica que o worker já tem chamadas de banco demais em andamento; a
+    requisição é rejeitada imediatamente em vez de aumentar a latência de
+    todas as outras. É convertida em HTTP 503 por um exception handler global.
+
+    Attributes:
+        pendentes: Número de chamadas pendentes no momento da rejeição
+    """
+
+    def __init__(self, pendentes: int):
+        self.pendentes = pendentes
+        super().__init__(f"Banco de dados sobrecarregado: {pendentes} chamada(s) pendente(s)")
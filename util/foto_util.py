@@ -11,7 +11,6 @@ from pathlib import Path
 import base64
 import io
 from typing import Optional
-from PIL import Image
 
 from util.logger_config import logger
 from util.config import FOTO_PERFIL_TAMANHO_MAX
@@ -107,7 +106,9 @@ def salvar_foto_cropada_usuario(id: int, conteudo_base64: str) -> bool:
         # Decodificar base64
         image_data = base64.b64decode(conteudo_base64)
 
-        # Abrir imagem com Pillow
+        # Abrir imagem com Pillow (carregado apenas quando há upload)
+        from PIL import Image
+
         imagem = Image.open(io.BytesIO(image_data))
 
         # Converter para RGB se necessário (remove canal alpha)
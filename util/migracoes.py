@@ -0,0 +1,163 @@
+"""
+Migrações versionadas do esquema do banco de dados.
+
+A versão aplicada fica registrada na tabela schema_versao. Na inicialização,
+aplicar_migracoes() lê essa versão com uma única consulta e, se o banco já
+estiver atualizado, retorna sem executar nenhum CREATE TABLE — o custo de
+subir um worker não cresce com o número de tabelas.
+
+As migrações pendentes rodam em uma única transação BEGIN IMMEDIATE, que
+funciona como lock entre processos: com vários workers subindo ao mesmo
+tempo, apenas um aplica as migrações; os demais aguardam o lock, releem a
+versão e encontram o banco atualizado. Uma falha desfaz todas as migrações
+da execução.
+
+Para alterar o esquema, acrescente uma Migracao ao final de MIGRACOES com a
+próxima versão (nunca altere ou reordene migrações já publicadas). Novos
+índices em sql/indices_sql.py entram com uma migração que chame
+indices_repo.criar_indices() (os comandos usam IF NOT EXISTS). Novas chaves
+de configuração não precisam de migração: main.py executa
+migrar_configs_para_banco() em toda inicialização.
+"""
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, List
+
+from repo import migracao_repo
+from util.db_util import unidade_de_trabalho
+from util.logger_config import logger
+
+# Tempo máximo aguardando outro processo concluir as migrações
+MIGRACAO_TIMEOUT_SEGUNDOS = float(os.getenv('MIGRACAO_TIMEOUT_SEGUNDOS', '120'))
+
+# Intervalo entre tentativas de obter o lock das migrações
+_INTERVALO_TENTATIVA_SEGUNDOS = 0.5
+
+
+@dataclass(frozen=True)
+class Migracao:
+    """
+    Uma migração de esquema.
+
+    Attributes:
+        versao: Número da versão (sequencial, começando em 1)
+        descricao: Descrição registrada em schema_versao
+        aplicar: Função que executa a migração (usa get_connection(), que
+            participa da transação das migrações)
+    """
+    versao: int
+    descricao: str
+    aplicar: Callable[[], None]
+
+
+def _criar_tabelas() -> None:
+    """Cria as tabelas, índices FTS5 e triggers (ordem respeita as dependências)."""
+    from repo import (
+        usuario_repo, configuracao_repo, tarefa_repo, chamado_repo, chamado_interacao_repo,
+        chat_sala_repo, chat_participante_repo, chat_mensagem_repo, chat_evento_repo,
+        categoria_repo, especie_repo, raca_repo, abrigo_repo, adotante_repo,
+        endereco_repo, animal_repo, solicitacao_repo, adocao_repo, visita_repo,
+    )
+
+    for repo in (
+        usuario_repo, configuracao_repo, tarefa_repo, chamado_repo, chamado_interacao_repo,
+        chat_sala_repo, chat_participante_repo, chat_mensagem_repo, chat_evento_repo,
+        categoria_repo, especie_repo, raca_repo, abrigo_repo, adotante_repo,
+        endereco_repo, animal_repo, solicitacao_repo, adocao_repo, visita_repo,
+    ):
+        repo.criar_tabela()
+
+
+def _criar_indices() -> None:
+    """Cria o plano de índices de sql/indices_sql.py."""
+    from repo import indices_repo
+
+    indices_repo.criar_indices()
+
+
+def _migrar_configuracoes() -> None:
+    """Copia para o banco as configurações editáveis definidas no .env."""
+    from util.migrar_config import migrar_configs_para_banco
+
+    migrar_configs_para_banco()
+
+
+def _criar_tabela_rate_limit() -> None:
+    """Cria a tabela do estado compartilhado dos rate limiters."""
+    from repo import rate_limit_repo
+
+    rate_limit_repo.criar_tabela()
+
+
+# Migrações em ordem de versão.
+# A versão 1 usa CREATE TABLE IF NOT EXISTS e verificações de coluna, então
+# também atualiza bancos criados antes do controle de versão.
+MIGRACOES: List[Migracao] = [
+    Migracao(1, "Esquema inicial: tabelas, índices FTS5 e triggers", _criar_tabelas),
+    Migracao(2, "Plano de índices (sql/indices_sql.py)", _criar_indices),
+    Migracao(3, "Configurações do .env copiadas para o banco", _migrar_configuracoes),
+    Migracao(4, "Tabela rate_limit (estado compartilhado dos rate limiters)", _criar_tabela_rate_limit),
+]
+
+
+def obter_versao_mais_recente() -> int:
+    """
+    Retorna a versão da última migração declarada.
+
+    Returns:
+        Número da versão (0 se não houver migrações)
+    """
+    return max((migracao.versao for migracao in MIGRACOES), default=0)
+
+
+def _aplicar_pendentes() -> int:
+    """Aplica, em uma transação com lock de escrita, as migrações ainda não registradas."""
+    with unidade_de_trabalho():
+        # Relê a versão com o lock obtido: outro worker pode ter acabado de migrar
+        versao_atual = migracao_repo.obter_versao_atual()
+        pendentes = sorted(
+            (migracao for migracao in MIGRACOES if migracao.versao > versao_atual),
+            key=lambda migracao: migracao.versao,
+        )
+        for migracao in pendentes:
+            logger.info(f"Aplicando migração {migracao.versao}: {migracao.descricao}")
+            migracao.aplicar()
+            migracao_repo.registrar(migracao.versao, migracao.descricao)
+        return len(pendentes)
+
+
+def aplicar_migracoes() -> int:
+    """
+    Aplica as migrações pendentes.
+
+    Seguro para execução simultânea por vários processos: se outro processo
+    estiver migrando, aguarda até MIGRACAO_TIMEOUT_SEGUNDOS pelo lock.
+
+    Returns:
+        Número de migrações aplicadas por esta chamada
+
+    Raises:
+        sqlite3.OperationalError: Se o lock não for obtido dentro do tempo limite
+        Exception: Erro de alguma migração (nenhuma migração da execução é mantida)
+    """
+    migracao_repo.criar_tabela()
+    versao_mais_recente = obter_versao_mais_recente()
+    if migracao_repo.obter_versao_atual() >= versao_mais_recente:
+        logger.debug(f"Esquema do banco atualizado (versão {versao_mais_recente})")
+        return 0
+
+    limite = time.monotonic() + MIGRACAO_TIMEOUT_SEGUNDOS
+    while True:
+        try:
+            aplicadas = _aplicar_pendentes()
+            break
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) or time.monotonic() >= limite:
+                raise
+            logger.info("Aguardando outro processo concluir as migrações do banco...")
+            time.sleep(_INTERVALO_TENTATIVA_SEGUNDOS)
+
+    logger.info(f"Esquema do banco na versão {versao_mais_recente} ({aplicadas} migrações aplicadas)")
+    return aplicadas
@@ -1,9 +1,10 @@
 """
 Utilitário para migração de configurações do .env para o banco de dados.
 
-Este módulo é executado automaticamente na inicialização da aplicação
-para garantir que todas as configurações editáveis estejam disponíveis
-na interface administrativa.
+Executado na migração 3 (util/migracoes.py) e novamente a cada
+inicialização da aplicação (main.py, logo após as migrações), para que
+configurações editáveis acrescentadas depois da migração também fiquem
+disponíveis na interface administrativa.
 """
 
 from util.logger_config import logger
@@ -82,7 +83,8 @@ def migrar_configs_para_banco():
     Executa a migração apenas para configurações que ainda não existem
     no banco de dados, preservando valores já customizados pelo admin.
 
-    Esta função deve ser chamada na inicialização da aplicação.
+    Idempotente: main.py a chama em toda inicialização, depois de
+    aplicar_migracoes() e antes de config.precarregar().
     """
     import os
     from dotenv import load_dotenv
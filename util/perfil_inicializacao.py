@@ -0,0 +1,168 @@
+"""
+Perfil de inicialização da aplicação.
+
+Sobe o servidor (uvicorn com main.app) em um processo separado com
+`python -X importtime`, mede o tempo desde o início do processo até
+/health responder e reúne o tempo de importação de cada módulo.
+
+Uso:
+    python -m util.comandos perfil-inicializacao [--top N] [--orcamento-ms MS]
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List
+
+# Tempo máximo aceito entre o início do processo e /health responder
+INICIALIZACAO_ORCAMENTO_MS = int(os.getenv('INICIALIZACAO_ORCAMENTO_MS', '3000'))
+
+# Raiz do projeto (onde está o main.py)
+_RAIZ_PROJETO = Path(__file__).resolve().parent.parent
+
+_PREFIXO_IMPORTTIME = "import time:"
+
+
+@dataclass
+class TempoImportacao:
+    """
+    Tempo de importação de um módulo (saída do -X importtime).
+
+    Attributes:
+        modulo: Nome do módulo
+        proprio_us: Microssegundos gastos no próprio módulo
+        acumulado_us: Microssegundos incluindo os módulos importados por ele
+    """
+    modulo: str
+    proprio_us: int
+    acumulado_us: int
+
+
+@dataclass
+class RelatorioInicializacao:
+    """
+    Resultado da medição da inicialização.
+
+    Attributes:
+        tempo_health_ms: Milissegundos do início do processo até /health responder
+        importacoes: Tempo de importação de cada módulo, na ordem da saída
+    """
+    tempo_health_ms: float
+    importacoes: List[TempoImportacao] = field(default_factory=list)
+
+    def mais_lentas(self, quantidade: int = 20) -> List[TempoImportacao]:
+        """
+        Retorna os módulos com maior tempo acumulado de importação.
+
+        Args:
+            quantidade: Número de módulos retornados
+
+        Returns:
+            Lista ordenada do mais lento para o mais rápido
+        """
+        return sorted(self.importacoes, key=lambda i: i.acumulado_us, reverse=True)[:quantidade]
+
+
+def interpretar_importtime(linhas: Iterable[str]) -> List[TempoImportacao]:
+    """
+    Interpreta as linhas geradas por `python -X importtime`.
+
+    Linhas que não são do importtime (logs do servidor, cabeçalho) são ignoradas.
+
+    Args:
+        linhas: Linhas da saída de erro do processo
+
+    Returns:
+        Lista de TempoImportacao
+    """
+    importacoes = []
+    for linha in linhas:
+        if not linha.startswith(_PREFIXO_IMPORTTIME):
+            continue
+        partes = linha[len(_PREFIXO_IMPORTTIME):].split("|")
+        if len(partes) != 3 or not partes[0].strip().isdigit():
+            continue  # cabeçalho "self [us] | cumulative | imported package"
+        importacoes.append(TempoImportacao(
+            modulo=partes[2].strip(),
+            proprio_us=int(partes[0]),
+            acumulado_us=int(partes[1]),
+        ))
+    return importacoes
+
+
+def _porta_livre() -> int:
+    """Obtém uma porta TCP livre na interface local."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def medir_inicializacao(timeout_segundos: float = 60.0) -> RelatorioInicializacao:
+    """
+    Sobe a aplicação em um processo separado e mede o tempo até /health responder.
+
+    O processo usa o mesmo ambiente (.env, DATABASE_PATH) do processo atual.
+
+    Args:
+        timeout_segundos: Tempo máximo aguardando /health
+
+    Returns:
+        RelatorioInicializacao com o tempo medido e os tempos de importação
+
+    Raises:
+        RuntimeError: Se o servidor encerrar ou não responder dentro do tempo limite
+    """
+    porta = _porta_livre()
+    url = f"http://127.0.0.1:{porta}/health"
+    # "import main" explícito: importações feitas pelo importlib (uvicorn main:app)
+    # não aparecem no importtime, e o tempo total do main ficaria de fora
+    comando = [
+        sys.executable, "-X", "importtime", "-c",
+        "import main, uvicorn; "
+        f"uvicorn.run(main.app, host='127.0.0.1', port={porta}, log_level='warning')",
+    ]
+
+    # A saída do importtime passa de milhares de linhas: arquivo em vez de pipe
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as saida:
+        inicio = time.perf_counter()
+        processo = subprocess.Popen(
+            comando, cwd=_RAIZ_PROJETO, stdout=subprocess.DEVNULL, stderr=saida,
+        )
+        try:
+            tempo_health_ms = None
+            limite = inicio + timeout_segundos
+            while time.perf_counter() < limite:
+                if processo.poll() is not None:
+                    break
+                try:
+                    with urllib.request.urlopen(url, timeout=1) as resposta:
+                        if resposta.status == 200:
+                            tempo_health_ms = (time.perf_counter() - inicio) * 1000
+                            break
+                except (urllib.error.URLError, ConnectionError, OSError):
+                    time.sleep(0.02)
+        finally:
+            processo.terminate()
+            try:
+                processo.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                processo.kill()
+                processo.wait()
+
+        saida.seek(0)
+        linhas = saida.read().splitlines()
+
+    if tempo_health_ms is None:
+        ultimas = "\n".join(l for l in linhas if not l.startswith(_PREFIXO_IMPORTTIME))[-2000:]
+        raise RuntimeError(f"A aplicação não respondeu em {url}:\n{ultimas}")
+
+    return RelatorioInicializacao(
+        tempo_health_ms=tempo_health_ms,
+        importacoes=interpretar_importtime(linhas),
+    )
@@ -0,0 +1,214 @@
+"""
+Verificação dos planos de execução das consultas SQL.
+
+Monta o esquema completo (tabelas, índices FTS5, triggers e o plano de
+sql/indices_sql.py) em um banco em memória e roda EXPLAIN QUERY PLAN sobre
+cada comando declarado em sql/*_sql.py. Um comando que faça varredura
+completa de uma tabela (SCAN sem índice) é apontado como problema, a menos
+que esteja em VARREDURAS_PERMITIDAS.
+
+Não são consideradas varreduras completas:
+    - SCAN de um índice parcial (percorre só as linhas que atendem à condição)
+    - SCAN de tabela virtual FTS5 (a consulta MATCH usa o índice invertido)
+    - SCAN de subconsulta materializada ou linha constante
+
+Os comandos também são executados com a verificação de chaves estrangeiras
+e os triggers, então o plano inclui as buscas que o SQLite faz nas tabelas
+filhas e nos índices FTS ao alterar um registro.
+
+Uso:
+    python -m util.comandos verificar-indices
+"""
+import importlib
+import pkgutil
+import re
+import sqlite3
+from typing import Dict, List, Sequence, Tuple
+
+import sql
+from sql import indices_sql
+
+# Comandos que percorrem a tabela inteira de propósito: "modulo.CONSTANTE" -> motivo
+VARREDURAS_PERMITIDAS: Dict[str, str] = {
+    # Listagens e contagens completas (telas administrativas)
+    "abrigo_sql.OBTER_TODOS": "listagem completa",
+    "abrigo_sql.CONTAR": "contagem total",
+    "adocao_sql.OBTER_TODOS": "listagem completa",
+    "adocao_sql.CONTAR": "contagem total",
+    "adotante_sql.OBTER_TODOS": "listagem completa",
+    "adotante_sql.CONTAR": "contagem total",
+    "animal_sql.CONTAR": "contagem total",
+    "categoria_sql.OBTER_TODOS": "listagem completa",
+    "categoria_sql.CONTAR": "contagem total",
+    "chamado_sql.OBTER_TODOS": "listagem completa (ordenada por prioridade)",
+    "configuracao_sql.OBTER_TODOS": "listagem completa",
+    "configuracao_sql.CONTAR": "contagem total",
+    "endereco_sql.OBTER_TODOS": "listagem completa",
+    "endereco_sql.CONTAR": "contagem total",
+    "especie_sql.OBTER_TODOS": "listagem completa",
+    "especie_sql.CONTAR": "contagem total",
+    "raca_sql.OBTER_TODOS": "listagem completa",
+    "raca_sql.CONTAR": "contagem total",
+    "solicitacao_sql.OBTER_TODOS": "listagem completa",
+    "solicitacao_sql.CONTAR": "contagem total",
+    "usuario_sql.OBTER_TODOS": "listagem completa",
+    "usuario_sql.OBTER_QUANTIDADE": "contagem total",
+    "visita_sql.OBTER_TODOS": "listagem completa",
+    "visita_sql.CONTAR": "contagem total",
+    # Busca com LIKE '%termo%' em cadastros pequenos (não usa índice B-tree)
+    "abrigo_sql.BUSCAR_POR_TERMO": "LIKE em cadastro pequeno",
+    "categoria_sql.BUSCAR_POR_TERMO": "LIKE em cadastro pequeno",
+    "configuracao_sql.BUSCAR_POR_TERMO": "LIKE em cadastro pequeno",
+    "especie_sql.BUSCAR_POR_TERMO": "LIKE em cadastro pequeno",
+    "raca_sql.BUSCAR_POR_TERMO": "LIKE em cadastro pequeno",
+    # Manutenção (carga e reconstrução de índices, migrações e reparos)
+    "adocao_sql.POPULAR_FTS": "carga do índice de busca",
+    "adotante_sql.POPULAR_FTS": "carga do índice de busca",
+    "animal_sql.POPULAR_FTS": "carga do índice de busca",
+    "solicitacao_sql.POPULAR_FTS": "carga do índice de busca",
+    "visita_sql.POPULAR_FTS": "carga do índice de busca",
+    "migracao_sql.LISTAR": "histórico de migrações",
+    "usuario_sql.LISTAR_PARA_NORMALIZAR": "migração dos campos de busca",
+    "chat_participante_sql.RECALCULAR_NAO_LIDAS": "reparo de contadores",
+    "chat_evento_sql.EXCLUIR_ANTERIORES": "limpeza periódica do log de eventos",
+}
+
+_PADRAO_COMANDO = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+_PADRAO_PARAMETROS = re.compile(r"uses (\d+)")
+_PADRAO_INDICE = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+def _modulos_sql() -> List[Tuple[str, object]]:
+    """Retorna os módulos sql/*_sql.py (exceto o plano de índices), em ordem alfabética."""
+    modulos = []
+    for info in sorted(pkgutil.iter_modules(sql.__path__), key=lambda m: m.name):
+        if info.name.endswith("_sql") and info.name != "indices_sql":
+            modulos.append((info.name, importlib.import_module(f"sql.{info.name}")))
+    return modulos
+
+
+def montar_esquema(conn: sqlite3.Connection) -> None:
+    """
+    Cria em uma conexão o esquema completo declarado em sql/.
+
+    Tabelas primeiro, depois índices e tabelas FTS5, triggers (que referenciam
+    outras tabelas) e por fim o plano de índices de indices_sql.
+
+    Args:
+        conn: Conexão (normalmente um banco em memória)
+    """
+    modulos = [modulo for _, modulo in _modulos_sql()]
+    for modulo in modulos:
+        conn.execute(modulo.CRIAR_TABELA)
+    for modulo in modulos:
+        for nome, valor in vars(modulo).items():
+            if nome.startswith("CRIAR_INDICE") or nome == "CRIAR_TABELA_FTS":
+                conn.execute(valor)
+    for modulo in modulos:
+        for trigger in getattr(modulo, "TRIGGERS_FTS", []):
+            conn.execute(trigger)
+    for indice in indices_sql.TODOS_INDICES:
+        conn.execute(indice)
+
+
+def listar_comandos() -> List[Tuple[str, str]]:
+    """
+    Lista os comandos SELECT/INSERT/UPDATE/DELETE declarados em sql/.
+
+    Constantes com prefixo "_" são fragmentos usados para compor outras
+    consultas e não são listadas.
+
+    Returns:
+        Lista de tuplas ("modulo.CONSTANTE", sql)
+    """
+    comandos = []
+    for nome_modulo, modulo in _modulos_sql():
+        for nome, valor in vars(modulo).items():
+            if nome.startswith("_") or not nome.isupper() or not isinstance(valor, str):
+                continue
+            if _PADRAO_COMANDO.match(valor):
+                comandos.append((f"{nome_modulo}.{nome}", valor))
+    return comandos
+
+
+def obter_plano(conn: sqlite3.Connection, comando: str) -> List[str]:
+    """
+    Retorna o plano de execução de um comando, com parâmetros nulos.
+
+    Args:
+        conn: Conexão com o esquema montado
+        comando: Comando SQL com parâmetros "?"
+
+    Returns:
+        Linhas de detalhe do EXPLAIN QUERY PLAN
+    """
+    parametros: Sequence[None] = ()
+    try:
+        linhas = conn.execute(f"EXPLAIN QUERY PLAN {comando}", parametros).fetchall()
+    except sqlite3.ProgrammingError as e:
+        # O sqlite3 informa quantos parâmetros o comando espera
+        quantidade = _PADRAO_PARAMETROS.search(str(e))
+        if not quantidade:
+            raise
+        parametros = (None,) * int(quantidade.group(1))
+        linhas = conn.execute(f"EXPLAIN QUERY PLAN {comando}", parametros).fetchall()
+    return [linha[3] for linha in linhas]
+
+
+def _indices_parciais(conn: sqlite3.Connection) -> set[str]:
+    """Retorna o nome dos índices parciais do esquema."""
+    cursor = conn.execute(
+        "SELECT il.name FROM sqlite_master m, pragma_index_list(m.name) il "
+        "WHERE m.type = 'table' AND il.partial"
+    )
+    return {linha[0] for linha in cursor.fetchall()}
+
+
+def encontrar_varreduras(plano: Sequence[str], indices_parciais: set[str]) -> List[str]:
+    """
+    Seleciona as linhas do plano que são varreduras completas de tabela.
+
+    Args:
+        plano: Linhas de detalhe do EXPLAIN QUERY PLAN
+        indices_parciais: Nomes dos índices parciais do esquema
+
+    Returns:
+        Linhas do plano que indicam varredura completa
+    """
+    varreduras = []
+    for detalhe in plano:
+        if not detalhe.startswith("SCAN "):
+            continue
+        if "VIRTUAL TABLE" in detalhe or detalhe.startswith(("SCAN (", "SCAN CONSTANT ROW")):
+            continue
+        indice = _PADRAO_INDICE.search(detalhe)
+        if indice and indice.group(1) in indices_parciais:
+            continue
+        varreduras.append(detalhe)
+    return varreduras
+
+
+def verificar_planos() -> Dict[str, List[str]]:
+    """
+    Verifica os planos de todos os comandos de sql/ em um esquema em memória.
+
+    Returns:
+        Dicionário "modulo.CONSTANTE" -> varreduras encontradas, apenas para
+        comandos fora de VARREDURAS_PERMITIDAS (vazio se tudo estiver indexado)
+    """
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        montar_esquema(conn)
+        parciais = _indices_parciais(conn)
+
+        problemas = {}
+        for nome, comando in listar_comandos():
+            if nome in VARREDURAS_PERMITIDAS:
+                continue
+            varreduras = encontrar_varreduras(obter_plano(conn, comando), parciais)
+            if varreduras:
+                problemas[nome] = varreduras
+        return problemas
+    finally:
+        conn.close()
@@ -4,9 +4,35 @@ Módulo de rate limiting reutilizável.
 Implementa limitação de requisições (rate limiting) para proteger
 rotas contra abuso, brute force e DDoS.
 
-Oferece duas classes:
+Oferece três classes:
     - RateLimiter: Rate limiter estático (valores fixos na inicialização)
-    - DynamicRateLimiter: Rate limiter dinâmico (lê valores do config_cache)
+    - TokenBucketRateLimiter: RateLimiter que usa sempre o algoritmo token bucket
+    - DynamicRateLimiter: Rate limiter dinâmico (limites vindos do config_cache)
+
+Algoritmos (RATE_LIMIT_ALGORITMO no .env ou parâmetro algoritmo):
+    - "janela": janela deslizante; guarda o instante de cada tentativa dentro
+      da janela (memória e CPU crescem com max_tentativas)
+    - "token_bucket": balde com max_tentativas fichas, reabastecido
+      continuamente (max_tentativas por janela); guarda dois floats por
+      identificador, independentemente do limite
+
+O estado de cada limiter fica em um CacheLRU limitado a
+RATE_LIMIT_MAX_IDENTIFICADORES identificadores. Identificadores sem
+tentativas há uma janela expiram, e varredor_rate_limit os remove a cada
+RATE_LIMIT_VARREDURA_SEGUNDOS. obter_estatisticas_limiters() retorna as
+métricas por nome de limiter.
+
+Nas rotas async, use verificar_async() (e obter_tempo_reset_async() /
+obter_tentativas_restantes_async()): com o backend sqlite, o acesso ao banco
+roda com executar_db, fora do event loop. Com o backend local, equivalem às
+versões síncronas.
+
+Backends (RATE_LIMIT_BACKEND no .env ou parâmetro backend):
+    - "local": estado na memória do worker; com vários workers do uvicorn
+      cada um conta à parte
+    - "sqlite": token bucket na tabela rate_limit, comum a todos os workers
+      e processos; cada worker reserva lotes de fichas (TokenBucketCompartilhado)
+      para não ir ao banco a cada requisição
 
 Uso do RateLimiter (estático):
     from util.rate_limiter import RateLimiter
@@ -19,7 +45,7 @@ Uso do RateLimiter (estático):
     async def post_login(request: Request, ...):
         ip = request.client.host if request.client else "unknown"
 
-        if not login_limiter.verificar(ip):
+        if not await login_limiter.verificar_async(ip):
             raise HTTPException(status_code=429, detail="Muitas tentativas")
 
 Uso do DynamicRateLimiter (recomendado):
@@ -39,30 +65,350 @@ Uso do DynamicRateLimiter (recomendado):
     async def post_login(request: Request, ...):
         ip = obter_identificador_cliente(request)
 
-        if not login_limiter.verificar(ip):
+        if not await login_limiter.verificar_async(ip):
             raise HTTPException(status_code=429, detail="Muitas tentativas")
 
-    # Mudanças nas configurações no banco são aplicadas automaticamente!
+    # Mudanças nas configurações são aplicadas quando o config_cache é limpo
+    # (config.limpar() / config.limpar_chave()), como faz a tela de configurações
 """
 
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from util.cache_lru import CacheLRU
 from util.logger_config import logger
+from util.config import (
+    RATE_LIMIT_ALGORITMO,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_LOTE_MAX,
+    RATE_LIMIT_MAX_IDENTIFICADORES,
+    RATE_LIMIT_VARREDURA_SEGUNDOS,
+)
 from util.config_cache import config
+from util.db_async import executar_db
+
+
+class AlgoritmoRateLimit:
+    """
+    Base dos algoritmos: estado por identificador em um CacheLRU limitado.
+
+    O TTL de cada entrada é a janela do limiter: um identificador sem
+    tentativas há uma janela inteira está no mesmo estado de um novo, então
+    a entrada pode ser descartada sem alterar o resultado. Ao atingir
+    max_identificadores, o identificador usado há mais tempo é descartado.
+
+    Attributes:
+        itens: Estado de cada identificador
+        usa_banco: True se registrar/restantes/segundos_para_liberar acessam
+            o banco (devem rodar fora do event loop)
+    """
+
+    usa_banco = False
+
+    def __init__(self, max_identificadores: int = RATE_LIMIT_MAX_IDENTIFICADORES):
+        self.itens = CacheLRU(max_itens=max_identificadores, ttl_segundos=0)
+
+    def _gravar(self, identificador: str, valor, janela_segundos: float) -> None:
+        """Grava o estado do identificador com validade de uma janela."""
+        self.itens.ttl_segundos = janela_segundos
+        self.itens.definir(identificador, valor)
+
+    def limpar(self, identificador: Optional[str] = None) -> None:
+        """Remove o estado de um identificador (ou de todos, se None)."""
+        if identificador is None:
+            self.itens.limpar()
+        else:
+            self.itens.remover(identificador)
+
+    def varrer(self, janela_segundos: float) -> int:
+        """Remove os identificadores cuja janela já passou; retorna quantos."""
+        return self.itens.remover_expirados()
+
+    def __contains__(self, identificador: str) -> bool:
+        return identificador in self.itens
+
+    def __len__(self) -> int:
+        return len(self.itens)
+
+
+class JanelaDeslizante(AlgoritmoRateLimit):
+    """
+    Algoritmo de janela deslizante (sliding window log).
+
+    Guarda o instante (relógio monotônico) de cada tentativa aceita dentro
+    da janela e bloqueia quando há max_tentativas delas.
+    """
+
+    def _na_janela(self, identificador: str, agora: float, janela_segundos: float) -> List[float]:
+        """Retorna as tentativas do identificador que ainda estão na janela."""
+        return [t for t in self.itens.obter(identificador, ()) if agora - t < janela_segundos]
+
+    def registrar(self, identificador: str, max_tentativas: int, janela_segundos: float) -> bool:
+        """Registra uma tentativa se houver espaço na janela."""
+        agora = time.monotonic()
+        tentativas = self._na_janela(identificador, agora, janela_segundos)
+        if len(tentativas) >= max_tentativas:
+            return False
+        tentativas.append(agora)
+        self._gravar(identificador, tentativas, janela_segundos)
+        return True
+
+    def restantes(self, identificador: str, max_tentativas: int, janela_segundos: float) -> int:
+        """Número de tentativas ainda aceitas na janela atual."""
+        tentativas = self._na_janela(identificador, time.monotonic(), janela_segundos)
+        return max(0, max_tentativas - len(tentativas))
+
+    def segundos_para_liberar(
+        self, identificador: str, max_tentativas: int, janela_segundos: float
+    ) -> Optional[float]:
+        """Segundos até a tentativa mais antiga sair da janela (None se não bloqueado)."""
+        agora = time.monotonic()
+        tentativas = self._na_janela(identificador, agora, janela_segundos)
+        if len(tentativas) < max_tentativas:
+            return None
+        # Reset quando a tentativa mais antiga sair da janela
+        return tentativas[0] + janela_segundos - agora
+
+
+class TokenBucket(AlgoritmoRateLimit):
+    """
+    Algoritmo token bucket.
+
+    Cada identificador tem um balde com até max_tentativas fichas; cada
+    tentativa consome uma e o balde é reabastecido à taxa de max_tentativas
+    por janela. O estado por identificador são dois floats: fichas e o
+    instante (relógio monotônico) do último cálculo.
+    """
+
+    def _fichas(
+        self, identificador: str, agora: float, max_tentativas: int, janela_segundos: float
+    ) -> float:
+        """Fichas disponíveis no instante agora (balde novo começa cheio)."""
+        balde: Optional[Tuple[float, float]] = self.itens.obter(identificador)
+        if balde is None:
+            return float(max_tentativas)
+        fichas, instante = balde
+        reabastecidas = (agora - instante) * max_tentativas / janela_segundos
+        return min(float(max_tentativas), fichas + reabastecidas)
+
+    def registrar(self, identificador: str, max_tentativas: int, janela_segundos: float) -> bool:
+        """Consome uma ficha do balde, se houver."""
+        agora = time.monotonic()
+        fichas = self._fichas(identificador, agora, max_tentativas, janela_segundos)
+        if fichas < 1:
+            self._gravar(identificador, (fichas, agora), janela_segundos)
+            return False
+        self._gravar(identificador, (fichas - 1, agora), janela_segundos)
+        return True
+
+    def restantes(self, identificador: str, max_tentativas: int, janela_segundos: float) -> int:
+        """Número de fichas inteiras disponíveis agora."""
+        return math.floor(
+            self._fichas(identificador, time.monotonic(), max_tentativas, janela_segundos)
+        )
+
+    def segundos_para_liberar(
+        self, identificador: str, max_tentativas: int, janela_segundos: float
+    ) -> Optional[float]:
+        """Segundos até a próxima ficha (None se já há ficha disponível)."""
+        fichas = self._fichas(identificador, time.monotonic(), max_tentativas, janela_segundos)
+        if fichas >= 1:
+            return None
+        return (1 - fichas) * janela_segundos / max_tentativas
+
+
+class TokenBucketCompartilhado(AlgoritmoRateLimit):
+    """
+    Token bucket com o balde na tabela rate_limit, comum a todos os workers.
+
+    Para não gravar no banco a cada requisição, o worker reserva um lote de
+    fichas de uma vez (repo.rate_limit_repo.reservar, atômico entre
+    processos) e as consome localmente. O lote é 1/10 do limite, entre 1 e
+    RATE_LIMIT_LOTE_MAX, e o total consumido por todos os workers nunca passa
+    das fichas do balde. Limiters com menos de 20 tentativas por janela
+    (login, cadastro, esqueci senha) têm lote de 1: continuam exatos, mas
+    gravam no banco a cada tentativa. Um lote maior bloquearia o cliente
+    antes do limite quando as fichas ficam reservadas em outro worker.
+    Uma reserva vale pelo tempo que o balde leva para repor as fichas
+    reservadas; fichas não usadas nesse prazo são descartadas.
+
+    As operações que acessam o banco são síncronas; nas rotas, use os
+    métodos *_async do RateLimiter, que as executam com executar_db.
+
+    Se o banco falhar, o worker passa a limitar o identificador apenas
+    localmente (TokenBucket) até a próxima reserva bem-sucedida.
+
+    Attributes:
+        limiter: Nome do limiter (chave na tabela rate_limit)
+        itens: Reserva local de cada identificador: (fichas, válida até)
+    """
+
+    usa_banco = True
+
+    def __init__(self, limiter: str, max_identificadores: int = RATE_LIMIT_MAX_IDENTIFICADORES):
+        super().__init__(max_identificadores)
+        self.limiter = limiter
+        self._local = TokenBucket(max_identificadores)
+        # Reservas são consumidas no event loop e nas threads de executar_db
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lote(max_tentativas: int) -> int:
+        """Fichas reservadas por ida ao banco."""
+        return max(1, min(RATE_LIMIT_LOTE_MAX, max_tentativas // 10))
+
+    def consumir_reserva(self, identificador: str) -> bool:
+        """
+        Consome uma ficha da reserva local, sem acessar o banco.
+
+        Returns:
+            True se havia ficha válida na reserva
+        """
+        with self._lock:
+            reserva: Optional[Tuple[int, float]] = self.itens.obter(identificador)
+            if reserva is None or reserva[0] <= 0 or time.monotonic() >= reserva[1]:
+                return False
+            self.itens.definir(identificador, (reserva[0] - 1, reserva[1]))
+            return True
+
+    def registrar(self, identificador: str, max_tentativas: int, janela_segundos: float) -> bool:
+        """Consome uma ficha da reserva local ou reserva um novo lote no banco."""
+        from repo import rate_limit_repo
+
+        if self.consumir_reserva(identificador):
+            return True
+
+        agora = time.monotonic()
+        lote = self._lote(max_tentativas)
+        try:
+            concedidas = rate_limit_repo.reservar(
+                self.limiter, identificador, max_tentativas,
+                max_tentativas / janela_segundos, lote, time.time(),
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Rate limit [{self.limiter}] sem acesso ao estado compartilhado: {e}")
+            return self._local.registrar(identificador, max_tentativas, janela_segundos)
+
+        if concedidas == 0:
+            return False
+        # A validade da reserva fica na própria entrada; o TTL do cache é a
+        # janela do limiter, como nos demais algoritmos (validade <= janela)
+        validade = concedidas * janela_segundos / max_tentativas
+        with self._lock:
+            self._gravar(identificador, (concedidas - 1, agora + validade), janela_segundos)
+        return True
+
+    def _fichas_compartilhadas(
+        self, identificador: str, max_tentativas: int, janela_segundos: float
+    ) -> float:
+        """Fichas disponíveis agora no balde do banco (balde inexistente = cheio)."""
+        from repo import rate_limit_repo
+
+        try:
+            balde = rate_limit_repo.obter(self.limiter, identificador)
+        except sqlite3.Error as e:
+            logger.error(f"Rate limit [{self.limiter}] sem acesso ao estado compartilhado: {e}")
+            return float(self._local.restantes(identificador, max_tentativas, janela_segundos))
+        if balde is None:
+            return float(max_tentativas)
+        fichas, atualizado_em = balde
+        reabastecidas = max(0.0, time.time() - atualizado_em) * max_tentativas / janela_segundos
+        return min(float(max_tentativas), fichas + reabastecidas)
+
+    def _reserva_local(self, identificador: str) -> int:
+        """Fichas ainda válidas na reserva local."""
+        reserva = self.itens.obter(identificador)
+        if reserva is None or time.monotonic() >= reserva[1]:
+            return 0
+        return reserva[0]
+
+    def restantes(self, identificador: str, max_tentativas: int, janela_segundos: float) -> int:
+        """Fichas da reserva local mais as disponíveis no banco."""
+        compartilhadas = self._fichas_compartilhadas(identificador, max_tentativas, janela_segundos)
+        return min(max_tentativas, self._reserva_local(identificador) + math.floor(compartilhadas))
+
+    def segundos_para_liberar(
+        self, identificador: str, max_tentativas: int, janela_segundos: float
+    ) -> Optional[float]:
+        """Segundos até haver ficha no balde do banco (None se há ficha disponível)."""
+        if self._reserva_local(identificador) > 0:
+            return None
+        fichas = self._fichas_compartilhadas(identificador, max_tentativas, janela_segundos)
+        if fichas >= 1:
+            return None
+        return (1 - fichas) * janela_segundos / max_tentativas
+
+    def limpar(self, identificador: Optional[str] = None) -> None:
+        """Remove a reserva local e o balde compartilhado."""
+        from repo import rate_limit_repo
+
+        super().limpar(identificador)
+        self._local.limpar(identificador)
+        try:
+            rate_limit_repo.excluir(self.limiter, identificador)
+        except sqlite3.Error as e:
+            logger.error(f"Rate limit [{self.limiter}] erro ao limpar estado compartilhado: {e}")
+
+    def varrer(self, janela_segundos: float) -> int:
+        """Remove reservas vencidas e baldes sem uso há uma janela (já cheios)."""
+        from repo import rate_limit_repo
+
+        removidos = super().varrer(janela_segundos) + self._local.varrer(janela_segundos)
+        try:
+            removidos += rate_limit_repo.excluir_inativos(self.limiter, time.time() - janela_segundos)
+        except sqlite3.Error as e:
+            logger.error(f"Rate limit [{self.limiter}] erro na varredura do estado compartilhado: {e}")
+        return removidos
+
+    def __contains__(self, identificador: str) -> bool:
+        # O balde pode ter sido criado por outro worker
+        return True
+
+
+# Algoritmos disponíveis: nome (RATE_LIMIT_ALGORITMO) -> classe
+ALGORITMOS = {
+    "janela": JanelaDeslizante,
+    "token_bucket": TokenBucket,
+}
+
+# Backends do estado: "local" (memória do worker) ou "sqlite" (tabela rate_limit)
+BACKENDS = ("local", "sqlite")
+
+# Limiters criados no processo (varredura periódica e métricas)
+_limiters: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+
+
+def _criar_algoritmo(algoritmo: str, backend: str, limiter: str) -> AlgoritmoRateLimit:
+    """Instancia o algoritmo pelo nome, no backend informado."""
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(
+            f"algoritmo de rate limit inválido: {algoritmo!r} (opções: {', '.join(ALGORITMOS)})"
+        )
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"backend de rate limit inválido: {backend!r} (opções: {', '.join(BACKENDS)})"
+        )
+    if backend == "sqlite":
+        return TokenBucketCompartilhado(limiter)
+    return ALGORITMOS[algoritmo]()
 
 
 class RateLimiter:
     """
-    Rate limiter baseado em janela deslizante (sliding window).
+    Rate limiter por identificador (geralmente IP).
 
-    Mantém registro de tentativas por identificador (geralmente IP)
-    e bloqueia se exceder limite em janela de tempo.
+    Bloqueia o identificador que exceder max_tentativas na janela de tempo,
+    segundo o algoritmo escolhido (janela deslizante por padrão).
 
     Attributes:
         max_tentativas: Número máximo de tentativas permitidas
         janela: Timedelta representando janela de tempo
-        tentativas: Dict de identificador -> lista de timestamps
+        algoritmo: Nome do algoritmo ("janela" ou "token_bucket")
     """
 
     def __init__(
@@ -70,6 +416,8 @@ class RateLimiter:
         max_tentativas: int = 5,
         janela_minutos: int = 5,
         nome: str = "default",
+        algoritmo: Optional[str] = None,
+        backend: Optional[str] = None,
     ):
         """
         Inicializa rate limiter.
@@ -77,7 +425,14 @@ class RateLimiter:
         Args:
             max_tentativas: Número máximo de tentativas na janela
             janela_minutos: Tamanho da janela em minutos
-            nome: Nome descritivo do limiter (para logs)
+            nome: Nome descritivo do limiter (para logs; chave do estado
+                compartilhado, deve ser único com o backend sqlite)
+            algoritmo: "janela" ou "token_bucket" (padrão: RATE_LIMIT_ALGORITMO)
+            backend: "local" ou "sqlite" (padrão: RATE_LIMIT_BACKEND); o
+                backend sqlite usa sempre token bucket
+
+        Raises:
+            ValueError: Se os limites não forem positivos ou o algoritmo/backend não existir
         """
         if max_tentativas <= 0:
             raise ValueError("max_tentativas deve ser positivo")
@@ -88,14 +443,16 @@ class RateLimiter:
         self.janela = timedelta(minutes=janela_minutos)
         self.janela_minutos = janela_minutos
         self.nome = nome
-        self.tentativas: defaultdict[str, list[datetime]] = defaultdict(list)
+        self.backend = backend or RATE_LIMIT_BACKEND
+        self.algoritmo = "token_bucket" if self.backend == "sqlite" else algoritmo or RATE_LIMIT_ALGORITMO
+        self._estado = _criar_algoritmo(self.algoritmo, self.backend, nome)
+        _limiters.add(self)
 
     def verificar(self, identificador: str) -> bool:
         """
         Verifica se identificador está dentro do limite.
 
-        Remove tentativas antigas da janela e verifica se está
-        abaixo do máximo. Se estiver, registra nova tentativa.
+        Se estiver, registra nova tentativa.
 
         Args:
             identificador: Identificador único (geralmente IP)
@@ -104,25 +461,51 @@ class RateLimiter:
             True se dentro do limite (permitido)
             False se excedeu limite (bloqueado)
         """
-        agora = datetime.now()
+        permitido = self._estado.registrar(
+            identificador, self.max_tentativas, self.janela.total_seconds()
+        )
+        if not permitido:
+            self._registrar_bloqueio(identificador)
+        return permitido
 
-        # Limpar tentativas antigas (fora da janela)
-        self.tentativas[identificador] = [
-            t for t in self.tentativas[identificador] if agora - t < self.janela
-        ]
+    async def verificar_async(self, identificador: str) -> bool:
+        """
+        Versão de verificar() para rotas async.
 
-        # Verificar se excedeu limite
-        if len(self.tentativas[identificador]) >= self.max_tentativas:
-            logger.warning(
-                f"Rate limit excedido [{self.nome}] - "
-                f"Identificador: {identificador}, "
-                f"Tentativas: {len(self.tentativas[identificador])}/{self.max_tentativas}"
-            )
-            return False
+        Com o backend sqlite, a ficha sai da reserva local do worker quando
+        possível; a reserva de um novo lote no banco roda com executar_db,
+        sem bloquear o event loop. Com o backend local, equivale a verificar().
 
-        # Registrar nova tentativa
-        self.tentativas[identificador].append(agora)
-        return True
+        Args:
+            identificador: Identificador único (geralmente IP)
+
+        Returns:
+            True se dentro do limite (permitido)
+            False se excedeu limite (bloqueado)
+        """
+        if not self._estado.usa_banco:
+            return self.verificar(identificador)
+
+        self._atualizar_valores()
+        if self._estado.consumir_reserva(identificador):
+            return True
+        permitido = await executar_db(
+            self._estado.registrar, identificador, self.max_tentativas, self.janela.total_seconds()
+        )
+        if not permitido:
+            self._registrar_bloqueio(identificador)
+        return permitido
+
+    def _registrar_bloqueio(self, identificador: str) -> None:
+        """Registra no log uma tentativa bloqueada."""
+        logger.warning(
+            f"Rate limit excedido [{self.nome}] - "
+            f"Identificador: {identificador}, "
+            f"Limite: {self.max_tentativas} em {self.janela_minutos} min"
+        )
+
+    def _atualizar_valores(self) -> None:
+        """Atualiza os limites antes do uso (limites fixos: nada a fazer)."""
 
     def limpar(self, identificador: Optional[str] = None) -> None:
         """
@@ -133,11 +516,11 @@ class RateLimiter:
                           Se None, limpa todos (útil para testes).
         """
         if identificador:
-            if identificador in self.tentativas:
-                del self.tentativas[identificador]
+            if identificador in self._estado:
+                self._estado.limpar(identificador)
                 logger.debug(f"Limpo rate limit para identificador: {identificador}")
         else:
-            self.tentativas.clear()
+            self._estado.limpar()
             logger.debug(f"Limpo todos os rate limits [{self.nome}]")
 
     def obter_tentativas_restantes(self, identificador: str) -> int:
@@ -150,19 +533,19 @@ class RateLimiter:
         Returns:
             Número de tentativas restantes (0 se bloqueado)
         """
-        agora = datetime.now()
-
-        # Limpar tentativas antigas
-        self.tentativas[identificador] = [
-            t for t in self.tentativas[identificador] if agora - t < self.janela
-        ]
+        return self._estado.restantes(
+            identificador, self.max_tentativas, self.janela.total_seconds()
+        )
 
-        tentativas_atuais = len(self.tentativas[identificador])
-        return max(0, self.max_tentativas - tentativas_atuais)
+    async def obter_tentativas_restantes_async(self, identificador: str) -> int:
+        """Versão de obter_tentativas_restantes() para rotas async (backend sqlite fora do event loop)."""
+        if not self._estado.usa_banco:
+            return self.obter_tentativas_restantes(identificador)
+        return await executar_db(self.obter_tentativas_restantes, identificador)
 
     def obter_tempo_reset(self, identificador: str) -> Optional[timedelta]:
         """
-        Retorna tempo até o reset do limite.
+        Retorna tempo até o identificador voltar a ser aceito.
 
         Args:
             identificador: Identificador único
@@ -170,41 +553,96 @@ class RateLimiter:
         Returns:
             Timedelta até reset, ou None se não bloqueado
         """
-        if identificador not in self.tentativas or not self.tentativas[identificador]:
+        if identificador not in self._estado:
             return None
+        segundos = self._estado.segundos_para_liberar(
+            identificador, self.max_tentativas, self.janela.total_seconds()
+        )
+        if segundos is None or segundos <= 0:
+            return None
+        return timedelta(seconds=segundos)
 
-        agora = datetime.now()
+    async def obter_tempo_reset_async(self, identificador: str) -> Optional[timedelta]:
+        """Versão de obter_tempo_reset() para rotas async (backend sqlite fora do event loop)."""
+        if not self._estado.usa_banco:
+            return self.obter_tempo_reset(identificador)
+        return await executar_db(self.obter_tempo_reset, identificador)
 
-        # Limpar tentativas antigas
-        self.tentativas[identificador] = [
-            t for t in self.tentativas[identificador] if agora - t < self.janela
-        ]
+    def varrer(self) -> int:
+        """
+        Remove o estado dos identificadores sem tentativas na última janela.
+
+        Returns:
+            Número de identificadores removidos
+        """
+        return self._estado.varrer(self.janela.total_seconds())
 
-        # Se ainda está bloqueado, calcular tempo até reset
-        if len(self.tentativas[identificador]) >= self.max_tentativas:
-            # Reset quando a tentativa mais antiga sair da janela
-            tentativa_mais_antiga = self.tentativas[identificador][0]
-            tempo_reset = (tentativa_mais_antiga + self.janela) - agora
-            return tempo_reset if tempo_reset.total_seconds() > 0 else None
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna métricas do estado mantido pelo limiter.
 
-        return None
+        Returns:
+            Dicionário com identificadores (mantidos agora), max_identificadores,
+            descartados (removidos por falta de espaço) e expirados (removidos
+            por inatividade)
+        """
+        estatisticas = self._estado.itens.obter_estatisticas()
+        return {
+            "identificadores": estatisticas["itens"],
+            "max_identificadores": estatisticas["max_itens"],
+            "descartados": estatisticas["descartados"],
+            "expirados": estatisticas["expirados"],
+        }
 
     def __repr__(self) -> str:
         """Representação string do limiter."""
         return (
-            f"RateLimiter(nome='{self.nome}', "
+            f"{type(self).__name__}(nome='{self.nome}', "
             f"max_tentativas={self.max_tentativas}, "
-            f"janela_minutos={self.janela_minutos})"
+            f"janela_minutos={self.janela_minutos}, "
+            f"algoritmo='{self.algoritmo}')"
+        )
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Rate limiter que usa sempre o algoritmo token bucket.
+
+    Permite rajadas de até max_tentativas e depois uma tentativa a cada
+    janela / max_tentativas, com memória constante por identificador.
+    """
+
+    def __init__(
+        self,
+        max_tentativas: int = 5,
+        janela_minutos: int = 5,
+        nome: str = "default",
+    ):
+        """
+        Inicializa rate limiter token bucket.
+
+        Args:
+            max_tentativas: Capacidade do balde (tentativas em rajada)
+            janela_minutos: Tempo para reabastecer o balde vazio, em minutos
+            nome: Nome descritivo do limiter (para logs)
+        """
+        super().__init__(
+            max_tentativas=max_tentativas,
+            janela_minutos=janela_minutos,
+            nome=nome,
+            algoritmo="token_bucket",
         )
 
 
 class DynamicRateLimiter(RateLimiter):
     """
-    Rate limiter dinâmico que busca valores do config_cache a cada verificação.
+    Rate limiter dinâmico com limites vindos do config_cache.
 
     Permite alteração de rate limits sem reiniciar o servidor. Os valores
     max_tentativas e janela_minutos são lidos do cache de configuração
-    usando as chaves fornecidas.
+    usando as chaves fornecidas na criação e relidos apenas quando o cache
+    avisa que uma dessas chaves (ou todo o cache) foi limpa; a verificação
+    usa os números já calculados.
 
     Attributes:
         chave_max: Chave de configuração para max_tentativas
@@ -220,6 +658,8 @@ class DynamicRateLimiter(RateLimiter):
         padrao_max: int = 5,
         padrao_minutos: int = 5,
         nome: str = "dynamic",
+        algoritmo: Optional[str] = None,
+        backend: Optional[str] = None,
     ):
         """
         Inicializa rate limiter dinâmico.
@@ -230,6 +670,8 @@ class DynamicRateLimiter(RateLimiter):
             padrao_max: Valor padrão para max_tentativas
             padrao_minutos: Valor padrão para janela_minutos
             nome: Nome descritivo do limiter (para logs)
+            algoritmo: "janela" ou "token_bucket" (padrão: RATE_LIMIT_ALGORITMO)
+            backend: "local" ou "sqlite" (padrão: RATE_LIMIT_BACKEND)
         """
         # Validar valores padrão
         if padrao_max <= 0:
@@ -245,20 +687,39 @@ class DynamicRateLimiter(RateLimiter):
         # Inicializar com valores atuais do config
         max_tentativas = config.obter_int(chave_max, padrao_max)
         janela_minutos = config.obter_int(chave_minutos, padrao_minutos)
+        self._desatualizado = False
 
         super().__init__(
             max_tentativas=max_tentativas,
             janela_minutos=janela_minutos,
-            nome=nome
+            nome=nome,
+            algoritmo=algoritmo,
+            backend=backend,
         )
 
+    def configuracao_alterada(self, chave: Optional[str]) -> None:
+        """
+        Marca os limites para releitura se a configuração alterada os afeta.
+
+        Args:
+            chave: Chave alterada no config_cache (None = todas)
+        """
+        if chave is None or chave in (self.chave_max, self.chave_minutos):
+            self._desatualizado = True
+
     def _atualizar_valores(self) -> None:
         """
         Atualiza valores de max_tentativas e janela_minutos do config_cache.
 
-        Chamado internamente antes de cada verificação para garantir
-        que está usando os valores mais recentes.
+        Chamado internamente antes de cada verificação; só consulta o
+        config_cache depois de configuracao_alterada() marcar os limites
+        (alterações feitas em outros workers chegam pelo
+        verificador_configuracoes, em segundo plano).
         """
+        if not self._desatualizado:
+            return
+        self._desatualizado = False
+
         max_tentativas = config.obter_int(self.chave_max, self.padrao_max)
         janela_minutos = config.obter_int(self.chave_minutos, self.padrao_minutos)
 
@@ -282,8 +743,8 @@ class DynamicRateLimiter(RateLimiter):
         """
         Verifica se identificador está dentro do limite (com valores atualizados).
 
-        Atualiza valores do config_cache antes de verificar, garantindo
-        que mudanças em configurações sejam aplicadas imediatamente.
+        Limites alterados no config_cache valem a partir da primeira
+        verificação depois da alteração.
 
         Args:
             identificador: Identificador único (geralmente IP)
@@ -331,10 +792,21 @@ class DynamicRateLimiter(RateLimiter):
             f"chave_max='{self.chave_max}', "
             f"chave_minutos='{self.chave_minutos}', "
             f"max_tentativas={self.max_tentativas}, "
-            f"janela_minutos={self.janela_minutos})"
+            f"janela_minutos={self.janela_minutos}, "
+            f"algoritmo='{self.algoritmo}')"
         )
 
 
+def _configuracao_alterada(chave: Optional[str]) -> None:
+    """Repassa as alterações do config_cache aos rate limiters dinâmicos."""
+    for limiter in list(_limiters):
+        if isinstance(limiter, DynamicRateLimiter):
+            limiter.configuracao_alterada(chave)
+
+
+config.inscrever(_configuracao_alterada)
+
+
 def obter_identificador_cliente(request) -> str:
     """
     Extrai identificador único do cliente (geralmente IP).
@@ -348,3 +820,87 @@ def obter_identificador_cliente(request) -> str:
     if hasattr(request, "client") and request.client:
         return request.client.host
     return "unknown"
+
+
+def obter_estatisticas_limiters() -> Dict[str, dict]:
+    """
+    Retorna as métricas de todos os limiters do processo, por nome.
+
+    Limiters com o mesmo nome têm as métricas somadas.
+
+    Returns:
+        Dicionário nome -> métricas (ver RateLimiter.obter_estatisticas)
+    """
+    metricas: Dict[str, dict] = {}
+    for limiter in list(_limiters):
+        estatisticas = limiter.obter_estatisticas()
+        if limiter.nome not in metricas:
+            metricas[limiter.nome] = estatisticas
+        else:
+            for campo, valor in estatisticas.items():
+                metricas[limiter.nome][campo] += valor
+    return dict(sorted(metricas.items()))
+
+
+def varrer_limiters() -> int:
+    """
+    Remove de todos os limiters os identificadores inativos há uma janela.
+
+    Returns:
+        Total de identificadores removidos
+    """
+    return sum(limiter.varrer() for limiter in list(_limiters))
+
+
+class VarredorRateLimit:
+    """
+    Tarefa assíncrona que varre periodicamente o estado dos limiters.
+
+    Sem a varredura, um identificador só é descartado quando volta a ser
+    consultado ou quando o limiter atinge RATE_LIMIT_MAX_IDENTIFICADORES.
+    """
+
+    def __init__(self, intervalo_segundos: float = RATE_LIMIT_VARREDURA_SEGUNDOS):
+        """
+        Inicializa o varredor.
+
+        Args:
+            intervalo_segundos: Intervalo entre varreduras (0 desativa)
+        """
+        self.intervalo_segundos = intervalo_segundos
+        self._tarefa: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        """Inicia a tarefa no event loop atual (sem efeito se já estiver rodando)."""
+        if self.intervalo_segundos <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        if self._tarefa is not None and not self._tarefa.done() and self._tarefa.get_loop() is loop:
+            return
+        self._tarefa = loop.create_task(self._varrer_periodicamente())
+
+    async def _varrer_periodicamente(self) -> None:
+        """Laço da tarefa: varre os limiters a cada intervalo."""
+        while True:
+            await asyncio.sleep(self.intervalo_segundos)
+            try:
+                # Os limiters com backend sqlite excluem baldes no banco
+                removidos = await executar_db(varrer_limiters)
+                if removidos:
+                    logger.debug(f"[RateLimit] {removidos} identificadores inativos removidos")
+            except Exception as e:
+                logger.error(f"[RateLimit] Erro na varredura dos limiters: {e}")
+
+    async def encerrar(self) -> None:
+        """Cancela a tarefa de varredura."""
+        tarefa, self._tarefa = self._tarefa, None
+        if tarefa is not None and not tarefa.done():
+            tarefa.cancel()
+            try:
+                await tarefa
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+
+
+# Instância global usada pela aplicação
+varredor_rate_limit = VarredorRateLimit()
@@ -1,17 +1,23 @@
-from passlib.context import CryptContext
 import secrets
 from datetime import datetime, timedelta
+from functools import lru_cache
 from util.datetime_util import agora
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def _contexto_senha():
+    """Contexto de hash de senhas, criado no primeiro uso para não importar passlib/bcrypt no boot"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def criar_hash_senha(senha: str) -> str:
     """Cria hash da senha"""
-    return pwd_context.hash(senha)
+    return _contexto_senha().hash(senha)
 
 def verificar_senha(senha_plana: str, senha_hash: str) -> bool:
     """Verifica se senha corresponde ao hash"""
-    return pwd_context.verify(senha_plana, senha_hash)
+    return _contexto_senha().verify(senha_plana, senha_hash)
 
 def gerar_token_redefinicao() -> str:
     """Gera token seguro para redefinição de senha"""
@@ -3,18 +3,38 @@ Módulo de utilidades para templates Jinja2.
 
 Fornece filtros customizados, funções globais e configuração
 do ambiente Jinja2 para a aplicação FastAPI.
+
+Todas as rotas compartilham um único Environment: cada template é compilado
+uma vez por processo e o bytecode fica em TEMPLATES_CACHE_DIR, reaproveitado
+pelos demais workers e reinícios.
 """
 
+import os
+from functools import lru_cache
+from pathlib import Path
 from typing import Union, Optional
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
 
 from util.flash_messages import obter_mensagens
-from util.config import APP_NAME, VERSION, TOAST_AUTO_HIDE_DELAY_MS
+from util.config import APP_NAME, VERSION, TOAST_AUTO_HIDE_DELAY_MS, IS_DEVELOPMENT
 from util.csrf_protection import get_csrf_token, CSRF_FORM_FIELD
 from util.config_cache import config
+from util.cache_pagina import FragmentoCacheExtension
+
+# Diretório raiz dos templates (base.html, componentes e subpastas)
+TEMPLATES_DIR = "templates"
+
+# Diretório do cache de bytecode dos templates (vazio desativa o cache em disco)
+TEMPLATES_CACHE_DIR = os.getenv("TEMPLATES_CACHE_DIR", ".cache/jinja2")
+
+# Recarregar templates alterados em disco (padrão: apenas em desenvolvimento)
+TEMPLATES_AUTO_RELOAD = os.getenv("TEMPLATES_AUTO_RELOAD", str(IS_DEVELOPMENT)).lower() == "true"
+
+# Compilar todos os templates na inicialização, antes da primeira requisição
+TEMPLATES_PRECOMPILAR = os.getenv("TEMPLATES_PRECOMPILAR", "False").lower() == "true"
 
 
 def formatar_data_br(
@@ -201,27 +221,38 @@ def csrf_input(request: Optional[Request] = None) -> str:
     return f'<input type="hidden" name="{CSRF_FORM_FIELD}" value="{token}">'
 
 
-def criar_templates(pasta: str) -> Jinja2Templates:
+def _criar_cache_bytecode() -> Optional[FileSystemBytecodeCache]:
+    """Cria o cache de bytecode em TEMPLATES_CACHE_DIR (None se desativado)."""
+    if not TEMPLATES_CACHE_DIR:
+        return None
+    pasta = Path(TEMPLATES_CACHE_DIR)
+    pasta.mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(str(pasta))
+
+
+@lru_cache(maxsize=None)
+def obter_ambiente() -> Environment:
     """
-    Cria instância de Jinja2Templates com configurações customizadas.
+    Retorna o ambiente Jinja2 compartilhado por todas as rotas.
 
-    Configura o ambiente Jinja2 com:
+    Configura o ambiente com:
     - Funções globais (obter_mensagens, csrf_input)
     - Variáveis globais (APP_NAME, VERSION)
     - Filtros customizados (data_br, data_hora_br, foto_usuario)
-
-    Args:
-        pasta: Caminho da pasta de templates (não utilizado, mantido por compatibilidade)
+    - Cache de bytecode em disco (TEMPLATES_CACHE_DIR)
+    - Tag {% cache %} para fragmentos (util/cache_pagina.py)
+    - auto_reload conforme TEMPLATES_AUTO_RELOAD
 
     Returns:
-        Instância configurada de Jinja2Templates
-
-    Note:
-        Sempre usa o diretório raiz 'templates' para permitir
-        acesso a templates base e componentes compartilhados.
+        Instância única de Environment
     """
     # Usar o diretório raiz 'templates' para permitir acesso a base.html e subpastas
-    env = Environment(loader=FileSystemLoader("templates"))
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=_criar_cache_bytecode(),
+        auto_reload=TEMPLATES_AUTO_RELOAD,
+        extensions=[FragmentoCacheExtension],
+    )
 
     # Adicionar função global para obter mensagens
     env.globals['obter_mensagens'] = obter_mensagens
@@ -259,5 +290,53 @@ def criar_templates(pasta: str) -> Jinja2Templates:
     env.filters['data_br_as'] = format_data_as_hora
     env.filters['hora_br'] = format_hora
 
-    templates = Jinja2Templates(env=env)
-    return templates
+    return env
+
+
+@lru_cache(maxsize=None)
+def _templates_compartilhado() -> Jinja2Templates:
+    """Jinja2Templates único sobre o ambiente compartilhado."""
+    return Jinja2Templates(env=obter_ambiente())
+
+
+def criar_templates(pasta: str) -> Jinja2Templates:
+    """
+    Retorna a instância de Jinja2Templates compartilhada pela aplicação.
+
+    Todas as chamadas retornam o mesmo objeto, apoiado em obter_ambiente():
+    os templates são compilados uma única vez por processo, qualquer que
+    seja o módulo de rotas que os renderize.
+
+    Args:
+        pasta: Caminho da pasta de templates (não utilizado, mantido por compatibilidade)
+
+    Returns:
+        Instância configurada de Jinja2Templates
+
+    Note:
+        Sempre usa o diretório raiz 'templates' para permitir
+        acesso a templates base e componentes compartilhados.
+    """
+    return _templates_compartilhado()
+
+
+def precompilar_templates() -> int:
+    """
+    Compila todos os templates .html do ambiente compartilhado.
+
+    Preenche o cache em memória do processo e, com TEMPLATES_CACHE_DIR
+    configurado, grava o bytecode em disco para os demais workers. Pode
+    rodar na inicialização (TEMPLATES_PRECOMPILAR) ou no build da imagem
+    (python -m util.comandos precompilar-templates).
+
+    Returns:
+        Quantidade de templates compilados
+
+    Raises:
+        jinja2.TemplateSyntaxError: Se algum template tiver erro de sintaxe
+    """
+    env = obter_ambiente()
+    nomes = env.list_templates(extensions=["html"])
+    for nome in nomes:
+        env.get_template(nome)
+    return len(nomes)